@@ -0,0 +1,104 @@
+"""
+同步與非同步職缺端點吞吐量基準測試 / Sync vs async job endpoint throughput benchmark
+
+透過 ASGI（django.test.AsyncClient）以相同併發數呼叫 /api/jobs/ 與 /api/async/jobs/，
+比較每秒請求數與延遲。預設停用回應快取以量測 ORM 路徑。
+Calls /api/jobs/ and /api/async/jobs/ through ASGI (django.test.AsyncClient) at the same
+concurrency and compares requests per second and latency. The response cache is disabled
+by default so the ORM path is measured.
+
+用法 / Usage:
+    python benchmarks/async_throughput.py --rows 50000 --requests 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import seed_job_postings, setup_django  # noqa: E402
+
+# 被比較的端點 / Endpoints being compared
+ENDPOINTS = {
+    "sync": "/api/jobs/",
+    "async": "/api/async/jobs/",
+}
+
+# 每次請求輪替使用的查詢字串 / Query strings rotated across requests
+QUERY_STRINGS = (
+    "?status=active&limit=20",
+    "?status=active&sort_by=expiration_date&limit=20",
+    "?status=expired&sort_desc=true&limit=20",
+    "?limit=20&offset=100",
+)
+
+
+async def _run_endpoint(path, token, total_requests, concurrency):
+    """
+    以固定併發數送出請求並回傳 (總秒數, 延遲列表) / Send requests at a fixed concurrency and return (seconds, latencies)
+    """
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    next_request = iter(range(total_requests))
+
+    async def worker():
+        for request_number in next_request:
+            query = QUERY_STRINGS[request_number % len(QUERY_STRINGS)]
+            started_at = time.perf_counter()
+            response = await client.get(path + query, headers=headers)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code != 200:
+                raise RuntimeError(f"{path}{query} returned {response.status_code}")
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started_at, latencies
+
+
+def run(row_count, total_requests, concurrency, use_cache, db_path=None):
+    """
+    建立資料並比較兩個端點 / Seed data and compare both endpoints
+    """
+    setup_django(db_path)
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from ninja_jwt.tokens import RefreshToken
+
+    settings.JOBS_RESPONSE_CACHE = {**settings.JOBS_RESPONSE_CACHE, "ENABLED": use_cache}
+    seed_job_postings(row_count)
+    user = User.objects.create_user(username="bench", password="bench-password")
+    token = str(RefreshToken.for_user(user).access_token)
+
+    for name, path in ENDPOINTS.items():
+        seconds, latencies = asyncio.run(_run_endpoint(path, token, total_requests, concurrency))
+        latencies.sort()
+        print(
+            f"{name:>5}: {total_requests / seconds:8.1f} req/s  "
+            f"p50={statistics.median(latencies) * 1000:7.2f} ms  "
+            f"p95={latencies[int(len(latencies) * 0.95) - 1] * 1000:7.2f} ms"
+        )
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000, help="number of postings to seed")
+    parser.add_argument("--requests", type=int, default=2_000, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent clients")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.rows, args.requests, args.concurrency, args.cache, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+JWT 認證微基準測試 / JWT authentication micro-benchmark
+
+比較 JWTAuth（每次驗簽＋查詢使用者）與 CachedJWTAuth 命中時每次認證的成本
+Compares the per-request cost of JWTAuth (signature check + user query every time) with a
+CachedJWTAuth hit
+
+用法 / Usage:
+    python benchmarks/auth.py --repeat 2000
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, time_call  # noqa: E402
+
+
+def run(repeat, db_path=None):
+    """
+    建立使用者並輸出每次認證的成本（微秒） / Create a user and print the per-request cost in microseconds
+    """
+    setup_django(db_path)
+
+    from django.contrib.auth.models import User
+    from django.test import RequestFactory
+    from ninja_jwt.authentication import JWTAuth
+    from ninja_jwt.tokens import RefreshToken
+
+    from jobs.auth import CachedJWTAuth, token_cache
+
+    user = User.objects.create_user(username="bench", password="bench")
+    token = str(RefreshToken.for_user(user).access_token)
+    request = RequestFactory().get("/")
+
+    results = {
+        "JWTAuth": time_call(lambda: JWTAuth().authenticate(request, token), repeat),
+        "CachedJWTAuth hit": time_call(lambda: CachedJWTAuth().authenticate(request, token), repeat),
+    }
+    for name, milliseconds in results.items():
+        print(f"{name:>18}: {milliseconds * 1000:7.2f} us/request")
+    print(f"cache stats: {token_cache.snapshot()}")
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=2000, help="authentications per measurement")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.repeat, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+SQLite 讀寫併發基準測試 / SQLite reader/writer concurrency benchmark
+
+以多個讀取執行緒（列表查詢）與寫入執行緒（更新職缺）同時存取同一個資料庫檔案，
+比較預設 SQLite 設定（rollback journal、每次請求新連線）與 JOBS_SQLITE 設定檔（WAL、持久連線）的吞吐量與延遲。
+每次操作前後呼叫 close_old_connections()，模擬 Django 在請求開始與結束時的連線處理。
+Runs reader threads (list queries) and writer threads (posting updates) against one database
+file and compares the default SQLite setup (rollback journal, a new connection per request)
+with the JOBS_SQLITE profile (WAL, persistent connections). close_old_connections() runs
+before and after every operation, like Django does when a request starts and finishes.
+
+用法 / Usage:
+    python benchmarks/concurrency.py --rows 10000 --readers 8 --writers 2 --seconds 5
+"""
+import argparse
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django  # noqa: E402
+
+# 比較的設定檔：JOBS_SQLITE 覆寫值與 CONN_MAX_AGE / Compared profiles: JOBS_SQLITE overrides and CONN_MAX_AGE
+PROFILES = (
+    ("baseline", {
+        "JOURNAL_MODE": "DELETE", "SYNCHRONOUS": "FULL", "CACHE_SIZE": None, "MMAP_SIZE": None, "TEMP_STORE": None,
+    }, 0),
+    ("tuned", {}, 600),
+)
+
+# 讀取每頁筆數 / Rows per read
+PAGE_SIZE = 20
+
+
+def _percentile_ms(latencies, percentile):
+    """
+    最近排名法分位數（毫秒） / Nearest-rank percentile in milliseconds
+    """
+    if not latencies:
+        return 0.0
+    latencies = sorted(latencies)
+    return latencies[max(int(round(percentile / 100 * len(latencies))) - 1, 0)] * 1000
+
+
+def _read(randomizer, job_count):
+    """
+    讀取一頁有效職缺 / Read one page of active postings
+    """
+    from jobs.models import JobPosting
+    from jobs.serializers import project_job_rows
+
+    offset = randomizer.randrange(0, max(job_count - PAGE_SIZE, 1))
+    queryset = JobPosting.objects.filter(status="active").order_by("-posting_date", "-id")
+    return list(project_job_rows(queryset)[offset:offset + PAGE_SIZE])
+
+
+def _write(randomizer, job_ids):
+    """
+    以 ORM 更新一筆職缺（含觸發器與訊號） / Update one posting through the ORM (triggers and signals included)
+    """
+    from jobs.models import JobPosting
+
+    job = JobPosting.objects.get(id=randomizer.choice(job_ids))
+    job.title = f"{job.title.split(' #')[0]} #{randomizer.randrange(1_000_000)}"
+    job.save()
+
+
+def _worker(operation, seconds, stats, seed, *args):
+    """
+    在限定時間內重複執行操作並記錄延遲與錯誤 / Repeat an operation for a fixed time, recording latency and errors
+    """
+    from django.db import OperationalError, close_old_connections, connections
+
+    randomizer = random.Random(seed)
+    deadline = time.perf_counter() + seconds
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        close_old_connections()  # request_started
+        started_at = time.perf_counter()
+        try:
+            operation(randomizer, *args)
+            latencies.append(time.perf_counter() - started_at)
+        except OperationalError:
+            errors += 1
+        finally:
+            close_old_connections()  # request_finished
+    connections.close_all()
+    stats.append((latencies, errors))
+
+
+def run_profile(name, overrides, conn_max_age, readers, writers, seconds, base_settings):
+    """
+    以指定設定檔執行一輪併發讀寫並輸出結果 / Run one concurrent read/write round with a profile and print the result
+    """
+    from django.conf import settings
+    from django.db import connection, connections
+
+    from jobs.models import JobPosting
+
+    connections.close_all()
+    settings.JOBS_SQLITE = {**base_settings, **overrides}
+    connections.settings["default"]["CONN_MAX_AGE"] = conn_max_age
+    # journal_mode 會保存在資料庫檔案，先以新連線切換 / journal_mode persists in the file, so switch it with a fresh connection
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA journal_mode")
+        journal_mode = cursor.fetchone()[0]
+    job_ids = list(JobPosting.objects.values_list("id", flat=True))
+    active_count = JobPosting.objects.filter(status="active").count()
+    connections.close_all()
+
+    read_stats, write_stats = [], []
+    threads = [
+        threading.Thread(target=_worker, args=(_read, seconds, read_stats, index, active_count))
+        for index in range(readers)
+    ] + [
+        threading.Thread(target=_worker, args=(_write, seconds, write_stats, 1000 + index, job_ids))
+        for index in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    read_latencies = [latency for latencies, _ in read_stats for latency in latencies]
+    write_latencies = [latency for latencies, _ in write_stats for latency in latencies]
+    print(
+        f"{name:<9} journal={journal_mode:<7} conn_max_age={conn_max_age:<4} "
+        f"reads/s={len(read_latencies) / seconds:8.1f} writes/s={len(write_latencies) / seconds:7.1f}  "
+        f"read p50={_percentile_ms(read_latencies, 50):6.2f} ms p95={_percentile_ms(read_latencies, 95):7.2f} ms  "
+        f"write p50={_percentile_ms(write_latencies, 50):6.2f} ms p95={_percentile_ms(write_latencies, 95):7.2f} ms  "
+        f"errors={sum(errors for _, errors in read_stats + write_stats)}"
+    )
+    return {
+        "profile": name,
+        "reads_per_second": len(read_latencies) / seconds,
+        "writes_per_second": len(write_latencies) / seconds,
+        "read_mean_ms": statistics.fmean(read_latencies) * 1000 if read_latencies else 0.0,
+    }
+
+
+def run(rows, readers, writers, seconds, db_path=None):
+    """
+    產生資料後依序執行各設定檔 / Generate the dataset and run every profile in turn
+    """
+    setup_django(db_path)
+
+    from django.conf import settings
+
+    from benchmarks.datagen import generate_job_postings
+
+    generate_job_postings(rows)
+    base_settings = dict(settings.JOBS_SQLITE)
+    print(f"{rows} rows, {readers} readers, {writers} writers, {seconds}s per profile")
+    return [
+        run_profile(name, overrides, conn_max_age, readers, writers, seconds, base_settings)
+        for name, overrides, conn_max_age in PROFILES
+    ]
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="number of postings")
+    parser.add_argument("--readers", type=int, default=8, help="reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="writer threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration per profile")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.rows, args.readers, args.writers, args.seconds, args.db)
+
+
+if __name__ == "__main__":
+    main()
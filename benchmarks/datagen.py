@@ -0,0 +1,263 @@
+"""
+擬真職缺資料產生器 / Realistic job posting data generator
+
+產生 10k 到 5M 筆職缺，地點、公司與技能依 Zipf 分布偏斜（少數熱門值佔大多數），
+職稱、年資、薪資與技能彼此相關，部分職缺沒有薪資。資料以原生 SQL 分批寫入，
+寫入期間移除全文檢索與薪資索引的觸發器，完成後一次重建。
+Generates 10k to 5M postings with Zipf-skewed locations, companies and skills (a few popular
+values cover most rows); titles, seniority, salaries and skills are correlated and some
+postings have no salary. Rows are written with raw SQL in batches; the search and salary index
+triggers are dropped while loading and the indexes rebuilt once at the end.
+
+用法 / Usage:
+    python benchmarks/datagen.py --rows 1000000 --db /tmp/jobs-1m.sqlite3
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import SEED_BATCH_SIZE, setup_django  # noqa: E402
+
+# 支援的資料量範圍 / Supported dataset sizes
+MIN_ROWS = 10_000
+MAX_ROWS = 5_000_000
+
+# 各維度的值數量 / Number of distinct values per dimension
+LOCATION_COUNT = 300
+COMPANY_COUNT = 20_000
+
+# Zipf 指數，越大越偏斜 / Zipf exponents; larger is more skewed
+LOCATION_SKEW = 1.1
+COMPANY_SKEW = 0.9
+SKILL_SKEW = 1.0
+
+# 沒有薪資資料的比例 / Share of postings without salary data
+NO_SALARY_RATIO = 0.15
+
+# 只有單邊薪資的比例 / Share of postings with only one salary bound
+OPEN_SALARY_RATIO = 0.05
+
+# 刊登日期分布（相對今天的天數）與有效天數 / Posting date spread around today and lifetime in days
+POSTING_DAYS = (-540, 30)
+LIFETIME_DAYS = (14, 90)
+
+# 每筆職缺的技能數 / Skills per posting
+SKILLS_PER_JOB = (2, 7)
+
+# 熱門城市（其餘為編號城市） / Popular cities, followed by numbered ones
+CITIES = (
+    "Taipei", "New Taipei", "Taichung", "Kaohsiung", "Taoyuan", "Hsinchu", "Tainan", "Remote",
+    "Tokyo", "Singapore", "Hong Kong", "Seoul", "Berlin", "London", "San Francisco", "New York",
+)
+
+# 職務：名稱、基本年薪、技能群組 / Roles: title, base salary and skill groups
+ROLES = (
+    ("Backend Engineer", 900_000, ("python", "web", "data")),
+    ("Frontend Engineer", 850_000, ("frontend", "web")),
+    ("Full Stack Engineer", 950_000, ("python", "frontend", "web")),
+    ("Data Engineer", 1_000_000, ("data", "python", "cloud")),
+    ("Data Scientist", 1_050_000, ("data", "python", "ml")),
+    ("Machine Learning Engineer", 1_200_000, ("ml", "python", "cloud")),
+    ("DevOps Engineer", 1_000_000, ("cloud", "ops")),
+    ("Mobile Engineer", 900_000, ("mobile", "frontend")),
+    ("QA Engineer", 700_000, ("qa", "web")),
+    ("Product Manager", 1_100_000, ("product",)),
+)
+
+# 年資等級與薪資倍數 / Seniority levels and salary multipliers
+SENIORITY = (("Junior", 0.7), ("", 1.0), ("Senior", 1.4), ("Staff", 1.8), ("Principal", 2.2))
+
+# 各群組的技能（依熱門程度排序） / Skills per group, most popular first
+SKILL_GROUPS = {
+    "python": ("Python", "Django", "FastAPI", "Flask", "Celery", "SQLAlchemy", "Pydantic"),
+    "web": ("SQL", "PostgreSQL", "REST", "Redis", "GraphQL", "MySQL", "gRPC", "Kafka"),
+    "frontend": ("JavaScript", "TypeScript", "React", "Vue", "CSS", "Next.js", "Angular", "Svelte"),
+    "data": ("SQL", "Spark", "Airflow", "Pandas", "dbt", "BigQuery", "Snowflake", "Hadoop"),
+    "ml": ("PyTorch", "TensorFlow", "scikit-learn", "NumPy", "MLflow", "CUDA", "Hugging Face"),
+    "cloud": ("AWS", "Docker", "Kubernetes", "Terraform", "GCP", "Azure", "Helm"),
+    "ops": ("Linux", "Bash", "Prometheus", "Grafana", "Ansible", "Nginx", "Go"),
+    "mobile": ("Kotlin", "Swift", "Android", "iOS", "Flutter", "React Native"),
+    "qa": ("Selenium", "Cypress", "Pytest", "Playwright", "JMeter"),
+    "product": ("Agile", "Scrum", "Jira", "Roadmapping", "A/B Testing", "Analytics"),
+}
+
+
+def zipf_cum_weights(count, skew):
+    """
+    Zipf 分布的累積權重，供 random.choices 使用 / Cumulative Zipf weights for random.choices
+    """
+    return list(itertools.accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+class JobGenerator:
+    """
+    以固定亂數種子產生可重現的職缺列 / Generate reproducible posting rows from a fixed seed
+    """
+
+    def __init__(self, seed=42, today=None):
+        self.randomizer = random.Random(seed)
+        self.today = today or date.today()
+        self.locations = [*CITIES, *(f"City {index}" for index in range(len(CITIES), LOCATION_COUNT))]
+        self.location_weights = zipf_cum_weights(len(self.locations), LOCATION_SKEW)
+        self.companies = [f"Company {index}" for index in range(COMPANY_COUNT)]
+        self.company_weights = zipf_cum_weights(COMPANY_COUNT, COMPANY_SKEW)
+        self.group_weights = {
+            group: zipf_cum_weights(len(skills), SKILL_SKEW) for group, skills in SKILL_GROUPS.items()
+        }
+
+    @staticmethod
+    def skill_names():
+        """
+        所有技能名稱（去重） / Every skill name, deduplicated
+        """
+        return list(dict.fromkeys(skill for skills in SKILL_GROUPS.values() for skill in skills))
+
+    def _salary(self, base, multiplier):
+        """
+        產生薪資範圍，部分沒有薪資或只有單邊 / Build a salary range; some are missing or open-ended
+        """
+        roll = self.randomizer.random()
+        if roll < NO_SALARY_RATIO:
+            return None, None
+        salary_min = int(base * multiplier * self.randomizer.uniform(0.8, 1.2)) // 10_000 * 10_000
+        salary_max = salary_min + self.randomizer.randrange(100_000, 600_001, 50_000)
+        if roll < NO_SALARY_RATIO + OPEN_SALARY_RATIO:
+            return (salary_min, None) if self.randomizer.random() < 0.5 else (None, salary_max)
+        return salary_min, salary_max
+
+    def _skills(self, groups):
+        """
+        依職務群組挑選技能，保留順序且不重複 / Pick skills from the role's groups, ordered and unique
+        """
+        count = self.randomizer.randint(*SKILLS_PER_JOB)
+        picked = []
+        while len(picked) < count:
+            group = self.randomizer.choice(groups)
+            skill = self.randomizer.choices(SKILL_GROUPS[group], cum_weights=self.group_weights[group])[0]
+            if skill not in picked:
+                picked.append(skill)
+            elif len(picked) >= sum(len(SKILL_GROUPS[name]) for name in groups):
+                break
+        return picked
+
+    def rows(self, row_count):
+        """
+        逐筆產生職缺（值依 seed_job_postings 的欄位順序） / Yield postings in the column order of the insert
+        """
+        from jobs.locations import location_fields
+        from jobs.status import compute_status
+
+        # 每個地點只解析一次標準地點與網格 / Resolve the standard location and grid cell once per location
+        resolved = {location: location_fields(location) for location in self.locations}
+        now_text = self.today.isoformat() + " 00:00:00"
+        for row_number in range(row_count):
+            title, base, groups = self.randomizer.choice(ROLES)
+            level, multiplier = self.randomizer.choice(SENIORITY)
+            location = self.randomizer.choices(self.locations, cum_weights=self.location_weights)[0]
+            company = self.randomizer.choices(self.companies, cum_weights=self.company_weights)[0]
+            posting_date = self.today + timedelta(days=self.randomizer.randint(*POSTING_DAYS))
+            expiration_date = posting_date + timedelta(days=self.randomizer.randint(*LIFETIME_DAYS))
+            salary_min, salary_max = self._salary(base, multiplier)
+            skills = self._skills(groups)
+            full_title = f"{level} {title}".strip()
+            yield (
+                f"{full_title} #{row_number}",
+                f"{company} is hiring a {full_title} in {location}. Work with {', '.join(skills)}.",
+                location,
+                salary_min,
+                salary_max,
+                company,
+                posting_date.isoformat(),
+                expiration_date.isoformat(),
+                compute_status(posting_date, expiration_date, self.today).value,
+                json.dumps(skills),
+                now_text,
+                now_text,
+                *resolved[location],
+            ), skills
+
+
+def generate_job_postings(row_count, seed=42, today=None, progress=None):
+    """
+    產生職缺與技能關聯並重建索引，回傳耗時秒數 / Generate postings and skill links, rebuild the indexes and return the seconds spent
+
+    progress 為可選的回呼，參數為已寫入筆數 / progress is an optional callback receiving the rows written so far
+    """
+    from django.db import connection, transaction
+
+    from jobs.salary import drop_salary_index, rebuild_salary_index
+    from jobs.search import drop_search_index, rebuild_search_index
+    from jobs.skills import normalize_skill_name
+
+    if not MIN_ROWS <= row_count <= MAX_ROWS:
+        raise ValueError(f"row_count must be between {MIN_ROWS} and {MAX_ROWS}")
+
+    started_at = time.perf_counter()
+    generator = JobGenerator(seed, today)
+    drop_search_index()
+    drop_salary_index()
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT OR IGNORE INTO jobs_skill (name, normalized_name) VALUES (%s, %s)",
+            [(name, normalize_skill_name(name)) for name in generator.skill_names()],
+        )
+        cursor.execute("SELECT name, id FROM jobs_skill")
+        skill_ids = dict(cursor.fetchall())
+
+    insert_sql = (
+        "INSERT INTO jobs_jobposting (title, description, location, salary_min, salary_max, "
+        "company_name, posting_date, expiration_date, status, required_skills, created_at, updated_at, "
+        "normalized_location_id, geo_cell) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    )
+    link_sql = "INSERT INTO jobs_jobpostingskill (job_posting_id, skill_id, position) VALUES (%s, %s, %s)"
+    rows = generator.rows(row_count)
+    written = 0
+    while written < row_count:
+        batch = list(itertools.islice(rows, SEED_BATCH_SIZE))
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(insert_sql, [row for row, _ in batch])
+            cursor.execute("SELECT MAX(id) FROM jobs_jobposting")
+            first_id = cursor.fetchone()[0] - len(batch) + 1
+            cursor.executemany(link_sql, [
+                (first_id + offset, skill_ids[skill], position)
+                for offset, (_, skills) in enumerate(batch)
+                for position, skill in enumerate(skills)
+            ])
+        written += len(batch)
+        if progress:
+            progress(written)
+
+    rebuild_search_index()
+    rebuild_salary_index()
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return time.perf_counter() - started_at
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help=f"number of postings ({MIN_ROWS}-{MAX_ROWS})")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--db", default=None, help="SQLite file to create (default: temporary file)")
+    args = parser.parse_args()
+
+    db_path = setup_django(args.db)
+    seconds = generate_job_postings(
+        args.rows, args.seed, progress=lambda written: print(f"\r{written}/{args.rows} rows", end="", flush=True),
+    )
+    print(f"\ngenerated {args.rows} rows in {seconds:.1f}s: {db_path}")
+
+
+if __name__ == "__main__":
+    main()
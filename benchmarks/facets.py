@@ -0,0 +1,134 @@
+"""
+職缺分面計數基準測試 / Job facet count benchmark
+
+在大量資料上量測 GET /api/jobs/facets 各分面與整體的耗時，確認在時間預算內完成
+Measures per-facet and total latency of the facets computation on a large dataset and checks
+every facet finishes within the time budget
+
+用法 / Usage:
+    python benchmarks/facets.py --rows 1000000 --skills-per-job 3
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import seed_job_postings, setup_django, time_call  # noqa: E402
+
+# 預設資料筆數 / Default row count
+DEFAULT_ROWS = 1_000_000
+
+# 技能種類數 / Number of distinct skills
+SKILL_COUNT = 300
+
+# 每批插入的技能關聯筆數 / Skill links inserted per batch
+LINK_BATCH_SIZE = 100_000
+
+# 量測案例：名稱與過濾參數 / Cases: name and filter params
+FACET_CASES = (
+    ("unfiltered", {}),
+    ("active", {"status": "active"}),
+    ("active in one city", {"status": "active", "location": "City 7"}),
+    ("search", {"search": "Job 12"}),
+    ("skill", {"skill": "skill 1"}),
+)
+
+
+def seed_skill_links(skills_per_job, seed=42):
+    """
+    以原生 SQL 為每筆職缺建立技能關聯 / Link every posting to skills with raw SQL
+    """
+    from django.db import connection, transaction
+
+    randomizer = random.Random(seed)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO jobs_skill (name, normalized_name) VALUES (%s, %s)",
+            [(f"Skill {index}", f"skill {index}") for index in range(SKILL_COUNT)],
+        )
+        cursor.execute("SELECT id FROM jobs_skill")
+        skill_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT id FROM jobs_jobposting")
+        job_ids = [row[0] for row in cursor.fetchall()]
+
+    batch = []
+    for job_id in job_ids:
+        for position, skill_id in enumerate(randomizer.sample(skill_ids, skills_per_job)):
+            batch.append((job_id, skill_id, position))
+        if len(batch) >= LINK_BATCH_SIZE:
+            _insert_links(batch)
+            batch = []
+    _insert_links(batch)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def _insert_links(batch):
+    """
+    插入一批技能關聯 / Insert one batch of skill links
+    """
+    from django.db import connection, transaction
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO jobs_jobpostingskill (job_posting_id, skill_id, position) VALUES (%s, %s, %s)",
+            batch,
+        )
+
+
+def run(row_count, skills_per_job, db_path=None):
+    """
+    建立資料並量測每個案例 / Seed data and measure every case
+
+    回傳超過時間預算的案例數 / Returns the number of cases with facets over the time budget
+    """
+    setup_django(db_path)
+
+    from jobs.facets import Facet, FACET_FIELDS, count_field, count_skills, compute_facets, get_facet_settings
+    from jobs.queries import filter_job_postings
+    from jobs.schemas import JobFilterParams
+    from jobs.search import drop_search_index, rebuild_search_index
+
+    # 灌資料時移除觸發器，完成後一次重建索引 / Drop the triggers while seeding and rebuild the index once afterwards
+    started_at = time.perf_counter()
+    drop_search_index()
+    seed_job_postings(row_count)
+    seed_skill_links(skills_per_job)
+    rebuild_search_index()
+    print(f"seeded {row_count} rows x {skills_per_job} skills in {time.perf_counter() - started_at:.1f}s")
+    print(f"time budget per facet: {get_facet_settings()['TIMEOUT_MS']} ms")
+
+    failures = 0
+    for name, params in FACET_CASES:
+        filters = JobFilterParams(**params)
+        queryset = filter_job_postings(filters)
+        timings = []
+        for facet in Facet:
+            if facet == Facet.SKILL:
+                elapsed_ms = time_call(lambda: count_skills(queryset, 10), repeat=3)
+            else:
+                elapsed_ms = time_call(lambda: count_field(queryset, FACET_FIELDS[facet], 10), repeat=3)
+            timings.append(f"{facet.value}={elapsed_ms:.0f}ms")
+        result = compute_facets(filters, 10)
+        failures += 1 if result["timed_out"] else 0
+        print(f"[{'TIMEOUT ' + ','.join(result['timed_out']) if result['timed_out'] else 'OK'}] {name}: {' '.join(timings)}")
+    return failures
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="number of postings to seed")
+    parser.add_argument("--skills-per-job", type=int, default=3, help="skills linked to every posting")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    sys.exit(1 if run(args.rows, args.skills_per_job, args.db) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+距離搜尋基準測試 / Proximity search benchmark
+
+比較 near=lat,lng&radius_km= 的筆數查詢耗時：實際採用的過濾（geo_cell 預篩或只用地點 id，見 MAX_CELL_RANGES）、
+不設上限的全部 geo_cell 區間，以及逐列計算大圓距離（SQLite 自訂函式）；輸出查詢計畫，並以測試用戶端
+（關閉回應快取與快照）量測列表端點的延遲。大半徑的區間數可達近百個，可看出上限的效果。
+Compares the count query of near=lat,lng&radius_km= for the filter actually used (geo_cell
+prefilter or location ids only, see MAX_CELL_RANGES), every geo_cell range without a cap, and
+the great-circle distance computed per row (an SQLite user function); prints the query plan and
+measures list endpoint latency through the test client (response cache and snapshot off).
+Large radii need close to a hundred ranges, which shows the effect of the cap.
+
+用法 / Usage:
+    python benchmarks/geo.py --rows 1000000 --repeat 20
+"""
+import argparse
+import sys
+from functools import reduce
+from operator import or_
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, time_call  # noqa: E402
+
+# 量測的中心點與半徑：台北、新竹、東京 / Measured centers and radii: Taipei, Hsinchu, Tokyo
+SEARCHES = (
+    ("25.033,121.565", 10),
+    ("25.033,121.565", 50),
+    ("24.814,120.968", 150),
+    ("35.676,139.650", 300),
+    ("35.676,139.650", 500),
+)
+
+# 逐列計算距離的基準查詢 / Baseline query computing the distance per row
+PER_ROW_SQL = (
+    "SELECT COUNT(*) FROM jobs_jobposting p CROSS JOIN jobs_location l ON l.id = p.normalized_location_id "
+    "WHERE bench_distance_km(l.latitude, l.longitude, %s, %s) <= %s"
+)
+
+
+def run(rows, repeat, db_path=None):
+    """
+    產生資料並輸出預篩與逐列計算的比較 / Generate the dataset and print the prefilter versus per-row comparison
+    """
+    setup_django(db_path)
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.db.models import Q
+    from django.test import Client
+    from ninja_jwt.tokens import RefreshToken
+
+    from benchmarks.datagen import generate_job_postings
+    from jobs.locations import cell_ranges, get_gazetteer, haversine_km, near_prefilter, parse_near
+    from jobs.models import JobPosting
+    from jobs.queries import filter_job_postings
+    from jobs.schemas import JobFilterParams
+
+    generate_job_postings(rows)
+    settings.JOBS_RESPONSE_CACHE = {**settings.JOBS_RESPONSE_CACHE, "ENABLED": False}
+    settings.JOBS_SNAPSHOT = {"ENABLED": False}
+    user = User.objects.create_user(username="bench", password="bench")
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    connection.ensure_connection()
+    connection.connection.create_function("bench_distance_km", 4, haversine_km, deterministic=True)
+    resolved = JobPosting.objects.filter(normalized_location__isnull=False).count()
+    print(f"{rows} rows, {resolved} with a standard location")
+
+    for near, radius_km in SEARCHES:
+        queryset = filter_job_postings(JobFilterParams(near=near, radius_km=radius_km))
+        prefilter_count = queryset.count()
+        prefilter_ms = time_call(queryset.count, repeat)
+
+        latitude, longitude = parse_near(near)
+        location_ids = get_gazetteer().within(latitude, longitude, radius_km)
+        ranges = cell_ranges(latitude, longitude, radius_km)
+        used = "ids only" if near_prefilter(latitude, longitude, radius_km, len(location_ids)) is None else "prefilter"
+        # 不設上限：每個區間都加入 OR / Uncapped: every range joins the OR
+        uncapped = JobPosting.objects.filter(
+            reduce(or_, (Q(geo_cell__range=bounds) for bounds in ranges)),
+            normalized_location_id__in=sorted(location_ids),
+        )
+        uncapped_ms = time_call(uncapped.count, repeat)
+
+        def per_row():
+            with connection.cursor() as cursor:
+                cursor.execute(PER_ROW_SQL, [latitude, longitude, radius_km])
+                return cursor.fetchone()[0]
+
+        per_row_count = per_row()
+        per_row_ms = time_call(per_row, repeat)
+        url = f"/api/jobs/?status=active&near={near}&radius_km={radius_km}"
+        page_ms = time_call(lambda: client.get(url), repeat)
+        print(
+            f"near={near} radius={radius_km:>3} km  ranges={len(ranges):>3} locations={len(location_ids):>2}  "
+            f"matches={prefilter_count:>8}  {used:<9} {prefilter_ms:8.2f} ms  "
+            f"uncapped ranges {uncapped_ms:8.2f} ms  per-row {per_row_ms:8.2f} ms ({per_row_ms / prefilter_ms:5.1f}x)  "
+            f"list page {page_ms:7.2f} ms" + ("" if prefilter_count == per_row_count else f"  MISMATCH per-row={per_row_count}")
+        )
+
+    for near, radius_km in (SEARCHES[1], SEARCHES[-1]):
+        plan = filter_job_postings(JobFilterParams(near=near, radius_km=radius_km)).explain()
+        print(f"query plan (near={near} radius={radius_km} km):")
+        print("\n".join(f"  {line}" for line in plan.splitlines()))
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of postings")
+    parser.add_argument("--repeat", type=int, default=20, help="runs per measurement")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.db)
+
+
+if __name__ == "__main__":
+    main()
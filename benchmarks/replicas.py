@@ -0,0 +1,157 @@
+"""
+讀取副本基準測試 / Read-replica benchmark
+
+以兩個 SQLite 檔案（default 與 replica）執行：讀取執行緒經完整中介軟體請求列表，寫入執行緒更新職缺，
+複寫替身執行緒每隔 --sync-interval 秒以 sync_replicas 將 default 複製到副本。
+比較讀取全走 default 與讀取走副本時的吞吐量與延遲，並輸出每次複寫的耗時（副本落後的下限）。
+Runs against two SQLite files (default and replica): reader threads request the list endpoint
+through the full middleware, writer threads update postings, and a replication stand-in thread
+copies default into the replica with sync_replicas every --sync-interval seconds. Compares
+throughput and latency with every read on default and with reads on the replica, and prints
+the time each copy takes (a lower bound on replica lag).
+
+用法 / Usage:
+    python benchmarks/replicas.py --rows 10000 --readers 8 --writers 2 --seconds 5 --sync-interval 1
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django  # noqa: E402
+from benchmarks.concurrency import PAGE_SIZE, _percentile_ms, _worker, _write  # noqa: E402
+
+# 比較的設定檔：名稱與是否啟用副本 / Compared profiles: name and whether replicas are enabled
+PROFILES = (
+    ("primary", False),
+    ("replica", True),
+)
+
+
+def _read(randomizer, client, headers, job_count):
+    """
+    經測試用戶端讀取一頁列表 / Read one list page through the test client
+    """
+    offset = randomizer.randrange(0, max(job_count - PAGE_SIZE, 1))
+    response = client.get(f"/api/jobs/?limit={PAGE_SIZE}&offset={offset}", **headers)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET /api/jobs/ returned {response.status_code}")
+
+
+def _replicate(interval, stop, durations):
+    """
+    複寫替身：停止前每隔一段時間複製一次 / Replication stand-in: copy every interval until stopped
+    """
+    from django.db import connections
+
+    from jobs.replication import sync_replicas
+
+    while not stop.wait(interval):
+        durations.extend(sync_replicas().values())
+    connections.close_all()
+
+
+def run_profile(name, enabled, readers, writers, seconds, sync_interval, headers, job_ids, active_count):
+    """
+    以指定設定檔執行一輪併發讀寫並輸出結果 / Run one concurrent read/write round with a profile and print the result
+    """
+    from django.conf import settings
+    from django.db import connections
+    from django.test import Client
+
+    connections.close_all()
+    settings.JOBS_REPLICAS = {**settings.JOBS_REPLICAS, "ENABLED": enabled, "ALIASES": ["replica"]}
+
+    read_stats, write_stats, sync_durations = [], [], []
+    stop = threading.Event()
+    replicator = threading.Thread(target=_replicate, args=(sync_interval, stop, sync_durations))
+    threads = [
+        threading.Thread(target=_worker, args=(_read, seconds, read_stats, index, Client(), headers, active_count))
+        for index in range(readers)
+    ] + [
+        threading.Thread(target=_worker, args=(_write, seconds, write_stats, 1000 + index, job_ids))
+        for index in range(writers)
+    ]
+    if enabled:
+        replicator.start()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stop.set()
+    if enabled:
+        replicator.join()
+
+    read_latencies = [latency for latencies, _ in read_stats for latency in latencies]
+    write_latencies = [latency for latencies, _ in write_stats for latency in latencies]
+    sync_ms = statistics.fmean(sync_durations) * 1000 if sync_durations else 0.0
+    print(
+        f"{name:<8} reads/s={len(read_latencies) / seconds:8.1f} writes/s={len(write_latencies) / seconds:7.1f}  "
+        f"read p50={_percentile_ms(read_latencies, 50):6.2f} ms p95={_percentile_ms(read_latencies, 95):7.2f} ms  "
+        f"write p50={_percentile_ms(write_latencies, 50):6.2f} ms  "
+        f"syncs={len(sync_durations)} sync mean={sync_ms:6.1f} ms  "
+        f"errors={sum(errors for _, errors in read_stats + write_stats)}"
+    )
+    return {
+        "profile": name,
+        "reads_per_second": len(read_latencies) / seconds,
+        "writes_per_second": len(write_latencies) / seconds,
+        "sync_mean_ms": sync_ms,
+    }
+
+
+def run(rows, readers, writers, seconds, sync_interval, db_path=None):
+    """
+    產生資料並建立副本後依序執行各設定檔 / Generate the dataset, create the replica and run every profile in turn
+    """
+    db_path = setup_django(db_path)
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from ninja_jwt.tokens import RefreshToken
+
+    from benchmarks.datagen import generate_job_postings
+    from jobs.models import JobPosting
+    from jobs.replication import sync_replicas
+
+    # 副本檔案放在基準資料庫旁，並量測讀取本身而非回應快取 / The replica file sits next to the benchmark database, and reads are measured without the response cache
+    connections.settings["replica"]["NAME"] = str(Path(db_path).with_suffix(".replica.sqlite3"))
+    settings.JOBS_RESPONSE_CACHE = {**settings.JOBS_RESPONSE_CACHE, "ENABLED": False}
+
+    generate_job_postings(rows)
+    user = User.objects.create_user(username="bench", password="bench")
+    headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+    job_ids = list(JobPosting.objects.values_list("id", flat=True))
+    active_count = JobPosting.objects.filter(status="active").count()
+    initial_sync = sync_replicas(["replica"])["replica"]
+
+    print(f"{rows} rows, {readers} readers, {writers} writers, {seconds}s per profile, "
+          f"sync every {sync_interval}s (initial copy {initial_sync * 1000:.1f} ms)")
+    return [
+        run_profile(name, enabled, readers, writers, seconds, sync_interval, headers, job_ids, active_count)
+        for name, enabled in PROFILES
+    ]
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000, help="number of postings")
+    parser.add_argument("--readers", type=int, default=8, help="reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="writer threads")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration per profile")
+    parser.add_argument("--sync-interval", type=float, default=1.0, help="seconds between replica copies")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.rows, args.readers, args.writers, args.seconds, args.sync_interval, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+職缺序列化微基準測試 / Job serialization micro-benchmark
+
+比較舊路徑（模型實例＋逐欄位建立 JobPostingOut＋每次存取解析技能 JSON＋NinjaJSONEncoder）與
+新路徑（values() 投影＋每列解碼一次＋TypeAdapter 整頁驗證並直接輸出 JSON）每列的成本。
+Compares the per-row cost of the legacy path (model instances + field-by-field
+JobPostingOut + skills JSON parsed on every access + NinjaJSONEncoder) with the fast path
+(values() projection + one decode per row + whole-page TypeAdapter validation dumping JSON
+directly).
+
+用法 / Usage:
+    python benchmarks/serialization.py --page-size 100 --repeat 200
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import seed_job_postings, setup_django, time_call  # noqa: E402
+
+# 種子資料筆數 / Number of seeded rows
+SEED_ROWS = 1_000
+
+# 每筆職缺的技能數 / Skills per posting
+SKILLS_PER_JOB = 8
+
+
+def _legacy_serialize(jobs):
+    """
+    重現舊版逐欄位組裝，技能每次存取都重新解析 / Reproduce the legacy field-by-field build with skills parsed on access
+    """
+    from jobs.schemas import JobPostingOut
+
+    return [
+        JobPostingOut(
+            id=job.id,
+            title=job.title,
+            description=job.description,
+            location=job.location,
+            salary_min=job.salary_min,
+            salary_max=job.salary_max,
+            company_name=job.company_name,
+            posting_date=job.posting_date,
+            expiration_date=job.expiration_date,
+            required_skills=json.loads(job._required_skills),
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+        for job in jobs
+    ]
+
+
+def run(page_size, repeat, db_path=None):
+    """
+    建立資料並輸出每列成本（微秒） / Seed data and print the per-row cost in microseconds
+    """
+    setup_django(db_path)
+
+    from django.db import connection
+
+    from jobs.models import JobPosting
+    from jobs.cache import _render
+    from jobs.serializers import project_job_rows, render_rows
+
+    seed_job_postings(SEED_ROWS)
+    skills_json = json.dumps([f"Skill {index}" for index in range(SKILLS_PER_JOB)])
+    with connection.cursor() as cursor:
+        cursor.execute("UPDATE jobs_jobposting SET required_skills = %s", [skills_json])
+
+    page = JobPosting.objects.order_by("posting_date", "id")[:page_size]
+    jobs = list(page)
+    rows = list(project_job_rows(page))
+
+    def per_row(milliseconds):
+        return milliseconds * 1000 / page_size
+
+    results = {
+        "legacy fetch+render": per_row(time_call(lambda: _render(_legacy_serialize(list(page.all()))), repeat)),
+        "fast fetch+render": per_row(time_call(lambda: render_rows(list(project_job_rows(page))), repeat)),
+        "legacy render only": per_row(time_call(lambda: _render(_legacy_serialize(jobs)), repeat)),
+        "fast render only": per_row(time_call(lambda: render_rows([dict(row) for row in rows]), repeat)),
+    }
+    for name, microseconds in results.items():
+        print(f"{name:>24}: {microseconds:7.2f} us/row")
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100, help="rows per serialized page")
+    parser.add_argument("--repeat", type=int, default=200, help="iterations per measurement")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.page_size, args.repeat, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+有效職缺快照基準測試 / Active snapshot benchmark
+
+量測快照的重建時間與每十萬筆的記憶體，並以測試用戶端（關閉回應快取）比較常見瀏覽查詢
+由資料庫與由快照回答的延遲，以及單筆寫入後的增量更新成本。
+Measures the snapshot's rebuild time and memory per 100k postings, compares the latency of
+common browsing queries answered by the database and by the snapshot through the test client
+(response cache off), and times the incremental update after a single write.
+
+用法 / Usage:
+    python benchmarks/snapshot.py --rows 100000 --repeat 50
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, time_call  # noqa: E402
+
+# 量測的瀏覽查詢 / Browsing queries measured
+QUERIES = (
+    "status=active",
+    "status=active&sort_desc=true&offset=500",
+    "status=active&sort_by=salary_max&sort_desc=true",
+    "status=active&location=taipei",
+)
+
+
+def run(rows, repeat, db_path=None):
+    """
+    產生資料並輸出快照與資料庫路徑的比較 / Generate the dataset and print the snapshot versus database comparison
+    """
+    setup_django(db_path)
+
+    from datetime import date
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from ninja_jwt.tokens import RefreshToken
+
+    from benchmarks.datagen import generate_job_postings
+    from jobs.cache import list_generation
+    from jobs.models import JobPosting
+    from jobs.snapshot import active_snapshot
+
+    generate_job_postings(rows)
+    settings.JOBS_RESPONSE_CACHE = {**settings.JOBS_RESPONSE_CACHE, "ENABLED": False}
+    user = User.objects.create_user(username="bench", password="bench")
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+    rebuild_ms = time_call(lambda: (active_snapshot.clear(), active_snapshot.sync(date.today(), list_generation())), 1)
+    stats = active_snapshot.stats()
+    exact_bytes = active_snapshot.memory_usage()
+    print(
+        f"{rows} rows, {stats['rows']} active: rebuild {rebuild_ms:.0f} ms, "
+        f"{exact_bytes / 1024 / 1024:.1f} MiB ({exact_bytes / max(stats['rows'], 1) * 100_000 / 1024 / 1024:.1f} MiB per 100k)"
+    )
+
+    for query in QUERIES:
+        url = f"/api/jobs/?{query}"
+        settings.JOBS_SNAPSHOT = {"ENABLED": False}
+        database_ms = time_call(lambda: client.get(url), repeat)
+        settings.JOBS_SNAPSHOT = {"ENABLED": True}
+        client.get(url)  # 計算排序 / Compute the sort order
+        snapshot_ms = time_call(lambda: client.get(url), repeat)
+        print(f"{query:<50} database {database_ms:7.2f} ms  snapshot {snapshot_ms:7.2f} ms  ({database_ms / snapshot_ms:5.1f}x)")
+
+    job = JobPosting.objects.filter(status="active").first()
+
+    def write_and_read():
+        job.save()
+        client.get(f"/api/jobs/?{QUERIES[0]}")
+
+    print(f"{'save() + next read (incremental update)':<50} {time_call(write_and_read, repeat):7.2f} ms")
+    print(f"snapshot stats: {active_snapshot.stats()}")
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="number of postings")
+    parser.add_argument("--repeat", type=int, default=50, help="requests per measurement")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.rows, args.repeat, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+職缺 API 負載與基準測試套件 / Job API load and benchmark suite
+
+以 benchmarks/datagen.py 產生各資料量的資料集，對每個端點量測延遲分位數與吞吐量：
+- wsgi：django.test.Client 依序送出請求（經完整中介軟體）
+- asgi：django.test.AsyncClient 於行程內以固定併發數送出請求
+結果寫入 JSON，可用 --compare 與上一次的結果比較。預設停用回應快取以量測資料庫路徑。
+Generates a dataset per size with benchmarks/datagen.py and measures latency percentiles and
+throughput of every endpoint:
+- wsgi: django.test.Client sending requests sequentially (through the full middleware)
+- asgi: django.test.AsyncClient sending requests in-process at a fixed concurrency
+Results are written to JSON and can be compared with a previous run through --compare. The
+response cache is disabled by default so the database path is measured.
+
+用法 / Usage:
+    python benchmarks/suite.py --sizes 10000 100000 --output results.json
+    python benchmarks/suite.py --sizes 10000 --compare results.json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import PROJECT_ROOT  # noqa: E402
+
+# 預設資料量 / Default dataset sizes
+DEFAULT_SIZES = (10_000, 100_000)
+
+# 端點案例：名稱與路徑（{job_id} 以資料集中的職缺替換） / Endpoint cases: name and path ({job_id} is filled from the dataset)
+ENDPOINT_CASES = (
+    ("list", "/api/jobs/?limit=20"),
+    ("list active by expiration", "/api/jobs/?status=active&sort_by=expiration_date&limit=20"),
+    ("list by location", "/api/jobs/?location=Taipei&limit=20"),
+    ("list by skill", "/api/jobs/?skill=Kubernetes&limit=20"),
+    ("list by salary", "/api/jobs/?salary_min=1000000&salary_max=1200000&limit=20"),
+    ("search", "/api/jobs/?search=Engineer%20Taipei&limit=20"),
+    ("cursor", "/api/jobs/cursor?status=active&limit=20"),
+    ("detail", "/api/jobs/{job_id}"),
+    ("facets", "/api/jobs/facets?status=active"),
+    ("salary histogram", "/api/jobs/salary-histogram?status=active&bucket_size=100000"),
+)
+
+# 延遲分位數 / Latency percentiles
+PERCENTILES = (50, 95, 99)
+
+
+def _percentile(sorted_values, percentile):
+    """
+    最近排名法分位數 / Nearest-rank percentile
+    """
+    index = max(int(round(percentile / 100 * len(sorted_values))) - 1, 0)
+    return sorted_values[index]
+
+
+def summarize(latencies, seconds):
+    """
+    將延遲列表整理為統計值（毫秒） / Summarize latencies in milliseconds
+    """
+    latencies = sorted(latencies)
+    summary = {
+        "requests": len(latencies),
+        "rps": round(len(latencies) / seconds, 1),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3),
+    }
+    for percentile in PERCENTILES:
+        summary[f"p{percentile}_ms"] = round(_percentile(latencies, percentile) * 1000, 3)
+    return summary
+
+
+def _check(response, path):
+    """
+    非 200 回應視為錯誤 / Treat non-200 responses as errors
+    """
+    if response.status_code != 200:
+        raise RuntimeError(f"{path} returned {response.status_code}: {response.content[:200]!r}")
+
+
+def measure_wsgi(path, headers, total_requests):
+    """
+    以測試用戶端依序送出請求 / Send requests sequentially with the test client
+    """
+    from django.test import Client
+
+    client = Client(**headers)
+    _check(client.get(path), path)  # 暖機 / Warm-up
+    latencies = []
+    started_at = time.perf_counter()
+    for _ in range(total_requests):
+        request_started_at = time.perf_counter()
+        response = client.get(path)
+        latencies.append(time.perf_counter() - request_started_at)
+        _check(response, path)
+    return summarize(latencies, time.perf_counter() - started_at)
+
+
+async def measure_asgi(path, headers, total_requests, concurrency):
+    """
+    以行程內 ASGI 用戶端併發送出請求 / Send concurrent requests with the in-process ASGI client
+    """
+    from asgiref.sync import sync_to_async
+    from django.db import connections
+    from django.test import AsyncClient
+
+    # sync_to_async 執行緒保有自己的連線，切換資料集後需重新開啟 / The sync_to_async thread keeps its own connection, reopened after a dataset switch
+    await sync_to_async(connections.close_all)()
+    client = AsyncClient()
+    _check(await client.get(path, headers=headers), path)  # 暖機 / Warm-up
+    latencies = []
+    next_request = iter(range(total_requests))
+
+    async def worker():
+        for _ in next_request:
+            request_started_at = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - request_started_at)
+            _check(response, path)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started_at)
+
+
+def _prepare_dataset(size, seed, data_dir):
+    """
+    產生或沿用資料集檔案並將 Django 連線指向它 / Generate or reuse a dataset file and point Django at it
+
+    同一 data_dir 下相同資料量與種子的檔案會被沿用 / Files of the same size and seed in data_dir are reused
+    """
+    from benchmarks.common import setup_django
+
+    db_path = Path(data_dir) / f"jobs-{size}-seed{seed}.sqlite3"
+    reuse = db_path.exists()
+    if not _django_ready():
+        setup_django(str(db_path))
+    else:
+        from django.core.cache import caches
+        from django.core.management import call_command
+        from django.db import connections
+
+        connections["default"].close()
+        connections["default"].settings_dict["NAME"] = str(db_path)
+        for cache in caches.all():
+            cache.clear()
+        call_command("migrate", verbosity=0)
+    if not reuse:
+        from benchmarks.datagen import generate_job_postings
+
+        seconds = generate_job_postings(size, seed)
+        print(f"generated {size} rows in {seconds:.1f}s: {db_path}")
+    return db_path
+
+
+def _django_ready():
+    """
+    Django 是否已啟動 / Whether Django has been set up
+    """
+    from django.apps import apps
+
+    return apps.ready
+
+
+def _git_revision():
+    """
+    目前的 git 版本，無法取得時為 None / Current git revision, or None when unavailable
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, total_requests, concurrency, seed, data_dir, use_cache, cases=None):
+    """
+    對每個資料量執行所有案例並回傳結果 / Run every case against every size and return the results
+    """
+    results = []
+    for size in sizes:
+        _prepare_dataset(size, seed, data_dir)
+
+        from django.conf import settings
+        from django.contrib.auth.models import User
+        from ninja_jwt.tokens import RefreshToken
+
+        from jobs.models import JobPosting
+
+        settings.JOBS_RESPONSE_CACHE = {**settings.JOBS_RESPONSE_CACHE, "ENABLED": use_cache}
+        settings.JOBS_RATE_LIMIT = {**settings.JOBS_RATE_LIMIT, "ENABLED": False}
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "testserver"]
+        user, _ = User.objects.get_or_create(username="bench")
+        token = str(RefreshToken.for_user(user).access_token)
+        job_id = JobPosting.objects.order_by("id").values_list("id", flat=True)[size // 2]
+
+        for name, path in ENDPOINT_CASES:
+            if cases and name not in cases:
+                continue
+            path = path.format(job_id=job_id)
+            wsgi = measure_wsgi(path, {"HTTP_AUTHORIZATION": f"Bearer {token}"}, total_requests)
+            asgi = asyncio.run(measure_asgi(path, {"Authorization": f"Bearer {token}"}, total_requests, concurrency))
+            for client_name, summary in (("wsgi", wsgi), ("asgi", asgi)):
+                results.append({"size": size, "endpoint": name, "path": path, "client": client_name, **summary})
+                print(
+                    f"{size:>8} {name:<28} {client_name}: {summary['rps']:8.1f} req/s  "
+                    f"p50={summary['p50_ms']:8.2f} ms  p95={summary['p95_ms']:8.2f} ms  p99={summary['p99_ms']:8.2f} ms"
+                )
+    return results
+
+
+def compare(results, previous):
+    """
+    與先前結果比較 p50 與吞吐量 / Compare p50 and throughput with a previous run
+    """
+    previous_by_key = {(row["size"], row["endpoint"], row["client"]): row for row in previous["results"]}
+    print(f"\ncompared with {previous['meta'].get('revision')} ({previous['meta'].get('timestamp')}):")
+    for row in results:
+        before = previous_by_key.get((row["size"], row["endpoint"], row["client"]))
+        if before is None:
+            continue
+        p50_change = (row["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+        rps_change = (row["rps"] - before["rps"]) / before["rps"] * 100 if before["rps"] else 0.0
+        print(
+            f"{row['size']:>8} {row['endpoint']:<28} {row['client']}: "
+            f"p50 {before['p50_ms']:.2f} -> {row['p50_ms']:.2f} ms ({p50_change:+.1f}%)  "
+            f"rps {before['rps']:.1f} -> {row['rps']:.1f} ({rps_change:+.1f}%)"
+        )
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="dataset sizes (10000-5000000)")
+    parser.add_argument("--requests", type=int, default=200, help="requests per endpoint and client")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent ASGI clients")
+    parser.add_argument("--seed", type=int, default=42, help="dataset random seed")
+    parser.add_argument("--data-dir", default=None, help="directory caching generated datasets (default: temporary)")
+    parser.add_argument("--case", action="append", dest="cases", help="only run the named endpoint case (repeatable)")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache enabled")
+    parser.add_argument("--output", default=None, help="JSON file to write the results to")
+    parser.add_argument("--compare", default=None, help="previous JSON results to compare against")
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="job_bench_")
+    results = run(args.sizes, args.requests, args.concurrency, args.seed, data_dir, args.cache, args.cases)
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "response_cache": args.cache,
+        },
+        "results": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"results written to {args.output}")
+    if args.compare:
+        compare(results, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+背景工作佇列基準測試 / Background task queue benchmark
+
+以模擬耗時副作用（固定睡眠）比較建立職缺端點在請求內執行副作用與加入佇列的延遲，
+再以 run_workers --burst 量測不同工作行程數清空佇列的吞吐量與等待時間。
+Using a simulated slow side effect (a fixed sleep), compares create endpoint latency when the
+side effect runs inside the request against enqueueing it, then measures the throughput and
+wait time of run_workers --burst draining the queue with different process counts.
+
+用法 / Usage:
+    python benchmarks/tasks.py --tasks 2000 --side-effect-ms 20 --processes 1 2 4
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.common import setup_django, time_call  # noqa: E402
+
+# 模擬副作用的工作路徑 / Task path of the simulated side effect
+SIDE_EFFECT_TASK = "benchmarks.tasks.simulated_side_effect"
+
+# 模擬副作用的耗時秒數，由命令列設定 / Seconds the simulated side effect takes, set from the command line
+SIDE_EFFECT_SECONDS = 0.02
+
+
+def simulated_side_effect(job_id):
+    """
+    模擬索引更新或通知等 I/O 等待 / Simulate I/O waits such as index updates or notifications
+    """
+    time.sleep(SIDE_EFFECT_SECONDS)
+
+
+def run(task_count, side_effect_ms, process_counts, repeat, db_path=None):
+    """
+    輸出端點延遲與工作行程吞吐量 / Print endpoint latency and worker throughput
+    """
+    global SIDE_EFFECT_SECONDS
+    SIDE_EFFECT_SECONDS = side_effect_ms / 1000
+    setup_django(db_path)
+
+    from django.conf import settings
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from django.test import Client
+    from ninja_jwt.tokens import RefreshToken
+
+    from jobs.models import Task
+    from jobs.tasks import enqueue_many, queue_stats
+
+    user = User.objects.create_user(username="bench", password="bench")
+    client = Client(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+    job_data = {
+        "title": "Bench Job",
+        "description": "Task benchmark",
+        "location": "Taipei",
+        "company_name": "Bench Company",
+        "posting_date": date.today().isoformat(),
+        "expiration_date": (date.today() + timedelta(days=30)).isoformat(),
+        "required_skills": ["Python"],
+    }
+
+    def create():
+        response = client.post("/api/jobs/", job_data, content_type="application/json")
+        return response.json()["id"]
+
+    settings.JOBS_TASKS = {"JOB_SIDE_EFFECTS": []}
+    # 先送一次請求暖機 / Warm up with one request first
+    create()
+    plain_ms = time_call(create, repeat)
+    inline_ms = time_call(lambda: simulated_side_effect(create()), repeat)
+    settings.JOBS_TASKS = {"JOB_SIDE_EFFECTS": [SIDE_EFFECT_TASK]}
+    queued_ms = time_call(create, repeat)
+    print(f"create endpoint (side effect {side_effect_ms} ms)")
+    print(f"  no side effect  {plain_ms:8.2f} ms")
+    print(f"  inline          {inline_ms:8.2f} ms")
+    print(f"  enqueued        {queued_ms:8.2f} ms  ({queued_ms - plain_ms:+.2f} ms for the outbox insert)")
+
+    print(f"draining {task_count} tasks with run_workers --burst")
+    for processes in process_counts:
+        Task.objects.all().delete()
+        enqueue_many((SIDE_EFFECT_TASK, {"job_id": number}, None) for number in range(task_count))
+        started_at = time.perf_counter()
+        call_command("run_workers", "--processes", str(processes), "--burst", "--poll-interval", "0", stdout=StringIO())
+        seconds = time.perf_counter() - started_at
+        stats = queue_stats()
+        print(
+            f"  processes={processes:>2}  {task_count / seconds:8.1f} tasks/s  "
+            f"wait p50 {stats['wait_seconds']['0.5']:7.2f} s  p95 {stats['wait_seconds']['0.95']:7.2f} s  "
+            f"run p50 {stats['run_seconds']['0.5'] * 1000:6.2f} ms  left {stats['depth']['queued']}"
+        )
+
+
+def main():
+    """
+    命令列進入點 / Command line entry point
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1000, help="tasks to drain per process count")
+    parser.add_argument("--side-effect-ms", type=float, default=20, help="duration of the simulated side effect")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="worker process counts to compare")
+    parser.add_argument("--repeat", type=int, default=50, help="requests per endpoint measurement")
+    parser.add_argument("--db", default=None, help="SQLite file to use (default: temporary file)")
+    args = parser.parse_args()
+    run(args.tasks, args.side_effect_ms, args.processes, args.repeat, args.db)
+
+
+if __name__ == "__main__":
+    main()
@@ -47,6 +47,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # 置於最前以量測完整請求 / First so it measures the whole request
+    'jobs.metrics.MetricsMiddleware',
+    # 置於外層以壓縮最終回應本文 / Outer so it compresses the final response body
+    'jobs.compression.CompressionMiddleware',
+    # 請求範圍的副本路由狀態與讀己之寫釘選 / Per-request replica routing state and read-your-writes pins
+    'jobs.routers.ReplicaPinningMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -83,9 +89,174 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # 交易開始即取得寫入鎖並等待，避免多個寫入者升級鎖時互相死結
+            # Take the write lock when a transaction begins and wait for it, so concurrent
+            # writers never deadlock while upgrading their locks
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
+        # 持久連線，重用前先檢查健康；ASGI 部署應設為 0 / Persistent connections, health-checked before reuse; set to 0 under ASGI
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    },
+    # 本機讀取副本，由 sync_replicas 從 default 複製；測試時鏡像 default
+    # Local read replica copied from default by sync_replicas; mirrors default under tests
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.replica.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+        },
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {
+            'MIRROR': 'default',
+        },
+    },
+}
+
+# 讀取送往副本、寫入送往 default，見 jobs/routers.py / Reads go to replicas and writes to default, see jobs/routers.py
+DATABASE_ROUTERS = ['jobs.routers.ReplicaRouter']
+
+# 讀取副本設定 / Read replica settings
+JOBS_REPLICAS = {
+    # 啟用前先執行 sync_replicas 建立副本 / Run sync_replicas to create the replica before enabling
+    'ENABLED': False,
+    'ALIASES': ['replica'],
+    'STRATEGY': 'round_robin',  # 或 'least_loaded' / Or 'least_loaded'
+    'PIN_SECONDS': 5,  # 寫入後該客戶端讀取 default 的秒數 / Seconds a client reads from default after a write
+}
+
+# SQLite 連線 PRAGMA，見 jobs/sqlite.py / SQLite connection PRAGMAs, see jobs/sqlite.py
+JOBS_SQLITE = {
+    'ENABLED': True,
+    'JOURNAL_MODE': 'WAL',  # 讀取者不被寫入者阻擋 / Readers are not blocked by the writer
+    'SYNCHRONOUS': 'NORMAL',  # WAL 下安全，提交不需每次 fsync / Safe under WAL; commits skip the per-transaction fsync
+    'CACHE_SIZE': -64000,  # 頁面快取，負值為 KiB / Page cache; negative values are KiB
+    'MMAP_SIZE': 268435456,  # 256 MB 記憶體映射讀取 / 256 MB of memory-mapped reads
+    'TEMP_STORE': 'MEMORY',
+    'BUSY_TIMEOUT': None,  # 毫秒；None 沿用 OPTIONS 的 timeout / Milliseconds; None keeps the OPTIONS timeout
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'job-platform',
     }
 }
 
+# 職缺回應快取設定 / Job response cache settings
+JOBS_RESPONSE_CACHE = {
+    'ENABLED': True,
+    # 使用的 CACHES 別名；多行程部署需為共用快取，寫入才會使其他行程的項目失效（jobs.W002）
+    # CACHES alias to use; must be a shared cache in multi-process deployments so writes invalidate other processes' entries (jobs.W002)
+    'ALIAS': 'default',
+    'TIMEOUT': 300,  # 秒，且不會超過當天午夜 / Seconds, never past today's midnight
+}
+
+# 有效職缺記憶體快照設定，見 jobs/snapshot.py / Active job in-memory snapshot settings, see jobs/snapshot.py
+JOBS_SNAPSHOT = {
+    'ENABLED': True,
+    'MAX_AGE': 300,  # 秒，超過即整份重建 / Seconds before a full rebuild
+    'REBUILD_INTERVAL': 1.0,  # 兩次整份重建的最短間隔秒數 / Minimum seconds between full rebuilds
+}
+
+# 條件式請求設定（ETag / Last-Modified） / Conditional request settings (ETag / Last-Modified)
+JOBS_CONDITIONAL = {
+    'ENABLED': True,  # 關閉後列表不執行 ETag 彙總查詢 / When off, lists skip the ETag aggregate query
+}
+
+# 回應壓縮設定（brotli 需安裝 brotli 套件） / Response compression settings (brotli requires the brotli package)
+JOBS_COMPRESSION = {
+    'ENABLED': True,
+    'MIN_SIZE': 1024,  # 小於此位元組數不壓縮 / Responses smaller than this many bytes stay uncompressed
+}
+
+# 職缺批次端點設定 / Job bulk endpoint settings
+JOBS_BULK = {
+    'MAX_ITEMS': 1000,  # 單次請求最多項目數 / Maximum items per request
+    'BATCH_SIZE': 500,  # 每個 SQL 批次的筆數 / Rows per SQL batch
+}
+
+# 職缺匯出設定 / Job export settings
+JOBS_EXPORT = {
+    'CHUNK_SIZE': 2000,  # 每次從資料庫讀取的筆數 / Rows fetched from the database per chunk
+}
+
+# 職缺分面計數設定 / Job facet count settings
+JOBS_FACETS = {
+    'DEFAULT_TOP': 10,  # 每個分面預設回傳的值數 / Values returned per facet by default
+    'MAX_TOP': 100,  # 每個分面最多回傳的值數 / Maximum values per facet
+    'TIMEOUT_MS': 500,  # 每個分面的時間預算（僅 SQLite） / Time budget per facet (SQLite only)
+}
+
+# 職缺薪資分布設定 / Job salary histogram settings
+JOBS_SALARY = {
+    'DEFAULT_BUCKET_SIZE': 10000,  # 分布圖預設級距 / Default histogram bucket size
+    'MAX_BUCKETS': 200,  # 分布圖最多級數 / Maximum number of histogram buckets
+}
+
+# 地點正規化與距離搜尋設定，見 jobs/locations.py / Location normalization and proximity search settings, see jobs/locations.py
+JOBS_GEO = {
+    'DEFAULT_RADIUS_KM': 25,  # 只給 near 時的搜尋半徑 / Radius used when only near is given
+    'MAX_RADIUS_KM': 500,  # 搜尋半徑上限 / Largest allowed radius
+    'MAX_CELL_RANGES': 16,  # geo_cell 預篩最多的區間數，超過時只以地點 id 過濾 / Most geo_cell ranges in the prefilter; above it only location ids filter
+}
+
+# 職缺狀態排程設定 / Job status scheduler settings
+JOBS_STATUS = {
+    # 行程內每日轉換；多行程部署建議改用 cron 執行 transition_job_statuses
+    # In-process daily transitions; multi-process deployments should run transition_job_statuses from cron
+    'RUN_SCHEDULER': False,
+    'RUN_AT_SECONDS': 1,  # 午夜後延遲幾秒執行 / Seconds after midnight to run at
+}
+
+# 背景工作佇列設定，由 manage.py run_workers 執行 / Background task queue settings, run by manage.py run_workers
+JOBS_TASKS = {
+    # 職缺建立或更新後加入的工作（點分路徑，以 job_id 呼叫） / Tasks enqueued after a posting is created or updated (dotted paths called with job_id)
+    'JOB_SIDE_EFFECTS': [],
+    'MAX_ATTEMPTS': 5,  # 每個工作最多執行次數 / Attempts per task
+    'PROCESSES': 2,  # 預設工作行程數 / Default worker processes
+}
+
+# 已驗證 JWT 快取設定 / Verified JWT cache settings
+JOBS_AUTH_CACHE = {
+    'ENABLED': True,
+    'MAX_ENTRIES': 10000,  # LRU 最多項目數 / Maximum LRU entries
+    'TTL': 300,  # 項目最長存活秒數，限制其他行程的撤銷延遲 / Max entry lifetime in seconds, bounding revocation delay in other processes
+    # 記錄撤銷的 CACHES 別名；多行程部署需為共用快取，否則撤銷只在單一行程生效（jobs.W001）
+    # CACHES alias recording revocations; must be a shared cache in multi-process deployments, otherwise revocations stay in one process (jobs.W001)
+    'ALIAS': 'default',
+}
+
+
+# 限流設定 / Rate limit settings
+JOBS_RATE_LIMIT = {
+    'ENABLED': True,
+    # 多行程部署改用 jobs.ratelimit.CacheTokenBucketBackend 共用桶 / Multi-process deployments share buckets with jobs.ratelimit.CacheTokenBucketBackend
+    'BACKEND': 'jobs.ratelimit.LocalTokenBucketBackend',
+    'RATES': {
+        'login_ip': '30/min',  # 每個 IP 的登入嘗試 / Login attempts per IP
+        'login_user': '10/min',  # 每個帳號的登入嘗試 / Login attempts per username
+        'jobs': None,  # 職缺端點每位使用者的請求，例如 '600/min' / Job endpoint requests per user, e.g. '600/min'
+    },
+}
+
+
+# 效能量測設定 / Performance instrumentation settings
+JOBS_METRICS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,  # 回應附上 Server-Timing 標頭 / Attach the Server-Timing header to responses
+    # /metrics 只開放給帶有此 Bearer 令牌或來自 ALLOWED_IPS 的抓取者 / /metrics only serves scrapers with this bearer token or from ALLOWED_IPS
+    'TOKEN': None,
+    'ALLOWED_IPS': ('127.0.0.1', '::1'),
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -14,13 +14,22 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from functools import partial
+
 from django.contrib import admin
 from django.urls import path
 from ninja import NinjaAPI
+from ninja.errors import Throttled
 from jobs.api import router as jobs_router, auth_router
+from jobs.async_api import async_router as async_jobs_router
+from jobs.metrics import TimedJSONRenderer, metrics_view
+from jobs.ratelimit import throttled_response
 
 # 創建API實例 / Create API instance
-api = NinjaAPI(title="工作職缺平台 API / Job Platform API")
+api = NinjaAPI(title="工作職缺平台 API / Job Platform API", renderer=TimedJSONRenderer())
+
+# 限流的 429 回應附上 Retry-After / Throttled 429 responses carry Retry-After
+api.add_exception_handler(Throttled, partial(throttled_response, api))
 
 # 添加認證路由 / Add auth router
 api.add_router("/auth/", auth_router)
@@ -28,7 +37,11 @@ api.add_router("/auth/", auth_router)
 # 添加職缺API路由 / Add jobs API router
 api.add_router("/jobs/", jobs_router)
 
+# 添加非同步職缺API路由（ASGI 部署使用） / Add async jobs API router (for ASGI deployments)
+api.add_router("/async/jobs/", async_jobs_router)
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),  # Django Ninja API 路由
+    path('metrics', metrics_view),  # Prometheus 抓取端點 / Prometheus scrape endpoint
 ]
@@ -1,18 +1,46 @@
 from datetime import date
-from typing import List, Dict, Any
-from django.db.models import Q
-from django.http import Http404
+from typing import List, Dict, Any, Optional
+from django.db import transaction
+from django.http import Http404, HttpResponse
 from django.contrib.auth import authenticate
 from ninja import Router, Query, Body, Schema
 from ninja.pagination import paginate
-from ninja_jwt.authentication import JWTAuth
-from ninja_jwt.tokens import RefreshToken
+from ninja_jwt.tokens import AccessToken, RefreshToken
 from ninja_extra import status
 
+from jobs.auth import CachedJWTAuth, revoke_token
+from jobs.bulk import BulkLimitExceeded, bulk_create_jobs, bulk_delete_jobs, bulk_update_jobs
+from jobs.cache import aggregate_cache_key, cache_response, detail_cache_key, get_cached_response, list_cache_key
+from jobs.conditional import (
+    fetch_detail_validators,
+    fetch_list_validators,
+    has_preconditions,
+    job_validators,
+    precondition_response,
+    revalidate_cached_response,
+    validator_headers,
+)
+from jobs.export import ExportFormat, stream_export
+from jobs.facets import compute_facets, get_facet_settings
 from jobs.models import JobPosting
+from jobs.negotiation import InvalidFields, negotiate
+from jobs.pagination import InvalidCursor, paginate_by_cursor
+from jobs.queries import build_job_queryset, filter_job_postings, prepare_status_filter, resolve_sort_field
+from jobs.ratelimit import TokenBucketThrottle, client_ip, enforce
+from jobs.salary import TooManyBuckets, get_salary_settings, salary_histogram
+from jobs.serializers import project_job_rows, render_job, render_row_page, render_rows, serialize_job
+from jobs.snapshot import snapshot_page
+from jobs.status import ensure_transitioned
+from jobs.tasks import enqueue_job_side_effects, save_with_side_effects
 from jobs.schemas import (
     JobPostingIn, 
     JobPostingOut, 
+    JobPostingPage,
+    JobFacetsOut,
+    SalaryHistogramOut,
+    JobBulkIn,
+    JobBulkDeleteIn,
+    JobBulkResult,
     JobStatus, 
     JobFilterParams, 
     ErrorMessage, 
@@ -30,14 +58,19 @@ class RefreshRequest(Schema):
 # JWT 認證路由 / JWT Authentication router
 auth_router = Router(tags=["auth"])
 
-@auth_router.post("/token", response={200: Dict[str, Any], 401: ErrorMessage})
+@auth_router.post("/token", response={200: Dict[str, Any], 401: ErrorMessage, 429: ErrorMessage})
 def login(request, data: TokenRequest = Body(...)):
     """
     獲取JWT令牌 / Get JWT token
     
     使用用戶名和密碼來獲取訪問令牌和刷新令牌
     Use username and password to get access token and refresh token
+
+    每次嘗試都會執行密碼雜湊，因此先以 IP 與帳號的令牌桶限流
+    Every attempt runs the password hasher, so attempts are first limited per IP and per username
     """
+    enforce("login_ip", client_ip(request))
+    enforce("login_user", data.username.lower())
     user = authenticate(username=data.username, password=data.password)
     if user is None:
         return 401, {"detail": "Invalid credentials"}
@@ -65,12 +98,28 @@ def refresh_token(request, data: RefreshRequest = Body(...)):
     except Exception as e:
         return 401, {"detail": str(e)}
 
+@auth_router.post("/token/revoke", response={200: SuccessMessage}, auth=CachedJWTAuth())
+def revoke_access_token(request):
+    """
+    撤銷目前使用的訪問令牌（登出） / Revoke the access token in use (log out)
+
+    令牌立即從驗證快取移除，之後的請求會得到 401
+    The token is dropped from the verified-token cache at once and later requests get 401
+    """
+    raw_token = request.headers["Authorization"].split(" ", 1)[1]
+    revoke_token(AccessToken(raw_token))
+    return {"message": "Token revoked"}
+
 
 # 創建API路由器，並設置認證 / Create API router with authentication
-router = Router(tags=["jobs"])
+# 限流速率由 JOBS_RATE_LIMIT["RATES"]["jobs"] 設定，預設不限 / Rate from JOBS_RATE_LIMIT["RATES"]["jobs"], unlimited by default
+router = Router(tags=["jobs"], throttle=TokenBucketThrottle("jobs"))
+
+# 每頁最少筆數 / Minimum page size
+MIN_PAGE_SIZE = 1
 
 
-@router.post("/", response={201: JobPostingOut, 400: ErrorMessage}, auth=JWTAuth())
+@router.post("/", response={201: JobPostingOut, 400: ErrorMessage}, auth=CachedJWTAuth())
 def create_job_posting(request, job_data: JobPostingIn):
     """
     創建新的職缺貼文 / Create a new job posting
@@ -89,178 +138,306 @@ def create_job_posting(request, job_data: JobPostingIn):
             expiration_date=job_data.expiration_date,
         )
         job.required_skills = job_data.required_skills
-        job.save()
+        # 副作用工作與職缺在同一交易中加入 / Side-effect tasks are enqueued in the same transaction as the posting
+        save_with_side_effects(job)
         
         # 準備響應 / Prepare response
-        response = JobPostingOut(
-            id=job.id,
-            title=job.title,
-            description=job.description,
-            location=job.location,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            company_name=job.company_name,
-            posting_date=job.posting_date,
-            expiration_date=job.expiration_date,
-            required_skills=job.required_skills,
-            created_at=job.created_at,
-            updated_at=job.updated_at,
-        )
-        return 201, response
+        return 201, serialize_job(job)
     except Exception as e:
         return 400, {"detail": str(e)}
 
 
-@router.get("/", response=List[JobPostingOut], auth=JWTAuth())
-def list_job_postings(request, filters: JobFilterParams = Query(...)):
+@router.post("/bulk", response={200: JobBulkResult, 413: ErrorMessage}, auth=CachedJWTAuth())
+def bulk_create_job_postings(request, payload: JobBulkIn):
+    """
+    批次創建職缺 / Create job postings in bulk
+    
+    逐筆驗證後於單一交易寫入，回傳每筆結果；項目數上限由 JOBS_BULK["MAX_ITEMS"] 設定
+    Validates every item, writes them in one transaction and returns per-item results; the
+    item limit is configured by JOBS_BULK["MAX_ITEMS"]
+    """
+    try:
+        return bulk_create_jobs(payload.items, payload.all_or_nothing)
+    except BulkLimitExceeded as e:
+        return 413, {"detail": str(e)}
+
+
+@router.put("/bulk", response={200: JobBulkResult, 413: ErrorMessage}, auth=CachedJWTAuth())
+def bulk_update_job_postings(request, payload: JobBulkIn):
+    """
+    批次更新職缺 / Update job postings in bulk
+    
+    每個項目需包含 id，不允許更改 company_name / Every item needs an id; company_name cannot change
+    """
+    try:
+        return bulk_update_jobs(payload.items, payload.all_or_nothing)
+    except BulkLimitExceeded as e:
+        return 413, {"detail": str(e)}
+
+
+@router.post("/bulk/delete", response={200: JobBulkResult, 413: ErrorMessage}, auth=CachedJWTAuth())
+def bulk_delete_job_postings(request, payload: JobBulkDeleteIn):
+    """
+    批次刪除職缺 / Delete job postings in bulk
+    """
+    try:
+        return bulk_delete_jobs(payload.ids)
+    except BulkLimitExceeded as e:
+        return 413, {"detail": str(e)}
+
+
+@router.get("/", response={200: List[JobPostingOut], 400: ErrorMessage}, auth=CachedJWTAuth())
+def list_job_postings(request, filters: JobFilterParams = Query(...), fields: Optional[str] = None):
     """
     獲取所有職缺，支持搜索、篩選和排序 / Get all job postings with search, filter and sort
     
     查詢參數支持:
-    - search: 搜索標題，描述和公司名
+    - search: 搜索標題，描述和公司名（全文檢索索引）
     - status: 按狀態過濾 (active/expired/scheduled)
-    - location, company, skill: 過濾特定字段
-    - sort_by, sort_desc: 排序控制
+    - location, company, skill: 過濾特定字段（skill 為精確比對，skill_match=any/all 控制多技能）
+    - near, radius_km: 距離搜尋，near=緯度,經度 / Proximity search around near=lat,lng
+    - sort_by, sort_desc: 排序控制（搜索時可用 relevance 依相關度排序）
     - limit, offset: 分頁參數
+    - fields: 只輸出指定欄位，例如 id,title,location / Output only the named fields, e.g. id,title,location
+    
+    回應會被快取，X-Cache 標頭標示 HIT/MISS / Responses are cached; the X-Cache header reports HIT/MISS
+    status=active 且無搜尋、技能、薪資過濾時由有效職缺快照回答 / status=active without search, skill or salary filters is answered from the active snapshot
+    回應帶有 ETag 與 Last-Modified，If-None-Match 相符時回傳 304 / Responses carry ETag and Last-Modified; a matching If-None-Match gets a 304
+    Accept: application/msgpack 時輸出 MessagePack（需安裝 msgpack） / Accept: application/msgpack gets MessagePack (requires msgpack)
     """
-    # 基础查询 / Base query
-    queryset = JobPosting.objects.all()
+    try:
+        representation = negotiate(request, fields)
+    except InvalidFields as e:
+        return 400, {"detail": str(e)}
     
-    # 文本搜索 / Text search
-    if filters.search:
-        queryset = queryset.filter(
-            Q(title__icontains=filters.search) | 
-            Q(description__icontains=filters.search) | 
-            Q(company_name__icontains=filters.search)
-        )
+    # 讀取快取 / Read the response cache
+    cache_key = list_cache_key(filters, variant=representation.variant)
+    cached_response = get_cached_response(cache_key, "list")
+    if cached_response is not None:
+        return revalidate_cached_response(request, cached_response)
     
-    # 按状态筛选 / Filter by status
-    today = date.today()
-    if filters.status == JobStatus.ACTIVE:
-        queryset = queryset.filter(posting_date__lte=today, expiration_date__gte=today)
-    elif filters.status == JobStatus.EXPIRED:
-        queryset = queryset.filter(expiration_date__lt=today)
-    elif filters.status == JobStatus.SCHEDULED:
-        queryset = queryset.filter(posting_date__gt=today)
+    prepare_status_filter(filters)
     
-    # 按特定字段筛选 / Filter by specific fields
-    if filters.location:
-        queryset = queryset.filter(location__icontains=filters.location)
-    if filters.company:
-        queryset = queryset.filter(company_name__icontains=filters.company)
-    if filters.skill:
-        # 由于skill是存储为JSON的TextField，我们需要使用LIKE查询
-        queryset = queryset.filter(_required_skills__icontains=filters.skill)
+    # 有效職缺的瀏覽由記憶體快照回答，不查詢資料庫 / Active-job browsing is answered from the in-memory snapshot without querying the database
+    page = snapshot_page(filters, representation.fields, representation.variant)
     
-    # 排序 / Sort
-    sort_field = filters.sort_by
-    if sort_field not in ["posting_date", "expiration_date"]:
-        sort_field = "posting_date"  # 默认排序字段
+    # 以 MAX(updated_at) 與 COUNT 驗證，未變更時不需序列化 / Validate with MAX(updated_at) and COUNT; unchanged lists skip serialization
+    validators = page[1] if page is not None else fetch_list_validators(filters, variant=representation.variant)
+    not_modified = precondition_response(request, validators)
+    if not_modified is not None:
+        return not_modified
     
-    if filters.sort_desc:
-        sort_field = f"-{sort_field}"
+    if page is not None:
+        rows = page[0]
+    else:
+        # 過濾與排序 / Filter and sort
+        queryset = build_job_queryset(filters)
+        
+        # 分页並只投影輸出欄位 / Paginate and project only the output columns
+        rows = project_job_rows(queryset, representation.fields)[filters.offset:filters.offset + filters.limit]
     
-    queryset = queryset.order_by(sort_field)
+    # 格式化响应並寫入快取 / Format the response and store it in the cache
+    content = render_rows(rows, representation.fields, representation.format)
+    return cache_response(cache_key, content, {**representation.headers, **validator_headers(validators)})
+
+
+@router.get("/cursor", response={200: JobPostingPage, 400: ErrorMessage}, auth=CachedJWTAuth())
+def list_job_postings_by_cursor(
+    request, filters: JobFilterParams = Query(...), cursor: Optional[str] = None, fields: Optional[str] = None,
+):
+    """
+    以游標分頁獲取職缺 / Get job postings with cursor (keyset) pagination
     
-    # 分页 / Pagination
-    results = queryset[filters.offset:filters.offset + filters.limit]
+    過濾參數與列表端點相同，offset 會被忽略；以回應中的 next_cursor 取得下一頁
+    Accepts the same filters as the list endpoint but ignores offset; pass next_cursor from
+    the response to fetch the following page
+    - cursor: 上一頁回傳的游標，預設為第一頁 / Cursor from the previous page, first page by default
+    - sort_by: posting_date、expiration_date、salary_min 或 salary_max（relevance 不支援，退回 posting_date）
+    - fields: 只輸出指定欄位 / Output only the named fields
+    """
+    if filters.limit < MIN_PAGE_SIZE:
+        return 400, {"detail": f"limit must be at least {MIN_PAGE_SIZE}"}
+    try:
+        representation = negotiate(request, fields)
+    except InvalidFields as e:
+        return 400, {"detail": str(e)}
     
-    # 格式化响应 / Format response
-    response = []
-    for job in results:
-        response.append(
-            JobPostingOut(
-                id=job.id,
-                title=job.title,
-                description=job.description,
-                location=job.location,
-                salary_min=job.salary_min,
-                salary_max=job.salary_max,
-                company_name=job.company_name,
-                posting_date=job.posting_date,
-                expiration_date=job.expiration_date,
-                required_skills=job.required_skills,
-                created_at=job.created_at,
-                updated_at=job.updated_at,
-            )
+    prepare_status_filter(filters)
+    sort_field = resolve_sort_field(filters)
+    queryset = build_job_queryset(filters.model_copy(update={"sort_by": sort_field}))
+    try:
+        # 游標需要排序欄位與 id，即使未輸出 / The cursor needs the sort field and id even when they are not output
+        rows, next_cursor = paginate_by_cursor(
+            project_job_rows(queryset, representation.fields, extra=(sort_field, "id")),
+            sort_field, filters.sort_desc, filters.limit, cursor,
         )
+    except InvalidCursor as e:
+        return 400, {"detail": str(e)}
+    
+    content = render_row_page(rows, next_cursor, representation.fields, representation.format)
+    return HttpResponse(content, headers=representation.headers)
+
+
+@router.get("/facets", response={200: JobFacetsOut, 400: ErrorMessage}, auth=CachedJWTAuth())
+def job_posting_facets(request, filters: JobFilterParams = Query(...), top: Optional[int] = None):
+    """
+    取得搜尋結果的分面計數 / Get faceted counts for search results
+    
+    過濾參數與列表端點相同（排序與分頁參數會被忽略），回傳 status、location、company、skill
+    各自筆數最多的前 top 個值；超過時間預算的分面列於 timed_out，此時回應不會被快取
+    Takes the same filters as the list endpoint (sort and pagination are ignored) and returns
+    the top values of status, location, company and skill; facets exceeding the time budget
+    are listed in timed_out and such responses are not cached
+    - top: 每個分面回傳的值數，預設與上限由 JOBS_FACETS 設定 / Values per facet, default and limit set by JOBS_FACETS
+    """
+    facet_settings = get_facet_settings()
+    top = facet_settings["DEFAULT_TOP"] if top is None else top
+    if not MIN_PAGE_SIZE <= top <= facet_settings["MAX_TOP"]:
+        return 400, {"detail": f"top must be between {MIN_PAGE_SIZE} and {facet_settings['MAX_TOP']}"}
+    
+    cache_key = aggregate_cache_key("facets", filters, top=top)
+    cached_response = get_cached_response(cache_key, "facets")
+    if cached_response is not None:
+        return cached_response
+    
+    # 狀態分面以儲存的 status 分組，先補做當天的轉換使計數與 ?status= 過濾一致
+    # The status facet groups on the stored column, so catch up the day's transition first to keep it consistent with ?status= filtering
+    ensure_transitioned()
+    result = compute_facets(filters, top)
+    if result["timed_out"]:
+        return result
+    return cache_response(cache_key, JobFacetsOut(**result))
+
+
+@router.get("/salary-histogram", response={200: SalaryHistogramOut, 400: ErrorMessage}, auth=CachedJWTAuth())
+def job_salary_histogram(request, filters: JobFilterParams = Query(...), bucket_size: Optional[int] = None):
+    """
+    取得薪資分布 / Get the salary distribution
+    
+    過濾參數與列表端點相同（排序與分頁參數會被忽略）；每筆職缺以薪資範圍中點歸入 [lower, upper) 級距，
+    在資料庫以單一 GROUP BY 計算
+    Takes the same filters as the list endpoint (sort and pagination are ignored); each posting
+    falls into the [lower, upper) bucket of its salary midpoint, counted with one GROUP BY
+    - bucket_size: 級距大小，預設與級數上限由 JOBS_SALARY 設定 / Bucket size; default and bucket limit set by JOBS_SALARY
+    """
+    bucket_size = get_salary_settings()["DEFAULT_BUCKET_SIZE"] if bucket_size is None else bucket_size
+    if bucket_size < 1:
+        return 400, {"detail": "bucket_size must be at least 1"}
+    
+    cache_key = aggregate_cache_key("salary-histogram", filters, bucket_size=bucket_size)
+    cached_response = get_cached_response(cache_key, "salary-histogram")
+    if cached_response is not None:
+        return cached_response
+    
+    prepare_status_filter(filters)
+    try:
+        buckets, unknown = salary_histogram(filter_job_postings(filters), bucket_size)
+    except TooManyBuckets as e:
+        return 400, {"detail": str(e)}
+    return cache_response(
+        cache_key, SalaryHistogramOut(bucket_size=bucket_size, buckets=buckets, unknown=unknown)
+    )
+
+
+@router.get("/export", auth=CachedJWTAuth())
+def export_job_postings(
+    request,
+    filters: JobFilterParams = Query(...),
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+):
+    """
+    串流匯出職缺 / Stream an export of job postings
     
-    return response
+    過濾與排序參數與列表端點相同，limit/offset 會被忽略；記憶體用量固定
+    Takes the same filter and sort params as the list endpoint, ignores limit/offset and
+    uses constant memory
+    - format: ndjson（預設 / default）或 csv，CSV 的 required_skills 為 JSON 陣列字串
+    """
+    prepare_status_filter(filters)
+    return stream_export(build_job_queryset(filters), export_format)
 
 
-@router.get("/{job_id}", response={200: JobPostingOut, 404: ErrorMessage}, auth=JWTAuth())
-def get_job_posting(request, job_id: int):
+@router.get("/{job_id}", response={200: JobPostingOut, 400: ErrorMessage, 404: ErrorMessage}, auth=CachedJWTAuth())
+def get_job_posting(request, job_id: int, fields: Optional[str] = None):
     """
     獲取單個職缺的詳細信息 / Get details of a specific job posting
+    
+    回應帶有 ETag 與 Last-Modified，If-None-Match 相符時回傳 304 / Responses carry ETag and Last-Modified; a matching If-None-Match gets a 304
+    fields 與 Accept 協商同列表端點；只有預設表示法會被快取 / fields and Accept negotiation work like the list endpoint; only the default representation is cached
     """
+    try:
+        representation = negotiate(request, fields)
+    except InvalidFields as e:
+        return 400, {"detail": str(e)}
+    
+    # 寫入只精準刪除預設表示法的詳情鍵，其他表示法不快取 / Writes delete only the default detail key, so other representations are not cached
+    cache_key = detail_cache_key(job_id) if representation.variant is None else None
+    cached_response = get_cached_response(cache_key, "detail") if cache_key else None
+    if cached_response is not None:
+        return revalidate_cached_response(request, cached_response)
+    
+    # 帶條件標頭時只讀取 updated_at 驗證 / With conditional headers, validate by reading updated_at only
+    if has_preconditions(request):
+        not_modified = precondition_response(request, fetch_detail_validators(job_id, variant=representation.variant))
+        if not_modified is not None:
+            return not_modified
+    
     try:
         job = JobPosting.objects.get(id=job_id)
         
-        return JobPostingOut(
-            id=job.id,
-            title=job.title,
-            description=job.description,
-            location=job.location,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            company_name=job.company_name,
-            posting_date=job.posting_date,
-            expiration_date=job.expiration_date,
-            required_skills=job.required_skills,
-            created_at=job.created_at,
-            updated_at=job.updated_at,
-        )
+        content = render_job(job, representation.fields, representation.format)
+        headers = {**representation.headers, **validator_headers(job_validators(job, variant=representation.variant))}
+        if cache_key is None:
+            return HttpResponse(content, headers=headers)
+        return cache_response(cache_key, content, headers)
     except JobPosting.DoesNotExist:
         return 404, {"detail": "Job posting not found"}
 
 
-@router.put("/{job_id}", response={200: JobPostingOut, 400: ErrorMessage, 404: ErrorMessage}, auth=JWTAuth())
-def update_job_posting(request, job_id: int, job_data: JobPostingIn):
+@router.put("/{job_id}", response={200: JobPostingOut, 400: ErrorMessage, 404: ErrorMessage}, auth=CachedJWTAuth())
+def update_job_posting(request, job_id: int, job_data: JobPostingIn, response: HttpResponse):
     """
     更新現有職缺 / Update an existing job posting
     
     不允許更改company_name字段 / company_name field cannot be changed
+    帶 If-Match 時只在 ETag 相符才更新，否則回傳 412 / With If-Match the update only applies when the ETag matches, otherwise 412
     """
     try:
-        job = JobPosting.objects.get(id=job_id)
-        
-        # 检查公司名是否被更改 / Check if company name is changed
-        if job_data.company_name != job.company_name:
-            return 400, {"detail": "Company name cannot be changed"}
+        with transaction.atomic():
+            job = JobPosting.objects.select_for_update().get(id=job_id)
+            
+            # 樂觀鎖：檢查 If-Match / Optimistic concurrency: check If-Match
+            precondition_failed = precondition_response(request, job_validators(job))
+            if precondition_failed is not None:
+                return precondition_failed
+            
+            # 检查公司名是否被更改 / Check if company name is changed
+            if job_data.company_name != job.company_name:
+                return 400, {"detail": "Company name cannot be changed"}
+            
+            # 更新字段 / Update fields
+            job.title = job_data.title
+            job.description = job_data.description
+            job.location = job_data.location
+            job.salary_min = job_data.salary_min
+            job.salary_max = job_data.salary_max
+            job.posting_date = job_data.posting_date
+            job.expiration_date = job_data.expiration_date
+            job.required_skills = job_data.required_skills
+            
+            job.save()
+            enqueue_job_side_effects([job])
         
-        # 更新字段 / Update fields
-        job.title = job_data.title
-        job.description = job_data.description
-        job.location = job_data.location
-        job.salary_min = job_data.salary_min
-        job.salary_max = job_data.salary_max
-        job.posting_date = job_data.posting_date
-        job.expiration_date = job_data.expiration_date
-        job.required_skills = job_data.required_skills
-        
-        job.save()
-        
-        return JobPostingOut(
-            id=job.id,
-            title=job.title,
-            description=job.description,
-            location=job.location,
-            salary_min=job.salary_min,
-            salary_max=job.salary_max,
-            company_name=job.company_name,
-            posting_date=job.posting_date,
-            expiration_date=job.expiration_date,
-            required_skills=job.required_skills,
-            created_at=job.created_at,
-            updated_at=job.updated_at,
-        )
+        for header, value in validator_headers(job_validators(job)).items():
+            response[header] = value
+        return serialize_job(job)
     except JobPosting.DoesNotExist:
         return 404, {"detail": "Job posting not found"}
     except Exception as e:
         return 400, {"detail": str(e)}
 
 
-@router.delete("/{job_id}", response={200: SuccessMessage, 404: ErrorMessage}, auth=JWTAuth())
+@router.delete("/{job_id}", response={200: SuccessMessage, 404: ErrorMessage}, auth=CachedJWTAuth())
 def delete_job_posting(request, job_id: int):
     """
     刪除職缺 / Delete a job posting
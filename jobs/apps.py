@@ -1,6 +1,60 @@
 from django.apps import AppConfig
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+
+def restore_search_triggers(sender, using, **kwargs):
+    """
+    migrate 後補建全文檢索與薪資範圍索引的觸發器 / Restore the full-text search and salary index triggers after migrate
+    """
+    from jobs.salary import ensure_salary_triggers
+    from jobs.search import ensure_search_triggers
+
+    ensure_search_triggers(connections[using])
+    ensure_salary_triggers(connections[using])
 
 
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        """
+        註冊應用程式訊號 / Register application signals
+        """
+        from django.contrib.auth import get_user_model
+
+        from jobs import checks  # noqa: F401  註冊系統檢查 / Registers the system checks
+        from jobs.auth import drop_cached_user
+        from jobs.cache import invalidate_job_on_change, lists_invalidated
+        from jobs.metrics import install_query_recorder
+        from jobs.snapshot import note_invalidated_lists
+        from jobs.sqlite import apply_sqlite_pragmas
+        from jobs.status import get_status_settings, start_scheduler
+
+        post_migrate.connect(restore_search_triggers, sender=self)
+
+        # 新的 SQLite 連線套用 WAL 等 PRAGMA（先於量測，不計入請求的 SQL 數） / New SQLite connections get WAL and other PRAGMAs (before instrumentation, so they are not counted per request)
+        connection_created.connect(apply_sqlite_pragmas)
+
+        # 每個資料庫連線都計入請求的 SQL 數與耗時 / Every database connection counts SQL queries and time per request
+        connection_created.connect(install_query_recorder)
+
+        # 職缺寫入時使回應快取失效 / Invalidate the response cache whenever a posting is written
+        job_posting = self.get_model('JobPosting')
+        post_save.connect(invalidate_job_on_change, sender=job_posting)
+        post_delete.connect(invalidate_job_on_change, sender=job_posting)
+
+        # 列表失效時增量更新有效職缺快照 / Incrementally update the active snapshot whenever lists are invalidated
+        lists_invalidated.connect(note_invalidated_lists)
+
+        # 使用者更新或刪除時移除其已驗證令牌快取 / Drop a user's verified-token cache entries when it is updated or deleted
+        user_model = get_user_model()
+        post_save.connect(drop_cached_user, sender=user_model)
+        post_delete.connect(drop_cached_user, sender=user_model)
+
+        # 行程內的每日狀態轉換（預設關閉，建議以 cron 執行管理命令）
+        # In-process daily status transitions (off by default; cron running the command is preferred)
+        if get_status_settings()["RUN_SCHEDULER"]:
+            start_scheduler()
@@ -0,0 +1,167 @@
+"""
+職缺 API 的非同步版本 / Async versions of the job API endpoints
+
+與 jobs.api 行為相同，但以 async def 與 Django 非同步 ORM（aget、acreate、async for）實作，
+部署於 ASGI 時不需經過 thread-sensitive 的同步轉接層。
+Behaves like jobs.api but is implemented with async def and Django's async ORM (aget,
+acreate, async for), so ASGI deployments skip the thread-sensitive sync adapter.
+"""
+from typing import List, Optional
+
+from django.http import HttpResponse
+from ninja import Query, Router
+
+from jobs.auth import AsyncCachedJWTAuth
+from jobs.cache import aget_cached_response, acache_response, alist_cache_key, detail_cache_key
+from jobs.conditional import (
+    afetch_detail_validators,
+    afetch_list_validators,
+    has_preconditions,
+    job_validators,
+    precondition_response,
+    revalidate_cached_response,
+    validator_headers,
+)
+from jobs.models import JobPosting
+from jobs.negotiation import InvalidFields, negotiate
+from jobs.queries import aprepare_status_filter, build_job_queryset
+from jobs.ratelimit import TokenBucketThrottle
+from jobs.schemas import ErrorMessage, JobFilterParams, JobPostingIn, JobPostingOut, SuccessMessage
+from jobs.search import aprepare_search
+from jobs.serializers import project_job_rows, render_job, render_rows, serialize_job
+from jobs.snapshot import asnapshot_page
+from jobs.tasks import asave_with_side_effects
+
+# 非同步職缺路由器 / Async jobs router
+async_router = Router(tags=["jobs-async"], throttle=TokenBucketThrottle("jobs"))
+
+
+@async_router.post("/", response={201: JobPostingOut, 400: ErrorMessage}, auth=AsyncCachedJWTAuth())
+async def acreate_job_posting(request, job_data: JobPostingIn):
+    """
+    非同步創建職缺 / Create a job posting asynchronously
+    """
+    try:
+        job = JobPosting(**job_data.model_dump(exclude={"required_skills"}))
+        job.required_skills = job_data.required_skills
+        await asave_with_side_effects(job)
+        return 201, serialize_job(job)
+    except Exception as e:
+        return 400, {"detail": str(e)}
+
+
+@async_router.get("/", response={200: List[JobPostingOut], 400: ErrorMessage}, auth=AsyncCachedJWTAuth())
+async def alist_job_postings(request, filters: JobFilterParams = Query(...), fields: Optional[str] = None):
+    """
+    非同步獲取職缺列表，參數同 GET /api/jobs/ / List job postings asynchronously, same params as GET /api/jobs/
+    """
+    try:
+        representation = negotiate(request, fields)
+    except InvalidFields as e:
+        return 400, {"detail": str(e)}
+
+    cache_key = await alist_cache_key(filters, variant=representation.variant)
+    cached_response = await aget_cached_response(cache_key, "list")
+    if cached_response is not None:
+        return revalidate_cached_response(request, cached_response)
+
+    await aprepare_status_filter(filters)
+    page = await asnapshot_page(filters, representation.fields, representation.variant)
+    if page is None and filters.search:
+        await aprepare_search()
+    validators = page[1] if page is not None else await afetch_list_validators(filters, variant=representation.variant)
+    not_modified = precondition_response(request, validators)
+    if not_modified is not None:
+        return not_modified
+
+    if page is not None:
+        rows = page[0]
+    else:
+        queryset = project_job_rows(build_job_queryset(filters), representation.fields)
+        rows = [row async for row in queryset[filters.offset:filters.offset + filters.limit]]
+    content = render_rows(rows, representation.fields, representation.format)
+    return await acache_response(cache_key, content, {**representation.headers, **validator_headers(validators)})
+
+
+@async_router.get(
+    "/{job_id}",
+    response={200: JobPostingOut, 400: ErrorMessage, 404: ErrorMessage},
+    auth=AsyncCachedJWTAuth(),
+)
+async def aget_job_posting(request, job_id: int, fields: Optional[str] = None):
+    """
+    非同步獲取單個職缺，參數同 GET /api/jobs/{job_id} / Get a job posting asynchronously, same params as GET /api/jobs/{job_id}
+    """
+    try:
+        representation = negotiate(request, fields)
+    except InvalidFields as e:
+        return 400, {"detail": str(e)}
+
+    cache_key = detail_cache_key(job_id) if representation.variant is None else None
+    cached_response = await aget_cached_response(cache_key, "detail") if cache_key else None
+    if cached_response is not None:
+        return revalidate_cached_response(request, cached_response)
+
+    if has_preconditions(request):
+        not_modified = precondition_response(request, await afetch_detail_validators(job_id, variant=representation.variant))
+        if not_modified is not None:
+            return not_modified
+
+    try:
+        job = await JobPosting.objects.aget(id=job_id)
+    except JobPosting.DoesNotExist:
+        return 404, {"detail": "Job posting not found"}
+    content = render_job(job, representation.fields, representation.format)
+    headers = {**representation.headers, **validator_headers(job_validators(job, variant=representation.variant))}
+    if cache_key is None:
+        return HttpResponse(content, headers=headers)
+    return await acache_response(cache_key, content, headers)
+
+
+@async_router.put(
+    "/{job_id}",
+    response={200: JobPostingOut, 400: ErrorMessage, 404: ErrorMessage},
+    auth=AsyncCachedJWTAuth(),
+)
+async def aupdate_job_posting(request, job_id: int, job_data: JobPostingIn, response: HttpResponse):
+    """
+    非同步更新職缺，不允許更改 company_name / Update a job posting asynchronously; company_name cannot change
+
+    If-Match 在讀取後檢查但不鎖定資料列；需要嚴格保證時使用同步端點
+    If-Match is checked after the read without locking the row; use the sync endpoint for a strict guarantee
+    """
+    try:
+        job = await JobPosting.objects.aget(id=job_id)
+    except JobPosting.DoesNotExist:
+        return 404, {"detail": "Job posting not found"}
+
+    precondition_failed = precondition_response(request, job_validators(job))
+    if precondition_failed is not None:
+        return precondition_failed
+
+    if job_data.company_name != job.company_name:
+        return 400, {"detail": "Company name cannot be changed"}
+
+    try:
+        for field_name, value in job_data.model_dump(exclude={"company_name", "required_skills"}).items():
+            setattr(job, field_name, value)
+        job.required_skills = job_data.required_skills
+        await asave_with_side_effects(job)
+        for header, value in validator_headers(job_validators(job)).items():
+            response[header] = value
+        return serialize_job(job)
+    except Exception as e:
+        return 400, {"detail": str(e)}
+
+
+@async_router.delete("/{job_id}", response={200: SuccessMessage, 404: ErrorMessage}, auth=AsyncCachedJWTAuth())
+async def adelete_job_posting(request, job_id: int):
+    """
+    非同步刪除職缺 / Delete a job posting asynchronously
+    """
+    try:
+        job = await JobPosting.objects.aget(id=job_id)
+    except JobPosting.DoesNotExist:
+        return 404, {"detail": "Job posting not found"}
+    await job.adelete()
+    return {"message": "Job posting deleted successfully"}
@@ -0,0 +1,304 @@
+"""
+帶有已驗證令牌快取的 JWT 認證 / JWT authentication with a verified-token cache
+
+JWTAuth 每次請求都會驗證簽章並從資料庫載入 User；同一令牌重複使用時，
+這裡以有上限的 LRU 快取記住驗證結果直到令牌到期（或 TTL 到期），命中時不需驗簽也不查資料庫。
+JWTAuth verifies the signature and loads the User from the database on every request. When
+the same token is reused, this module memoizes the verified result in a bounded LRU until the
+token expires (or the TTL runs out), so a hit needs neither signature verification nor a query.
+
+撤銷 / Revocation:
+- 本行程內立即生效 / Takes effect immediately in this process
+- 撤銷記錄於 JOBS_AUTH_CACHE["ALIAS"] 的 Django 快取，其他行程在快取未命中時檢查，因此最遲在 TTL 內生效；
+  只有該別名是共用快取（Redis、Memcached 等）時才成立。預設的 local-memory 快取下撤銷只在處理它的行程生效，
+  其他行程在整個令牌效期內仍接受該令牌，系統檢查 jobs.W001 會提出警告
+  Revocations are recorded in the Django cache under JOBS_AUTH_CACHE["ALIAS"] and checked by
+  other processes on a miss, so they take effect there within the TTL. That only holds when the
+  alias is a shared cache (Redis, Memcached, ...): with the default local-memory cache a
+  revocation only applies in the process that handled it and other processes keep accepting
+  the token for its whole lifetime, which system check jobs.W001 warns about
+"""
+import copy
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from ninja_extra.security import AsyncHttpBearer
+from ninja_jwt.authentication import JWTAuth
+from ninja_jwt.exceptions import AuthenticationFailed
+from ninja_jwt.settings import api_settings
+
+from jobs.metrics import timed
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_AUTH_CACHE 覆寫 / Defaults, overridable by settings.JOBS_AUTH_CACHE
+DEFAULT_AUTH_CACHE_SETTINGS = {
+    "ENABLED": True,
+    "MAX_ENTRIES": 10_000,  # LRU 最多項目數 / Maximum LRU entries
+    "TTL": 300,  # 項目最長存活秒數（不超過令牌效期），None 表示直到令牌到期 / Max entry lifetime in seconds (never past the token expiry), None for the token lifetime
+    "ALIAS": "default",  # 記錄撤銷的 CACHES 別名 / CACHES alias recording revocations
+    "KEY_PREFIX": "jobs-auth",
+}
+
+
+def get_auth_cache_settings():
+    """
+    取得合併預設值後的認證快取設定 / Get auth cache settings merged with defaults
+    """
+    return {**DEFAULT_AUTH_CACHE_SETTINGS, **getattr(settings, "JOBS_AUTH_CACHE", {})}
+
+
+def _token_key(raw_token):
+    """
+    以摘要作為快取鍵，避免在記憶體中保存完整令牌 / Key entries by digest so full tokens are not kept in memory
+    """
+    return hashlib.blake2b(raw_token.encode(), digest_size=16).digest()
+
+
+class TokenCacheEntry:
+    """
+    已驗證令牌的快取項目 / Cache entry of a verified token
+    """
+    __slots__ = ("user", "user_id", "jti", "issued_at", "expires_at")
+
+    def __init__(self, user, user_id, jti, issued_at, expires_at):
+        self.user = user
+        self.user_id = user_id
+        self.jti = jti
+        self.issued_at = issued_at
+        self.expires_at = expires_at
+
+
+class VerifiedTokenCache:
+    """
+    執行緒安全、有上限的已驗證令牌 LRU / Thread-safe, bounded LRU of verified tokens
+
+    同時記錄命中、未命中、逐出、撤銷次數與驗證耗時 / Also records hits, misses, evictions, revocations and verification time
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._counters = {"hit": 0, "miss": 0, "expired": 0, "eviction": 0, "revoked": 0}
+        self._verify_count = 0
+        self._verify_seconds = 0.0
+
+    def get(self, key, now=None):
+        """
+        取得未過期的項目並標記為最近使用 / Get an unexpired entry and mark it recently used
+        """
+        now = now or time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["miss"] += 1
+                return None
+            if entry.expires_at <= now:
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["miss"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hit"] += 1
+            return entry
+
+    def put(self, key, entry, max_entries):
+        """
+        寫入項目，超過上限時逐出最久未使用者 / Store an entry, evicting the least recently used beyond the limit
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+                self._counters["eviction"] += 1
+
+    def discard(self, predicate):
+        """
+        移除符合條件的項目並回傳數量 / Remove entries matching the predicate and return how many
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if predicate(entry)]
+            for key in keys:
+                del self._entries[key]
+            self._counters["revoked"] += len(keys)
+        return len(keys)
+
+    def record_verification(self, seconds):
+        """
+        記錄一次完整驗證（驗簽＋載入使用者）的耗時 / Record the cost of one full verification (signature + user load)
+        """
+        with self._lock:
+            self._verify_count += 1
+            self._verify_seconds += seconds
+
+    def clear(self):
+        """
+        清除所有項目與計數 / Clear every entry and counter
+        """
+        with self._lock:
+            self._entries.clear()
+            self._reset_counters()
+
+    def snapshot(self):
+        """
+        回傳目前計數與驗證成本 / Return the current counters and verification cost
+        """
+        with self._lock:
+            return {
+                **self._counters,
+                "size": len(self._entries),
+                "verify_count": self._verify_count,
+                "verify_seconds_total": self._verify_seconds,
+                "verify_seconds_avg": self._verify_seconds / self._verify_count if self._verify_count else 0.0,
+            }
+
+
+# 全域已驗證令牌快取 / Global verified-token cache
+token_cache = VerifiedTokenCache()
+
+
+def _shared_cache():
+    """
+    取得記錄撤銷的共用快取 / Get the shared cache recording revocations
+    """
+    return caches[get_auth_cache_settings()["ALIAS"]]
+
+
+def _revocation_key(kind, value):
+    """
+    撤銷記錄的快取鍵 / Cache key of a revocation record
+    """
+    return f"{get_auth_cache_settings()['KEY_PREFIX']}:revoked-{kind}:{value}"
+
+
+def revoke_token(validated_token):
+    """
+    撤銷單一令牌直到其到期 / Revoke a single token until it expires
+
+    validated_token 為已驗證的令牌物件 / validated_token is a validated token object
+    """
+    jti = validated_token.get(api_settings.JTI_CLAIM)
+    remaining = max(int(validated_token["exp"] - time.time()), 1)
+    _shared_cache().set(_revocation_key("jti", jti), True, timeout=remaining)
+    removed = token_cache.discard(lambda entry: entry.jti == jti)
+    logger.info("Token revoked: jti=%s cached_entries=%s", jti, removed)
+
+
+def revoke_user(user_id):
+    """
+    撤銷使用者在此刻之前簽發的所有令牌 / Revoke every token issued to the user before now
+
+    記錄保留到存取令牌的最長效期 / The record is kept for the longest access token lifetime
+    """
+    lifetime = int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+    _shared_cache().set(_revocation_key("user", user_id), time.time(), timeout=lifetime)
+    removed = token_cache.discard(lambda entry: entry.user_id == user_id)
+    logger.info("User tokens revoked: user_id=%s cached_entries=%s", user_id, removed)
+
+
+def drop_cached_user(sender, instance, **kwargs):
+    """
+    使用者更新或刪除時移除其快取項目，下次請求重新載入 / Drop a user's entries when it is updated or deleted so the next request reloads it
+
+    只清除本行程的項目，其他行程最遲在 TTL 內更新 / Only this process is purged; others catch up within the TTL
+    """
+    if kwargs.get("created"):
+        return
+    token_cache.discard(lambda entry: entry.user_id == instance.pk)
+
+
+def _is_revoked(entry):
+    """
+    檢查撤銷記錄（ALIAS 為共用快取時涵蓋所有行程） / Check the revocation records (covering every process when ALIAS is a shared cache)
+    """
+    records = _shared_cache().get_many([
+        _revocation_key("jti", entry.jti),
+        _revocation_key("user", entry.user_id),
+    ])
+    if records.get(_revocation_key("jti", entry.jti)):
+        return True
+    revoked_at = records.get(_revocation_key("user", entry.user_id))
+    return revoked_at is not None and entry.issued_at <= revoked_at
+
+
+class CachedJWTAuth(JWTAuth):
+    """
+    快取已驗證令牌的 JWTAuth / JWTAuth that caches verified tokens
+
+    未命中時走原本的驗簽與使用者載入流程並記錄耗時 / A miss runs the regular verification and user load and records its cost
+    """
+
+    def _verify(self, token):
+        """
+        完整驗證令牌並建立快取項目 / Fully verify a token and build its cache entry
+        """
+        started_at = time.perf_counter()
+        validated_token = self.get_validated_token(token)
+        user = self.get_user(validated_token)
+        token_cache.record_verification(time.perf_counter() - started_at)
+
+        cache_settings = get_auth_cache_settings()
+        expires_at = validated_token["exp"]
+        if cache_settings["TTL"] is not None:
+            expires_at = min(expires_at, time.time() + cache_settings["TTL"])
+        entry = TokenCacheEntry(
+            user=user,
+            user_id=user.pk,
+            jti=validated_token.get(api_settings.JTI_CLAIM),
+            issued_at=validated_token.get("iat", 0),
+            expires_at=expires_at,
+        )
+        if _is_revoked(entry):
+            raise AuthenticationFailed(_("Token has been revoked"))
+        if cache_settings["ENABLED"]:
+            token_cache.put(_token_key(token), entry, cache_settings["MAX_ENTRIES"])
+        return entry
+
+    def _cached_entry(self, token):
+        """
+        取得快取項目，停用時不查快取 / Get the cached entry, skipping the cache when disabled
+        """
+        if not get_auth_cache_settings()["ENABLED"]:
+            return None
+        return token_cache.get(_token_key(token))
+
+    @staticmethod
+    def _authenticated(request, entry):
+        """
+        以項目中的使用者完成認證；回傳副本避免請求間共用可變物件
+        Authenticate with the entry's user; a copy keeps requests from sharing a mutable object
+        """
+        user = copy.copy(entry.user)
+        request.user = user
+        return user
+
+    def authenticate(self, request, token):
+        request.user = AnonymousUser()
+        with timed("auth"):
+            entry = self._cached_entry(token) or self._verify(token)
+        return self._authenticated(request, entry)
+
+
+class AsyncCachedJWTAuth(CachedJWTAuth, AsyncHttpBearer):
+    """
+    CachedJWTAuth 的非同步版本：命中時完全不需切換執行緒
+    Async version of CachedJWTAuth: a hit never switches threads
+    """
+
+    async def authenticate(self, request, token):
+        request.user = AnonymousUser()
+        with timed("auth"):
+            entry = self._cached_entry(token) or await sync_to_async(self._verify)(token)
+        return self._authenticated(request, entry)
@@ -0,0 +1,251 @@
+"""
+職缺批次寫入 / Bulk writes for job postings
+
+先逐筆驗證全部項目，再於單一交易中以 bulk_create/bulk_update 寫入有效項目，並回報每筆結果。
+bulk_* 不會呼叫 save() 與模型訊號，因此狀態、技能關聯、回應快取與副作用工作在此明確同步。
+Every item is validated first, then the valid ones are written with bulk_create/bulk_update
+in a single transaction and a result is reported per item. bulk_* skips save() and model
+signals, so the status, skill links, the response cache and side-effect tasks are synced
+explicitly here.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from pydantic import ValidationError
+
+from jobs.cache import deferred_invalidation, invalidate_jobs, invalidate_lists
+from jobs.models import JobPosting
+from jobs.schemas import JobPostingIn
+from jobs.skills import sync_job_skills
+from jobs.tasks import enqueue_job_side_effects
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_BULK 覆寫 / Defaults, overridable by settings.JOBS_BULK
+DEFAULT_BULK_SETTINGS = {
+    "MAX_ITEMS": 1000,  # 單次請求最多項目數 / Maximum items per request
+    "BATCH_SIZE": 500,  # 每個 SQL 批次的筆數 / Rows per SQL batch
+}
+
+# 批次更新時會寫入的欄位 / Fields written by bulk updates
+UPDATABLE_FIELDS = (
+    "title",
+    "description",
+    "location",
+    "normalized_location",
+    "geo_cell",
+    "salary_min",
+    "salary_max",
+    "posting_date",
+    "expiration_date",
+    "status",
+    "_required_skills",
+    "updated_at",
+)
+
+
+class BulkLimitExceeded(ValueError):
+    """
+    批次項目數超過上限 / The number of bulk items exceeds the limit
+    """
+
+
+def get_bulk_settings():
+    """
+    取得合併預設值後的批次設定 / Get bulk settings merged with defaults
+    """
+    return {**DEFAULT_BULK_SETTINGS, **getattr(settings, "JOBS_BULK", {})}
+
+
+def check_bulk_size(items):
+    """
+    確認批次大小未超過上限 / Ensure the batch does not exceed the size limit
+    """
+    max_items = get_bulk_settings()["MAX_ITEMS"]
+    if len(items) > max_items:
+        raise BulkLimitExceeded(f"At most {max_items} items are allowed per request")
+
+
+def _format_validation_error(error):
+    """
+    將 pydantic 錯誤轉為易讀字串列表 / Turn a pydantic error into readable strings
+    """
+    return [
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    ]
+
+
+def build_job(job_data, **extra_fields):
+    """
+    由 JobPostingIn 建立未儲存的職缺 / Build an unsaved posting from JobPostingIn
+    """
+    job = JobPosting(**job_data.model_dump(exclude={"required_skills"}), **extra_fields)
+    job.required_skills = job_data.required_skills
+    job.refresh_status()
+    job.refresh_location()
+    return job
+
+
+def _item_result(index, job_id=None, errors=None):
+    """
+    建立單筆結果 / Build a single item result
+    """
+    return {"index": index, "id": job_id, "success": not errors, "errors": errors or []}
+
+
+def _summarize(results):
+    """
+    統計成功與失敗筆數 / Count succeeded and failed items
+    """
+    succeeded = sum(1 for result in results if result["success"])
+    return {"succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+
+def _abort_valid_items(results):
+    """
+    全有或全無模式下，將有效項目標記為未寫入 / In all-or-nothing mode, mark valid items as not written
+    """
+    for result in results:
+        if result["success"]:
+            result.update(success=False, id=None, errors=["Not written because other items failed"])
+
+
+def bulk_create_jobs(items, all_or_nothing=False):
+    """
+    批次建立職缺 / Create job postings in bulk
+
+    items 為原始字典列表；all_or_nothing 為 True 時任一項目失敗則全部不寫入
+    items are raw dicts; with all_or_nothing nothing is written when any item fails
+    """
+    check_bulk_size(items)
+
+    results = []
+    pending = []
+    for index, item in enumerate(items):
+        try:
+            job_data = JobPostingIn.model_validate(item)
+        except ValidationError as error:
+            results.append(_item_result(index, errors=_format_validation_error(error)))
+            continue
+        pending.append((index, build_job(job_data)))
+        results.append(_item_result(index))
+
+    if all_or_nothing and len(pending) != len(items):
+        _abort_valid_items(results)
+        return _summarize(results)
+
+    if pending:
+        jobs = [job for _, job in pending]
+        with transaction.atomic():
+            JobPosting.objects.bulk_create(jobs, batch_size=get_bulk_settings()["BATCH_SIZE"])
+            sync_job_skills(jobs)
+            enqueue_job_side_effects(jobs)
+        for index, job in pending:
+            results[index]["id"] = job.id
+        invalidate_lists([job.id for job in jobs])
+
+    logger.info("Bulk create finished: items=%s created=%s", len(items), len(pending))
+    return _summarize(results)
+
+
+def bulk_update_jobs(items, all_or_nothing=False):
+    """
+    批次更新職缺 / Update job postings in bulk
+
+    每個項目需包含 id；與單筆更新相同，不允許更改 company_name
+    Every item needs an id; as with single updates, company_name cannot change
+    """
+    check_bulk_size(items)
+
+    requested_ids = [item.get("id") for item in items if isinstance(item, dict)]
+    existing = JobPosting.objects.in_bulk([job_id for job_id in requested_ids if isinstance(job_id, int)])
+
+    results = []
+    pending = []
+    seen_ids = set()
+    now = timezone.now()
+    for index, item in enumerate(items):
+        job_id = item.get("id") if isinstance(item, dict) else None
+        job_id = job_id if isinstance(job_id, int) else None
+        try:
+            job_data = JobPostingIn.model_validate(item)
+        except ValidationError as error:
+            results.append(_item_result(index, job_id, _format_validation_error(error)))
+            continue
+
+        job = existing.get(job_id)
+        if job_id is None:
+            errors = ["id: Field required"]
+        elif job_id in seen_ids:
+            errors = ["id: Duplicate id in request"]
+        elif job is None:
+            errors = ["Job posting not found"]
+        elif job_data.company_name != job.company_name:
+            errors = ["Company name cannot be changed"]
+        else:
+            errors = []
+        if errors:
+            results.append(_item_result(index, job_id, errors))
+            continue
+
+        seen_ids.add(job_id)
+        previous_skills = job._required_skills
+        for field_name, value in job_data.model_dump(exclude={"company_name", "required_skills"}).items():
+            setattr(job, field_name, value)
+        job.required_skills = job_data.required_skills
+        job.refresh_status()
+        job.refresh_location()
+        job.updated_at = now
+        pending.append((job, previous_skills != job._required_skills))
+        results.append(_item_result(index, job_id))
+
+    if all_or_nothing and len(pending) != len(items):
+        _abort_valid_items(results)
+        return _summarize(results)
+
+    if pending:
+        jobs = [job for job, _ in pending]
+        with transaction.atomic():
+            JobPosting.objects.bulk_update(jobs, UPDATABLE_FIELDS, batch_size=get_bulk_settings()["BATCH_SIZE"])
+            sync_job_skills([job for job, skills_changed in pending if skills_changed])
+            enqueue_job_side_effects(jobs)
+        invalidate_jobs([job.id for job in jobs])
+
+    logger.info("Bulk update finished: items=%s updated=%s", len(items), len(pending))
+    return _summarize(results)
+
+
+def bulk_delete_jobs(job_ids):
+    """
+    批次刪除職缺 / Delete job postings in bulk
+
+    每個請求項目各有一筆結果；不存在的 id 與重複的 id 會回報為失敗項目。QuerySet.delete() 逐筆觸發的
+    失效訊號被略過，提交後一次使所有刪除的職缺失效
+    Every requested item gets a result; ids that do not exist and repeated ids are reported as
+    failed items. The per-row invalidation signals of QuerySet.delete() are skipped and every
+    deleted posting is invalidated once after the commit
+    """
+    check_bulk_size(job_ids)
+
+    unique_ids = list(dict.fromkeys(job_ids))
+    with deferred_invalidation(), transaction.atomic():
+        existing_ids = set(JobPosting.objects.filter(id__in=unique_ids).values_list("id", flat=True))
+        JobPosting.objects.filter(id__in=existing_ids).delete()
+    invalidate_jobs(existing_ids)
+
+    results = []
+    seen_ids = set()
+    for index, job_id in enumerate(job_ids):
+        if job_id in seen_ids:
+            errors = ["id: Duplicate id in request"]
+        elif job_id not in existing_ids:
+            errors = ["Job posting not found"]
+        else:
+            errors = None
+        seen_ids.add(job_id)
+        results.append(_item_result(index, job_id, errors))
+    logger.info("Bulk delete finished: items=%s deleted=%s", len(job_ids), len(existing_ids))
+    return _summarize(results)
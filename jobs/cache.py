@@ -0,0 +1,432 @@
+"""
+職缺列表與詳情的回應快取 / Response cache for job list and detail endpoints
+
+使用 Django 快取框架（預設 local-memory，可透過 CACHES 與 JOBS_RESPONSE_CACHE 設定替換），
+快取已渲染的 JSON 位元組，命中時不需查詢資料庫也不需重新序列化。
+Uses the Django cache framework (local-memory by default, replaceable through CACHES and
+JOBS_RESPONSE_CACHE) and stores rendered JSON bytes, so a hit skips both the database and
+serialization.
+
+失效策略 / Invalidation:
+- 詳情以職缺 id 為鍵，寫入時精準刪除 / Detail entries are keyed by id and deleted on write
+- 列表鍵包含世代號，任何寫入都會遞增世代號使舊列表失效
+  List keys embed a generation number that every write bumps
+- 鍵包含當天日期且 TTL 不超過午夜，狀態在換日時自然更新
+  Keys embed today's date and TTLs never cross midnight, so status flips at the day boundary
+
+世代號與詳情項目存於 JOBS_RESPONSE_CACHE["ALIAS"]，因此寫入只會使同一快取中的項目失效。
+多行程部署（多個工作行程、批次寫入、cron 的 transition_job_statuses）須使用共用快取（Redis、Memcached），
+預設的 local-memory 快取下其他行程的項目最長在 TIMEOUT 內回傳舊資料，系統檢查 jobs.W002 會提出警告。
+The generation and the detail entries live in JOBS_RESPONSE_CACHE["ALIAS"], so a write only
+invalidates entries in that same cache. Multi-process deployments (several workers, bulk
+writes, transition_job_statuses from cron) need a shared cache (Redis, Memcached); with the
+default local-memory cache other processes can serve stale entries for up to TIMEOUT, which
+system check jobs.W002 warns about.
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.dispatch import Signal
+from django.http import HttpResponse
+from ninja.responses import NinjaJSONEncoder
+
+from jobs.locations import parse_near, resolve_radius
+from jobs.metrics import timed
+from jobs.negotiation import JSON_CONTENT_TYPE
+from jobs.queries import resolve_sort_field
+from jobs.skills import parse_skill_names
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_RESPONSE_CACHE 覆寫 / Defaults, overridable by settings.JOBS_RESPONSE_CACHE
+DEFAULT_CACHE_SETTINGS = {
+    "ENABLED": True,
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "KEY_PREFIX": "jobs",
+}
+
+# 回應標頭，標示快取命中與否 / Response header telling whether the cache was hit
+CACHE_STATUS_HEADER = "X-Cache"
+
+# 列表世代號的快取鍵 / Cache key of the list generation number
+LIST_GENERATION_KEY = "list-generation"
+
+# 列表失效後發送，參數為 job_ids（已知的變動職缺，None 表示未知）與新的 generation
+# Sent after lists are invalidated with job_ids (the changed postings, None when unknown) and the new generation
+lists_invalidated = Signal()
+
+# 是否在 deferred_invalidation 區塊內 / Whether a deferred_invalidation block is active
+_invalidation_deferred = ContextVar("jobs_invalidation_deferred", default=False)
+
+
+def get_cache_settings():
+    """
+    取得合併預設值後的快取設定 / Get cache settings merged with defaults
+    """
+    return {**DEFAULT_CACHE_SETTINGS, **getattr(settings, "JOBS_RESPONSE_CACHE", {})}
+
+
+def _get_cache():
+    """
+    取得設定中的快取後端 / Get the configured cache backend
+    """
+    return caches[get_cache_settings()["ALIAS"]]
+
+
+def _make_key(*parts):
+    """
+    組合帶前綴的快取鍵 / Build a prefixed cache key
+    """
+    return ":".join([get_cache_settings()["KEY_PREFIX"], *map(str, parts)])
+
+
+class CacheStats:
+    """
+    執行緒安全的命中/未命中計數器 / Thread-safe hit/miss counters
+
+    以端點名稱分組，供監控與除錯使用 / Grouped by endpoint name for monitoring and debugging
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, endpoint, outcome):
+        """
+        記錄一次命中或未命中 / Record one hit or miss
+        """
+        with self._lock:
+            endpoint_counts = self._counts.setdefault(endpoint, {"hit": 0, "miss": 0})
+            endpoint_counts[outcome] += 1
+
+    def snapshot(self):
+        """
+        回傳目前計數的副本 / Return a copy of the current counts
+        """
+        with self._lock:
+            return {endpoint: dict(counts) for endpoint, counts in self._counts.items()}
+
+    def reset(self):
+        """
+        清除所有計數 / Clear all counts
+        """
+        with self._lock:
+            self._counts.clear()
+
+
+# 全域快取統計 / Global cache statistics
+cache_stats = CacheStats()
+
+
+def seconds_until_midnight(now=None):
+    """
+    計算距離下一個午夜的秒數 / Seconds left until the next midnight
+    """
+    now = now or datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return max(int((next_midnight - now).total_seconds()), 1)
+
+
+def _effective_timeout(now=None):
+    """
+    TTL 取設定值與距午夜秒數的較小者 / TTL is the smaller of the setting and the time to midnight
+    """
+    return min(get_cache_settings()["TIMEOUT"], seconds_until_midnight(now))
+
+
+def normalize_filters(filters):
+    """
+    將過濾參數正規化為穩定的字典 / Normalize filter params into a stable dict
+
+    語意相同的查詢（大小寫、空白、技能順序、非法排序欄位）會得到相同的鍵
+    Queries with the same meaning (case, whitespace, skill order, invalid sort fields) map
+    to the same key
+    """
+    def _text(value):
+        return " ".join(value.split()).lower() if value else None
+
+    sort_by = filters.sort_by if filters.sort_by == "relevance" and filters.search else resolve_sort_field(filters)
+    return {
+        "search": _text(filters.search),
+        "status": filters.status.value if filters.status else None,
+        "location": _text(filters.location),
+        "company": _text(filters.company),
+        "skill": sorted(parse_skill_names(filters.skill)),
+        "skill_match": filters.skill_match.value,
+        "salary_min": filters.salary_min,
+        "salary_max": filters.salary_max,
+        "salary_match": filters.salary_match.value,
+        "near": ",".join(map(str, parse_near(filters.near))) if filters.near else None,
+        "radius_km": float(resolve_radius(filters.radius_km)) if filters.near else None,
+        "sort_by": sort_by,
+        "sort_desc": filters.sort_desc,
+        "limit": filters.limit,
+        "offset": filters.offset,
+    }
+
+
+def _get_list_generation(cache):
+    """
+    取得列表世代號，不存在時以目前時間初始化 / Get the list generation, initialized from the clock when missing
+
+    以時間初始化可避免世代號被逐出後重新從 1 開始而命中舊資料
+    Initializing from the clock keeps an evicted counter from restarting at 1 and reviving stale entries
+    """
+    generation_key = _make_key(LIST_GENERATION_KEY)
+    generation = cache.get(generation_key)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(generation_key, generation, timeout=None)
+        generation = cache.get(generation_key, generation)
+    return generation
+
+
+async def _aget_list_generation(cache):
+    """
+    _get_list_generation 的非同步版本 / Async version of _get_list_generation
+    """
+    generation_key = _make_key(LIST_GENERATION_KEY)
+    generation = await cache.aget(generation_key)
+    if generation is None:
+        generation = time.time_ns()
+        await cache.aadd(generation_key, generation, timeout=None)
+        generation = await cache.aget(generation_key, generation)
+    return generation
+
+
+def _list_key(generation, params, today, kind="list"):
+    """
+    由世代號與正規化參數組合列表鍵 / Combine the generation and normalized params into a list key
+    """
+    today = today or date.today()
+    normalized = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return _make_key(kind, generation, today.isoformat(), digest)
+
+
+def list_generation():
+    """
+    目前的列表世代號 / Current list generation
+    """
+    return _get_list_generation(_get_cache())
+
+
+async def alist_generation():
+    """
+    list_generation 的非同步版本 / Async version of list_generation
+    """
+    return await _aget_list_generation(_get_cache())
+
+
+def list_params(filters, variant=None):
+    """
+    列表鍵的參數：正規化過濾參數與表示法變體 / Params of a list key: normalized filters and the representation variant
+    """
+    params = normalize_filters(filters)
+    if variant is not None:
+        params["variant"] = variant
+    return params
+
+
+def list_cache_key(filters, today=None, variant=None):
+    """
+    產生列表回應的快取鍵；variant 為非預設表示法（稀疏欄位、編碼） / Build the cache key of a list response; variant describes a non-default representation (sparse fields, encoding)
+    """
+    return _list_key(_get_list_generation(_get_cache()), list_params(filters, variant), today)
+
+
+async def alist_cache_key(filters, today=None, variant=None):
+    """
+    list_cache_key 的非同步版本 / Async version of list_cache_key
+    """
+    return _list_key(await _aget_list_generation(_get_cache()), list_params(filters, variant), today)
+
+
+def aggregate_cache_key(kind, filters, today=None, **params):
+    """
+    產生彙總回應（分面、薪資分布）的快取鍵，與列表共用世代號
+    Build the cache key of an aggregate response (facets, salary histogram), sharing the list generation
+
+    排序與分頁參數不影響彙總，不納入鍵；params 為端點專屬參數
+    Sort and pagination params do not affect aggregates and stay out of the key; params are endpoint-specific
+    """
+    normalized = normalize_filters(filters)
+    for name in ("sort_by", "sort_desc", "limit", "offset"):
+        normalized.pop(name)
+    normalized.update(params)
+    return _list_key(_get_list_generation(_get_cache()), normalized, today, kind=kind)
+
+
+def detail_cache_key(job_id, today=None):
+    """
+    產生詳情回應的快取鍵 / Build the cache key of a detail response
+    """
+    today = today or date.today()
+    return _make_key("detail", job_id, today.isoformat())
+
+
+def _lookup_result(entry, endpoint):
+    """
+    依快取內容記錄統計並建立回應 / Record stats for cached content and build the response
+
+    項目為 (內容, 標頭)；舊格式的純位元組視為沒有額外標頭 / Entries are (content, headers); plain bytes from the old format carry no headers
+    """
+    if entry is None:
+        cache_stats.record(endpoint, "miss")
+        return None
+    cache_stats.record(endpoint, "hit")
+    content, headers = entry if isinstance(entry, tuple) else (entry, None)
+    return _content_response(content, "HIT", headers)
+
+
+def get_cached_response(cache_key, endpoint):
+    """
+    讀取快取的回應，未命中回傳 None / Read a cached response, None on a miss
+    """
+    if not get_cache_settings()["ENABLED"]:
+        return None
+    return _lookup_result(_get_cache().get(cache_key), endpoint)
+
+
+async def aget_cached_response(cache_key, endpoint):
+    """
+    get_cached_response 的非同步版本 / Async version of get_cached_response
+    """
+    if not get_cache_settings()["ENABLED"]:
+        return None
+    return _lookup_result(await _get_cache().aget(cache_key), endpoint)
+
+
+@timed("serialize")
+def _render(data):
+    """
+    將 Schema 或 Schema 列表渲染為 JSON 位元組；已渲染的位元組直接沿用
+    Render a Schema or a list of Schemas into JSON bytes; pre-rendered bytes are used as is
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, list):
+        payload = [item.model_dump() for item in data]
+    else:
+        payload = data.model_dump()
+    return json.dumps(payload, cls=NinjaJSONEncoder).encode()
+
+
+def cache_response(cache_key, data, headers=None):
+    """
+    渲染資料為 JSON、寫入快取並回傳回應 / Render data to JSON, store it and return the response
+
+    data 可為 Schema、Schema 列表或已渲染的 JSON 位元組 / data may be a Schema, a list of Schemas or rendered JSON bytes
+    headers 與內容一起快取（例如 ETag），命中時原樣附上 / headers are cached with the content (e.g. ETag) and replayed on a hit
+    """
+    content = _render(data)
+    if get_cache_settings()["ENABLED"]:
+        _get_cache().set(cache_key, (content, headers), timeout=_effective_timeout())
+    return _content_response(content, "MISS", headers)
+
+
+async def acache_response(cache_key, data, headers=None):
+    """
+    cache_response 的非同步版本 / Async version of cache_response
+    """
+    content = _render(data)
+    if get_cache_settings()["ENABLED"]:
+        await _get_cache().aset(cache_key, (content, headers), timeout=_effective_timeout())
+    return _content_response(content, "MISS", headers)
+
+
+def _content_response(content, cache_status, headers=None):
+    """
+    建立帶有快取狀態標頭的回應，預設為 JSON，headers 可覆寫 Content-Type
+    Build a response carrying the cache status header; JSON by default, headers may override Content-Type
+    """
+    response = HttpResponse(content, headers={"Content-Type": JSON_CONTENT_TYPE, **(headers or {})})
+    response[CACHE_STATUS_HEADER] = cache_status
+    return response
+
+
+def invalidate_job(job_id):
+    """
+    使單一職缺的詳情與所有列表失效 / Invalidate one posting's detail and every list
+
+    詳情直接刪除；列表以遞增世代號失效，舊項目由 TTL 自然清除
+    The detail entry is deleted; lists are invalidated by bumping the generation and old
+    entries expire through their TTL
+    """
+    cache = _get_cache()
+    cache.delete(detail_cache_key(job_id))
+    invalidate_lists([job_id])
+
+
+def invalidate_jobs(job_ids):
+    """
+    批次使多筆職缺的詳情與所有列表失效 / Invalidate the details of many postings and every list in one go
+
+    供不觸發模型訊號的批次寫入（bulk_create/bulk_update）使用
+    Used by bulk writes (bulk_create/bulk_update) that bypass model signals
+    """
+    _get_cache().delete_many([detail_cache_key(job_id) for job_id in job_ids])
+    invalidate_lists(job_ids)
+
+
+def invalidate_lists(job_ids=None):
+    """
+    遞增列表世代號使所有列表快取失效 / Bump the list generation to invalidate every cached list
+
+    job_ids 為已知的變動職缺，隨 lists_invalidated 訊號傳給增量更新的接收者（例如有效職缺快照）
+    job_ids names the changed postings when known and is passed on through the lists_invalidated
+    signal to incremental receivers such as the active snapshot
+    """
+    cache = _get_cache()
+    generation_key = _make_key(LIST_GENERATION_KEY)
+    try:
+        generation = cache.incr(generation_key)
+    except ValueError:
+        generation = time.time_ns()
+        cache.set(generation_key, generation, timeout=None)
+    logger.info("Job list cache invalidated")
+    lists_invalidated.send(sender=None, job_ids=None if job_ids is None else list(job_ids), generation=generation)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    區塊內略過逐筆的訊號失效，由呼叫端結束後一次失效 / Skip per-row signal invalidation inside the block; the caller invalidates once afterwards
+
+    供 QuerySet.delete() 等會逐筆觸發訊號的批次寫入使用，避免每筆都遞增列表世代號
+    For bulk writes such as QuerySet.delete() that fire a signal per row, so the list
+    generation is not bumped once per row
+    """
+    token = _invalidation_deferred.set(True)
+    try:
+        yield
+    finally:
+        _invalidation_deferred.reset(token)
+
+
+def invalidate_job_on_change(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    職缺儲存或刪除時的訊號處理 / Signal handler for job posting save and delete
+
+    交易中的寫入在提交後再失效一次：提交前的併發讀取仍看到舊資料列，可能以新世代號寫入快取；
+    deferred_invalidation 區塊內不做任何事
+    Writes inside a transaction invalidate again after commit: a concurrent read before the
+    commit still sees the old row and may cache it under the new generation. Does nothing
+    inside a deferred_invalidation block
+    """
+    if _invalidation_deferred.get():
+        return
+    job_id = instance.pk
+    invalidate_job(job_id)
+    if connections[using].in_atomic_block:
+        transaction.on_commit(lambda: invalidate_job(job_id), using=using)
@@ -0,0 +1,77 @@
+"""
+跨行程狀態所需快取的系統檢查 / System checks for the caches holding cross-process state
+
+local-memory 等行程內快取只在寫入的行程可見；多行程部署（多個 WSGI/ASGI 工作行程、cron 命令）中，
+記錄在其中的狀態不會傳到其他行程。單一行程部署（例如開發伺服器）可以 SILENCED_SYSTEM_CHECKS 略過這些警告。
+A process-local cache such as local-memory is only visible to the process that wrote it, so in
+multi-process deployments (several WSGI/ASGI workers, cron commands) state recorded there never
+reaches the other processes. Single-process deployments (e.g. the development server) may
+silence these warnings through SILENCED_SYSTEM_CHECKS.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+# 只在本行程可見的快取後端 / Cache backends visible to the current process only
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# 共用快取的建議 / Hint pointing at a shared cache
+SHARED_CACHE_HINT = "Point it at a shared cache (e.g. Redis or Memcached) when running more than one process."
+
+
+def is_process_local_cache(alias):
+    """
+    CACHES 別名是否為行程內快取 / Whether a CACHES alias is process-local
+    """
+    return settings.CACHES.get(alias, {}).get("BACKEND") in PROCESS_LOCAL_CACHE_BACKENDS
+
+
+@register(Tags.caches)
+def check_auth_cache(app_configs=None, **kwargs):
+    """
+    令牌撤銷記錄於行程內快取時發出警告 / Warn when token revocations are recorded in a process-local cache
+
+    撤銷記錄不論令牌快取是否啟用都會檢查；其他行程看不到撤銷，撤銷的令牌在整個令牌效期內仍被接受
+    Revocation records are checked whether or not the token cache is enabled; other processes
+    never see the revocation, so a revoked token stays accepted for its whole lifetime
+    """
+    from jobs.auth import get_auth_cache_settings
+
+    auth_settings = get_auth_cache_settings()
+    if not is_process_local_cache(auth_settings["ALIAS"]):
+        return []
+    return [Warning(
+        f"JOBS_AUTH_CACHE['ALIAS'] ({auth_settings['ALIAS']!r}) is a process-local cache, so token revocations "
+        "only reach the process that handled them.",
+        hint=SHARED_CACHE_HINT,
+        id="jobs.W001",
+    )]
+
+
+@register(Tags.caches)
+def check_response_cache(app_configs=None, **kwargs):
+    """
+    列表世代號記錄於行程內快取時發出警告 / Warn when the list generation lives in a process-local cache
+
+    其他行程、批次寫入與 cron 的 transition_job_statuses 遞增的世代號傳不到其他工作行程，
+    其列表與詳情快取及有效職缺快照最長在 TIMEOUT 內回傳舊資料
+    A generation bumped by another process, a bulk write or transition_job_statuses from cron
+    never reaches the other workers, whose cached lists, details and active snapshot can be
+    stale for up to TIMEOUT
+    """
+    from jobs.cache import get_cache_settings
+    from jobs.snapshot import get_snapshot_settings
+
+    cache_settings = get_cache_settings()
+    if not (cache_settings["ENABLED"] or get_snapshot_settings()["ENABLED"]):
+        return []
+    if not is_process_local_cache(cache_settings["ALIAS"]):
+        return []
+    return [Warning(
+        f"JOBS_RESPONSE_CACHE['ALIAS'] ({cache_settings['ALIAS']!r}) is a process-local cache, so writes in one "
+        "process do not invalidate the cached responses and active snapshot of other processes.",
+        hint=SHARED_CACHE_HINT,
+        id="jobs.W002",
+    )]
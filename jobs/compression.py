@@ -0,0 +1,210 @@
+"""
+回應壓縮 / Response compression
+
+CompressionMiddleware 依 Accept-Encoding 以 brotli（需安裝 brotli）或 gzip 壓縮超過門檻的回應，
+串流回應（匯出）逐塊壓縮。壓縮耗時計入 Server-Timing 的 compress 階段。
+CompressionMiddleware compresses responses above a size threshold with brotli (requires the
+brotli package) or gzip according to Accept-Encoding; streaming responses (exports) are
+compressed chunk by chunk. Compression time is reported as the compress phase of Server-Timing.
+
+ETag：壓縮後的表示法位元組不同，因此在強 ETag 內加上編碼後綴（"abc" -> "abc-gzip"），
+並在請求進入時從 If-None-Match / If-Match 移除後綴，讓條件式請求與樂觀鎖照常運作。
+ETags: a compressed representation has different bytes, so an encoding suffix is added inside
+the strong ETag ("abc" -> "abc-gzip") and stripped from If-None-Match / If-Match on the way in,
+so conditional requests and optimistic locking keep working.
+"""
+import gzip
+import re
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+from jobs.metrics import timed
+
+try:
+    import brotli
+except ImportError:  # 選用相依套件 / Optional dependency
+    brotli = None
+
+# 預設設定，可由 settings.JOBS_COMPRESSION 覆寫 / Defaults, overridable by settings.JOBS_COMPRESSION
+DEFAULT_COMPRESSION_SETTINGS = {
+    "ENABLED": True,
+    "MIN_SIZE": 1024,  # 小於此位元組數不壓縮 / Responses smaller than this many bytes stay uncompressed
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 5,  # 0-11，越高越小但越慢 / 0-11; higher is smaller but slower
+}
+
+# 帶有 ETag 的條件式請求標頭 / Conditional request headers carrying ETags
+ETAG_REQUEST_HEADERS = ("HTTP_IF_NONE_MATCH", "HTTP_IF_MATCH")
+
+# ETag 內的編碼後綴 / Encoding suffix inside ETags
+_ETAG_SUFFIX = re.compile(r'-(br|gzip)"')
+
+
+def get_compression_settings():
+    """
+    取得合併預設值後的壓縮設定 / Get compression settings merged with defaults
+    """
+    return {**DEFAULT_COMPRESSION_SETTINGS, **getattr(settings, "JOBS_COMPRESSION", {})}
+
+
+def supported_encodings():
+    """
+    依偏好排序的可用編碼 / Available encodings, most preferred first
+    """
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding):
+    """
+    依 Accept-Encoding 的 q 值選擇編碼，同分時依伺服器偏好；不接受壓縮時回傳 None
+    Choose an encoding by the q-values of Accept-Encoding, breaking ties by server preference;
+    None when no compression is acceptable
+    """
+    qualities = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if name:
+            qualities[name.strip().lower()] = quality
+
+    candidates = [
+        (qualities.get(encoding, qualities.get("*", 0.0)), -rank, encoding)
+        for rank, encoding in enumerate(supported_encodings())
+    ]
+    quality, _, encoding = max(candidates)
+    return encoding if quality > 0 else None
+
+
+def compress(content, encoding, compression_settings):
+    """
+    壓縮整段內容 / Compress a whole body
+    """
+    if encoding == "br":
+        return brotli.compress(content, quality=compression_settings["BROTLI_QUALITY"])
+    return gzip.compress(content, compresslevel=compression_settings["GZIP_LEVEL"], mtime=0)
+
+
+def compress_stream(chunks, encoding, compression_settings):
+    """
+    逐塊壓縮串流內容，每塊都會 flush 以維持串流 / Compress streamed chunks, flushing each one to keep streaming
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=compression_settings["BROTLI_QUALITY"])
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    # wbits=31 產生 gzip 標頭與結尾 / wbits=31 writes the gzip header and trailer
+    compressor = zlib.compressobj(compression_settings["GZIP_LEVEL"], zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def strip_etag_suffix(request):
+    """
+    從條件式請求標頭移除編碼後綴，回傳移除的編碼 / Strip encoding suffixes from conditional headers and return the stripped encoding
+    """
+    stripped = None
+    for header in ETAG_REQUEST_HEADERS:
+        value = request.META.get(header)
+        if not value:
+            continue
+        match = _ETAG_SUFFIX.search(value)
+        if match:
+            stripped = match.group(1)
+            request.META[header] = _ETAG_SUFFIX.sub('"', value)
+    return stripped
+
+
+def _suffix_etag(response, encoding):
+    """
+    在強 ETag 內加上編碼後綴；弱 ETag 不變 / Add the encoding suffix inside a strong ETag; weak ETags stay as they are
+    """
+    etag = response.get("ETag")
+    if etag and etag.startswith('"') and etag.endswith('"'):
+        response["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware:
+    """
+    依 Accept-Encoding 壓縮回應 / Compress responses according to Accept-Encoding
+
+    同時支援 WSGI 與 ASGI；非同步串流回應不壓縮 / Supports both WSGI and ASGI; async streaming responses stay uncompressed
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not get_compression_settings()["ENABLED"]:
+            return self.get_response(request)
+        etag_encoding = strip_etag_suffix(request)
+        return self._process(request, self.get_response(request), etag_encoding)
+
+    async def __acall__(self, request):
+        if not get_compression_settings()["ENABLED"]:
+            return await self.get_response(request)
+        etag_encoding = strip_etag_suffix(request)
+        return self._process(request, await self.get_response(request), etag_encoding)
+
+    @staticmethod
+    def _process(request, response, etag_encoding):
+        """
+        壓縮回應並調整標頭 / Compress the response and adjust its headers
+        """
+        # 304 沿用用戶端快取的表示法，ETag 需帶回相同後綴 / A 304 refers to the client's cached representation, so its ETag keeps the same suffix
+        if response.status_code == 304:
+            if etag_encoding:
+                _suffix_etag(response, etag_encoding)
+            return response
+        if response.has_header("Content-Encoding"):
+            return response
+
+        compression_settings = get_compression_settings()
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < compression_settings["MIN_SIZE"]:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content, encoding, compression_settings)
+            del response["Content-Length"]
+        else:
+            with timed("compress"):
+                compressed = compress(response.content, encoding, compression_settings)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        _suffix_etag(response, encoding)
+        response["Content-Encoding"] = encoding
+        return response
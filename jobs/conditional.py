@@ -0,0 +1,206 @@
+"""
+職缺列表與詳情的條件式請求 / Conditional requests for job list and detail endpoints
+
+以 updated_at 產生強 ETag 與 Last-Modified，讓用戶端以 If-None-Match / If-Modified-Since
+重新驗證，未變更時回傳 304 且不需序列化；PUT 以 If-Match 做樂觀鎖，不符時回傳 412。
+Derives strong ETags and Last-Modified from updated_at so clients can revalidate with
+If-None-Match / If-Modified-Since and get a 304 without any serialization; PUT honours
+If-Match for optimistic concurrency and answers 412 on a mismatch.
+
+驗證值 / Validators:
+- 詳情：職缺 id 與 updated_at / Detail: the posting id and updated_at
+- 列表：過濾結果的 MAX(updated_at) 與 COUNT，加上正規化參數；以單一彙總查詢取得
+  List: MAX(updated_at) and COUNT of the filtered rows plus the normalized params, fetched
+  with one aggregate query
+- 兩者都包含當天日期，因為狀態在換日時改變但不會更新 updated_at
+  Both embed today's date, since status flips at midnight without touching updated_at
+
+只有經由 ORM 或批次端點的寫入會更新 updated_at；直接以 SQL 修改資料列不會改變驗證值
+Only writes through the ORM or the bulk endpoints bump updated_at; rows changed with raw SQL
+keep their validators
+"""
+import hashlib
+import json
+from datetime import date, datetime, time
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from jobs.cache import list_params
+from jobs.models import JobPosting
+from jobs.queries import filter_job_postings
+
+# 預設設定，可由 settings.JOBS_CONDITIONAL 覆寫 / Defaults, overridable by settings.JOBS_CONDITIONAL
+DEFAULT_CONDITIONAL_SETTINGS = {
+    "ENABLED": True,
+}
+
+# 回應表示法版本，輸出格式改變時遞增使舊 ETag 失效 / Representation version; bump it when the output format changes to retire old ETags
+REPRESENTATION_VERSION = 1
+
+# 條件式請求標頭 / Conditional request headers
+PRECONDITION_HEADERS = (
+    "HTTP_IF_MATCH",
+    "HTTP_IF_NONE_MATCH",
+    "HTTP_IF_MODIFIED_SINCE",
+    "HTTP_IF_UNMODIFIED_SINCE",
+)
+
+
+def get_conditional_settings():
+    """
+    取得合併預設值後的條件式請求設定 / Get conditional request settings merged with defaults
+    """
+    return {**DEFAULT_CONDITIONAL_SETTINGS, **getattr(settings, "JOBS_CONDITIONAL", {})}
+
+
+class Validators(NamedTuple):
+    """
+    回應的驗證值 / Validators of a response
+    """
+    etag: str
+    last_modified: datetime
+
+
+def _start_of_day(today):
+    """
+    當天午夜（依 USE_TZ 決定是否帶時區） / Today's midnight, timezone-aware when USE_TZ is on
+    """
+    midnight = datetime.combine(today, time.min)
+    return timezone.make_aware(midnight) if settings.USE_TZ else midnight
+
+
+def _make_validators(parts, last_updated, today):
+    """
+    由組成部分計算強 ETag；Last-Modified 不早於當天午夜，因為狀態在換日時改變
+    Compute a strong ETag from its parts; Last-Modified is never before today's midnight
+    because status flips at the day boundary
+    """
+    today = today or date.today()
+    payload = json.dumps([REPRESENTATION_VERSION, today.isoformat(), *parts], default=str, separators=(",", ":"))
+    etag = '"%s"' % hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    start_of_day = _start_of_day(today)
+    last_modified = max(last_updated, start_of_day) if last_updated else start_of_day
+    return Validators(etag, last_modified)
+
+
+def detail_validators(job_id, updated_at, today=None, variant=None):
+    """
+    詳情回應的驗證值；variant 為非預設表示法 / Validators of a detail response; variant describes a non-default representation
+    """
+    return _make_validators(("detail", job_id, updated_at, variant), updated_at, today)
+
+
+def list_validators(params, last_updated, count, today=None):
+    """
+    列表回應的驗證值；params 為正規化的過濾與分頁參數
+    Validators of a list response; params are the normalized filter and pagination params
+    """
+    return _make_validators(("list", params, last_updated, count), last_updated, today)
+
+
+def job_validators(job, today=None, variant=None):
+    """
+    已載入職缺的驗證值，停用時回傳 None / Validators of a loaded posting, None when disabled
+    """
+    if not get_conditional_settings()["ENABLED"]:
+        return None
+    return detail_validators(job.pk, job.updated_at, today, variant)
+
+
+def _list_aggregate(filters):
+    """
+    過濾結果的 MAX(updated_at) 與 COUNT 查詢 / Query set for MAX(updated_at) and COUNT of the filtered rows
+    """
+    return filter_job_postings(filters).order_by(), {"last_updated": Max("updated_at"), "count": Count("id")}
+
+
+def fetch_list_validators(filters, today=None, variant=None):
+    """
+    以單一彙總查詢取得列表驗證值，停用時回傳 None / Fetch list validators with a single aggregate query, None when disabled
+    """
+    if not get_conditional_settings()["ENABLED"]:
+        return None
+    queryset, aggregates = _list_aggregate(filters)
+    result = queryset.aggregate(**aggregates)
+    return list_validators(list_params(filters, variant), result["last_updated"], result["count"], today)
+
+
+async def afetch_list_validators(filters, today=None, variant=None):
+    """
+    fetch_list_validators 的非同步版本 / Async version of fetch_list_validators
+    """
+    if not get_conditional_settings()["ENABLED"]:
+        return None
+    queryset, aggregates = _list_aggregate(filters)
+    result = await queryset.aaggregate(**aggregates)
+    return list_validators(list_params(filters, variant), result["last_updated"], result["count"], today)
+
+
+def fetch_detail_validators(job_id, today=None, variant=None) -> Optional[Validators]:
+    """
+    只讀取 updated_at 取得詳情驗證值，職缺不存在時回傳 None
+    Fetch detail validators by reading updated_at only; None when the posting does not exist
+    """
+    updated_at = JobPosting.objects.filter(id=job_id).values_list("updated_at", flat=True).first()
+    return None if updated_at is None else detail_validators(job_id, updated_at, today, variant)
+
+
+async def afetch_detail_validators(job_id, today=None, variant=None) -> Optional[Validators]:
+    """
+    fetch_detail_validators 的非同步版本 / Async version of fetch_detail_validators
+    """
+    updated_at = await JobPosting.objects.filter(id=job_id).values_list("updated_at", flat=True).afirst()
+    return None if updated_at is None else detail_validators(job_id, updated_at, today, variant)
+
+
+def has_preconditions(request):
+    """
+    請求是否帶有條件式標頭 / Whether the request carries conditional headers
+    """
+    return get_conditional_settings()["ENABLED"] and any(header in request.META for header in PRECONDITION_HEADERS)
+
+
+def validator_headers(validators):
+    """
+    驗證值對應的回應標頭 / Response headers carrying the validators
+    """
+    if validators is None:
+        return {}
+    return {"ETag": validators.etag, "Last-Modified": http_date(validators.last_modified.timestamp())}
+
+
+def precondition_response(request, validators):
+    """
+    依 RFC 9110 評估條件式標頭，條件成立時回傳 None，否則回傳 304 或 412
+    Evaluate the conditional headers per RFC 9110; None when the request should proceed,
+    otherwise a 304 or 412 response
+    """
+    if validators is None or not has_preconditions(request):
+        return None
+    response = HttpResponse(headers=validator_headers(validators))
+    result = get_conditional_response(
+        request, etag=validators.etag, last_modified=int(validators.last_modified.timestamp()), response=response,
+    )
+    return None if result is response else result
+
+
+def revalidate_cached_response(request, response):
+    """
+    以快取回應上的 ETag 與 Last-Modified 評估條件式標頭（不查詢資料庫），回傳 304/412 或原回應
+    Evaluate the conditional headers against the ETag and Last-Modified of a cached response
+    (without touching the database) and return a 304/412 or the response itself
+    """
+    if not has_preconditions(request) or not response.has_header("ETag"):
+        return response
+    return get_conditional_response(
+        request,
+        etag=response["ETag"],
+        last_modified=parse_http_date_safe(response.get("Last-Modified", "")),
+        response=response,
+    )
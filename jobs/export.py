@@ -0,0 +1,118 @@
+"""
+職缺串流匯出 / Streaming export of job postings
+
+以 values_list().iterator(chunk_size=...) 逐批讀取並逐行輸出 NDJSON 或 CSV，
+記憶體用量只與批次大小有關，與資料表大小無關。
+Reads rows in chunks with values_list().iterator(chunk_size=...) and emits NDJSON or CSV
+line by line, so memory use depends on the chunk size rather than the table size.
+"""
+import csv
+import json
+from enum import Enum
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+# 預設設定，可由 settings.JOBS_EXPORT 覆寫 / Defaults, overridable by settings.JOBS_EXPORT
+DEFAULT_EXPORT_SETTINGS = {
+    "CHUNK_SIZE": 2000,  # 每次從資料庫讀取的筆數 / Rows fetched from the database per chunk
+}
+
+# 匯出欄位（與 JobPostingOut 相同） / Exported fields (same as JobPostingOut)
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "location",
+    "salary_min",
+    "salary_max",
+    "company_name",
+    "posting_date",
+    "expiration_date",
+    "required_skills",
+    "created_at",
+    "updated_at",
+)
+
+# 對應的資料庫欄位名稱 / Matching model field names
+_MODEL_FIELDS = tuple("_required_skills" if field == "required_skills" else field for field in EXPORT_FIELDS)
+
+
+class ExportFormat(str, Enum):
+    """
+    匯出格式 / Export format
+    """
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+# 各格式的 Content-Type / Content-Type per format
+CONTENT_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+def get_export_settings():
+    """
+    取得合併預設值後的匯出設定 / Get export settings merged with defaults
+    """
+    return {**DEFAULT_EXPORT_SETTINGS, **getattr(settings, "JOBS_EXPORT", {})}
+
+
+def _iter_records(queryset):
+    """
+    逐筆產生匯出用的字典 / Yield export dicts one row at a time
+
+    技能 JSON 每列只解析一次 / The skills JSON is decoded once per row
+    """
+    rows = queryset.values_list(*_MODEL_FIELDS).iterator(chunk_size=get_export_settings()["CHUNK_SIZE"])
+    for row in rows:
+        record = dict(zip(EXPORT_FIELDS, row))
+        record["required_skills"] = json.loads(record["required_skills"])
+        yield record
+
+
+def _to_text(value):
+    """
+    將日期與時間轉為 ISO 字串 / Convert dates and datetimes to ISO strings
+    """
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def iter_ndjson(queryset):
+    """
+    逐行產生 NDJSON / Yield NDJSON lines
+    """
+    for record in _iter_records(queryset):
+        yield json.dumps(record, default=_to_text, ensure_ascii=False) + "\n"
+
+
+class _EchoBuffer:
+    """
+    讓 csv.writer 直接回傳寫入內容的假緩衝區 / Pseudo buffer letting csv.writer return what it writes
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset):
+    """
+    逐行產生 CSV，技能欄位以 JSON 陣列表示 / Yield CSV lines, with skills as a JSON array
+    """
+    writer = csv.writer(_EchoBuffer())
+    yield writer.writerow(EXPORT_FIELDS)
+    for record in _iter_records(queryset):
+        record["required_skills"] = json.dumps(record["required_skills"], ensure_ascii=False)
+        yield writer.writerow([_to_text(record[field]) for field in EXPORT_FIELDS])
+
+
+def stream_export(queryset, export_format):
+    """
+    建立串流匯出回應 / Build a streaming export response
+    """
+    lines = iter_csv(queryset) if export_format == ExportFormat.CSV else iter_ndjson(queryset)
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[export_format])
+    response["Content-Disposition"] = f'attachment; filename="jobs.{export_format.value}"'
+    return response
@@ -0,0 +1,168 @@
+"""
+職缺搜尋結果的分面計數 / Faceted counts for job search results
+
+每個分面在 SQL 以單次 GROUP BY 計算，過濾條件與列表端點相同（jobs.queries.filter_job_postings），
+只回傳筆數最多的前 N 個值。SQLite 上每個分面都有時間預算，超時的分面會被略過並列於 timed_out，
+使大資料量下的回應時間有上限。
+Each facet is a single GROUP BY in SQL over the same filters as the list endpoint
+(jobs.queries.filter_job_postings) and returns only the top N values. On SQLite every facet
+runs under a time budget; facets exceeding it are skipped and listed in timed_out, which
+bounds the response time on large tables.
+
+狀態分面以儲存的 status 欄位分組（只讀索引）；端點計數前會先補做當天的轉換（jobs.status.ensure_transitioned），
+因此跨日後轉換尚未執行時，計數仍與 ?status= 過濾的結果一致。
+The status facet groups on the stored status column (reading only its index); the endpoint
+catches up the day's transition first (jobs.status.ensure_transitioned), so the counts agree
+with ?status= filtering even when the day's transition has not run yet.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from enum import Enum
+
+from django.conf import settings
+from django.db import OperationalError, connection, connections
+from django.db.models import Count
+
+from jobs.models import JobPostingSkill, Skill
+from jobs.queries import filter_job_postings
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_FACETS 覆寫 / Defaults, overridable by settings.JOBS_FACETS
+DEFAULT_FACET_SETTINGS = {
+    "DEFAULT_TOP": 10,  # 每個分面預設回傳的值數 / Values returned per facet by default
+    "MAX_TOP": 100,  # 每個分面最多回傳的值數 / Maximum values per facet
+    "TIMEOUT_MS": 500,  # 每個分面的時間預算（僅 SQLite） / Time budget per facet (SQLite only)
+}
+
+# SQLite 每執行多少個虛擬機指令檢查一次時間 / SQLite VM instructions between time budget checks
+PROGRESS_CHECK_INTERVAL = 10_000
+
+
+class Facet(str, Enum):
+    """
+    可計數的分面 / Countable facets
+    """
+    STATUS = "status"
+    LOCATION = "location"
+    COMPANY = "company"
+    SKILL = "skill"
+
+
+# 直接以 JobPosting 欄位分組的分面 / Facets grouped directly on a JobPosting column
+FACET_FIELDS = {
+    Facet.STATUS: "status",
+    Facet.LOCATION: "location",
+    Facet.COMPANY: "company_name",
+}
+
+
+class FacetTimeout(Exception):
+    """
+    分面查詢超過時間預算 / A facet query exceeded its time budget
+    """
+
+
+def get_facet_settings():
+    """
+    取得合併預設值後的分面設定 / Get facet settings merged with defaults
+    """
+    return {**DEFAULT_FACET_SETTINGS, **getattr(settings, "JOBS_FACETS", {})}
+
+
+@contextmanager
+def time_budget(milliseconds, db_connection=None):
+    """
+    在 SQLite 上限制區塊內查詢的執行時間 / Limit the run time of queries in the block on SQLite
+
+    超時時 SQLite 中斷查詢並拋出 FacetTimeout；其他後端不做限制
+    SQLite interrupts the query when the budget runs out and FacetTimeout is raised; other
+    backends are not limited
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite" or not milliseconds:
+        yield
+        return
+
+    deadline = time.monotonic() + milliseconds / 1000
+    db_connection.ensure_connection()
+    raw_connection = db_connection.connection
+    raw_connection.set_progress_handler(lambda: time.monotonic() > deadline, PROGRESS_CHECK_INTERVAL)
+    try:
+        yield
+    except OperationalError as error:
+        if time.monotonic() > deadline and "interrupted" in str(error):
+            raise FacetTimeout(str(error)) from error
+        raise
+    finally:
+        raw_connection.set_progress_handler(None, PROGRESS_CHECK_INTERVAL)
+
+
+def _buckets(rows, value_field):
+    """
+    將分組結果轉為 {value, count} 列表 / Convert grouped rows into {value, count} dicts
+    """
+    return [{"value": row[value_field], "count": row["count"]} for row in rows]
+
+
+def count_field(queryset, field_name, top):
+    """
+    以單一 GROUP BY 計算欄位值的筆數 / Count values of a column with one GROUP BY
+    """
+    rows = (
+        queryset.order_by()
+        .values(field_name)
+        .annotate(count=Count("id"))
+        .order_by("-count", field_name)[:top]
+    )
+    return _buckets(rows, field_name)
+
+
+def count_skills(queryset, top):
+    """
+    透過技能關聯表計算技能筆數 / Count skills through the skill link table
+
+    以 skill_id 分組（只讀關聯表索引），再以第二個查詢取得前 N 名的名稱；未過濾時略過職缺子查詢
+    Groups by skill_id (reading only the link table index), then fetches the names of the top
+    N in a second query; the posting subquery is skipped when nothing is filtered
+    """
+    links = JobPostingSkill.objects.all()
+    if queryset.query.has_filters():
+        links = links.filter(job_posting__in=queryset.order_by().values("id"))
+    rows = list(
+        links.values("skill_id")
+        .annotate(count=Count("id"))
+        .order_by("-count", "skill_id")[:top]
+    )
+    names = dict(Skill.objects.filter(id__in=[row["skill_id"] for row in rows]).values_list("id", "name"))
+    return [{"value": names[row["skill_id"]], "count": row["count"]} for row in rows]
+
+
+def compute_facets(filters, top):
+    """
+    依過濾條件計算所有分面 / Compute every facet for the given filters
+
+    排序與分頁參數會被忽略 / Sort and pagination params are ignored
+    """
+    queryset = filter_job_postings(filters)
+    timeout_ms = get_facet_settings()["TIMEOUT_MS"]
+    # 預算設於實際執行查詢的連線（可能是讀取副本） / The budget goes on the connection that runs the queries, possibly a replica
+    db_connection = connections[queryset.db]
+
+    facets = {}
+    timed_out = []
+    for facet in Facet:
+        started_at = time.perf_counter()
+        try:
+            with time_budget(timeout_ms, db_connection):
+                if facet == Facet.SKILL:
+                    facets[facet.value] = count_skills(queryset, top)
+                else:
+                    facets[facet.value] = count_field(queryset, FACET_FIELDS[facet], top)
+        except FacetTimeout:
+            timed_out.append(facet.value)
+            logger.warning("Facet timed out: facet=%s budget_ms=%s", facet.value, timeout_ms)
+            continue
+        logger.debug("Facet counted: facet=%s ms=%.1f", facet.value, (time.perf_counter() - started_at) * 1000)
+    return {"facets": facets, "timed_out": timed_out}
@@ -0,0 +1,223 @@
+"""
+職缺資料檔串流匯入 / Streaming import of job feed files
+
+逐行讀取 NDJSON 或 CSV，以 JobPostingIn 驗證後分塊 bulk_create，可依 external_id 進行 upsert。
+CSV 欄位與 /api/jobs/export 相同，required_skills 為 JSON 陣列（或逗號分隔）字串。
+Reads NDJSON or CSV line by line, validates rows with JobPostingIn and bulk_creates them in
+chunks, optionally upserting on external_id. CSV columns match /api/jobs/export, with
+required_skills as a JSON array (or comma separated) string.
+"""
+import csv
+import json
+import logging
+import time
+from pathlib import Path
+
+from django.db import IntegrityError, transaction
+from pydantic import ValidationError
+
+from jobs.bulk import build_job
+from jobs.cache import invalidate_jobs, invalidate_lists
+from jobs.export import ExportFormat
+from jobs.models import JobPosting
+from jobs.schemas import JobPostingIn
+from jobs.skills import SKILL_SEPARATOR, sync_job_skills
+
+logger = logging.getLogger(__name__)
+
+# 預設每塊寫入的筆數 / Default rows written per chunk
+DEFAULT_CHUNK_SIZE = 1000
+
+# 每個檔案最多記錄的錯誤數 / Maximum errors kept per file
+MAX_REPORTED_ERRORS = 20
+
+# upsert 使用的外部鍵欄位 / External key field used for upserts
+EXTERNAL_KEY_FIELD = "external_id"
+
+# upsert 衝突時更新的欄位 / Fields updated on upsert conflicts
+UPSERT_UPDATE_FIELDS = (
+    "title",
+    "description",
+    "location",
+    "normalized_location",
+    "geo_cell",
+    "salary_min",
+    "salary_max",
+    "company_name",
+    "posting_date",
+    "expiration_date",
+    "status",
+    "_required_skills",
+    "updated_at",
+)
+
+# 副檔名對應的格式 / Formats by file extension
+FORMAT_BY_SUFFIX = {
+    ".ndjson": ExportFormat.NDJSON,
+    ".jsonl": ExportFormat.NDJSON,
+    ".csv": ExportFormat.CSV,
+}
+
+
+def detect_format(path):
+    """
+    依副檔名判斷檔案格式 / Detect the file format from its extension
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in FORMAT_BY_SUFFIX:
+        raise ValueError(f"Cannot detect format of {path}; use --format")
+    return FORMAT_BY_SUFFIX[suffix]
+
+
+def _clean_csv_row(row):
+    """
+    將 CSV 字串轉為 JobPostingIn 可接受的值 / Convert CSV strings into values JobPostingIn accepts
+
+    空字串視為 null；技能欄位接受 JSON 陣列或逗號分隔字串
+    Empty strings become null; the skills column accepts a JSON array or a comma separated string
+    """
+    cleaned = {key: (value if value != "" else None) for key, value in row.items() if key}
+    skills = (cleaned.get("required_skills") or "").strip()
+    if skills.startswith("["):
+        cleaned["required_skills"] = json.loads(skills)
+    else:
+        cleaned["required_skills"] = [name.strip() for name in skills.split(SKILL_SEPARATOR) if name.strip()]
+    return cleaned
+
+
+def iter_rows(path, file_format):
+    """
+    逐筆產生 (行號, 原始字典) / Yield (line number, raw dict) one row at a time
+
+    無法解析的 NDJSON 行以 ValueError 物件代替字典 / Unparsable NDJSON lines yield a ValueError instead of a dict
+    """
+    with open(path, newline="", encoding="utf-8") as handle:
+        if file_format == ExportFormat.CSV:
+            reader = csv.DictReader(handle)
+            for row in reader:
+                try:
+                    yield reader.line_num, _clean_csv_row(row)
+                except ValueError as error:
+                    yield reader.line_num, error
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as error:
+                yield line_number, error
+
+
+class ImportStats:
+    """
+    單一檔案的匯入統計 / Import statistics of a single file
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.rows = 0
+        self.written = 0
+        self.failed = 0
+        self.errors = []
+        self.seconds = 0.0
+
+    def add_error(self, line_number, message):
+        """
+        記錄一筆錯誤（超過上限只計數） / Record an error (only counted beyond the limit)
+        """
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"{self.path}:{line_number}: {message}")
+
+    @property
+    def rows_per_second(self):
+        """
+        每秒處理的筆數 / Rows processed per second
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        """
+        轉為可跨行程傳遞的字典 / Convert to a dict that can cross process boundaries
+        """
+        return {
+            "path": self.path,
+            "rows": self.rows,
+            "written": self.written,
+            "failed": self.failed,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "rows_per_second": self.rows_per_second,
+        }
+
+
+def _write_chunk(jobs, upsert):
+    """
+    於單一交易寫入一塊職缺並同步技能 / Write one chunk of postings and sync skills in one transaction
+    """
+    with transaction.atomic():
+        if upsert:
+            JobPosting.objects.bulk_create(
+                jobs,
+                update_conflicts=True,
+                unique_fields=[EXTERNAL_KEY_FIELD],
+                update_fields=UPSERT_UPDATE_FIELDS,
+            )
+        else:
+            JobPosting.objects.bulk_create(jobs)
+        sync_job_skills(jobs)
+    if upsert:
+        invalidate_jobs([job.pk for job in jobs])
+
+
+def _flush(jobs, upsert, stats, line_number):
+    """
+    寫入一塊資料並更新統計；整塊違反唯一鍵時記為失敗 / Write a chunk and update stats; a chunk violating a unique key is counted as failed
+    """
+    try:
+        _write_chunk(jobs, upsert)
+    except IntegrityError as error:
+        stats.add_error(line_number, f"Chunk of {len(jobs)} rows rejected: {error}")
+        stats.failed += len(jobs) - 1
+        return
+    stats.written += len(jobs)
+
+
+def import_file(path, file_format=None, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """
+    匯入單一檔案並回傳統計 / Import a single file and return its statistics
+
+    upsert 為 True 時，具有相同 external_id 的既有職缺會被更新
+    With upsert, existing postings sharing an external_id are updated
+    """
+    file_format = file_format or detect_format(path)
+    stats = ImportStats(path)
+    started_at = time.perf_counter()
+    pending = []
+    for line_number, row in iter_rows(path, file_format):
+        stats.rows += 1
+        if isinstance(row, Exception):
+            stats.add_error(line_number, f"Invalid row: {row}")
+            continue
+        try:
+            job_data = JobPostingIn.model_validate(row)
+        except ValidationError as error:
+            stats.add_error(line_number, "; ".join(detail["msg"] for detail in error.errors()))
+            continue
+        external_id = row.get(EXTERNAL_KEY_FIELD) if isinstance(row, dict) else None
+        pending.append(build_job(job_data, external_id=str(external_id) if external_id else None))
+        if len(pending) >= chunk_size:
+            _flush(pending, upsert, stats, line_number)
+            pending = []
+    if pending:
+        _flush(pending, upsert, stats, "EOF")
+
+    if not upsert and stats.written:
+        invalidate_lists()
+    stats.seconds = time.perf_counter() - started_at
+    logger.info(
+        "Imported file: path=%s rows=%s written=%s failed=%s rows_per_second=%.0f",
+        stats.path, stats.rows, stats.written, stats.failed, stats.rows_per_second,
+    )
+    return stats
@@ -0,0 +1,410 @@
+"""
+職缺地點正規化與距離搜尋 / Job location normalization and proximity search
+
+location 仍保存使用者輸入的原始文字；儲存時以隨附的離線地名辭典（jobs/data/gazetteer.csv）解析出
+標準地點，寫入 normalized_location 與 geo_cell，讓 "Taipei"、"台北" 與 "Taipei City" 指向同一地點。
+The location column keeps the text as entered; on save it is resolved against the bundled
+offline gazetteer (jobs/data/gazetteer.csv) into a standard location stored in
+normalized_location and geo_cell, so "Taipei", "台北" and "Taipei City" point to the same place.
+
+距離過濾 near=lat,lng&radius_km= 分兩步 / The near=lat,lng&radius_km= filter works in two steps:
+- 邊界框預篩：將半徑的邊界框換算為 geo_cell（0.1° 網格）的區間，由 geo_cell 索引範圍掃描；
+  區間數超過 MAX_CELL_RANGES 或不少於半徑內的地點數時略過
+  Bounding-box prefilter: the radius' bounding box becomes ranges of geo_cell (a 0.1° grid),
+  scanned through the geo_cell index; skipped when there are more than MAX_CELL_RANGES ranges
+  or no fewer ranges than locations within the radius
+- 精確比對：職缺座標即其標準地點的座標，因此在記憶體中對地名辭典計算一次大圓距離，
+  再以 normalized_location_id 過濾，不需逐列計算三角函數
+  Exact check: a posting's coordinates are those of its standard location, so great-circle
+  distances are computed once per gazetteer entry in memory and applied as a
+  normalized_location_id filter instead of per-row trigonometry
+
+Location 資料表是地名辭典的副本（id 為辭典中的穩定編號），由遷移與 load_gazetteer 指令載入。
+The Location table mirrors the gazetteer (ids are the gazetteer's stable ids) and is loaded by
+the migration and the load_gazetteer command.
+"""
+import csv
+import logging
+import math
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from functools import lru_cache, reduce
+from operator import attrgetter, or_
+from pathlib import Path
+
+from django.conf import settings
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_GEO 覆寫 / Defaults, overridable by settings.JOBS_GEO
+DEFAULT_GEO_SETTINGS = {
+    "GAZETTEER": Path(__file__).resolve().parent / "data" / "gazetteer.csv",  # 地名辭典 CSV / Gazetteer CSV file
+    "DEFAULT_RADIUS_KM": 25,  # 只給 near 時的搜尋半徑 / Radius used when only near is given
+    "MAX_RADIUS_KM": 500,  # 搜尋半徑上限 / Largest allowed radius
+    "MAX_CELL_RANGES": 16,  # geo_cell 預篩最多的區間數，超過時只以地點 id 過濾 / Most geo_cell ranges in the prefilter; above it only location ids filter
+}
+
+# 地球平均半徑（公里） / Mean earth radius in kilometres
+EARTH_RADIUS_KM = 6371.0088
+
+# geo_cell 網格大小（度）；變更後需執行 load_gazetteer 重新計算 / Grid size of geo_cell in degrees; run load_gazetteer after changing it
+GEO_CELL_DEGREES = 0.1
+LATITUDE_CELLS = round(180 / GEO_CELL_DEGREES)
+LONGITUDE_CELLS = round(360 / GEO_CELL_DEGREES)
+
+# 地點文字中分隔多個部分的符號，例如 "Taipei, Taiwan" 或 "Remote / Taipei"
+# Separators between parts of a location text, e.g. "Taipei, Taiwan" or "Remote / Taipei"
+_PART_SEPARATORS = re.compile(r"[,，、/|;；()（）]")
+
+# 正規化時視為空白的標點 / Punctuation treated as whitespace when normalizing
+_PUNCTUATION = re.compile(r"[.\-_'’]")
+
+# 可省略的行政區後綴 / Administrative suffixes that may be dropped
+_SUFFIXES = (" city", " county", "市", "縣")
+
+# 異體字對照 / Variant character mapping
+_VARIANTS = str.maketrans({"臺": "台"})
+
+# 地名辭典的一筆地點 / One place in the gazetteer
+GazetteerEntry = namedtuple("GazetteerEntry", "id name country_code latitude longitude aliases")
+
+
+def get_geo_settings():
+    """
+    取得合併預設值後的地點設定 / Get location settings merged with defaults
+    """
+    return {**DEFAULT_GEO_SETTINGS, **getattr(settings, "JOBS_GEO", {})}
+
+
+def normalize_location_name(name):
+    """
+    正規化地點名稱：全半形統一、轉小寫、異體字與標點統一、合併空白 / Normalize a location name: NFKC, lowercase, unify variants and punctuation, collapse whitespace
+
+    例 / e.g. "  臺北市 " -> "台北市", "Taipei-City" -> "taipei city"
+    """
+    text = unicodedata.normalize("NFKC", str(name)).casefold().translate(_VARIANTS)
+    return " ".join(_PUNCTUATION.sub(" ", text).split())
+
+
+def _candidate_keys(text):
+    """
+    依序產生可嘗試的正規化鍵：完整文字、去除後綴，再逐一嘗試各部分 / Yield normalized keys to try: the full text, without suffix, then each part in turn
+    """
+    parts = [text, *_PART_SEPARATORS.split(text)] if _PART_SEPARATORS.search(text) else [text]
+    for part in parts:
+        key = normalize_location_name(part)
+        if not key:
+            continue
+        yield key
+        for suffix in _SUFFIXES:
+            if key.endswith(suffix) and len(key) > len(suffix):
+                yield key[:-len(suffix)].rstrip()
+
+
+class Gazetteer:
+    """
+    記憶體中的地名辭典：別名索引與依緯度排序的座標 / In-memory gazetteer: alias index and coordinates sorted by latitude
+    """
+
+    def __init__(self, entries):
+        self.entries = {entry.id: entry for entry in entries}
+        self._aliases = {}
+        for entry in entries:
+            for alias in (entry.name, *entry.aliases):
+                self._aliases.setdefault(normalize_location_name(alias), entry)
+        self._by_latitude = sorted(entries, key=attrgetter("latitude"))
+        self._latitudes = [entry.latitude for entry in self._by_latitude]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def resolve(self, text):
+        """
+        將地點文字解析為地名辭典項目，無法辨識時回傳 None / Resolve a location text into a gazetteer entry, or None when unknown
+        """
+        if not text:
+            return None
+        for key in _candidate_keys(text):
+            entry = self._aliases.get(key)
+            if entry is not None:
+                return entry
+        return None
+
+    def within(self, latitude, longitude, radius_km):
+        """
+        半徑內的項目 {id: 距離公里}；先以緯度二分搜尋邊界框再計算大圓距離
+        Entries within the radius as {id: distance in km}; bisects the bounding box by latitude before computing great-circle distances
+        """
+        min_latitude, max_latitude, longitude_ranges = bounding_box(latitude, longitude, radius_km)
+        start = bisect_left(self._latitudes, min_latitude)
+        stop = bisect_right(self._latitudes, max_latitude)
+        nearby = {}
+        for entry in self._by_latitude[start:stop]:
+            if not any(low <= entry.longitude <= high for low, high in longitude_ranges):
+                continue
+            distance = haversine_km(latitude, longitude, entry.latitude, entry.longitude)
+            if distance <= radius_km:
+                nearby[entry.id] = distance
+        return nearby
+
+
+def read_gazetteer(path):
+    """
+    讀取地名辭典 CSV（id,name,country_code,latitude,longitude,aliases；別名以 | 分隔）
+    Read a gazetteer CSV (id,name,country_code,latitude,longitude,aliases; aliases separated by |)
+    """
+    entries = []
+    with open(path, newline="", encoding="utf-8") as handle:
+        for line_number, row in enumerate(csv.DictReader(handle), start=2):
+            try:
+                entry = GazetteerEntry(
+                    id=int(row["id"]),
+                    name=row["name"].strip(),
+                    country_code=row["country_code"].strip().upper(),
+                    latitude=float(row["latitude"]),
+                    longitude=float(row["longitude"]),
+                    aliases=tuple(alias.strip() for alias in (row["aliases"] or "").split("|") if alias.strip()),
+                )
+            except (KeyError, TypeError, ValueError) as error:
+                raise ValueError(f"{path}:{line_number}: invalid gazetteer row: {error}") from error
+            if not (-90 <= entry.latitude <= 90 and -180 <= entry.longitude <= 180):
+                raise ValueError(f"{path}:{line_number}: coordinates out of range")
+            entries.append(entry)
+    return entries
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path):
+    gazetteer = Gazetteer(read_gazetteer(path))
+    logger.info("Gazetteer loaded: path=%s entries=%s", path, len(gazetteer))
+    return gazetteer
+
+
+def get_gazetteer():
+    """
+    取得目前設定的地名辭典（每個行程載入一次） / Get the configured gazetteer (loaded once per process)
+    """
+    return _load_gazetteer(str(get_geo_settings()["GAZETTEER"]))
+
+
+def resolve_location(text):
+    """
+    將地點文字解析為地名辭典項目 / Resolve a location text into a gazetteer entry
+    """
+    return get_gazetteer().resolve(text)
+
+
+def haversine_km(latitude, longitude, other_latitude, other_longitude):
+    """
+    兩點間的大圓距離（公里） / Great-circle distance between two points in kilometres
+    """
+    phi, other_phi = math.radians(latitude), math.radians(other_latitude)
+    half_chord = (
+        math.sin((other_phi - phi) / 2) ** 2
+        + math.cos(phi) * math.cos(other_phi) * math.sin(math.radians(other_longitude - longitude) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(half_chord)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    半徑的邊界框 (最小緯度, 最大緯度, [(最小經度, 最大經度), ...]) / Bounding box of a radius as (min latitude, max latitude, [(min longitude, max longitude), ...])
+
+    跨越 ±180° 經線時拆成兩段經度區間；包含極點時經度不限
+    Split into two longitude ranges across the ±180° meridian; longitudes are unbounded when a pole is inside
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    min_latitude = latitude - math.degrees(angular)
+    max_latitude = latitude + math.degrees(angular)
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90.0), min(max_latitude, 90.0), [(-180.0, 180.0)]
+
+    delta = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(latitude)))))
+    low, high = longitude - delta, longitude + delta
+    if high - low >= 360:
+        ranges = [(-180.0, 180.0)]
+    elif low < -180:
+        ranges = [(low + 360, 180.0), (-180.0, high)]
+    elif high > 180:
+        ranges = [(low, 180.0), (-180.0, high - 360)]
+    else:
+        ranges = [(low, high)]
+    return min_latitude, max_latitude, ranges
+
+
+def _latitude_cell(latitude):
+    return min(max(math.floor((latitude + 90) / GEO_CELL_DEGREES), 0), LATITUDE_CELLS - 1)
+
+
+def _longitude_cell(longitude):
+    return min(max(math.floor((longitude + 180) / GEO_CELL_DEGREES), 0), LONGITUDE_CELLS - 1)
+
+
+def geo_cell(latitude, longitude):
+    """
+    座標所在的網格編號（緯度列 × 經度欄） / Grid cell number of a coordinate (latitude row × longitude column)
+    """
+    return _latitude_cell(latitude) * LONGITUDE_CELLS + _longitude_cell(longitude)
+
+
+def cell_ranges(latitude, longitude, radius_km):
+    """
+    涵蓋半徑邊界框的 geo_cell 區間列表 [(low, high), ...]，相鄰區間已合併
+    geo_cell ranges [(low, high), ...] covering the radius' bounding box, adjacent ranges merged
+
+    每個緯度列的每段經度區間為連續編號，因此一列只需一到兩個區間
+    Each longitude range within a latitude row is contiguous, so a row needs one or two ranges
+    """
+    min_latitude, max_latitude, longitude_ranges = bounding_box(latitude, longitude, radius_km)
+    columns = sorted((_longitude_cell(low), _longitude_cell(high)) for low, high in longitude_ranges)
+    ranges = []
+    for row in range(_latitude_cell(min_latitude), _latitude_cell(max_latitude) + 1):
+        for first, last in columns:
+            low, high = row * LONGITUDE_CELLS + first, row * LONGITUDE_CELLS + last
+            if ranges and ranges[-1][1] + 1 >= low:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], high))
+            else:
+                ranges.append((low, high))
+    return ranges
+
+
+def parse_near(value):
+    """
+    解析 "緯度,經度" 字串 / Parse a "lat,lng" string
+
+    格式錯誤或超出範圍時拋出 ValueError / Raises ValueError when malformed or out of range
+    """
+    parts = str(value).split(",")
+    try:
+        latitude, longitude = (float(part) for part in parts)
+    except ValueError:
+        raise ValueError("near must be 'lat,lng', e.g. near=25.033,121.565") from None
+    if not (math.isfinite(latitude) and math.isfinite(longitude)):
+        raise ValueError("near must be 'lat,lng', e.g. near=25.033,121.565")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("near latitude must be within ±90 and longitude within ±180")
+    return latitude, longitude
+
+
+def resolve_radius(radius_km):
+    """
+    取得有效的搜尋半徑，並檢查是否在 (0, MAX_RADIUS_KM] 內 / Resolve the effective radius and check it is within (0, MAX_RADIUS_KM]
+    """
+    geo_settings = get_geo_settings()
+    radius_km = geo_settings["DEFAULT_RADIUS_KM"] if radius_km is None else radius_km
+    if not 0 < radius_km <= geo_settings["MAX_RADIUS_KM"]:
+        raise ValueError(f"radius_km must be greater than 0 and at most {geo_settings['MAX_RADIUS_KM']}")
+    return radius_km
+
+
+def nearby_location_ids(near, radius_km=None):
+    """
+    距離 near 在半徑內的標準地點 id 集合 / Ids of the standard locations within the radius of near
+    """
+    latitude, longitude = parse_near(near)
+    return set(get_gazetteer().within(latitude, longitude, resolve_radius(radius_km)))
+
+
+def location_condition(text):
+    """
+    地點文字過濾條件：原始文字包含查詢字串，或解析到同一標準地點 / Location text condition: the raw text contains the term, or resolves to the same standard location
+    """
+    condition = Q(location__icontains=text)
+    entry = resolve_location(text)
+    if entry is not None:
+        condition |= Q(normalized_location_id=entry.id)
+    return condition
+
+
+def near_prefilter(latitude, longitude, radius_km, location_count):
+    """
+    geo_cell 區間預篩條件；不划算時回傳 None / The geo_cell range prefilter, or None when it does not pay off
+
+    區間數隨半徑增長，每個區間都是一次索引範圍掃描；區間數超過 MAX_CELL_RANGES，或不少於半徑內的地點數
+    （此時以 normalized_location_id 索引逐一查找更省）時不預篩
+    The range count grows with the radius and each range is one index range scan, so there is no
+    prefilter when it exceeds MAX_CELL_RANGES or is not below the number of locations in the radius
+    (looking those up one by one through the normalized_location_id index is cheaper then)
+    """
+    ranges = cell_ranges(latitude, longitude, radius_km)
+    if len(ranges) > get_geo_settings()["MAX_CELL_RANGES"] or len(ranges) >= location_count:
+        return None
+    return reduce(or_, (Q(geo_cell__range=bounds) for bounds in ranges))
+
+
+def apply_near_filter(queryset, near, radius_km=None):
+    """
+    套用距離過濾：geo_cell 區間預篩後以標準地點 id 精確比對 / Apply the proximity filter: geo_cell range prefilter, then an exact match on standard location ids
+    """
+    if not near:
+        return queryset
+    latitude, longitude = parse_near(near)
+    radius_km = resolve_radius(radius_km)
+    location_ids = get_gazetteer().within(latitude, longitude, radius_km)
+    if not location_ids:
+        return queryset.none()
+    queryset = queryset.filter(normalized_location_id__in=sorted(location_ids))
+    prefilter = near_prefilter(latitude, longitude, radius_km, len(location_ids))
+    return queryset if prefilter is None else queryset.filter(prefilter)
+
+
+def location_fields(text):
+    """
+    由地點文字計算 (normalized_location_id, geo_cell) / Compute (normalized_location_id, geo_cell) from a location text
+    """
+    entry = resolve_location(text)
+    if entry is None:
+        return None, None
+    return entry.id, geo_cell(entry.latitude, entry.longitude)
+
+
+def load_locations(location_model=None, using="default"):
+    """
+    將地名辭典寫入 Location 資料表（依 id upsert），回傳筆數 / Write the gazetteer into the Location table (upsert by id) and return the row count
+
+    location_model 供遷移傳入歷史模型 / location_model lets migrations pass the historical model
+    """
+    if location_model is None:
+        from jobs.models import Location as location_model
+
+    locations = [
+        location_model(
+            id=entry.id,
+            name=entry.name,
+            country_code=entry.country_code,
+            latitude=entry.latitude,
+            longitude=entry.longitude,
+            aliases=list(entry.aliases),
+        )
+        for entry in get_gazetteer().entries.values()
+    ]
+    location_model.objects.using(using).bulk_create(
+        locations,
+        update_conflicts=True,
+        unique_fields=["id"],
+        update_fields=["name", "country_code", "latitude", "longitude", "aliases"],
+    )
+    return len(locations)
+
+
+def relocate_job_postings(job_model=None, using="default"):
+    """
+    依目前的地名辭典重新計算所有職缺的標準地點與網格，回傳更新筆數
+    Recompute the standard location and grid cell of every posting from the current gazetteer; returns the rows updated
+
+    依不同的地點文字逐一 UPDATE，次數與地點種類數相同而非職缺數
+    Issues one UPDATE per distinct location text, so the cost follows the number of distinct
+    locations rather than postings
+    """
+    if job_model is None:
+        from jobs.models import JobPosting as job_model
+
+    postings = job_model.objects.using(using)
+    updated = 0
+    for text in postings.order_by().values_list("location", flat=True).distinct().iterator():
+        location_id, cell = location_fields(text)
+        updated += postings.filter(location=text).update(normalized_location_id=location_id, geo_cell=cell)
+    return updated
@@ -0,0 +1,84 @@
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.export import ExportFormat
+from jobs.importer import DEFAULT_CHUNK_SIZE, detect_format, import_file
+
+
+def _import_in_worker(path, file_format, chunk_size, upsert):
+    """
+    在子行程中匯入單一檔案 / Import a single file inside a worker process
+
+    子行程不可沿用父行程的資料庫連線，先全部關閉讓 Django 重新連線
+    Workers must not reuse the parent's database connections, so they are closed first and
+    Django reconnects lazily
+    """
+    connections.close_all()
+    return import_file(path, file_format, chunk_size, upsert).as_dict()
+
+
+class Command(BaseCommand):
+    """
+    從 NDJSON/CSV 檔案串流匯入職缺 / Stream job postings in from NDJSON/CSV files
+
+    多個檔案（分片）可用 --workers 平行處理；SQLite 的寫入仍會依序進行
+    Several files (shards) can be processed in parallel with --workers; SQLite still
+    serializes the writes themselves
+    """
+    help = "Import job postings from NDJSON or CSV files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="NDJSON (.ndjson/.jsonl) or CSV files, one per shard")
+        parser.add_argument(
+            "--format",
+            choices=[choice.value for choice in ExportFormat],
+            help="file format (default: detected from the extension)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per bulk insert")
+        parser.add_argument("--upsert", action="store_true", help="update existing postings sharing external_id")
+        parser.add_argument("--workers", type=int, default=1, help="worker processes, one file per task")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1 or options["workers"] < 1:
+            raise CommandError("--chunk-size and --workers must be positive")
+
+        file_format = ExportFormat(options["format"]) if options["format"] else None
+        try:
+            tasks = [
+                (path, file_format or detect_format(path), options["chunk_size"], options["upsert"])
+                for path in options["paths"]
+            ]
+        except ValueError as error:
+            raise CommandError(str(error))
+
+        if options["workers"] == 1 or len(tasks) == 1:
+            results = [import_file(*task).as_dict() for task in tasks]
+        else:
+            connections.close_all()
+            with get_context("fork").Pool(min(options["workers"], len(tasks))) as pool:
+                results = pool.starmap(_import_in_worker, tasks)
+
+        self._report(results)
+
+    def _report(self, results):
+        """
+        輸出每個檔案與總計的吞吐量 / Print per-file and total throughput
+        """
+        for result in results:
+            self.stdout.write(
+                f"{result['path']}: {result['written']} written, {result['failed']} failed, "
+                f"{result['rows_per_second']:.0f} rows/s"
+            )
+            for error in result["errors"]:
+                self.stderr.write(error)
+
+        total_rows = sum(result["rows"] for result in results)
+        total_written = sum(result["written"] for result in results)
+        total_failed = sum(result["failed"] for result in results)
+        slowest_seconds = max((result["seconds"] for result in results), default=0.0)
+        throughput = total_rows / slowest_seconds if slowest_seconds else 0.0
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {total_written} of {total_rows} rows ({total_failed} failed) at {throughput:.0f} rows/s"
+        ))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from jobs.cache import invalidate_lists
+from jobs.locations import load_locations, relocate_job_postings
+
+
+class Command(BaseCommand):
+    """
+    由地名辭典重新載入地點表並重新解析職缺地點 / Reload the location table from the gazetteer and re-resolve posting locations
+
+    更新 jobs/data/gazetteer.csv（或 JOBS_GEO["GAZETTEER"]）後執行，並重新啟動網頁行程以載入新的辭典
+    Run after editing jobs/data/gazetteer.csv (or JOBS_GEO["GAZETTEER"]), then restart the web
+    processes so they load the new gazetteer
+    """
+    help = "Load the bundled gazetteer into the location table and backfill posting locations"
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                location_count = load_locations()
+                posting_count = relocate_job_postings()
+        except (OSError, ValueError) as error:
+            raise CommandError(f"Cannot load the gazetteer: {error}") from error
+        invalidate_lists()
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {location_count} locations and re-resolved {posting_count} job postings"
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    重建職缺全文檢索索引 / Rebuild the job posting full-text search index
+
+    用於回填既有資料或修復不同步的索引
+    Used to backfill existing rows or repair an out-of-sync index
+    """
+    help = "Rebuild the FTS5 search index for job postings"
+
+    def handle(self, *args, **options):
+        indexed_count = rebuild_search_index()
+        if indexed_count is None:
+            self.stdout.write(self.style.WARNING("FTS5 is not supported on this database backend"))
+            return
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed_count} job postings"))
@@ -0,0 +1,128 @@
+import os
+import signal
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from jobs.tasks import Worker, get_task_settings, queue_stats
+
+# 停止工作行程的訊號 / Signals that stop the workers
+STOP_SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+# 等待工作行程時讀取結果的間隔秒數 / Seconds between result reads while waiting for the workers
+RESULT_POLL_SECONDS = 0.1
+
+
+def _run_worker(batch_size, poll_interval, burst):
+    """
+    執行一個工作行程直到收到停止訊號（或 burst 時佇列清空），回傳 (成功數, 失敗數)
+    Run one worker until a stop signal arrives (or the queue drains in burst mode); returns
+    (succeeded, failed)
+
+    收到訊號時處理完目前這批才結束 / On a signal the current batch finishes before exiting
+    """
+    worker = Worker(batch_size, poll_interval)
+    previous = {signum: signal.signal(signum, lambda *_: worker.stop()) for signum in STOP_SIGNALS}
+    try:
+        return worker.run(burst)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+
+
+def _run_in_child(batch_size, poll_interval, burst, results):
+    """
+    子行程進入點，結果放入 results / Entry point of a child process; the outcome goes to results
+
+    子行程不可沿用父行程的資料庫連線，先全部關閉讓 Django 重新連線
+    Workers must not reuse the parent's database connections, so they are closed first and
+    Django reconnects lazily
+    """
+    connections.close_all()
+    results.put(_run_worker(batch_size, poll_interval, burst))
+
+
+class Command(BaseCommand):
+    """
+    執行背景工作的工作行程 / Run background task workers
+
+    每個工作行程各自認領到期工作；SIGINT/SIGTERM 讓所有工作行程處理完目前這批後結束
+    Each worker process claims due tasks on its own; SIGINT/SIGTERM let every worker finish its
+    current batch and exit
+    """
+    help = "Run worker processes for queued background tasks"
+
+    def add_arguments(self, parser):
+        task_settings = get_task_settings()
+        parser.add_argument("--processes", type=int, default=task_settings["PROCESSES"], help="worker processes")
+        parser.add_argument("--batch-size", type=int, default=task_settings["BATCH_SIZE"], help="tasks claimed at once")
+        parser.add_argument(
+            "--poll-interval", type=float, default=task_settings["POLL_INTERVAL"], help="seconds between polls of an empty queue",
+        )
+        parser.add_argument("--burst", action="store_true", help="exit once no task is due")
+
+    def handle(self, *args, **options):
+        if options["processes"] < 1 or options["batch_size"] < 1 or options["poll_interval"] < 0:
+            raise CommandError("--processes and --batch-size must be positive and --poll-interval not negative")
+
+        worker_args = (options["batch_size"], options["poll_interval"], options["burst"])
+        if options["processes"] == 1:
+            outcomes, crashed = [_run_worker(*worker_args)], []
+        else:
+            outcomes, crashed = self._run_processes(options["processes"], worker_args)
+
+        succeeded = sum(outcome[0] for outcome in outcomes)
+        failed = sum(outcome[1] for outcome in outcomes)
+        stats = queue_stats()
+        summary = (
+            f"Workers finished: {succeeded} succeeded, {failed} failed or retrying, "
+            f"{stats['due']} due, {stats['depth']['queued']} queued"
+        )
+        if not crashed:
+            self.stdout.write(self.style.SUCCESS(summary))
+            return
+        self.stdout.write(summary)
+        for pid, exitcode in crashed:
+            self.stderr.write(self.style.ERROR(f"Worker process {pid} exited with code {exitcode}"))
+        # 中斷的工作在租約到期後由其他工作行程重新認領 / Their claimed tasks are requeued once the lease expires
+        raise CommandError(f"{len(crashed)} of {options['processes']} worker processes exited abnormally")
+
+    def _run_processes(self, processes, worker_args):
+        """
+        以 fork 啟動多個工作行程並轉送停止訊號 / Fork worker processes and forward stop signals to them
+
+        等待期間持續讀取結果，避免子行程卡在寫入；回傳 (各行程結果, 異常結束的 (pid, exitcode))
+        Results are read while waiting so no child blocks on writing them; returns (outcomes of
+        the workers, (pid, exitcode) of those that exited abnormally)
+        """
+        context = get_context("fork")
+        results = context.SimpleQueue()
+        connections.close_all()
+        workers = [
+            context.Process(target=_run_in_child, args=(*worker_args, results), daemon=True)
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+
+        def forward(signum, frame):
+            for worker in workers:
+                if worker.is_alive():
+                    os.kill(worker.pid, signum)
+
+        previous = {signum: signal.signal(signum, forward) for signum in STOP_SIGNALS}
+        outcomes = []
+        try:
+            while any(worker.is_alive() for worker in workers):
+                while not results.empty():
+                    outcomes.append(results.get())
+                for worker in workers:
+                    worker.join(RESULT_POLL_SECONDS)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        while not results.empty():
+            outcomes.append(results.get())
+        crashed = [(worker.pid, worker.exitcode) for worker in workers if worker.exitcode != 0]
+        return outcomes, crashed
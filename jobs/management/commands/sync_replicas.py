@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.connection import ConnectionDoesNotExist
+
+from jobs.replication import sync_replicas
+
+
+class Command(BaseCommand):
+    """
+    將 default 複製到 SQLite 讀取副本 / Copy default into the SQLite read replicas
+
+    本機複寫替身，以 --interval 持續執行模擬複寫延遲 / Local replication stand-in; run it with
+    --interval to keep replicas following default with a bounded lag
+    """
+    help = "Copy the default SQLite database into the configured read replicas"
+
+    def add_arguments(self, parser):
+        parser.add_argument("aliases", nargs="*", help="Replica aliases (default: JOBS_REPLICAS['ALIASES'])")
+        parser.add_argument("--interval", type=float, help="Keep copying every this many seconds")
+
+    def handle(self, *args, **options):
+        aliases = options["aliases"] or None
+        interval = options["interval"]
+        if interval is not None and interval <= 0:
+            raise CommandError("--interval must be positive")
+
+        while True:
+            try:
+                timings = sync_replicas(aliases)
+            except (ConnectionDoesNotExist, ValueError) as error:
+                raise CommandError(str(error)) from error
+            summary = ", ".join(f"{alias}={seconds * 1000:.1f}ms" for alias, seconds in timings.items())
+            self.stdout.write(self.style.SUCCESS(f"Synced replicas: {summary or 'none configured'}"))
+            if interval is None:
+                return
+            time.sleep(interval)
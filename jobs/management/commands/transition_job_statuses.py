@@ -0,0 +1,33 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.status import transition_statuses
+
+
+class Command(BaseCommand):
+    """
+    將職缺狀態轉換到今天 / Transition job statuses to today
+
+    供 cron 在每天午夜後執行，例如 / Meant to run from cron right after midnight, e.g.
+    1 0 * * * python manage.py transition_job_statuses
+    """
+    help = "Move stored job statuses across the day boundary in bulk"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Day to transition to (YYYY-MM-DD), defaults to today")
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute every row instead of only forward transitions",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            today = date.fromisoformat(options["date"]) if options["date"] else None
+        except ValueError as error:
+            raise CommandError(f"Invalid --date: {error}") from error
+
+        counts = transition_statuses(today, full=options["full"])
+        summary = ", ".join(f"{status}={count}" for status, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Transitioned job statuses: {summary}"))
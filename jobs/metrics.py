@@ -0,0 +1,452 @@
+"""
+請求層級的效能量測 / Request-level performance instrumentation
+
+MetricsMiddleware 記錄每個端點的延遲分布、SQL 查詢數與耗時（透過 connection.execute_wrapper），
+以及認證與序列化等階段的耗時；結果以 Prometheus 文字格式輸出於 /metrics，
+並以 Server-Timing 標頭附在每個回應上。
+MetricsMiddleware records per-endpoint latency histograms, SQL query count and time (through
+connection.execute_wrapper) and the time spent in phases such as authentication and
+serialization; results are exposed in the Prometheus text format on /metrics and attached to
+every response as a Server-Timing header.
+
+階段以 timed("phase") 量測，可作為 context manager 或裝飾器；請求狀態存於 contextvars，
+因此經 sync_to_async 執行的 ORM 查詢也會計入。
+Phases are measured with timed("phase"), usable as a context manager or a decorator; request
+state lives in contextvars, so ORM queries run through sync_to_async are counted too.
+"""
+import bisect
+import hmac
+import ipaddress
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from ninja.renderers import JSONRenderer
+
+# 預設設定，可由 settings.JOBS_METRICS 覆寫 / Defaults, overridable by settings.JOBS_METRICS
+DEFAULT_METRICS_SETTINGS = {
+    "ENABLED": True,
+    "SERVER_TIMING": True,  # 是否輸出 Server-Timing 標頭 / Emit the Server-Timing header
+    # 延遲分布的上界（秒） / Latency histogram upper bounds in seconds
+    "BUCKETS": (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    # /metrics 的存取權：帶有此 Bearer 令牌，或客戶端 IP 在 ALLOWED_IPS（位址或 CIDR）內
+    # Access to /metrics: requests carrying this bearer token, or from a client IP within ALLOWED_IPS (addresses or CIDR)
+    "TOKEN": None,
+    "ALLOWED_IPS": ("127.0.0.1", "::1"),
+}
+
+# Prometheus 文字格式的內容類型 / Content type of the Prometheus text format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 目前請求的量測狀態 / Measurement state of the current request
+_current = ContextVar("jobs_request_metrics", default=None)
+
+
+def get_metrics_settings():
+    """
+    取得合併預設值後的量測設定 / Get metrics settings merged with defaults
+    """
+    return {**DEFAULT_METRICS_SETTINGS, **getattr(settings, "JOBS_METRICS", {})}
+
+
+class RequestMetrics:
+    """
+    單一請求的 SQL 與各階段耗時 / SQL and phase timings of one request
+    """
+    __slots__ = ("sql_count", "sql_seconds", "phases")
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+        self.phases = {}
+
+    def add_phase(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+
+class Histogram:
+    """
+    依標籤分組的累積分布 / Cumulative histogram grouped by labels
+    """
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, labels, value, buckets):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = {"buckets": tuple(buckets), "counts": [0] * len(buckets), "sum": 0.0, "count": 0}
+            index = bisect.bisect_left(series["buckets"], value)
+            if index < len(series["counts"]):
+                series["counts"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(series["buckets"], series["counts"]):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le=_number(bound))} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le='+Inf')} {series['count']}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(series['sum'])}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {series['count']}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class Counter:
+    """
+    依標籤分組的累加計數 / Monotonic counter grouped by labels
+    """
+
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.label_names, labels)} {_number(value)}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+def _number(value):
+    """
+    以 Prometheus 可解析的格式輸出數值 / Format a number for Prometheus
+    """
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(names, values, **extra):
+    """
+    組成 {name="value",...} 標籤字串 / Build a {name="value",...} label string
+    """
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "jobs_http_request_duration_seconds", "Request latency by endpoint.", ("method", "endpoint"),
+)
+REQUESTS = Counter(
+    "jobs_http_requests_total", "Requests by endpoint and status code.", ("method", "endpoint", "status"),
+)
+DB_QUERIES = Counter(
+    "jobs_db_queries_total", "SQL queries executed by endpoint.", ("method", "endpoint"),
+)
+DB_SECONDS = Counter(
+    "jobs_db_query_seconds_total", "Time spent executing SQL by endpoint.", ("method", "endpoint"),
+)
+PHASE_DURATION = Histogram(
+    "jobs_request_phase_duration_seconds", "Time spent per request phase (auth, serialize).", ("endpoint", "phase"),
+)
+
+# 所有註冊的量測 / Every registered metric
+REGISTRY = (REQUEST_DURATION, REQUESTS, DB_QUERIES, DB_SECONDS, PHASE_DURATION)
+
+
+@contextmanager
+def timed(phase):
+    """
+    將區塊耗時計入目前請求的某個階段；不在請求內時不做事
+    Add the block's duration to a phase of the current request; a no-op outside requests
+    """
+    request_metrics = _current.get()
+    if request_metrics is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_metrics.add_phase(phase, time.perf_counter() - started_at)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    計入目前請求的 SQL 查詢數與耗時的 execute_wrapper / execute_wrapper counting SQL queries and time of the current request
+    """
+    request_metrics = _current.get()
+    if request_metrics is None:
+        return execute(sql, params, many, context)
+    started_at = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        request_metrics.sql_count += 1
+        request_metrics.sql_seconds += time.perf_counter() - started_at
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    為新建立的資料庫連線安裝 record_query（connection_created 訊號）
+    Install record_query on every new database connection (connection_created signal)
+
+    以訊號安裝而非每個請求安裝，使 sync_to_async 執行緒中的連線也會計入
+    Installing per connection rather than per request also covers connections in sync_to_async threads
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedJSONRenderer(JSONRenderer):
+    """
+    將 JSON 編碼計入 serialize 階段的 ninja 渲染器 / Ninja renderer counting JSON encoding as the serialize phase
+    """
+
+    def render(self, request, data, *, response_status):
+        with timed("serialize"):
+            return super().render(request, data, response_status=response_status)
+
+
+def _endpoint(request):
+    """
+    以 URL 路由樣式作為端點標籤，避免路徑參數造成標籤爆量 / Use the URL route pattern as the endpoint label so path params do not explode cardinality
+    """
+    match = getattr(request, "resolver_match", None)
+    return f"/{match.route}" if match is not None else "unmatched"
+
+
+def server_timing(total_seconds, request_metrics):
+    """
+    組成 Server-Timing 標頭值（毫秒） / Build the Server-Timing header value in milliseconds
+    """
+    entries = [
+        f"total;dur={total_seconds * 1000:.2f}",
+        f'db;dur={request_metrics.sql_seconds * 1000:.2f};desc="{request_metrics.sql_count} queries"',
+    ]
+    entries += [f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in request_metrics.phases.items()]
+    return ", ".join(entries)
+
+
+class MetricsMiddleware:
+    """
+    量測每個請求並加上 Server-Timing 標頭 / Measure every request and add the Server-Timing header
+
+    同時支援 WSGI 與 ASGI / Supports both WSGI and ASGI
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not get_metrics_settings()["ENABLED"]:
+            return self.get_response(request)
+        request_metrics, token, started_at = self._start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, request_metrics, started_at)
+
+    async def __acall__(self, request):
+        if not get_metrics_settings()["ENABLED"]:
+            return await self.get_response(request)
+        request_metrics, token, started_at = self._start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, request_metrics, started_at)
+
+    @staticmethod
+    def _start():
+        request_metrics = RequestMetrics()
+        return request_metrics, _current.set(request_metrics), time.perf_counter()
+
+    @staticmethod
+    def _finish(request, response, request_metrics, started_at):
+        """
+        記錄量測結果並附上標頭 / Record the measurements and attach the header
+        """
+        total_seconds = time.perf_counter() - started_at
+        metrics_settings = get_metrics_settings()
+        endpoint = _endpoint(request)
+        labels = (request.method, endpoint)
+
+        REQUEST_DURATION.observe(labels, total_seconds, metrics_settings["BUCKETS"])
+        REQUESTS.inc((*labels, str(response.status_code)))
+        DB_QUERIES.inc(labels, request_metrics.sql_count)
+        DB_SECONDS.inc(labels, request_metrics.sql_seconds)
+        for phase, seconds in request_metrics.phases.items():
+            PHASE_DURATION.observe((endpoint, phase), seconds, metrics_settings["BUCKETS"])
+
+        if metrics_settings["SERVER_TIMING"]:
+            response["Server-Timing"] = server_timing(total_seconds, request_metrics)
+        return response
+
+
+def _auth_cache_lines():
+    """
+    已驗證令牌快取的計數 / Counters of the verified-token cache
+    """
+    from jobs.auth import token_cache
+
+    lines = []
+    for key, value in token_cache.snapshot().items():
+        name = f"jobs_auth_token_cache_{key}"
+        kind = "gauge" if key in ("size", "verify_seconds_avg") else "counter"
+        lines += [f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+    return lines
+
+
+def _response_cache_lines():
+    """
+    回應快取各端點的命中與未命中次數 / Response cache hits and misses per endpoint
+    """
+    from jobs.cache import cache_stats
+
+    counts = cache_stats.snapshot()
+    lines = []
+    for outcome, key in (("hit", "hits"), ("miss", "misses")):
+        name = f"jobs_response_cache_{key}_total"
+        lines.append(f"# TYPE {name} counter")
+        lines += [
+            f"{name}{_labels(('endpoint',), (endpoint,))} {endpoint_counts[outcome]}"
+            for endpoint, endpoint_counts in sorted(counts.items())
+        ]
+    return lines
+
+
+def _snapshot_lines():
+    """
+    有效職缺快照的筆數、記憶體與計數 / Rows, memory and counters of the active snapshot
+    """
+    from jobs.snapshot import active_snapshot
+
+    lines = []
+    for key, value in active_snapshot.stats().items():
+        name = f"jobs_active_snapshot_{key}"
+        kind = "counter" if key in ("hits", "fallbacks", "rebuilds", "updates") else "gauge"
+        lines += [f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+    return lines
+
+
+def _task_lines():
+    """
+    背景工作佇列深度與最近的等待、執行秒數 / Background task queue depth and recent wait and run seconds
+
+    資料庫無法查詢時（例如尚未遷移）略過 / Skipped when the database cannot be queried (e.g. before migrating)
+    """
+    from django.db import DatabaseError
+
+    from jobs.tasks import queue_stats
+
+    try:
+        stats = queue_stats()
+    except DatabaseError:
+        return []
+    lines = ["# TYPE jobs_tasks gauge"]
+    lines += [f"jobs_tasks{_labels(('status',), (status,))} {count}" for status, count in stats["depth"].items()]
+    for key in ("due", "oldest_due_seconds", "recent_finished"):
+        lines += [f"# TYPE jobs_tasks_{key} gauge", f"jobs_tasks_{key} {_number(stats[key])}"]
+    for key in ("wait_seconds", "run_seconds"):
+        lines.append(f"# TYPE jobs_tasks_{key} gauge")
+        lines += [
+            f"jobs_tasks_{key}{_labels(('quantile',), (quantile,))} {_number(value)}"
+            for quantile, value in stats[key].items()
+        ]
+    return lines
+
+
+def render_metrics():
+    """
+    以 Prometheus 文字格式輸出所有量測 / Render every metric in the Prometheus text format
+    """
+    lines = []
+    for metric in REGISTRY:
+        lines += metric.collect()
+    lines += _auth_cache_lines()
+    lines += _response_cache_lines()
+    lines += _snapshot_lines()
+    lines += _task_lines()
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    """
+    清除所有量測 / Clear every metric
+    """
+    from jobs.cache import cache_stats
+
+    for metric in REGISTRY:
+        metric.clear()
+    cache_stats.reset()
+
+
+def _ip_allowed(ip, allowed_ips):
+    """
+    IP 是否在允許的位址或網段內 / Whether an IP is within the allowed addresses or networks
+    """
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in ipaddress.ip_network(allowed, strict=False) for allowed in allowed_ips)
+
+
+def metrics_access_allowed(request):
+    """
+    是否允許抓取 /metrics：Bearer 令牌相符或客戶端 IP 在允許清單內 / Whether the request may scrape /metrics: a matching bearer token or an allow-listed client IP
+    """
+    from jobs.ratelimit import client_ip
+
+    metrics_settings = get_metrics_settings()
+    token = metrics_settings["TOKEN"]
+    if token:
+        scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode()):
+            return True
+    return _ip_allowed(client_ip(request), metrics_settings["ALLOWED_IPS"])
+
+
+def metrics_view(request):
+    """
+    Prometheus 抓取端點，只對 metrics_access_allowed 的請求開放 / Prometheus scrape endpoint, open only to requests passing metrics_access_allowed
+
+    量測含令牌快取、撤銷與佇列等內部計數，其他請求回傳 403 / The metrics include internal counters (token cache, revocations, queue), so other requests get a 403
+    """
+    if not metrics_access_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,82 @@
+# 建立職缺全文檢索索引 / Create the job posting full-text search index
+
+from django.db import migrations
+
+# 以下 SQL 凍結為本遷移當時的定義，不引用執行期的 jobs.search，之後修改該模組不會改變這個遷移
+# The SQL below is frozen as of this migration instead of importing the runtime jobs.search, so
+# later changes to that module never alter this migration
+
+# 建立虛擬表與同步觸發器 / Create the virtual table and its sync triggers
+CREATE_FTS_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_jobposting_fts USING fts5(
+        title, description, company_name,
+        content='jobs_jobposting', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_ai AFTER INSERT ON jobs_jobposting BEGIN
+        INSERT INTO jobs_jobposting_fts(rowid, title, description, company_name)
+        VALUES (new.id, new.title, new.description, new.company_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_ad AFTER DELETE ON jobs_jobposting BEGIN
+        INSERT INTO jobs_jobposting_fts(jobs_jobposting_fts, rowid, title, description, company_name)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_fts_au AFTER UPDATE OF title, description, company_name
+    ON jobs_jobposting BEGIN
+        INSERT INTO jobs_jobposting_fts(jobs_jobposting_fts, rowid, title, description, company_name)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name);
+        INSERT INTO jobs_jobposting_fts(rowid, title, description, company_name)
+        VALUES (new.id, new.title, new.description, new.company_name);
+    END
+    """,
+)
+
+# 從 jobs_jobposting 回填既有資料 / Backfill the existing rows from jobs_jobposting
+BACKFILL_FTS_SQL = "INSERT INTO jobs_jobposting_fts(jobs_jobposting_fts) VALUES ('rebuild')"
+
+# 移除虛擬表與觸發器 / Drop the virtual table and its triggers
+DROP_FTS_SQL = (
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_ai",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_fts_au",
+    "DROP TABLE IF EXISTS jobs_jobposting_fts",
+)
+
+
+def forwards(apps, schema_editor):
+    """
+    建立 FTS 虛擬表並回填既有資料 / Create the FTS table and backfill existing rows
+
+    非 SQLite 後端直接略過 / Skipped on non-SQLite backends
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in (*CREATE_FTS_SQL, BACKFILL_FTS_SQL):
+        schema_editor.execute(statement)
+
+
+def backwards(apps, schema_editor):
+    """
+    移除 FTS 虛擬表與觸發器 / Drop the FTS table and triggers
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_FTS_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
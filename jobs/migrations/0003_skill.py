@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_jobposting_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('normalized_name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobPostingSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='jobs.jobposting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='jobs.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='skills',
+            field=models.ManyToManyField(related_name='job_postings', through='jobs.JobPostingSkill', to='jobs.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='jobpostingskill',
+            index=models.Index(fields=['skill', 'job_posting'], name='jobskill_skill_job_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobpostingskill',
+            constraint=models.UniqueConstraint(fields=('job_posting', 'skill'), name='unique_job_posting_skill'),
+        ),
+    ]
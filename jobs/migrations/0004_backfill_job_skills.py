@@ -0,0 +1,68 @@
+# 從 JSON 欄位回填正規化技能 / Backfill normalized skills from the JSON column
+
+import json
+
+from django.db import migrations
+
+# 每批處理的職缺數 / Number of postings processed per batch
+BACKFILL_BATCH_SIZE = 2000
+
+
+def _normalize(name):
+    """
+    與 jobs.skills.normalize_skill_name 相同的正規化規則 / Same rule as jobs.skills.normalize_skill_name
+    """
+    return " ".join(str(name).split()).lower()
+
+
+def backfill_skills(apps, schema_editor):
+    """
+    解析每筆職缺的技能 JSON 並建立技能關聯 / Parse each posting's skills JSON and create skill links
+    """
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    Skill = apps.get_model('jobs', 'Skill')
+    JobPostingSkill = apps.get_model('jobs', 'JobPostingSkill')
+
+    skill_ids = {}
+    pending_links = []
+    rows = JobPosting.objects.values_list('id', '_required_skills').iterator(chunk_size=BACKFILL_BATCH_SIZE)
+    for job_id, skills_json in rows:
+        try:
+            names = json.loads(skills_json or '[]')
+        except ValueError:
+            names = []
+        seen = set()
+        for name in names if isinstance(names, list) else []:
+            normalized_name = _normalize(name)
+            if not normalized_name or normalized_name in seen:
+                continue
+            if normalized_name not in skill_ids:
+                skill = Skill.objects.create(name=" ".join(str(name).split()), normalized_name=normalized_name)
+                skill_ids[normalized_name] = skill.id
+            pending_links.append(
+                JobPostingSkill(job_posting_id=job_id, skill_id=skill_ids[normalized_name], position=len(seen))
+            )
+            seen.add(normalized_name)
+        if len(pending_links) >= BACKFILL_BATCH_SIZE:
+            JobPostingSkill.objects.bulk_create(pending_links)
+            pending_links = []
+    JobPostingSkill.objects.bulk_create(pending_links)
+
+
+def clear_skills(apps, schema_editor):
+    """
+    移除回填的技能資料 / Remove the backfilled skill data
+    """
+    apps.get_model('jobs', 'JobPostingSkill').objects.all().delete()
+    apps.get_model('jobs', 'Skill').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_skill'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, clear_skills),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_backfill_job_skills'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['posting_date', 'expiration_date'], name='jobs_post_date_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['expiration_date', 'posting_date'], name='jobs_exp_date_post_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['company_name'], name='jobs_company_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['location'], name='jobs_location_idx'),
+        ),
+    ]
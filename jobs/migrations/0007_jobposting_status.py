@@ -0,0 +1,43 @@
+# 新增儲存的狀態欄位並依今天日期回填 / Add the stored status column and backfill it for today
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+def backfill_status(apps, schema_editor):
+    """
+    以三個批次 UPDATE 依日期回填狀態 / Backfill the status from the dates with three bulk UPDATEs
+
+    條件與 jobs.status.status_condition 相同 / Same conditions as jobs.status.status_condition
+    """
+    JobPosting = apps.get_model('jobs', 'JobPosting')
+    today = date.today()
+    JobPosting.objects.filter(posting_date__lte=today, expiration_date__gte=today).update(status='active')
+    JobPosting.objects.filter(expiration_date__lt=today).update(status='expired')
+    JobPosting.objects.filter(posting_date__gt=today).update(status='scheduled')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_jobposting_external_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='status',
+            field=models.CharField(choices=[('active', 'Active'), ('expired', 'Expired'), ('scheduled', 'Scheduled')], default='active', editable=False, max_length=16),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'posting_date'], name='jobs_status_post_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', 'expiration_date'], name='jobs_status_exp_date_idx'),
+        ),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.2.1 on 2026-10-18 07:52
+
+import logging
+
+from django.db import OperationalError, migrations, models
+
+logger = logging.getLogger(__name__)
+
+# 以下 SQL 凍結為本遷移當時的定義，不引用執行期的 jobs.salary，之後修改該模組不會改變這個遷移
+# The SQL below is frozen as of this migration instead of importing the runtime jobs.salary, so
+# later changes to that module never alter this migration
+
+# 索引區間為兩端的包絡並限制在 rtree_i32 座標範圍內，null 端點視為無上/下限
+# The indexed interval is the hull of both bounds clamped into the rtree_i32 coordinate range;
+# null bounds are open-ended
+LOW_SQL = (
+    "MIN(MAX(MIN(COALESCE({row}salary_min, -2147483648), COALESCE({row}salary_max, 2147483647)), "
+    "-2147483648), 2147483647)"
+)
+HIGH_SQL = (
+    "MIN(MAX(MAX(COALESCE({row}salary_min, -2147483648), COALESCE({row}salary_max, 2147483647)), "
+    "-2147483648), 2147483647)"
+)
+HAS_SALARY_SQL = "{row}salary_min IS NOT NULL OR {row}salary_max IS NOT NULL"
+
+# 建立虛擬表與同步觸發器 / Create the virtual table and its sync triggers
+CREATE_SALARY_INDEX_SQL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_jobposting_salary_rtree USING rtree_i32(id, salary_low, salary_high)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_salary_rtree_ai AFTER INSERT ON jobs_jobposting
+    WHEN {HAS_SALARY_SQL.format(row="new.")} BEGIN
+        INSERT INTO jobs_jobposting_salary_rtree(id, salary_low, salary_high)
+        VALUES (new.id, {LOW_SQL.format(row="new.")}, {HIGH_SQL.format(row="new.")});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_salary_rtree_ad AFTER DELETE ON jobs_jobposting BEGIN
+        DELETE FROM jobs_jobposting_salary_rtree WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS jobs_jobposting_salary_rtree_au AFTER UPDATE OF salary_min, salary_max
+    ON jobs_jobposting BEGIN
+        DELETE FROM jobs_jobposting_salary_rtree WHERE id = old.id;
+        INSERT INTO jobs_jobposting_salary_rtree(id, salary_low, salary_high)
+        SELECT new.id, {LOW_SQL.format(row="new.")}, {HIGH_SQL.format(row="new.")}
+        WHERE {HAS_SALARY_SQL.format(row="new.")};
+    END
+    """,
+)
+
+# 從 jobs_jobposting 回填既有資料 / Backfill the existing rows from jobs_jobposting
+BACKFILL_SALARY_INDEX_SQL = (
+    "DELETE FROM jobs_jobposting_salary_rtree",
+    f"""
+    INSERT INTO jobs_jobposting_salary_rtree(id, salary_low, salary_high)
+    SELECT id, {LOW_SQL.format(row="")}, {HIGH_SQL.format(row="")} FROM jobs_jobposting
+    WHERE {HAS_SALARY_SQL.format(row="")}
+    """,
+)
+
+# 移除虛擬表與觸發器 / Drop the virtual table and its triggers
+DROP_SALARY_INDEX_SQL = (
+    "DROP TRIGGER IF EXISTS jobs_jobposting_salary_rtree_ai",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_salary_rtree_ad",
+    "DROP TRIGGER IF EXISTS jobs_jobposting_salary_rtree_au",
+    "DROP TABLE IF EXISTS jobs_jobposting_salary_rtree",
+)
+
+
+def create_range_index(apps, schema_editor):
+    """
+    建立 R*Tree 範圍索引並回填既有資料 / Create the R*Tree range index and backfill existing rows
+
+    非 SQLite 或 SQLite 未編譯 R*Tree 模組時略過 / Skipped on non-SQLite backends or SQLite builds without R*Tree
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(CREATE_SALARY_INDEX_SQL[0])
+    except OperationalError as error:
+        logger.warning("Skip salary index creation: %s", error)
+        return
+    for statement in (*CREATE_SALARY_INDEX_SQL[1:], *BACKFILL_SALARY_INDEX_SQL):
+        schema_editor.execute(statement)
+
+
+def drop_range_index(apps, schema_editor):
+    """
+    移除 R*Tree 範圍索引 / Drop the R*Tree range index
+    """
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in DROP_SALARY_INDEX_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_jobposting_facet_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_range_index, drop_range_index),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_min'], name='jobs_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['salary_max'], name='jobs_salary_max_idx'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# 新增地點表、標準地點與網格欄位，載入地名辭典並回填既有職缺
+# Add the location table and the standard location and grid cell columns, load the gazetteer and backfill existing postings
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from jobs.locations import load_locations, relocate_job_postings
+
+
+def load_gazetteer(apps, schema_editor):
+    """
+    載入地名辭典並依地點文字回填職缺 / Load the gazetteer and backfill postings from their location text
+    """
+    using = schema_editor.connection.alias
+    load_locations(apps.get_model('jobs', 'Location'), using=using)
+    relocate_job_postings(apps.get_model('jobs', 'JobPosting'), using=using)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_jobposting_salary_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='geo_cell',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.PositiveIntegerField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255)),
+                ('country_code', models.CharField(max_length=2)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+                ('aliases', models.JSONField(default=list)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['latitude', 'longitude'], name='jobs_location_lat_lng_idx')],
+            },
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='normalized_location',
+            field=models.ForeignKey(blank=True, db_constraint=False, editable=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='job_postings', to='jobs.location'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['geo_cell', 'normalized_location'], name='jobs_geo_cell_location_idx'),
+        ),
+        migrations.RunPython(load_gazetteer, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,55 @@
 from django.db import models
 import json
 
+from jobs.locations import location_fields
+from jobs.schemas import JobStatus
+from jobs.skills import sync_job_skills
+from jobs.status import STATUS_CHOICES, STATUS_MAX_LENGTH, compute_status
+from jobs.tasks import TASK_NAME_MAX_LENGTH, TASK_STATUS_CHOICES, TASK_STATUS_MAX_LENGTH, TaskStatus
+
 # Create your models here.
 
+# 技能模型 / Skill Model
+class Skill(models.Model):
+    """
+    正規化的技能 / Normalized skill
+
+    normalized_name 為小寫且合併空白後的名稱，用於精確比對
+    normalized_name is the lowercased, whitespace-collapsed name used for exact matching
+    """
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+# 地點模型 / Location Model
+class Location(models.Model):
+    """
+    正規化的地點與座標 / Normalized location with coordinates
+
+    資料來自隨附的地名辭典（見 jobs.locations），id 為辭典中的穩定編號
+    Loaded from the bundled gazetteer (see jobs.locations); ids are the gazetteer's stable ids
+    """
+    id = models.PositiveIntegerField(primary_key=True)
+    name = models.CharField(max_length=255)
+    country_code = models.CharField(max_length=2)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    # 解析時接受的其他寫法 / Other spellings accepted when resolving
+    aliases = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [
+            # 邊界框查詢 / Bounding-box lookups
+            models.Index(fields=['latitude', 'longitude'], name='jobs_location_lat_lng_idx'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
 # 職缺貼文模型 / Job Posting Model
 class JobPosting(models.Model):
     title = models.CharField(max_length=255)
@@ -13,15 +60,111 @@ class JobPosting(models.Model):
     company_name = models.CharField(max_length=255)
     posting_date = models.DateField()
     expiration_date = models.DateField()
+    # 由日期計算並儲存的狀態，跨日由排程批次轉換（見 jobs.status）
+    # Status computed from the dates and stored; transitioned in bulk at the day boundary (see jobs.status)
+    status = models.CharField(max_length=STATUS_MAX_LENGTH, choices=STATUS_CHOICES, editable=False)
     # 使用TextField來存儲JSON格式的技能列表 / Using TextField to store JSON formatted skills list
     _required_skills = models.TextField(db_column='required_skills', default='[]')
+    # 外部來源的唯一鍵，供匯入時 upsert 使用 / Unique key from external feeds, used for import upserts
+    external_id = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    # 正規化的技能關聯，用於過濾 / Normalized skill links used for filtering
+    skills = models.ManyToManyField(Skill, through='JobPostingSkill', related_name='job_postings')
+    # 由 location 解析的標準地點與 0.1° 網格編號，供地點正規化與距離搜尋（見 jobs.locations）
+    # Standard location and 0.1° grid cell resolved from location, for normalized and proximity search (see jobs.locations)
+    # 地點表是地名辭典的副本，不建立資料庫外鍵約束 / The location table mirrors the gazetteer, so no database FK constraint is created
+    normalized_location = models.ForeignKey(
+        Location, null=True, blank=True, editable=False, on_delete=models.DO_NOTHING,
+        db_constraint=False, related_name='job_postings',
+    )
+    geo_cell = models.IntegerField(null=True, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # 狀態 active/scheduled 與 posting_date 排序 / active & scheduled status, posting_date sorting
+            models.Index(fields=['posting_date', 'expiration_date'], name='jobs_post_date_exp_idx'),
+            # 狀態 active/expired 與 expiration_date 排序 / active & expired status, expiration_date sorting
+            models.Index(fields=['expiration_date', 'posting_date'], name='jobs_exp_date_post_idx'),
+            # 公司與地點的等值與前綴查詢 / Equality and prefix lookups on company and location
+            models.Index(fields=['company_name'], name='jobs_company_name_idx'),
+            models.Index(fields=['location'], name='jobs_location_idx'),
+            # 狀態等值過濾與日期排序 / Status equality filters with date sorting
+            models.Index(fields=['status', 'posting_date'], name='jobs_status_post_date_idx'),
+            models.Index(fields=['status', 'expiration_date'], name='jobs_status_exp_date_idx'),
+            # 狀態過濾下的地點與公司分面計數（覆蓋索引） / Location and company facet counts under a status filter (covering)
+            models.Index(fields=['status', 'location'], name='jobs_status_location_idx'),
+            models.Index(fields=['status', 'company_name'], name='jobs_status_company_idx'),
+            # 薪資排序與 contain 範圍掃描 / Salary sorting and contain range scans
+            models.Index(fields=['salary_min'], name='jobs_salary_min_idx'),
+            models.Index(fields=['salary_max'], name='jobs_salary_max_idx'),
+            # 距離搜尋的邊界框預篩 / Bounding-box prefilter of proximity search
+            models.Index(fields=['geo_cell', 'normalized_location'], name='jobs_geo_cell_location_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        記錄載入時的技能 JSON，以便儲存時判斷是否需要同步 / Remember the loaded skills JSON to detect changes on save
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._synced_skills = instance.__dict__.get('_required_skills')
+        return instance
+
+    def refresh_status(self, current_date=None):
+        """
+        依日期重新計算狀態欄位 / Recompute the status column from the dates
+
+        bulk_create/bulk_update 不會呼叫 save()，批次寫入前需自行呼叫
+        bulk_create/bulk_update skip save(), so bulk writers call this themselves
+        """
+        # 日期可能仍是字串（例如 objects.create 傳入 ISO 字串） / Dates may still be strings (e.g. ISO strings passed to objects.create)
+        posting_date = self._meta.get_field('posting_date').to_python(self.posting_date)
+        expiration_date = self._meta.get_field('expiration_date').to_python(self.expiration_date)
+        self.status = compute_status(posting_date, expiration_date, current_date)
+
+    def refresh_location(self):
+        """
+        依 location 文字重新解析標準地點與網格 / Re-resolve the standard location and grid cell from the location text
+
+        與 refresh_status 相同，批次寫入前需自行呼叫 / Like refresh_status, bulk writers call this themselves
+        """
+        self.normalized_location_id, self.geo_cell = location_fields(self.location)
+
+    def save(self, *args, **kwargs):
+        """
+        儲存職缺並在技能變動時同步技能關聯 / Save the posting and sync skill links when skills changed
+
+        狀態與標準地點在每次儲存時重新計算 / The status and standard location are recomputed on every save
+        """
+        self.refresh_status()
+        self.refresh_location()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            derived_fields = set()
+            if {'posting_date', 'expiration_date'} & set(update_fields):
+                derived_fields.add('status')
+            if 'location' in update_fields:
+                derived_fields.update(('normalized_location', 'geo_cell'))
+            if derived_fields:
+                kwargs['update_fields'] = {*update_fields, *derived_fields}
+        super().save(*args, **kwargs)
+        if getattr(self, '_synced_skills', None) != self._required_skills:
+            sync_job_skills([self])
+            self._synced_skills = self._required_skills
+
     # 创建一个序列化与反序列化的方法 / Create serialization and deserialization methods for skills
     @property
     def required_skills(self):
-        return json.loads(self._required_skills)
+        # 依原始 JSON 字串快取解碼結果，同一字串只解析一次；回傳副本避免外部修改快取
+        # Cache the decoded list per raw JSON string so it is parsed once; return a copy so
+        # callers cannot mutate the cache
+        raw_skills = self._required_skills
+        cached = self.__dict__.get('_decoded_skills')
+        if cached is None or cached[0] is not raw_skills:
+            cached = (raw_skills, tuple(json.loads(raw_skills)))
+            self.__dict__['_decoded_skills'] = cached
+        return list(cached[1])
     
     @required_skills.setter
     def required_skills(self, value):
@@ -41,9 +184,7 @@ class JobPosting(models.Model):
         當前日期介於 posting_date 和 expiration_date 之間時，職缺為活躍狀態
         A job is active when the current date is between posting_date and expiration_date
         """
-        from datetime import date
-        current_date = current_date or date.today()
-        return self.posting_date <= current_date <= self.expiration_date
+        return compute_status(self.posting_date, self.expiration_date, current_date) == JobStatus.ACTIVE
     
     def is_expired(self, current_date=None):
         """
@@ -52,9 +193,7 @@ class JobPosting(models.Model):
         當前日期大於 expiration_date 時，職缺已過期
         A job is expired when the current date is greater than expiration_date
         """
-        from datetime import date
-        current_date = current_date or date.today()
-        return current_date > self.expiration_date
+        return compute_status(self.posting_date, self.expiration_date, current_date) == JobStatus.EXPIRED
     
     def is_scheduled(self, current_date=None):
         """
@@ -63,6 +202,64 @@ class JobPosting(models.Model):
         當前日期小於 posting_date 時，職缺為已排定狀態
         A job is scheduled when the current date is less than posting_date
         """
-        from datetime import date
-        current_date = current_date or date.today()
-        return current_date < self.posting_date
+        return compute_status(self.posting_date, self.expiration_date, current_date) == JobStatus.SCHEDULED
+
+
+# 職缺技能關聯模型 / Job Posting Skill link Model
+class JobPostingSkill(models.Model):
+    """
+    職缺與技能的多對多中介表 / Many-to-many through table between postings and skills
+
+    position 保留技能在 required_skills 中的順序
+    position keeps the order of the skill within required_skills
+    """
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job_posting', 'skill'], name='unique_job_posting_skill'),
+        ]
+        indexes = [
+            # 依技能反查職缺 / Look up postings by skill
+            models.Index(fields=['skill', 'job_posting'], name='jobskill_skill_job_idx'),
+        ]
+
+
+# 背景工作模型 / Background Task Model
+class Task(models.Model):
+    """
+    資料庫佇列中的背景工作 / Background task in the database queue
+
+    name 為可呼叫物件的點分路徑，payload 為關鍵字參數；由 manage.py run_workers 執行（見 jobs.tasks）
+    name is the dotted path of a callable and payload its keyword arguments; run by
+    manage.py run_workers (see jobs.tasks)
+    """
+    name = models.CharField(max_length=TASK_NAME_MAX_LENGTH)
+    payload = models.JSONField(default=dict)
+    # 重複加入時的去重鍵 / Deduplication key for repeated enqueues
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=TASK_STATUS_MAX_LENGTH, choices=TASK_STATUS_CHOICES, default=TaskStatus.QUEUED.value)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    # 最早可執行時間，重試時往後延 / Earliest run time, pushed back on retry
+    run_after = models.DateTimeField()
+    # 認領中的工作行程與時間 / Claiming worker and time
+    locked_by = models.CharField(max_length=255, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # 認領到期工作 / Claiming due tasks
+            models.Index(fields=['status', 'run_after'], name='jobs_task_status_run_idx'),
+            # 清除與延遲量測 / Purging and latency metrics
+            models.Index(fields=['status', 'finished_at'], name='jobs_task_status_done_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,117 @@
+"""
+職缺回應的內容協商 / Content negotiation for job responses
+
+- 稀疏欄位：fields=id,title,... 只輸出指定欄位，ORM 也只投影對應欄位（列表可完全略過 description）
+  Sparse fieldsets: fields=id,title,... outputs only the named fields and the ORM projects only
+  their columns (list views can skip description entirely)
+- 編碼：Accept 偏好 application/msgpack 且已安裝 msgpack 時輸出 MessagePack，否則為 JSON
+  Encoding: MessagePack when Accept prefers application/msgpack and msgpack is installed,
+  JSON otherwise
+
+非預設表示法會納入快取鍵與 ETag，回應帶有 Vary: Accept
+Non-default representations are part of the cache key and the ETag; responses carry Vary: Accept
+"""
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+
+from jobs.schemas import JobPostingOut
+
+try:
+    import msgpack
+except ImportError:  # 選用相依套件 / Optional dependency
+    msgpack = None
+
+# 可選的輸出欄位（依輸出順序） / Selectable output fields, in output order
+OUTPUT_FIELDS = tuple(JobPostingOut.model_fields)
+
+# 回應內容類型 / Response content types
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+# 視為 MessagePack 的媒體類型 / Media types treated as MessagePack
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack", "application/vnd.msgpack")
+
+
+class InvalidFields(ValueError):
+    """
+    fields 參數包含未知欄位 / The fields param names unknown fields
+    """
+
+
+class ResponseFormat(str, Enum):
+    """
+    回應編碼 / Response encoding
+    """
+    JSON = "json"
+    MSGPACK = "msgpack"
+
+
+def parse_fields(value) -> Optional[Tuple[str, ...]]:
+    """
+    解析 fields 參數為依輸出順序排列的欄位組；未指定或包含全部欄位時回傳 None
+    Parse the fields param into a field tuple in output order; None when absent or naming every field
+
+    順序固定使語意相同的參數共用快取鍵 / A fixed order lets equivalent params share cache keys
+    """
+    if value is None:
+        return None
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    if not names:
+        return None
+    unknown = sorted(names.difference(OUTPUT_FIELDS))
+    if unknown:
+        raise InvalidFields(f"Unknown fields: {', '.join(unknown)}; choose from {', '.join(OUTPUT_FIELDS)}")
+    fields = tuple(name for name in OUTPUT_FIELDS if name in names)
+    return None if fields == OUTPUT_FIELDS else fields
+
+
+def negotiate_format(request):
+    """
+    依 Accept 標頭選擇編碼；未安裝 msgpack 時一律為 JSON / Pick the encoding from the Accept header; always JSON without msgpack
+    """
+    if msgpack is None or "HTTP_ACCEPT" not in request.META:
+        return ResponseFormat.JSON
+    preferred = request.get_preferred_type(["application/json", *MSGPACK_MEDIA_TYPES])
+    return ResponseFormat.MSGPACK if preferred in MSGPACK_MEDIA_TYPES else ResponseFormat.JSON
+
+
+class Representation(NamedTuple):
+    """
+    協商後的回應表示法 / Negotiated response representation
+    """
+    fields: Optional[Tuple[str, ...]] = None
+    format: ResponseFormat = ResponseFormat.JSON
+
+    @property
+    def variant(self):
+        """
+        納入快取鍵與 ETag 的變體；預設表示法為 None，與未協商的驗證值相同
+        Variant embedded in cache keys and ETags; None for the default representation so it
+        matches validators computed without negotiation
+        """
+        if self.fields is None and self.format is ResponseFormat.JSON:
+            return None
+        return {"fields": self.fields and list(self.fields), "format": self.format.value}
+
+    @property
+    def headers(self):
+        """
+        表示法的回應標頭 / Response headers of the representation
+        """
+        content_type = MSGPACK_CONTENT_TYPE if self.format is ResponseFormat.MSGPACK else JSON_CONTENT_TYPE
+        return {"Content-Type": content_type, "Vary": "Accept"}
+
+
+def negotiate(request, fields=None):
+    """
+    由 fields 參數與 Accept 標頭決定表示法，未知欄位拋出 InvalidFields
+    Resolve the representation from the fields param and the Accept header; unknown fields raise InvalidFields
+    """
+    return Representation(parse_fields(fields), negotiate_format(request))
+
+
+def pack(payload):
+    """
+    將已轉為 JSON 相容型別的資料編碼為 MessagePack / Encode JSON-compatible data as MessagePack
+    """
+    return msgpack.packb(payload, use_bin_type=True)
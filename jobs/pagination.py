@@ -0,0 +1,144 @@
+"""
+職缺列表的游標（keyset）分頁 / Cursor (keyset) pagination for job listings
+
+以 (排序欄位, id) 作為鍵，避免 OFFSET 需要逐筆略過前面資料的線性成本
+Keys on (sort field, id) so deep pages avoid the linear cost of OFFSET skipping rows
+"""
+import base64
+import binascii
+import json
+from datetime import date
+
+from django.db.models import Q
+
+# 游標格式版本，格式變更時遞增 / Cursor format version, bump when the format changes
+CURSOR_VERSION = 1
+
+# 值為日期的排序欄位，其餘排序欄位為整數 / Sort fields holding dates; the other sort fields hold integers
+DATE_SORT_FIELDS = ("posting_date", "expiration_date")
+
+
+class InvalidCursor(ValueError):
+    """
+    游標無法解析或與目前排序不符 / The cursor cannot be decoded or does not match the current sort
+    """
+
+
+def _encode_sort_value(sort_value):
+    """
+    日期以 ISO 字串編碼，整數與 null 原樣保留 / Dates are encoded as ISO strings; integers and nulls are kept as is
+    """
+    return sort_value.isoformat() if isinstance(sort_value, date) else sort_value
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _decode_sort_value(raw_value, sort_field):
+    """
+    _encode_sort_value 的反向操作，型別需與排序欄位相符 / Reverse of _encode_sort_value; the type must match the sort field
+    """
+    if raw_value is None:
+        return None
+    if sort_field in DATE_SORT_FIELDS:
+        if isinstance(raw_value, str):
+            return date.fromisoformat(raw_value)
+    elif _is_integer(raw_value):
+        return raw_value
+    raise ValueError("Sort value does not match the sort field")
+
+
+def encode_cursor(sort_field, sort_desc, sort_value, job_id):
+    """
+    將最後一筆的排序鍵編碼為不透明游標 / Encode the sort key of the last row into an opaque cursor
+    """
+    payload = {
+        "v": CURSOR_VERSION,
+        "f": sort_field,
+        "d": bool(sort_desc),
+        "k": _encode_sort_value(sort_value),
+        "id": job_id,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_field, sort_desc):
+    """
+    解析游標並確認與目前排序一致 / Decode a cursor and check it matches the current sort
+
+    回傳 (排序值, id)；格式錯誤或排序不符時拋出 InvalidCursor
+    Returns (sort value, id); raises InvalidCursor on malformed cursors or a sort mismatch
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, dict):
+            raise ValueError("Cursor payload is not an object")
+        if payload["v"] != CURSOR_VERSION:
+            raise InvalidCursor("Unsupported cursor version")
+        if payload["f"] != sort_field or payload["d"] is not bool(sort_desc):
+            raise InvalidCursor("Cursor does not match the current sort order")
+        sort_value = _decode_sort_value(payload["k"], sort_field)
+        job_id = payload["id"]
+        if not _is_integer(job_id):
+            raise ValueError("Cursor id is not an integer")
+    except InvalidCursor:
+        raise
+    except (binascii.Error, ValueError, KeyError, TypeError) as error:
+        raise InvalidCursor("Invalid cursor") from error
+    return sort_value, job_id
+
+
+def seek_after(queryset, sort_field, sort_desc, sort_value, job_id):
+    """
+    過濾出排在游標之後的資料 / Keep only rows ordered after the cursor position
+
+    寫成 field >= v AND (field > v OR id > x)，讓 SQLite 能以索引範圍掃描；
+    可為 null 的欄位（薪資）null 排在最後，因此另外接上 null 的部分
+    Written as field >= v AND (field > v OR id > x) so SQLite can use an index range scan;
+    nullable fields (salaries) sort nulls last, so the null tail is appended separately
+    """
+    id_lookup = "id__lt" if sort_desc else "id__gt"
+    if sort_value is None:
+        # 游標已在 null 區段，只依 id 前進 / The cursor is inside the null tail; advance by id only
+        return queryset.filter(**{f"{sort_field}__isnull": True, id_lookup: job_id})
+
+    if sort_desc:
+        condition = Q(**{f"{sort_field}__lte": sort_value}) & (
+            Q(**{f"{sort_field}__lt": sort_value}) | Q(**{sort_field: sort_value, "id__lt": job_id})
+        )
+    else:
+        condition = Q(**{f"{sort_field}__gte": sort_value}) & (
+            Q(**{f"{sort_field}__gt": sort_value}) | Q(**{sort_field: sort_value, "id__gt": job_id})
+        )
+    if queryset.model._meta.get_field(sort_field).null:
+        condition |= Q(**{f"{sort_field}__isnull": True})
+    return queryset.filter(condition)
+
+
+def paginate_by_cursor(queryset, sort_field, sort_desc, limit, cursor=None):
+    """
+    取得一頁資料與下一頁游標 / Fetch one page and the cursor of the next page
+
+    queryset 需已依 (sort_field, id) 同方向排序，可為模型或 values() 查詢；多取一筆以判斷是否還有下一頁
+    The queryset must already be ordered by (sort_field, id) in one direction and may yield
+    models or values() dicts; one extra row is fetched to tell whether another page exists
+    """
+    if cursor:
+        sort_value, job_id = decode_cursor(cursor, sort_field, sort_desc)
+        queryset = seek_after(queryset, sort_field, sort_desc, sort_value, job_id)
+
+    rows = list(queryset[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last_row = rows[-1]
+    if isinstance(last_row, dict):
+        sort_value, job_id = last_row[sort_field], last_row["id"]
+    else:
+        sort_value, job_id = getattr(last_row, sort_field), last_row.id
+    next_cursor = encode_cursor(sort_field, sort_desc, sort_value, job_id)
+    return rows, next_cursor
@@ -0,0 +1,134 @@
+"""
+職缺列表查詢建構 / Job posting list query construction
+
+將 JobFilterParams 轉為 QuerySet 的共用邏輯，供列表端點與其他讀取路徑重用
+Shared logic turning JobFilterParams into a QuerySet, reused by the list endpoint and
+other read paths
+
+原邏輯位於 jobs.api.list_job_postings / Originally inlined in jobs.api.list_job_postings
+"""
+from django.db.models import F
+
+from jobs.locations import apply_near_filter, location_condition
+from jobs.models import JobPosting
+from jobs.salary import apply_salary_filter
+from jobs.search import apply_search, annotate_rank
+from jobs.skills import filter_by_skills, parse_skill_names
+from jobs.status import aensure_transitioned, ensure_transitioned, stored_status_condition
+
+# 可排序的欄位 / Sortable fields
+SORTABLE_FIELDS = ("posting_date", "expiration_date", "salary_min", "salary_max")
+
+# 可為 null 的排序欄位，null 一律排在最後 / Nullable sort fields, whose nulls always sort last
+NULLABLE_SORT_FIELDS = ("salary_min", "salary_max")
+
+# 預設排序欄位 / Default sort field
+DEFAULT_SORT_FIELD = "posting_date"
+
+# 依相關度排序的 sort_by 值 / sort_by value ordering by relevance
+RELEVANCE_SORT = "relevance"
+
+
+def prepare_status_filter(filters):
+    """
+    依狀態過濾前補做當天的轉換 / Catch up the day's transition before filtering by status
+
+    由端點在建立查詢前呼叫，本行程當天已轉換時不做任何事 / Called by endpoints before building the query; a no-op once this process has transitioned the day
+    """
+    if filters.status:
+        ensure_transitioned()
+
+
+async def aprepare_status_filter(filters):
+    """
+    prepare_status_filter 的非同步版本 / Async version of prepare_status_filter
+    """
+    if filters.status:
+        await aensure_transitioned()
+
+
+def filter_by_status(queryset, status):
+    """
+    依職缺狀態過濾 / Filter by job status
+
+    比對儲存的 status 欄位（使用 (status, 日期) 複合索引）並檢查日期；轉換延遲時仍停留在此狀態的列不會出現，
+    尚未轉入的列則由端點先呼叫 prepare_status_filter 補上
+    Matches the stored status column (using the (status, date) composite indexes) and checks the
+    dates, so rows still holding the status while the transition is late are dropped; rows not
+    yet moved into it are caught up by the endpoint calling prepare_status_filter first
+    """
+    if status:
+        return queryset.filter(stored_status_condition(status))
+    return queryset
+
+
+def filter_job_postings(filters, queryset=None):
+    """
+    套用搜尋與過濾條件 / Apply search and filter conditions
+
+    不包含排序與分頁 / Does not apply sorting or pagination
+    """
+    queryset = JobPosting.objects.all() if queryset is None else queryset
+
+    # 文本搜索（SQLite 使用 FTS5 索引） / Text search (uses the FTS5 index on SQLite)
+    if filters.search:
+        queryset = apply_search(queryset, filters.search)
+
+    # 按状态筛选 / Filter by status
+    queryset = filter_by_status(queryset, filters.status)
+
+    # 按特定字段筛选 / Filter by specific fields
+    if filters.location:
+        # 原始文字包含查詢字串，或解析為同一標準地點 / Raw text contains the term or resolves to the same standard location
+        queryset = queryset.filter(location_condition(filters.location))
+    if filters.company:
+        queryset = queryset.filter(company_name__icontains=filters.company)
+    if filters.skill:
+        # 透過正規化技能表精確比對 / Exact match through the normalized skill tables
+        queryset = filter_by_skills(queryset, parse_skill_names(filters.skill), filters.skill_match)
+    # 薪資範圍（overlap/contain） / Salary range (overlap/contain)
+    queryset = apply_salary_filter(queryset, filters.salary_min, filters.salary_max, filters.salary_match)
+    # 距離範圍（geo_cell 邊界框預篩） / Proximity (geo_cell bounding-box prefilter)
+    queryset = apply_near_filter(queryset, filters.near, filters.radius_km)
+    return queryset
+
+
+def resolve_sort_field(filters):
+    """
+    取得有效的排序欄位 / Resolve the effective sort field
+
+    非法值退回預設的 posting_date / Invalid values fall back to posting_date
+    """
+    if filters.sort_by in SORTABLE_FIELDS:
+        return filters.sort_by
+    return DEFAULT_SORT_FIELD
+
+
+def sort_job_postings(queryset, filters):
+    """
+    套用排序 / Apply sorting
+
+    sort_by=relevance 且有搜索字串時依 bm25 排序，否則依日期或薪資欄位排序
+    Orders by bm25 when sort_by=relevance with a search term, otherwise by a date or salary field
+    """
+    if filters.sort_by == RELEVANCE_SORT and filters.search:
+        # bm25 分數越小越相關 / Lower bm25 scores are more relevant
+        return annotate_rank(queryset, filters.search).order_by("search_rank", "id")
+
+    # 以 id 作為次要排序鍵，確保分頁順序穩定 / id breaks ties so pagination order is stable
+    sort_field = resolve_sort_field(filters)
+    if sort_field in NULLABLE_SORT_FIELDS:
+        # 沒有薪資資料的職缺無論方向都排在最後 / Postings without the bound sort last in either direction
+        if filters.sort_desc:
+            return queryset.order_by(F(sort_field).desc(nulls_last=True), "-id")
+        return queryset.order_by(F(sort_field).asc(nulls_last=True), "id")
+    if filters.sort_desc:
+        return queryset.order_by(f"-{sort_field}", "-id")
+    return queryset.order_by(sort_field, "id")
+
+
+def build_job_queryset(filters):
+    """
+    建立完整的列表查詢（過濾＋排序，不含分頁） / Build the full list query (filter + sort, no pagination)
+    """
+    return sort_job_postings(filter_job_postings(filters), filters)
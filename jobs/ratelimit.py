@@ -0,0 +1,254 @@
+"""
+令牌桶限流 / Token bucket rate limiting
+
+登入會對每次嘗試執行完整的密碼雜湊，因此以每個 IP 與每個帳號的令牌桶限制嘗試速率；
+職缺端點可在設定中啟用每位使用者（匿名時為 IP）的限流。超過速率時回應 429 與 Retry-After。
+Login runs the full password hasher on every attempt, so attempts are limited by per-IP and
+per-username token buckets; job endpoints can enable a per-user (per-IP when anonymous) limit
+in settings. Requests over the rate get 429 with Retry-After.
+
+桶的狀態預設存於行程記憶體（LocalTokenBucketBackend）；多行程部署可改用
+CacheTokenBucketBackend 透過 Django 快取（例如 Redis）共用。
+Bucket state lives in process memory by default (LocalTokenBucketBackend); multi-process
+deployments can share it through the Django cache (e.g. Redis) with CacheTokenBucketBackend.
+"""
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.module_loading import import_string
+from ninja.errors import Throttled
+from ninja.throttling import BaseThrottle
+
+# 預設設定，可由 settings.JOBS_RATE_LIMIT 覆寫 / Defaults, overridable by settings.JOBS_RATE_LIMIT
+DEFAULT_RATE_LIMIT_SETTINGS = {
+    "ENABLED": True,
+    "BACKEND": "jobs.ratelimit.LocalTokenBucketBackend",
+    "ALIAS": "default",  # CacheTokenBucketBackend 使用的 CACHES 別名 / CACHES alias used by CacheTokenBucketBackend
+    "MAX_KEYS": 100_000,  # LocalTokenBucketBackend 最多保存的桶數 / Buckets kept by LocalTokenBucketBackend
+    # 各範圍的速率（"次數/期間"），None 表示不限制 / Rate per scope ("count/period"), None disables it
+    "RATES": {
+        "login_ip": "30/min",
+        "login_user": "10/min",
+        "jobs": None,
+    },
+}
+
+# 速率字串可用的期間單位 / Period units accepted in rate strings
+PERIODS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+}
+
+
+def get_rate_limit_settings():
+    """
+    取得合併預設值後的限流設定 / Get rate limit settings merged with defaults
+
+    RATES 逐項合併，只覆寫部分範圍時其他範圍保留預設 / RATES is merged per scope so partial overrides keep the other defaults
+    """
+    overrides = getattr(settings, "JOBS_RATE_LIMIT", {})
+    merged = {**DEFAULT_RATE_LIMIT_SETTINGS, **overrides}
+    merged["RATES"] = {**DEFAULT_RATE_LIMIT_SETTINGS["RATES"], **overrides.get("RATES", {})}
+    return merged
+
+
+def parse_rate(rate):
+    """
+    解析 "次數/期間" 為（容量, 每秒補充量） / Parse "count/period" into (capacity, tokens refilled per second)
+
+    期間可帶倍數，例如 "100/5min" / The period may carry a multiplier, e.g. "100/5min"
+    """
+    try:
+        count, period = rate.split("/", 1)
+        digits = period.rstrip("abcdefghijklmnopqrstuvwxyz")
+        seconds = int(digits or 1) * PERIODS[period[len(digits):] or "s"]
+        capacity = int(count)
+    except (ValueError, KeyError):
+        raise ValueError(f"Invalid rate: {rate!r}") from None
+    if capacity <= 0:
+        raise ValueError(f"Invalid rate: {rate!r}")
+    return capacity, capacity / seconds
+
+
+def _refill(state, capacity, refill_rate, now):
+    """
+    依經過時間補充令牌 / Refill tokens for the elapsed time
+
+    state 為（令牌數, 更新時間）或 None（滿桶） / state is (tokens, updated_at) or None for a full bucket
+    """
+    if state is None:
+        return float(capacity)
+    tokens, updated_at = state
+    return min(float(capacity), tokens + max(now - updated_at, 0.0) * refill_rate)
+
+
+def _take(tokens, refill_rate):
+    """
+    嘗試取出一個令牌，回傳（剩餘令牌, 需等待秒數） / Try to take one token; returns (tokens left, seconds to wait)
+    """
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / refill_rate
+
+
+class LocalTokenBucketBackend:
+    """
+    行程內的令牌桶，超過 MAX_KEYS 時移除最久未使用的桶 / In-process token buckets; the least recently used bucket goes beyond MAX_KEYS
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        取出一個令牌，回傳需等待秒數（0 表示允許） / Take one token; returns seconds to wait (0 means allowed)
+        """
+        now = now or time.time()
+        with self._lock:
+            tokens, wait = _take(_refill(self._buckets.get(key), capacity, refill_rate, now), refill_rate)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > get_rate_limit_settings()["MAX_KEYS"]:
+                self._buckets.popitem(last=False)
+        return wait
+
+    def reset(self):
+        """
+        清除所有桶 / Clear every bucket
+        """
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheTokenBucketBackend:
+    """
+    存於 Django 快取的令牌桶，可跨行程共用 / Token buckets in the Django cache, shared across processes
+
+    讀取與寫入之間沒有鎖，高併發下可能多放行少量請求；桶在補滿所需時間後自動過期
+    Reads and writes are not locked, so heavy concurrency may let a few extra requests through;
+    buckets expire once they would have refilled completely
+    """
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        取出一個令牌，回傳需等待秒數（0 表示允許） / Take one token; returns seconds to wait (0 means allowed)
+        """
+        now = now or time.time()
+        cache = caches[get_rate_limit_settings()["ALIAS"]]
+        cache_key = f"jobs-ratelimit:{key}"
+        tokens, wait = _take(_refill(cache.get(cache_key), capacity, refill_rate, now), refill_rate)
+        cache.set(cache_key, (tokens, now), timeout=math.ceil(capacity / refill_rate))
+        return wait
+
+    def reset(self):
+        """
+        快取中的桶隨快取清除 / Buckets in the cache are cleared with the cache
+        """
+
+
+# 依類別路徑保存的後端實例 / Backend instances by class path
+_backends = {}
+
+# 保護後端建立的鎖 / Lock guarding backend creation
+_backends_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    取得設定中的限流後端 / Get the configured rate limit backend
+    """
+    path = get_rate_limit_settings()["BACKEND"]
+    with _backends_lock:
+        if path not in _backends:
+            _backends[path] = import_string(path)()
+        return _backends[path]
+
+
+def reset_rate_limits():
+    """
+    清除所有行程內的桶 / Clear every in-process bucket
+    """
+    with _backends_lock:
+        backends = list(_backends.values())
+    for backend in backends:
+        backend.reset()
+
+
+# 解析客戶端 IP（遵循 NINJA_NUM_PROXIES） / Resolves the client IP (honours NINJA_NUM_PROXIES)
+_ip_resolver = BaseThrottle()
+
+
+def client_ip(request):
+    """
+    取得請求的客戶端 IP / Get the client IP of a request
+    """
+    return _ip_resolver.get_ident(request)
+
+
+def consume(scope, ident):
+    """
+    從某範圍的某個身分的桶取出一個令牌 / Take one token from the bucket of an identity in a scope
+
+    回傳需等待秒數，範圍未設定速率或限流停用時為 0 / Returns seconds to wait; 0 when the scope has no rate or limiting is disabled
+    """
+    rate_settings = get_rate_limit_settings()
+    rate = rate_settings["RATES"].get(scope)
+    if not rate_settings["ENABLED"] or rate is None:
+        return 0.0
+    capacity, refill_rate = parse_rate(rate)
+    digest = hashlib.sha256(str(ident).encode()).hexdigest()[:32]
+    return get_backend().consume(f"{scope}:{digest}", capacity, refill_rate)
+
+
+def enforce(scope, ident):
+    """
+    超過速率時拋出 Throttled（429） / Raise Throttled (429) when the rate is exceeded
+    """
+    wait = consume(scope, ident)
+    if wait:
+        raise Throttled(wait=wait)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    django-ninja 的令牌桶限流 / Token bucket throttle for django-ninja
+
+    已認證請求以使用者為身分，匿名請求以 IP 為身分；實例在請求間共用，等待時間存於執行緒區域變數
+    Authenticated requests are keyed by user and anonymous ones by IP; instances are shared
+    across requests, so the wait time lives in a thread local
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self._local = threading.local()
+
+    def get_ident(self, request):
+        user = getattr(request, "auth", None)
+        if user is not None and getattr(user, "pk", None) is not None:
+            return f"user:{user.pk}"
+        return f"ip:{client_ip(request)}"
+
+    def allow_request(self, request):
+        self._local.wait = consume(self.scope, self.get_ident(request))
+        return not self._local.wait
+
+    def wait(self):
+        return getattr(self._local, "wait", None)
+
+
+def throttled_response(api, request, exc):
+    """
+    429 回應並附上 Retry-After（向上取整秒數） / 429 response with Retry-After in whole seconds
+    """
+    response = api.create_response(request, {"detail": str(exc)}, status=exc.status_code)
+    if exc.wait:
+        response["Retry-After"] = str(math.ceil(exc.wait))
+    return response
@@ -0,0 +1,56 @@
+"""
+本機 SQLite 複寫替身 / Local SQLite replication stand-in
+
+SQLite 沒有內建複寫；本機開發與測試時以 sqlite3 線上備份 API 將 default 整份複製到各副本檔案，
+讓 ReplicaRouter 在兩個真實檔案間運作。備份在副本上是單一交易，讀取者看到的是完整的舊版或新版。
+正式環境應改用資料庫本身的複寫（例如 PostgreSQL 串流複寫或 LiteFS），不要執行 sync_replicas。
+SQLite has no built-in replication; for local development and tests the sqlite3 online backup API
+copies default wholesale into each replica file, so ReplicaRouter runs against two real files.
+The backup is one transaction on the replica, so readers see either the old or the new copy.
+Production should rely on real replication (e.g. PostgreSQL streaming replication or LiteFS)
+instead of running sync_replicas.
+"""
+import sqlite3
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from jobs.routers import get_replica_settings
+
+
+def copy_database(source_connection, target_path, timeout=5):
+    """
+    以線上備份 API 將 SQLite 連線的資料庫複製到目標檔案 / Copy an SQLite connection's database into a target file with the online backup API
+    """
+    source_connection.ensure_connection()
+    target = sqlite3.connect(target_path, timeout=timeout)
+    try:
+        source_connection.connection.backup(target)
+    finally:
+        target.close()
+
+
+def sync_replica(alias, source=DEFAULT_DB_ALIAS):
+    """
+    將來源資料庫複製到一個 SQLite 副本，回傳耗時秒數；副本與來源為同一檔案（測試鏡像）時不動作
+    Copy the source database into one SQLite replica and return the seconds taken; a replica
+    sharing the source file (a test mirror) is left alone
+    """
+    source_connection = connections[source]
+    replica_settings_dict = connections[alias].settings_dict
+    if source_connection.vendor != "sqlite" or connections[alias].vendor != "sqlite":
+        raise ValueError(f"Replication stand-in only supports SQLite databases, got {alias!r}")
+    if str(replica_settings_dict["NAME"]) == str(source_connection.settings_dict["NAME"]):
+        return 0.0
+
+    started_at = time.perf_counter()
+    copy_database(source_connection, replica_settings_dict["NAME"], replica_settings_dict["OPTIONS"].get("timeout", 5))
+    return time.perf_counter() - started_at
+
+
+def sync_replicas(aliases=None, source=DEFAULT_DB_ALIAS):
+    """
+    複製到每個設定的副本，回傳各別名耗時秒數 / Copy into every configured replica and return the seconds taken per alias
+    """
+    aliases = get_replica_settings()["ALIASES"] if aliases is None else aliases
+    return {alias: sync_replica(alias, source) for alias in aliases}
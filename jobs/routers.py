@@ -0,0 +1,248 @@
+"""
+讀取副本路由 / Read-replica routing
+
+ReplicaRouter 將職缺（ROUTED_APPS）的讀取送往 JOBS_REPLICAS["ALIASES"] 中的副本，寫入一律送往 default：
+ReplicaRouter sends reads of job models (ROUTED_APPS) to the replicas in JOBS_REPLICAS["ALIASES"]
+and every write to default:
+- STRATEGY="round_robin" 依序輪流；"least_loaded" 選擇本行程進行中請求最少的副本
+  STRATEGY="round_robin" takes turns; "least_loaded" picks the replica with the fewest
+  in-flight requests in this process
+- 同一請求的讀取固定使用同一副本，避免分頁與 ETag 彙總讀到不同時間點
+  All reads of one request stick to one replica, so a page and its ETag aggregate see the same
+  point in time
+- 只有 GET/HEAD 請求會讀取副本；寫入方法的請求（含其交易）與請求以外（管理指令、shell）的讀取都走 default
+  Only GET/HEAD requests read from replicas; requests with write methods (and so their
+  transactions) and reads outside requests (management commands, the shell) use default
+- 讀己之寫：請求內寫入後的讀取，以及寫入後 PIN_SECONDS 秒內同一客戶端（使用者或 IP）的讀取都走 default
+  Read-your-writes: reads after a write in the same request and reads from the same client
+  (user or IP) within PIN_SECONDS of a write go to default
+
+ReplicaPinningMiddleware 提供請求範圍的狀態並在寫入後記錄釘選；釘選存於 Django 快取，多行程部署需共用快取
+ReplicaPinningMiddleware provides the per-request state and records the pin after a write; pins
+live in the Django cache, which must be shared in multi-process deployments
+"""
+import itertools
+import threading
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+
+from jobs.ratelimit import client_ip
+
+# 預設設定，可由 settings.JOBS_REPLICAS 覆寫 / Defaults, overridable by settings.JOBS_REPLICAS
+DEFAULT_REPLICA_SETTINGS = {
+    "ENABLED": False,
+    "ALIASES": [],  # DATABASES 中的副本別名 / Replica aliases in DATABASES
+    "STRATEGY": "round_robin",  # "round_robin" 或 "least_loaded" / "round_robin" or "least_loaded"
+    "PIN_SECONDS": 5,  # 寫入後該客戶端讀取 default 的秒數 / Seconds a client reads from default after a write
+    "ROUTED_APPS": ["jobs"],  # 讀取送往副本的應用 / Apps whose reads go to replicas
+    "CACHE_ALIAS": "default",  # 記錄釘選的 CACHES 別名 / CACHES alias recording pins
+}
+
+STRATEGIES = ("round_robin", "least_loaded")
+
+# 可讀取副本的 HTTP 方法 / HTTP methods allowed to read from replicas
+REPLICA_METHODS = ("GET", "HEAD")
+
+# 請求範圍的路由狀態 / Per-request routing state
+_current = ContextVar("jobs_replica_routing", default=None)
+
+# 本行程的輪流計數與各副本進行中的請求數 / Round-robin counter and in-flight requests per replica in this process
+_turns = itertools.count()
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def get_replica_settings():
+    """
+    取得合併預設值後的副本設定 / Get replica settings merged with defaults
+    """
+    return {**DEFAULT_REPLICA_SETTINGS, **getattr(settings, "JOBS_REPLICAS", {})}
+
+
+def replica_aliases(replica_settings=None):
+    """
+    啟用中的副本別名；停用或未設定時為空 / Active replica aliases; empty when disabled or unset
+    """
+    replica_settings = replica_settings or get_replica_settings()
+    if not replica_settings["ENABLED"]:
+        return ()
+    return tuple(replica_settings["ALIASES"])
+
+
+def choose_replica(aliases, strategy):
+    """
+    依策略選擇副本 / Pick a replica by strategy
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Invalid JOBS_REPLICAS['STRATEGY']: {strategy!r}; choose from {', '.join(STRATEGIES)}")
+    if strategy == "least_loaded":
+        with _in_flight_lock:
+            # 同數時依輪流次序，避免總是選第一個 / Ties fall back to turn order so the first replica is not always chosen
+            offset = next(_turns)
+            ordered = aliases[offset % len(aliases):] + aliases[:offset % len(aliases)]
+            return min(ordered, key=lambda alias: _in_flight.get(alias, 0))
+    return aliases[next(_turns) % len(aliases)]
+
+
+def in_flight():
+    """
+    各副本進行中的請求數，供量測與測試 / In-flight requests per replica, for inspection and tests
+    """
+    with _in_flight_lock:
+        return {alias: count for alias, count in _in_flight.items() if count}
+
+
+def _pin_key(client):
+    return f"jobs-replica:pin:{client}"
+
+
+def _pin_cache():
+    return caches[get_replica_settings()["CACHE_ALIAS"]]
+
+
+def client_key(request):
+    """
+    讀己之寫的客戶端身分：已認證使用者，否則為 IP / Client identity for read-your-writes: the authenticated user, else the IP
+    """
+    user = getattr(request, "auth", None)
+    if user is not None and getattr(user, "pk", None) is not None:
+        return f"user:{user.pk}"
+    return f"ip:{client_ip(request)}"
+
+
+def pin_client(client, seconds=None):
+    """
+    在一段時間內將客戶端的讀取釘選於 default / Pin a client's reads to default for a while
+    """
+    seconds = get_replica_settings()["PIN_SECONDS"] if seconds is None else seconds
+    if seconds > 0:
+        _pin_cache().set(_pin_key(client), True, timeout=seconds)
+
+
+def is_pinned(client):
+    """
+    客戶端目前是否釘選於 default / Whether a client is currently pinned to default
+    """
+    return bool(_pin_cache().get(_pin_key(client)))
+
+
+class RoutingState:
+    """
+    單一請求的路由狀態 / Routing state of one request
+
+    副本與釘選狀態在第一次讀取時才決定，此時認證已完成 / The replica and the pin are resolved on the
+    first read, after authentication has run
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.replica = None
+        self.pinned = None
+        self.wrote = False
+        self.primary_only = request.method not in REPLICA_METHODS
+
+    def read_alias(self, aliases, replica_settings):
+        """
+        本請求讀取使用的別名 / Alias this request reads from
+        """
+        if self.primary_only or self.wrote:
+            return DEFAULT_DB_ALIAS
+        if self.pinned is None:
+            self.pinned = is_pinned(client_key(self.request))
+        if self.pinned:
+            return DEFAULT_DB_ALIAS
+        if self.replica is None:
+            self.replica = choose_replica(aliases, replica_settings["STRATEGY"])
+            with _in_flight_lock:
+                _in_flight[self.replica] = _in_flight.get(self.replica, 0) + 1
+        return self.replica
+
+    def finish(self):
+        """
+        請求結束：釋放副本並在寫入後釘選客戶端 / Request finished: release the replica and pin the client after a write
+        """
+        if self.replica is not None:
+            with _in_flight_lock:
+                _in_flight[self.replica] -= 1
+            self.replica = None
+        if self.wrote:
+            pin_client(client_key(self.request))
+
+
+class ReplicaRouter:
+    """
+    讀取送往副本、寫入送往 default 的資料庫路由 / Database router sending reads to replicas and writes to default
+    """
+
+    def db_for_read(self, model, **hints):
+        replica_settings = get_replica_settings()
+        aliases = replica_aliases(replica_settings)
+        if not aliases or model._meta.app_label not in replica_settings["ROUTED_APPS"]:
+            return None
+        state = _current.get()
+        if state is None:
+            return None
+        return state.read_alias(aliases, replica_settings)
+
+    def db_for_write(self, model, **hints):
+        state = _current.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 副本是 default 的複本，跨別名的關聯仍是同一份資料 / Replicas copy default, so relations across aliases are the same data
+        aliases = {DEFAULT_DB_ALIAS, *get_replica_settings()["ALIASES"]}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 副本由複寫取得結構，不直接遷移 / Replicas get their schema through replication, never by migrating
+        if db in get_replica_settings()["ALIASES"]:
+            return False
+        return None
+
+
+class ReplicaPinningMiddleware:
+    """
+    提供請求範圍的路由狀態並在寫入後釘選客戶端 / Provide per-request routing state and pin clients after writes
+
+    同時支援 WSGI 與 ASGI / Supports both WSGI and ASGI
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not replica_aliases():
+            return self.get_response(request)
+        state = RoutingState(request)
+        token = _current.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            _current.reset(token)
+            state.finish()
+
+    async def __acall__(self, request):
+        if not replica_aliases():
+            return await self.get_response(request)
+        state = RoutingState(request)
+        token = _current.set(state)
+        try:
+            return await self.get_response(request)
+        finally:
+            _current.reset(token)
+            state.finish()
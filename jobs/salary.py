@@ -0,0 +1,304 @@
+"""
+職缺薪資範圍過濾與分布 / Salary range filtering and distribution for job postings
+
+薪資範圍 [salary_min, salary_max] 中為 null 的一端視為無上/下限；兩端皆為 null 的職缺不符合任何薪資過濾。
+- overlap：職缺範圍與查詢範圍有交集 / the posting range intersects the requested range
+- contain：職缺範圍完全落在查詢範圍內 / the posting range lies entirely within the requested range
+
+SQLite 上以 R*Tree（rtree_i32）虛擬表作為範圍索引，並以觸發器與 JobPosting 資料表同步；R*Tree 只用於
+縮小候選集合，精確條件仍以一般欄位比對，其他後端或未建立索引時只使用 salary_min/salary_max 的 B-tree 索引。
+A null bound in [salary_min, salary_max] is open-ended; postings with both bounds null never
+match a salary filter. On SQLite an R*Tree (rtree_i32) virtual table kept in sync by triggers
+serves as the range index. It only narrows the candidates while the exact conditions are still
+checked on the columns; other backends, or databases without the index, rely on the B-tree
+indexes on salary_min/salary_max.
+"""
+import logging
+from enum import Enum
+
+from django.conf import settings
+from django.db import OperationalError, connection
+from django.db.models import Count, F, IntegerField, Q
+from django.db.models.expressions import ExpressionWrapper, RawSQL
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
+
+
+class TooManyBuckets(ValueError):
+    """
+    分布圖級數超過上限 / The histogram has more buckets than allowed
+    """
+
+
+class SalaryMatch(str, Enum):
+    """
+    薪資範圍比對模式 / Salary range match mode
+    """
+    OVERLAP = "overlap"  # 範圍有交集 / Ranges intersect
+    CONTAIN = "contain"  # 職缺範圍落在查詢範圍內 / Posting range within the requested range
+
+
+# 預設設定，可由 settings.JOBS_SALARY 覆寫 / Defaults, overridable by settings.JOBS_SALARY
+DEFAULT_SALARY_SETTINGS = {
+    "DEFAULT_BUCKET_SIZE": 10_000,  # 分布圖預設級距 / Default histogram bucket size
+    "MAX_BUCKETS": 200,  # 分布圖最多級數 / Maximum number of histogram buckets
+}
+
+# R*Tree 範圍索引虛擬表名稱 / Name of the R*Tree range index virtual table
+SALARY_INDEX_TABLE = "jobs_jobposting_salary_rtree"
+
+# rtree_i32 的座標範圍，null 端點以此表示無上/下限 / Coordinate range of rtree_i32; null bounds map to these
+SALARY_LOWEST = -2 ** 31
+SALARY_HIGHEST = 2 ** 31 - 1
+
+
+def _clamped(expression):
+    """
+    將數值限制在 rtree_i32 座標範圍內的 SQL / SQL clamping a value into the rtree_i32 coordinate range
+    """
+    return f"MIN(MAX({expression}, {SALARY_LOWEST}), {SALARY_HIGHEST})"
+
+
+# 索引區間取兩端的包絡，即使 salary_min > salary_max 的資料也能寫入且不漏查
+# The indexed interval is the hull of both bounds, so rows with salary_min > salary_max can
+# still be stored without being missed
+_LOW_SQL = _clamped(f"MIN(COALESCE(new.salary_min, {SALARY_LOWEST}), COALESCE(new.salary_max, {SALARY_HIGHEST}))")
+_HIGH_SQL = _clamped(f"MAX(COALESCE(new.salary_min, {SALARY_LOWEST}), COALESCE(new.salary_max, {SALARY_HIGHEST}))")
+_HAS_SALARY_SQL = "new.salary_min IS NOT NULL OR new.salary_max IS NOT NULL"
+
+# 建立虛擬表與同步觸發器的 SQL / SQL creating the virtual table and its sync triggers
+CREATE_SALARY_INDEX_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SALARY_INDEX_TABLE} USING rtree_i32(id, salary_low, salary_high)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SALARY_INDEX_TABLE}_ai AFTER INSERT ON jobs_jobposting
+    WHEN {_HAS_SALARY_SQL} BEGIN
+        INSERT INTO {SALARY_INDEX_TABLE}(id, salary_low, salary_high) VALUES (new.id, {_LOW_SQL}, {_HIGH_SQL});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SALARY_INDEX_TABLE}_ad AFTER DELETE ON jobs_jobposting BEGIN
+        DELETE FROM {SALARY_INDEX_TABLE} WHERE id = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {SALARY_INDEX_TABLE}_au AFTER UPDATE OF salary_min, salary_max
+    ON jobs_jobposting BEGIN
+        DELETE FROM {SALARY_INDEX_TABLE} WHERE id = old.id;
+        INSERT INTO {SALARY_INDEX_TABLE}(id, salary_low, salary_high)
+        SELECT new.id, {_LOW_SQL}, {_HIGH_SQL} WHERE {_HAS_SALARY_SQL};
+    END
+    """,
+)
+
+# 移除虛擬表與觸發器的 SQL / SQL dropping the virtual table and its triggers
+DROP_SALARY_INDEX_SQL = (
+    f"DROP TRIGGER IF EXISTS {SALARY_INDEX_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SALARY_INDEX_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SALARY_INDEX_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SALARY_INDEX_TABLE}",
+)
+
+# 已確認建有索引的連線別名，避免每次請求都做 introspection
+# Connection aliases known to have the index, avoiding introspection on every request
+_indexed_aliases = set()
+
+
+def get_salary_settings():
+    """
+    取得合併預設值後的薪資設定 / Get salary settings merged with defaults
+    """
+    return {**DEFAULT_SALARY_SETTINGS, **getattr(settings, "JOBS_SALARY", {})}
+
+
+def is_salary_index_available(db_connection=None):
+    """
+    檢查目前連線是否可使用 R*Tree 範圍索引 / Check whether the R*Tree range index can be used on this connection
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        return False
+    if db_connection.alias in _indexed_aliases:
+        return True
+    with db_connection.cursor() as cursor:
+        has_index = SALARY_INDEX_TABLE in db_connection.introspection.table_names(cursor)
+    if has_index:
+        _indexed_aliases.add(db_connection.alias)
+    return has_index
+
+
+def create_salary_index(db_connection=None):
+    """
+    建立 R*Tree 虛擬表與觸發器 / Create the R*Tree virtual table and triggers
+
+    非 SQLite 或 SQLite 未編譯 R*Tree 模組時略過 / Skipped on non-SQLite backends or SQLite builds without R*Tree
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        logger.info("Skip salary index creation: vendor=%s", db_connection.vendor)
+        return False
+    try:
+        with db_connection.cursor() as cursor:
+            for statement in CREATE_SALARY_INDEX_SQL:
+                cursor.execute(statement)
+    except OperationalError as error:
+        logger.warning("Skip salary index creation: %s", error)
+        return False
+    return True
+
+
+def ensure_salary_triggers(db_connection=None):
+    """
+    若索引已存在則補建同步觸發器 / Recreate the sync triggers when the index exists
+
+    與全文檢索相同，SQLite 重建資料表時會刪除觸發器 / As with search, SQLite drops triggers when it rebuilds the table
+
+    遷移可能已移除虛擬表，因此重新檢查而不沿用快取的結果
+    A migration may have dropped the virtual table, so it is checked again instead of trusting the cached result
+    """
+    db_connection = db_connection or connection
+    _indexed_aliases.discard(db_connection.alias)
+    if not is_salary_index_available(db_connection):
+        return
+    create_salary_index(db_connection)
+
+
+def drop_salary_index(db_connection=None):
+    """
+    移除 R*Tree 虛擬表與觸發器 / Drop the R*Tree virtual table and triggers
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        return
+    with db_connection.cursor() as cursor:
+        for statement in DROP_SALARY_INDEX_SQL:
+            cursor.execute(statement)
+    _indexed_aliases.discard(db_connection.alias)
+
+
+def _row_sql(trigger_sql):
+    """
+    將觸發器中的 new.欄位 改寫為一般欄位 / Rewrite new.column references of trigger SQL into plain columns
+    """
+    return trigger_sql.replace("new.", "")
+
+
+def rebuild_salary_index(db_connection=None):
+    """
+    從 jobs_jobposting 重新建立整個範圍索引 / Rebuild the whole range index from jobs_jobposting
+
+    回傳被索引的筆數；不支援時回傳 None / Returns the number of indexed rows, or None when unsupported
+    """
+    db_connection = db_connection or connection
+    if not create_salary_index(db_connection):
+        return None
+    with db_connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SALARY_INDEX_TABLE}")
+        cursor.execute(
+            f"INSERT INTO {SALARY_INDEX_TABLE}(id, salary_low, salary_high) "
+            f"SELECT id, {_row_sql(_LOW_SQL)}, {_row_sql(_HIGH_SQL)} FROM jobs_jobposting "
+            f"WHERE {_row_sql(_HAS_SALARY_SQL)}"
+        )
+        cursor.execute(f"SELECT COUNT(*) FROM {SALARY_INDEX_TABLE}")
+        indexed_count = cursor.fetchone()[0]
+    logger.info("Salary index rebuilt: rows=%s", indexed_count)
+    return indexed_count
+
+
+def _clamp(value):
+    """
+    將查詢值限制在 rtree_i32 座標範圍內 / Clamp a query value into the rtree_i32 coordinate range
+    """
+    return min(max(value, SALARY_LOWEST), SALARY_HIGHEST)
+
+
+def _overlap_candidates(lower, upper):
+    """
+    以 R*Tree 找出區間可能重疊的職缺 id / Find ids whose interval may overlap using the R*Tree
+    """
+    conditions = []
+    params = []
+    if lower is not None:
+        conditions.append("salary_high >= %s")
+        params.append(_clamp(lower))
+    if upper is not None:
+        conditions.append("salary_low <= %s")
+        params.append(_clamp(upper))
+    return RawSQL(f"SELECT id FROM {SALARY_INDEX_TABLE} WHERE {' AND '.join(conditions)}", params)
+
+
+def salary_condition(lower, upper, match=SalaryMatch.OVERLAP):
+    """
+    建立薪資範圍的精確查詢條件 / Build the exact query condition of a salary range
+
+    lower/upper 為 None 時該端不限 / A None lower/upper leaves that side open
+    """
+    if match == SalaryMatch.CONTAIN:
+        # 查詢有限制的一側，職缺該端需已知且落在範圍內（比較本身即排除 null）
+        # On each bounded side the posting bound must be known and inside (the comparison itself excludes nulls)
+        condition = Q()
+        if lower is not None:
+            condition &= Q(salary_min__gte=lower)
+        if upper is not None:
+            condition &= Q(salary_max__lte=upper)
+        return condition
+
+    # 職缺的 null 端點視為無限，因此永遠滿足該側；兩端皆 null 的職缺排除
+    # A null posting bound is unbounded and always satisfies its side; postings with no bound at all are excluded
+    condition = Q(salary_min__isnull=False) | Q(salary_max__isnull=False)
+    if lower is not None:
+        condition &= Q(salary_max__gte=lower) | Q(salary_max__isnull=True)
+    if upper is not None:
+        condition &= Q(salary_min__lte=upper) | Q(salary_min__isnull=True)
+    return condition
+
+
+def apply_salary_filter(queryset, lower, upper, match=SalaryMatch.OVERLAP):
+    """
+    套用薪資範圍過濾 / Apply the salary range filter
+
+    overlap 在可用時先以 R*Tree 縮小候選，contain 以 salary_min 的 B-tree 索引範圍掃描
+    overlap narrows candidates through the R*Tree when available; contain uses a range scan on
+    the salary_min B-tree index
+    """
+    if lower is None and upper is None:
+        return queryset
+    queryset = queryset.filter(salary_condition(lower, upper, match))
+    if match == SalaryMatch.OVERLAP and is_salary_index_available():
+        queryset = queryset.filter(id__in=_overlap_candidates(lower, upper))
+    return queryset
+
+
+def salary_histogram(queryset, bucket_size, max_buckets=None):
+    """
+    在資料庫計算薪資分布 / Compute the salary distribution in the database
+
+    每筆職缺以已知端點的中點歸入級距（僅一端已知時取該端），以單一 GROUP BY 計數；
+    回傳 (級距列表, 無薪資資料筆數)；級數超過 max_buckets 時拋出 TooManyBuckets
+    Each posting falls into the bucket of the midpoint of its known bounds (or the single known
+    bound) and buckets are counted with one GROUP BY; returns (buckets, postings without salary)
+    and raises TooManyBuckets beyond max_buckets
+    """
+    max_buckets = max_buckets or get_salary_settings()["MAX_BUCKETS"]
+    salary_point = Coalesce(
+        (F("salary_min") + F("salary_max")) / 2,
+        F("salary_min"),
+        F("salary_max"),
+    )
+    bucket = ExpressionWrapper(salary_point / bucket_size * bucket_size, output_field=IntegerField())
+    rows = (
+        queryset.order_by()
+        .filter(Q(salary_min__isnull=False) | Q(salary_max__isnull=False))
+        .annotate(bucket=bucket)
+        .values("bucket")
+        .annotate(count=Count("id"))
+        .order_by("bucket")[:max_buckets + 1]
+    )
+    if len(rows) > max_buckets:
+        raise TooManyBuckets(f"More than {max_buckets} buckets; use a larger bucket_size")
+    buckets = [
+        {"lower": row["bucket"], "upper": row["bucket"] + bucket_size, "count": row["count"]}
+        for row in rows
+    ]
+    unknown = queryset.order_by().filter(salary_min__isnull=True, salary_max__isnull=True).count()
+    return buckets, unknown
@@ -1,7 +1,12 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 from datetime import date, datetime
 from ninja import Schema, Field
 from enum import Enum
+from pydantic import model_validator
+
+from jobs.locations import parse_near, resolve_radius
+from jobs.salary import SalaryMatch
+from jobs.skills import SkillMatch
 
 
 class JobStatus(str, Enum):
@@ -45,13 +50,9 @@ class JobPostingOut(Schema):
     # 計算職缺狀態 / Calculate job status
     @property
     def status(self) -> JobStatus:
-        today = date.today()
-        if today < self.posting_date:
-            return JobStatus.SCHEDULED
-        elif today > self.expiration_date:
-            return JobStatus.EXPIRED
-        else:
-            return JobStatus.ACTIVE
+        from jobs.status import compute_status
+
+        return compute_status(self.posting_date, self.expiration_date)
 
 
 class JobFilterParams(Schema):
@@ -62,12 +63,119 @@ class JobFilterParams(Schema):
     status: Optional[JobStatus] = None  # 按状态筛选
     location: Optional[str] = None  # 按地点筛选
     company: Optional[str] = None  # 按公司筛选
-    skill: Optional[str] = None  # 按技能筛选
-    sort_by: Optional[str] = "posting_date"  # 排序字段
+    skill: Optional[str] = None  # 按技能精確筛选，可用逗號分隔多個技能 / Exact skill filter, comma separated for several
+    skill_match: SkillMatch = SkillMatch.ANY  # 多技能比對模式 any/all / Multi-skill match mode any/all
+    salary_min: Optional[int] = None  # 期望薪資下限 / Lower bound of the requested salary range
+    salary_max: Optional[int] = None  # 期望薪資上限 / Upper bound of the requested salary range
+    salary_match: SalaryMatch = SalaryMatch.OVERLAP  # 薪資比對模式 overlap/contain / Salary match mode overlap/contain
+    near: Optional[str] = None  # 距離搜尋中心點 "緯度,經度" / Center of the proximity search as "lat,lng"
+    radius_km: Optional[float] = None  # 搜尋半徑（公里），預設與上限由 JOBS_GEO 設定 / Radius in km; default and limit set by JOBS_GEO
+    sort_by: Optional[str] = "posting_date"  # 排序字段 (posting_date/expiration_date/salary_min/salary_max/relevance)
     sort_desc: bool = False  # 是否降序排序
     limit: int = 10  # 每页数量
     offset: int = 0  # 分页偏移量
 
+    @model_validator(mode="after")
+    def check_salary_range(self):
+        """
+        檢查薪資範圍上下限順序 / Check the order of the salary range bounds
+        """
+        if self.salary_min is not None and self.salary_max is not None and self.salary_min > self.salary_max:
+            raise ValueError("salary_min must not exceed salary_max")
+        return self
+
+    @model_validator(mode="after")
+    def check_near(self):
+        """
+        檢查距離搜尋的中心點與半徑 / Check the center and radius of the proximity search
+        """
+        if self.near is None:
+            if self.radius_km is not None:
+                raise ValueError("radius_km requires near")
+            return self
+        parse_near(self.near)
+        resolve_radius(self.radius_km)
+        return self
+
+
+class JobPostingPage(Schema):
+    """
+    游標分頁的輸出結構 / Output schema for cursor pagination
+    """
+    results: List[JobPostingOut]
+    next_cursor: Optional[str] = None  # 下一頁游標，最後一頁為 null / Cursor of the next page, null on the last page
+
+
+class FacetBucket(Schema):
+    """
+    分面中單一值的筆數 / Count of a single value within a facet
+    """
+    value: str
+    count: int
+
+
+class JobFacetsOut(Schema):
+    """
+    分面計數的輸出結構 / Output schema for faceted counts
+    """
+    facets: Dict[str, List[FacetBucket]]  # 分面名稱 -> 筆數最多的值 / Facet name -> top values
+    timed_out: List[str] = []  # 超過時間預算而略過的分面 / Facets skipped for exceeding the time budget
+
+
+class SalaryBucket(Schema):
+    """
+    薪資分布的單一級距 [lower, upper) / A single salary bucket [lower, upper)
+    """
+    lower: int
+    upper: int
+    count: int
+
+
+class SalaryHistogramOut(Schema):
+    """
+    薪資分布的輸出結構 / Output schema for the salary distribution
+    """
+    bucket_size: int
+    buckets: List[SalaryBucket]
+    unknown: int  # 沒有薪資資料的職缺數 / Postings without any salary bound
+
+
+class JobBulkIn(Schema):
+    """
+    批次建立/更新的輸入結構 / Input schema for bulk create/update
+
+    items 逐筆以 JobPostingIn 驗證，更新時每筆需另含 id
+    Each item is validated as JobPostingIn; updates also need an id per item
+    """
+    items: List[Dict[str, Any]]
+    all_or_nothing: bool = False  # 任一項目失敗則全部不寫入 / Write nothing when any item fails
+
+
+class JobBulkDeleteIn(Schema):
+    """
+    批次刪除的輸入結構 / Input schema for bulk delete
+    """
+    ids: List[int]
+
+
+class BulkItemResult(Schema):
+    """
+    批次操作的單筆結果 / Result of a single bulk item
+    """
+    index: int  # 項目在請求中的位置 / Position of the item in the request
+    id: Optional[int] = None
+    success: bool
+    errors: List[str] = []
+
+
+class JobBulkResult(Schema):
+    """
+    批次操作的輸出結構 / Output schema for bulk operations
+    """
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
 
 class ErrorMessage(Schema):
     """
@@ -0,0 +1,227 @@
+"""
+職缺全文檢索 / Full-text search for job postings
+
+在 SQLite 上使用 FTS5 虛擬表（trigram 分詞器）建立索引，並以觸發器與 JobPosting 資料表同步；
+其他資料庫後端則退回原本的 icontains 查詢。
+On SQLite an FTS5 virtual table (trigram tokenizer) indexes the postings and is kept in sync
+with the JobPosting table by triggers; other database backends fall back to icontains lookups.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# FTS5 虛擬表名稱 / Name of the FTS5 virtual table
+FTS_TABLE = "jobs_jobposting_fts"
+
+# 被索引的欄位（順序需與虛擬表定義一致） / Indexed columns (order must match the virtual table)
+FTS_COLUMNS = ("title", "description", "company_name")
+
+# trigram 分詞器最少需要三個字元才能比對 / The trigram tokenizer needs at least three characters to match
+MIN_FTS_TERM_LENGTH = 3
+
+# 已確認建有索引的連線別名，避免每次請求都做 introspection
+# Connection aliases known to have the index, avoiding introspection on every request
+_indexed_aliases = set()
+
+# 建立虛擬表與同步觸發器的 SQL / SQL creating the virtual table and its sync triggers
+CREATE_FTS_SQL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, company_name,
+        content='jobs_jobposting', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobs_jobposting BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company_name)
+        VALUES (new.id, new.title, new.description, new.company_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobs_jobposting BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company_name)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description, company_name
+    ON jobs_jobposting BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company_name)
+        VALUES ('delete', old.id, old.title, old.description, old.company_name);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company_name)
+        VALUES (new.id, new.title, new.description, new.company_name);
+    END
+    """,
+)
+
+# 移除虛擬表與觸發器的 SQL / SQL dropping the virtual table and its triggers
+DROP_FTS_SQL = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+
+def is_fts_available(db_connection=None):
+    """
+    檢查目前連線是否可使用 FTS 索引 / Check whether the FTS index can be used on this connection
+
+    只有 SQLite 且虛擬表已建立時回傳 True
+    Returns True only on SQLite when the virtual table has been created
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        return False
+    if db_connection.alias in _indexed_aliases:
+        return True
+    with db_connection.cursor() as cursor:
+        has_index = FTS_TABLE in db_connection.introspection.table_names(cursor)
+    if has_index:
+        _indexed_aliases.add(db_connection.alias)
+    return has_index
+
+
+async def aprepare_search(db_connection=None):
+    """
+    在非同步情境預先完成 FTS 可用性檢查 / Run the FTS availability check ahead of time in async code
+
+    檢查結果會被快取，之後建立查詢時不會再同步存取資料庫
+    The result is cached, so building querysets afterwards never touches the database synchronously
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor == "sqlite" and db_connection.alias not in _indexed_aliases:
+        await sync_to_async(is_fts_available)()
+
+
+def build_match_query(term):
+    """
+    將使用者輸入轉為 FTS5 片語查詢 / Convert user input into an FTS5 phrase query
+
+    整段字串作為單一片語並跳脫雙引號，語意與原本的子字串比對一致
+    The whole string becomes one quoted phrase with escaped double quotes, keeping the
+    substring semantics of the previous icontains search
+    """
+    escaped_term = term.replace('"', '""')
+    return f'"{escaped_term}"'
+
+
+def _can_use_fts(term):
+    """
+    判斷搜尋字串是否可走 FTS 索引 / Decide whether a search term can use the FTS index
+    """
+    return len(term.strip()) >= MIN_FTS_TERM_LENGTH and is_fts_available()
+
+
+def apply_search(queryset, term):
+    """
+    套用全文檢索過濾 / Apply the full-text search filter
+
+    可用 FTS 時以 rowid 子查詢過濾，否則退回三個欄位的 icontains
+    Filters by an FTS rowid subquery when available, otherwise falls back to icontains on
+    the three searchable columns
+    """
+    if not _can_use_fts(term):
+        return queryset.filter(
+            Q(title__icontains=term) |
+            Q(description__icontains=term) |
+            Q(company_name__icontains=term)
+        )
+
+    match_query = build_match_query(term)
+    return queryset.filter(
+        id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            (match_query,),
+        )
+    )
+
+
+def annotate_rank(queryset, term):
+    """
+    加上 bm25 相關度分數 / Annotate the bm25 relevance score
+
+    分數越小越相關；無法使用 FTS 時分數固定為 0
+    Lower scores are more relevant; the score is constant 0 when FTS cannot be used
+    """
+    if not _can_use_fts(term):
+        return queryset.annotate(search_rank=RawSQL("0", ()))
+
+    match_query = build_match_query(term)
+    return queryset.annotate(
+        search_rank=RawSQL(
+            f"SELECT bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = jobs_jobposting.id",
+            (match_query,),
+        )
+    )
+
+
+def create_search_index(db_connection=None):
+    """
+    建立 FTS 虛擬表與觸發器 / Create the FTS virtual table and triggers
+
+    非 SQLite 後端直接略過 / Skipped on non-SQLite backends
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        logger.info("Skip FTS index creation: vendor=%s", db_connection.vendor)
+        return False
+    with db_connection.cursor() as cursor:
+        for statement in CREATE_FTS_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def ensure_search_triggers(db_connection=None):
+    """
+    若索引已存在則補建同步觸發器 / Recreate the sync triggers when the index exists
+
+    SQLite 的 ALTER TABLE 會重建資料表並刪除觸發器，因此每次 migrate 後都需補建
+    SQLite rebuilds the table on many ALTER operations and drops its triggers, so they must
+    be restored after every migrate
+
+    遷移可能已移除虛擬表，因此重新檢查而不沿用快取的結果
+    A migration may have dropped the virtual table, so it is checked again instead of trusting the cached result
+    """
+    db_connection = db_connection or connection
+    _indexed_aliases.discard(db_connection.alias)
+    if not is_fts_available(db_connection):
+        return
+    create_search_index(db_connection)
+
+
+def drop_search_index(db_connection=None):
+    """
+    移除 FTS 虛擬表與觸發器 / Drop the FTS virtual table and triggers
+    """
+    db_connection = db_connection or connection
+    if db_connection.vendor != "sqlite":
+        return
+    with db_connection.cursor() as cursor:
+        for statement in DROP_FTS_SQL:
+            cursor.execute(statement)
+    _indexed_aliases.discard(db_connection.alias)
+
+
+def rebuild_search_index(db_connection=None):
+    """
+    從 jobs_jobposting 重新建立整個索引 / Rebuild the whole index from jobs_jobposting
+
+    回傳被索引的筆數；不支援 FTS 時回傳 None
+    Returns the number of indexed rows, or None when FTS is not supported
+    """
+    db_connection = db_connection or connection
+    if not create_search_index(db_connection):
+        return None
+    with db_connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        cursor.execute("SELECT COUNT(*) FROM jobs_jobposting")
+        indexed_count = cursor.fetchone()[0]
+    logger.info("FTS index rebuilt: rows=%s", indexed_count)
+    return indexed_count
@@ -0,0 +1,207 @@
+"""
+職缺輸出序列化 / Job posting output serialization
+
+列表使用 values() 投影取得字典列，每列只解碼一次技能 JSON，再以 TypeAdapter 一次驗證並直接輸出 JSON 位元組。
+驗證使用由 JobPostingOut 衍生的純 pydantic 模型：ninja Schema 的包裝驗證器（DjangoGetter）每列成本高出一個數量級，
+而資料列已是資料庫型別，不需要屬性解析。
+Lists project rows with values(), decode the skills JSON once per row, then validate the
+page with one TypeAdapter call and dump JSON bytes directly. Validation uses a plain pydantic
+model derived from JobPostingOut: the ninja Schema wrap validator (DjangoGetter) costs an
+order of magnitude more per row, and rows already hold database types that need no
+attribute resolution.
+
+原位於 jobs.api 各端點內的逐欄位組裝 / Originally inlined field by field in each jobs.api handler
+"""
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Annotated, List, Optional
+
+from django.core.serializers.json import DjangoJSONEncoder
+from pydantic import BaseModel, PlainSerializer, TypeAdapter, create_model
+
+from jobs.metrics import timed
+from jobs.negotiation import ResponseFormat, pack
+from jobs.schemas import JobPostingOut
+
+# values() 投影的欄位（技能為原始 JSON 欄位） / Fields projected with values() (skills as the raw JSON column)
+JOB_ROW_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "location",
+    "salary_min",
+    "salary_max",
+    "company_name",
+    "posting_date",
+    "expiration_date",
+    "_required_skills",
+    "created_at",
+    "updated_at",
+)
+
+# 輸出欄位對應的資料庫欄位（其餘同名） / Database column of an output field (same name otherwise)
+_FIELD_COLUMNS = {"required_skills": "_required_skills"}
+
+# 稀疏欄位組合的衍生模型快取上限 / Cache size of derived models for sparse fieldsets
+FIELDSET_CACHE_SIZE = 64
+
+# 與 ninja 預設 JSON 渲染相同的時間格式（毫秒精度、UTC 以 Z 結尾）
+# Same datetime format as ninja's default JSON renderer (millisecond precision, UTC as Z)
+_DjangoDateTime = Annotated[
+    datetime,
+    PlainSerializer(DjangoJSONEncoder().default, return_type=str, when_used="json"),
+]
+
+
+def _row_field(field_info):
+    """
+    將 JobPostingOut 欄位轉為衍生模型欄位 / Convert a JobPostingOut field into a derived model field
+    """
+    annotation = _DjangoDateTime if field_info.annotation is datetime else field_info.annotation
+    return annotation, field_info
+
+
+# 由 JobPostingOut 衍生的純 pydantic 模型，欄位永遠與輸出結構一致
+# Plain pydantic model derived from JobPostingOut, so its fields always match the output schema
+JobPostingRow = create_model(
+    "JobPostingRow",
+    __base__=BaseModel,
+    **{name: _row_field(field_info) for name, field_info in JobPostingOut.model_fields.items()},
+)
+
+
+@lru_cache(maxsize=FIELDSET_CACHE_SIZE)
+def row_model(fields=None):
+    """
+    稀疏欄位組的衍生模型，None 為完整模型 / Derived model of a sparse fieldset, the full model for None
+    """
+    if fields is None:
+        return JobPostingRow
+    return create_model(
+        "JobPostingRow",
+        __base__=BaseModel,
+        **{name: _row_field(JobPostingOut.model_fields[name]) for name in fields},
+    )
+
+
+@lru_cache(maxsize=FIELDSET_CACHE_SIZE)
+def _row_adapter(fields=None):
+    """
+    單筆職缺的 TypeAdapter / TypeAdapter of a single posting
+    """
+    return TypeAdapter(row_model(fields))
+
+
+@lru_cache(maxsize=FIELDSET_CACHE_SIZE)
+def _page_adapter(fields=None):
+    """
+    整頁驗證用的 TypeAdapter，每個欄位組建立一次 / TypeAdapter validating a whole page, built once per fieldset
+    """
+    return TypeAdapter(List[row_model(fields)])
+
+
+@lru_cache(maxsize=FIELDSET_CACHE_SIZE)
+def _cursor_page_adapter(fields=None):
+    """
+    游標分頁的衍生輸出模型 / Derived output model for cursor pages
+    """
+    return TypeAdapter(create_model(
+        "JobPostingRowPage",
+        __base__=BaseModel,
+        results=(List[row_model(fields)], ...),
+        next_cursor=(Optional[str], None),
+    ))
+
+
+def _dump(adapter, value, response_format):
+    """
+    以指定編碼輸出位元組 / Dump bytes in the requested encoding
+    """
+    if response_format is ResponseFormat.MSGPACK:
+        return pack(adapter.dump_python(value, mode="json"))
+    return adapter.dump_json(value)
+
+
+def serialize_job(job):
+    """
+    將職缺模型轉為輸出結構 / Convert a job posting model into the output schema
+    """
+    return JobPostingOut(
+        id=job.id,
+        title=job.title,
+        description=job.description,
+        location=job.location,
+        salary_min=job.salary_min,
+        salary_max=job.salary_max,
+        company_name=job.company_name,
+        posting_date=job.posting_date,
+        expiration_date=job.expiration_date,
+        required_skills=job.required_skills,
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+def row_columns(fields=None, extra=()):
+    """
+    輸出需要的資料庫欄位 / Database columns needed for the output
+
+    fields 為稀疏欄位組（None 為全部），extra 為分頁等需要但不輸出的欄位
+    fields is a sparse fieldset (None for all) and extra names columns needed, e.g. for paging, but not output
+    """
+    if fields is None:
+        return JOB_ROW_FIELDS
+    return tuple(dict.fromkeys([*(_FIELD_COLUMNS.get(name, name) for name in fields), *extra]))
+
+
+def project_job_rows(queryset, fields=None, extra=()):
+    """
+    只投影輸出需要的欄位，回傳 values() 查詢 / Project only the output columns, returning a values() queryset
+    """
+    return queryset.values(*row_columns(fields, extra))
+
+
+def decode_job_row(row):
+    """
+    就地將技能 JSON 解碼為列表 / Decode the skills JSON into a list in place
+    """
+    skills = row.pop("_required_skills", None)
+    if skills is not None:
+        row["required_skills"] = json.loads(skills)
+    return row
+
+
+def serialize_rows(rows, fields=None):
+    """
+    將 values() 字典列一次驗證為輸出模型列表 / Validate values() rows into output models in one call
+    """
+    return _page_adapter(fields).validate_python([decode_job_row(row) for row in rows])
+
+
+@timed("serialize")
+def render_rows(rows, fields=None, response_format=ResponseFormat.JSON):
+    """
+    驗證 values() 字典列並直接輸出 JSON（或 MessagePack）位元組 / Validate values() rows and dump JSON (or MessagePack) bytes directly
+    """
+    return _dump(_page_adapter(fields), serialize_rows(rows, fields), response_format)
+
+
+@timed("serialize")
+def render_row_page(rows, next_cursor, fields=None, response_format=ResponseFormat.JSON):
+    """
+    輸出游標分頁的 JSON（或 MessagePack）位元組 / Dump the JSON (or MessagePack) bytes of a cursor page
+    """
+    adapter = _cursor_page_adapter(fields)
+    page = adapter.validate_python({"results": serialize_rows(rows, fields), "next_cursor": next_cursor})
+    return _dump(adapter, page, response_format)
+
+
+@timed("serialize")
+def render_job(job, fields=None, response_format=ResponseFormat.JSON):
+    """
+    輸出單一職缺的位元組 / Dump the bytes of a single posting
+    """
+    adapter = _row_adapter(fields)
+    row = adapter.validate_python({name: getattr(job, name) for name in row_model(fields).model_fields})
+    return _dump(adapter, row, response_format)
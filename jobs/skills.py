@@ -0,0 +1,145 @@
+"""
+職缺技能正規化與查詢 / Job skill normalization and lookups
+
+技能以 Skill 與 JobPostingSkill 兩張表正規化儲存，供精確比對與多技能過濾使用；
+JobPosting._required_skills 的 JSON 欄位仍保留原始順序，作為序列化時的去正規化副本。
+Skills are stored normalized in the Skill and JobPostingSkill tables for exact and
+multi-skill filtering; the JobPosting._required_skills JSON column keeps the original
+order as a denormalized copy used for serialization.
+"""
+from enum import Enum
+
+from django.db.models import Count
+
+
+class SkillMatch(str, Enum):
+    """
+    多技能過濾模式 / Multi-skill filter mode
+    """
+    ANY = "any"  # 符合任一技能 / Match at least one skill
+    ALL = "all"  # 符合全部技能 / Match every skill
+
+
+# 多技能查詢字串的分隔符號 / Separator for multi-skill query strings
+SKILL_SEPARATOR = ","
+
+
+def normalize_skill_name(name):
+    """
+    正規化技能名稱：去除多餘空白並轉小寫 / Normalize a skill name: collapse whitespace and lowercase
+
+    例 / e.g. "  Rest  API " -> "rest api"
+    """
+    return " ".join(str(name).split()).lower()
+
+
+def parse_skill_names(raw_value):
+    """
+    解析逗號分隔的技能字串 / Parse a comma separated skill string
+
+    回傳去重後的正規化名稱列表，保留輸入順序
+    Returns de-duplicated normalized names, keeping input order
+    """
+    if not raw_value:
+        return []
+    return _unique_normalized(raw_value.split(SKILL_SEPARATOR))
+
+
+def _unique_normalized(names):
+    """
+    正規化並去除重複與空白名稱 / Normalize names and drop duplicates and blanks
+    """
+    normalized_names = []
+    for name in names:
+        normalized_name = normalize_skill_name(name)
+        if normalized_name and normalized_name not in normalized_names:
+            normalized_names.append(normalized_name)
+    return normalized_names
+
+
+def get_or_create_skills(names):
+    """
+    批次取得或建立技能 / Fetch or create skills in bulk
+
+    回傳 {正規化名稱: Skill}，查詢次數固定，不隨技能數量增加
+    Returns {normalized name: Skill} with a constant number of queries
+    """
+    from jobs.models import Skill
+
+    display_names = {}
+    for name in names:
+        normalized_name = normalize_skill_name(name)
+        if normalized_name:
+            display_names.setdefault(normalized_name, " ".join(str(name).split()))
+    if not display_names:
+        return {}
+
+    existing = {
+        skill.normalized_name: skill
+        for skill in Skill.objects.filter(normalized_name__in=display_names)
+    }
+    missing = [
+        Skill(name=display_names[normalized_name], normalized_name=normalized_name)
+        for normalized_name in display_names
+        if normalized_name not in existing
+    ]
+    if missing:
+        Skill.objects.bulk_create(missing, ignore_conflicts=True)
+        existing.update(
+            (skill.normalized_name, skill)
+            for skill in Skill.objects.filter(
+                normalized_name__in=[skill.normalized_name for skill in missing]
+            )
+        )
+    return existing
+
+
+def sync_job_skills(jobs):
+    """
+    依 required_skills 同步職缺的技能關聯 / Sync skill links of job postings from required_skills
+
+    可一次處理多筆職缺（供批次寫入使用），查詢次數不隨職缺數量增加
+    Accepts many postings at once (for bulk writes) with a query count independent of the
+    number of postings
+    """
+    from jobs.models import JobPostingSkill
+
+    jobs = [job for job in jobs if job.pk is not None]
+    if not jobs:
+        return
+
+    names_by_job = {job.pk: _unique_normalized(job.required_skills) for job in jobs}
+    skills = get_or_create_skills(
+        name for job in jobs for name in job.required_skills
+    )
+
+    JobPostingSkill.objects.filter(job_posting_id__in=names_by_job).delete()
+    JobPostingSkill.objects.bulk_create([
+        JobPostingSkill(job_posting_id=job_id, skill=skills[normalized_name], position=position)
+        for job_id, normalized_names in names_by_job.items()
+        for position, normalized_name in enumerate(normalized_names)
+    ])
+
+
+def filter_by_skills(queryset, names, match=SkillMatch.ANY):
+    """
+    依技能精確過濾職缺 / Filter job postings by exact skill names
+
+    ANY 使用 (skill_id, job_posting_id) 索引做半連接；ALL 以分組計數確認全部命中
+    ANY uses a semi-join on the (skill_id, job_posting_id) index; ALL groups and counts to
+    ensure every skill matches
+    """
+    from jobs.models import JobPostingSkill
+
+    normalized_names = _unique_normalized(names)
+    if not normalized_names:
+        return queryset
+
+    links = JobPostingSkill.objects.filter(skill__normalized_name__in=normalized_names)
+    if match == SkillMatch.ALL and len(normalized_names) > 1:
+        links = (
+            links.values("job_posting_id")
+            .annotate(matched_count=Count("skill_id", distinct=True))
+            .filter(matched_count=len(normalized_names))
+        )
+    return queryset.filter(id__in=links.values("job_posting_id"))
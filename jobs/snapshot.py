@@ -0,0 +1,523 @@
+"""
+有效職缺的記憶體快照 / In-memory snapshot of active job postings
+
+預設的瀏覽查詢（status=active，依日期或薪資排序，可加 location/company 過濾）是最熱門的路徑。
+ActiveSnapshot 在每個行程保存所有有效職缺，這些查詢的分頁與 ETag 彙總都由記憶體計算，不查詢資料庫：
+The default browsing query (status=active sorted by a date or salary field, optionally
+filtered by location/company) is the hottest path. ActiveSnapshot keeps every active posting in
+each process, so the page and the ETag aggregates of these queries are computed in memory
+without querying the database:
+- 每列為 __slots__ 物件，地點、公司與技能字串共用（intern）；posting_date 排序以 array('q') 組合鍵維持
+  Rows are __slots__ objects with shared (interned) location, company and skill strings; the
+  posting_date order is kept with array('q') composite keys
+- 寫入經 lists_invalidated 訊號標記變動的 id，下次讀取時只重新載入這些列（增量更新）；
+  未知範圍的寫入、換日、其他行程的寫入或超過 MAX_AGE 時整份重建。其他行程的寫入經由回應快取的
+  列表世代號得知，只有該快取為共用快取時才成立（見 jobs.cache）；local-memory 快取下最長在 MAX_AGE 後才重建
+  Writes mark the changed ids through the lists_invalidated signal and the next read reloads
+  only those rows (incremental update); writes of unknown extent, the day rollover, writes from
+  other processes and MAX_AGE trigger a full rebuild. Writes from other processes are seen
+  through the response cache's list generation, which only works when that cache is shared
+  (see jobs.cache); with a local-memory cache they are only picked up by the MAX_AGE rebuild
+- 快照以不可變狀態替換，讀取不需加鎖；重建進行中或距上次重建未滿 REBUILD_INTERVAL 時改查資料庫
+  States are swapped, never mutated, so reads take no lock; while a rebuild runs, or within
+  REBUILD_INTERVAL of the last one, requests fall back to the database
+
+location/company 與資料庫相同採 SQLite LIKE 語意（僅 ASCII 不分大小寫），location 與 near 另依標準地點比對，
+結果與 ETag 與資料庫路徑一致
+location/company follow SQLite LIKE semantics (case-insensitive for ASCII only) like the
+database, and location and near also match on the standard location, so results and ETags
+match the database path
+"""
+import bisect
+import logging
+import string
+import sys
+import threading
+import time
+from array import array
+from datetime import date
+from operator import attrgetter
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, transaction
+
+from jobs.cache import alist_generation, list_generation, list_params
+from jobs.conditional import get_conditional_settings, list_validators
+from jobs.locations import nearby_location_ids, resolve_location
+from jobs.queries import resolve_sort_field
+from jobs.schemas import JobStatus
+from jobs.serializers import JOB_ROW_FIELDS, row_columns
+from jobs.status import ensure_transitioned, stored_status_condition
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_SNAPSHOT 覆寫 / Defaults, overridable by settings.JOBS_SNAPSHOT
+DEFAULT_SNAPSHOT_SETTINGS = {
+    "ENABLED": True,
+    "MAX_AGE": 300,  # 秒，超過即整份重建，限制其他行程寫入的延遲 / Seconds before a full rebuild, bounding lag behind other processes
+    "REBUILD_INTERVAL": 1.0,  # 兩次整份重建的最短間隔秒數 / Minimum seconds between full rebuilds
+    "CHUNK_SIZE": 2000,  # 重建時每次從資料庫讀取的筆數 / Rows fetched from the database per chunk while rebuilding
+}
+
+# 組合排序鍵中 id 的位元數：posting_date 序數 << 43 | id / Bits of the id within the composite key: posting_date ordinal << 43 | id
+ID_BITS = 43
+
+# 逐一以 array.index 移除的最多 id 數，更多時整批壓縮 / Most ids removed one by one with array.index; more are compacted in one pass
+INDEXED_REMOVALS = 32
+
+# 快照載入的欄位：輸出欄位加上標準地點 / Columns loaded into the snapshot: the output columns plus the standard location
+SNAPSHOT_COLUMNS = (*JOB_ROW_FIELDS, "normalized_location_id")
+
+# SQLite LIKE 只對 ASCII 不分大小寫 / SQLite LIKE is case-insensitive for ASCII only
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def get_snapshot_settings():
+    """
+    取得合併預設值後的快照設定 / Get snapshot settings merged with defaults
+    """
+    return {**DEFAULT_SNAPSHOT_SETTINGS, **getattr(settings, "JOBS_SNAPSHOT", {})}
+
+
+def _ascii_lower(value):
+    return value.translate(_ASCII_LOWER)
+
+
+def _sort_key(posting_date, job_id):
+    """
+    依 (posting_date, id) 排序的 64 位元組合鍵 / 64-bit composite key ordered by (posting_date, id)
+    """
+    return posting_date.toordinal() << ID_BITS | job_id
+
+
+class SnapshotRow:
+    """
+    快照中的一筆職缺，欄位與 SNAPSHOT_COLUMNS 相同 / One posting in the snapshot, with the SNAPSHOT_COLUMNS columns
+    """
+    __slots__ = (*SNAPSHOT_COLUMNS, "location_key", "company_key")
+
+    def __init__(self, values, intern):
+        for name, value in zip(SNAPSHOT_COLUMNS, values):
+            setattr(self, name, value)
+        self.location = intern(self.location)
+        self.company_name = intern(self.company_name)
+        self._required_skills = intern(self._required_skills)
+        self.location_key = intern(_ascii_lower(self.location))
+        self.company_key = intern(_ascii_lower(self.company_name))
+
+    def as_row(self, columns):
+        """
+        轉為與 values() 相同的字典列 / Convert into a dict row like values() returns
+        """
+        return {column: getattr(self, column) for column in columns}
+
+
+class SnapshotState:
+    """
+    某一天、某個列表世代號的不可變快照 / Immutable snapshot for one day and list generation
+
+    rows 依 (posting_date, id) 排序，keys 與 ids 為平行的 array；其他排序在第一次使用時計算
+    rows are ordered by (posting_date, id) with parallel keys and ids arrays; other orders are
+    computed on first use
+    """
+
+    def __init__(self, today, generation, built_at, keys, ids, rows, strings):
+        self.today = today
+        self.generation = generation
+        self.built_at = built_at
+        self.keys = keys
+        self.ids = ids
+        self.rows = rows
+        self.strings = strings
+        self._orders = {}
+        self._totals = None
+
+    def with_generation(self, generation):
+        """
+        內容不變、世代號更新的狀態 / A state with the same content and a new generation
+        """
+        state = SnapshotState(self.today, generation, self.built_at, self.keys, self.ids, self.rows, self.strings)
+        state._orders, state._totals = self._orders, self._totals
+        return state
+
+    def order(self, sort_field, sort_desc):
+        """
+        依排序欄位與方向排列的列，與 jobs.queries.sort_job_postings 相同（可為 null 的欄位無論方向 null 都在最後）
+        Rows in the order of jobs.queries.sort_job_postings (nulls of nullable fields last in either direction)
+        """
+        order = self._orders.get((sort_field, sort_desc))
+        if order is not None:
+            return order
+        if sort_field == "posting_date":
+            ascending, nulls = self.rows, []
+        else:
+            present = [row for row in self.rows if getattr(row, sort_field) is not None]
+            ascending = sorted(present, key=attrgetter(sort_field, "id"))
+            nulls = sorted((row for row in self.rows if getattr(row, sort_field) is None), key=attrgetter("id"))
+        if sort_desc:
+            order = ascending[::-1] + nulls[::-1]
+        else:
+            order = ascending + nulls if nulls else ascending
+        self._orders[(sort_field, sort_desc)] = order
+        return order
+
+    def totals(self):
+        """
+        全部有效職缺的 MAX(updated_at) 與筆數 / MAX(updated_at) and count of every active posting
+        """
+        if self._totals is None:
+            self._totals = (max((row.updated_at for row in self.rows), default=None), len(self.rows))
+        return self._totals
+
+    def query(self, filters):
+        """
+        回傳 (分頁列, MAX(updated_at), 筆數)，彙總不含分頁 / Return (page rows, MAX(updated_at), count), aggregates ignoring pagination
+        """
+        order = self.order(resolve_sort_field(filters), filters.sort_desc)
+        start, stop = filters.offset, filters.offset + filters.limit
+        if not filters.location and not filters.company and not filters.near:
+            return order[start:stop], *self.totals()
+
+        matches = _row_matcher(filters)
+        matched = [row for row in order if matches(row)]
+        return matched[start:stop], max((row.updated_at for row in matched), default=None), len(matched)
+
+
+def _row_matcher(filters):
+    """
+    建立與 jobs.queries.filter_job_postings 相同的地點、公司與距離條件 / Build the location, company and proximity conditions of jobs.queries.filter_job_postings
+    """
+    location = _ascii_lower(filters.location) if filters.location else None
+    entry = resolve_location(filters.location) if filters.location else None
+    location_id = entry.id if entry is not None else None
+    company = _ascii_lower(filters.company) if filters.company else None
+    near_ids = nearby_location_ids(filters.near, filters.radius_km) if filters.near else None
+
+    def matches(row):
+        if location is not None and location not in row.location_key and (
+            location_id is None or row.normalized_location_id != location_id
+        ):
+            return False
+        if company is not None and company not in row.company_key:
+            return False
+        return near_ids is None or row.normalized_location_id in near_ids
+
+    return matches
+
+
+def is_servable(filters):
+    """
+    過濾參數能否由快照回答 / Whether the snapshot can answer the filter params
+
+    搜尋、技能與薪資過濾仍由資料庫索引處理 / Search, skill and salary filters stay on the database indexes
+    """
+    return (
+        filters.status == JobStatus.ACTIVE
+        and not filters.search
+        and not filters.skill
+        and filters.salary_min is None
+        and filters.salary_max is None
+        and filters.limit >= 0
+        and filters.offset >= 0
+    )
+
+
+class ActiveSnapshot:
+    """
+    管理有效職缺快照的建立、增量更新與統計 / Build, incrementally update and report on the active snapshot
+    """
+
+    def __init__(self):
+        self._state = None
+        # 保護待處理的變更與統計 / Guards pending changes and counters
+        self._lock = threading.Lock()
+        # 同時只有一個執行緒同步快照 / Only one thread syncs the snapshot at a time
+        self._sync_lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        丟棄快照與統計，下次讀取時重建 / Drop the snapshot and counters so the next read rebuilds
+        """
+        with self._lock:
+            self._state = None
+            self._pending = set()
+            self._full = True
+            self._expected_generation = None
+            self._last_rebuild = float("-inf")
+            self._bytes_per_row = None
+            self._counters = {"hits": 0, "fallbacks": 0, "rebuilds": 0, "updates": 0}
+            self._rebuild_seconds = 0.0
+
+    def note_change(self, job_ids, generation=None):
+        """
+        記錄變動的職缺；job_ids 為 None 時整份重建。generation 為寫入後的列表世代號，
+        連續時增量更新即可，不連續表示有其他寫入者，需整份重建
+        Record changed postings; None job_ids means a full rebuild. generation is the list
+        generation after the write: consecutive ones can be applied incrementally, a gap means
+        another writer and a full rebuild
+        """
+        with self._lock:
+            if job_ids is None:
+                self._full = True
+            else:
+                self._pending.update(job_ids)
+            if generation is None:
+                return
+            known = self._expected_generation
+            if known is None and self._state is not None:
+                known = self._state.generation
+            if known is not None and generation == known + 1:
+                self._expected_generation = generation
+            else:
+                self._full = True
+
+    def _is_fresh(self, state, today, generation, snapshot_settings):
+        return (
+            state is not None
+            and state.today == today
+            and state.generation == generation
+            and not self._full
+            and not self._pending
+            and time.monotonic() - state.built_at < snapshot_settings["MAX_AGE"]
+        )
+
+    def current(self, today, generation):
+        """
+        取得最新的快照，必要時同步；正在同步或需等待重建間隔時回傳 None
+        Get an up-to-date snapshot, syncing when needed; None while another thread syncs or a rebuild must wait
+        """
+        state = self._state
+        if self._is_fresh(state, today, generation, get_snapshot_settings()):
+            return state
+        return self.sync(today, generation)
+
+    def fresh_state(self, today, generation):
+        """
+        不同步，只回傳已是最新的快照 / Return the snapshot only when already up to date, without syncing
+        """
+        state = self._state
+        return state if self._is_fresh(state, today, generation, get_snapshot_settings()) else None
+
+    def sync(self, today, generation):
+        """
+        套用待處理的變更或整份重建 / Apply pending changes or rebuild in full
+        """
+        if not self._sync_lock.acquire(blocking=False):
+            return None
+        try:
+            snapshot_settings = get_snapshot_settings()
+            with self._lock:
+                pending, full, expected = self._pending, self._full, self._expected_generation
+                self._pending, self._full = set(), False
+            state = self._state
+            rebuild = (
+                full
+                or state is None
+                or state.today != today
+                or generation not in (state.generation, expected)
+                or time.monotonic() - state.built_at >= snapshot_settings["MAX_AGE"]
+            )
+            if rebuild and time.monotonic() - self._last_rebuild < snapshot_settings["REBUILD_INTERVAL"]:
+                with self._lock:
+                    self._full = True
+                return None
+            try:
+                state = self._rebuild(today, generation, snapshot_settings) if rebuild else self._apply(state, pending, generation)
+            except Exception:
+                with self._lock:
+                    self._pending.update(pending)
+                    self._full = self._full or full
+                raise
+            with self._lock:
+                self._state = state
+                if self._expected_generation == generation or rebuild:
+                    self._expected_generation = None
+            return state
+        finally:
+            self._sync_lock.release()
+
+    @staticmethod
+    def _load(queryset, chunk_size, strings):
+        """
+        以 values_list 串流載入快照列 / Stream snapshot rows in through values_list
+        """
+        def intern(value):
+            return strings.setdefault(value, value)
+
+        return [
+            SnapshotRow(values, intern)
+            for values in queryset.values_list(*SNAPSHOT_COLUMNS).iterator(chunk_size=chunk_size)
+        ]
+
+    def _rebuild(self, today, generation, snapshot_settings):
+        """
+        從資料庫整份重建 / Rebuild in full from the database
+        """
+        from jobs.models import JobPosting
+
+        started_at = time.perf_counter()
+        self._last_rebuild = time.monotonic()
+        strings = {}
+        ensure_transitioned(today)
+        queryset = JobPosting.objects.filter(stored_status_condition(JobStatus.ACTIVE, today)).order_by("posting_date", "id")
+        rows = self._load(queryset, snapshot_settings["CHUNK_SIZE"], strings)
+        keys = array("q", (_sort_key(row.posting_date, row.id) for row in rows))
+        ids = array("q", (row.id for row in rows))
+        state = SnapshotState(today, generation, time.monotonic(), keys, ids, rows, strings)
+
+        seconds = time.perf_counter() - started_at
+        with self._lock:
+            self._counters["rebuilds"] += 1
+            self._rebuild_seconds = seconds
+            self._bytes_per_row = None
+        logger.info("Active snapshot rebuilt: rows=%s seconds=%.3f", len(rows), seconds)
+        return state
+
+    def _apply(self, state, job_ids, generation):
+        """
+        只重新載入變動的職缺，產生新的狀態 / Reload only the changed postings into a new state
+        """
+        from jobs.models import JobPosting
+
+        if not job_ids:
+            return state.with_generation(generation)
+        queryset = JobPosting.objects.filter(stored_status_condition(JobStatus.ACTIVE, state.today), id__in=job_ids)
+        fresh = self._load(queryset, get_snapshot_settings()["CHUNK_SIZE"], state.strings)
+
+        # 複製後修改，進行中的讀取仍使用舊狀態 / Copy before changing so in-flight reads keep the old state
+        if len(job_ids) <= INDEXED_REMOVALS:
+            keys, ids, rows = array("q", state.keys), array("q", state.ids), list(state.rows)
+            for job_id in job_ids:
+                try:
+                    position = ids.index(job_id)
+                except ValueError:
+                    continue
+                del keys[position], ids[position], rows[position]
+        else:
+            kept = [position for position, job_id in enumerate(state.ids) if job_id not in job_ids]
+            keys = array("q", (state.keys[position] for position in kept))
+            ids = array("q", (state.ids[position] for position in kept))
+            rows = [state.rows[position] for position in kept]
+
+        for row in fresh:
+            key = _sort_key(row.posting_date, row.id)
+            position = bisect.bisect_left(keys, key)
+            keys.insert(position, key)
+            ids.insert(position, row.id)
+            rows.insert(position, row)
+
+        with self._lock:
+            self._counters["updates"] += 1
+        return SnapshotState(state.today, generation, state.built_at, keys, ids, rows, state.strings)
+
+    def record(self, outcome):
+        """
+        記錄一次由快照回答（hits）或改查資料庫（fallbacks） / Record a request served from the snapshot (hits) or falling back (fallbacks)
+        """
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def memory_usage(self):
+        """
+        估算目前快照的記憶體位元組數（共用的物件只計一次） / Estimate the snapshot's memory in bytes, counting shared objects once
+        """
+        state = self._state
+        if state is None:
+            return 0
+        seen = set()
+        total = sys.getsizeof(state.keys) + sys.getsizeof(state.ids) + sys.getsizeof(state.rows)
+        total += sum(sys.getsizeof(order) for order in list(state._orders.values()) if order is not state.rows)
+        for row in state.rows:
+            total += sys.getsizeof(row)
+            for name in SnapshotRow.__slots__:
+                value = getattr(row, name)
+                if value is not None and id(value) not in seen:
+                    seen.add(id(value))
+                    total += sys.getsizeof(value)
+        return total
+
+    def stats(self):
+        """
+        快照的筆數、記憶體與計數；記憶體在每次重建後量測一次再依筆數推估
+        Rows, memory and counters of the snapshot; memory is measured once per rebuild and
+        scaled by the row count
+        """
+        state = self._state
+        rows = len(state.rows) if state is not None else 0
+        if self._bytes_per_row is None and rows:
+            self._bytes_per_row = self.memory_usage() / rows
+        bytes_per_row = self._bytes_per_row or 0
+        with self._lock:
+            return {
+                "rows": rows,
+                "bytes": int(bytes_per_row * rows),
+                "bytes_per_100k": int(bytes_per_row * 100_000),
+                "rebuild_seconds": self._rebuild_seconds,
+                **self._counters,
+            }
+
+
+# 行程內的有效職缺快照 / Process-wide active snapshot
+active_snapshot = ActiveSnapshot()
+
+
+def note_invalidated_lists(sender, job_ids=None, generation=None, **kwargs):
+    """
+    列表失效時標記快照（lists_invalidated 訊號） / Mark the snapshot when lists are invalidated (lists_invalidated signal)
+
+    交易中的寫入在提交後再標記一次，涵蓋提交前就已依舊資料同步的快照
+    Writes inside a transaction are marked again after commit, covering a snapshot synced from
+    the old rows before the commit
+    """
+    active_snapshot.note_change(job_ids, generation)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: active_snapshot.note_change(job_ids))
+
+
+def _page(state, filters, fields, variant, today):
+    """
+    由快照產生分頁列與列表驗證值 / Build the page rows and list validators from the snapshot
+    """
+    page, last_updated, count = state.query(filters)
+    columns = row_columns(fields)
+    rows = [row.as_row(columns) for row in page]
+    validators = None
+    if get_conditional_settings()["ENABLED"]:
+        validators = list_validators(list_params(filters, variant), last_updated, count, today)
+    active_snapshot.record("hits")
+    return rows, validators
+
+
+def snapshot_page(filters, fields=None, variant=None, today=None):
+    """
+    由快照回答列表查詢，回傳 (values() 形式的分頁列, 驗證值)；無法由快照回答時回傳 None
+    Answer a list query from the snapshot, returning (page rows shaped like values(), validators);
+    None when the snapshot cannot answer it
+    """
+    if not get_snapshot_settings()["ENABLED"] or not is_servable(filters):
+        return None
+    today = today or date.today()
+    state = active_snapshot.current(today, list_generation())
+    if state is None:
+        active_snapshot.record("fallbacks")
+        return None
+    return _page(state, filters, fields, variant, today)
+
+
+async def asnapshot_page(filters, fields=None, variant=None, today=None):
+    """
+    snapshot_page 的非同步版本，需要同步時才進入執行緒 / Async version of snapshot_page; only syncing runs in a thread
+    """
+    if not get_snapshot_settings()["ENABLED"] or not is_servable(filters):
+        return None
+    today = today or date.today()
+    generation = await alist_generation()
+    state = active_snapshot.fresh_state(today, generation)
+    if state is None:
+        state = await sync_to_async(active_snapshot.sync)(today, generation)
+    if state is None:
+        active_snapshot.record("fallbacks")
+        return None
+    return _page(state, filters, fields, variant, today)
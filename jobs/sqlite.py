@@ -0,0 +1,101 @@
+"""
+SQLite 連線設定檔 / SQLite connection profile
+
+每個新建立的 SQLite 連線（connection_created 訊號）都會套用 JOBS_SQLITE 中的 PRAGMA：
+Every new SQLite connection (connection_created signal) gets the PRAGMAs in JOBS_SQLITE:
+- journal_mode=WAL：讀取者不會被寫入者阻擋，寫入只需附加到 WAL
+  journal_mode=WAL: readers are not blocked by the writer and writes only append to the WAL
+- synchronous=NORMAL：WAL 下仍不會損毀資料庫，只在斷電時可能遺失最後幾筆交易
+  synchronous=NORMAL: still corruption-safe in WAL mode; only a power loss may drop the last
+  few transactions
+- cache_size、mmap_size、temp_store：減少讀取的系統呼叫與暫存檔 / cache_size, mmap_size,
+  temp_store: fewer read syscalls and temporary files
+- busy_timeout：等待鎖的毫秒數，None 時沿用 OPTIONS["timeout"] / Milliseconds to wait for a lock;
+  None keeps OPTIONS["timeout"]
+
+值為 None 的項目不設定 / Entries set to None are left alone
+"""
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_SQLITE 覆寫 / Defaults, overridable by settings.JOBS_SQLITE
+DEFAULT_SQLITE_SETTINGS = {
+    "ENABLED": True,
+    "JOURNAL_MODE": "WAL",
+    "SYNCHRONOUS": "NORMAL",
+    "CACHE_SIZE": -64_000,  # 負值為 KiB，約 64 MB / Negative values are KiB, about 64 MB
+    "MMAP_SIZE": 256 * 1024 * 1024,
+    "TEMP_STORE": "MEMORY",
+    "BUSY_TIMEOUT": None,
+}
+
+# 設定鍵與 PRAGMA 名稱（依套用順序） / Setting keys and PRAGMA names, in the order they are applied
+PRAGMAS = (
+    ("BUSY_TIMEOUT", "busy_timeout"),
+    ("JOURNAL_MODE", "journal_mode"),
+    ("SYNCHRONOUS", "synchronous"),
+    ("CACHE_SIZE", "cache_size"),
+    ("MMAP_SIZE", "mmap_size"),
+    ("TEMP_STORE", "temp_store"),
+)
+
+
+def get_sqlite_settings():
+    """
+    取得合併預設值後的 SQLite 設定 / Get SQLite settings merged with defaults
+    """
+    return {**DEFAULT_SQLITE_SETTINGS, **getattr(settings, "JOBS_SQLITE", {})}
+
+
+def pragma_statements(sqlite_settings=None):
+    """
+    依設定產生 PRAGMA 敘述 / Build the PRAGMA statements from the settings
+
+    值來自設定檔而非使用者輸入，且只允許識別字與整數 / Values come from settings, not user input,
+    and only identifiers and integers are accepted
+    """
+    sqlite_settings = sqlite_settings or get_sqlite_settings()
+    statements = []
+    for key, pragma in PRAGMAS:
+        value = sqlite_settings.get(key)
+        if value is None:
+            continue
+        if not isinstance(value, int) and not str(value).isidentifier():
+            raise ValueError(f"Invalid value for JOBS_SQLITE[{key!r}]: {value!r}")
+        statements.append(f"PRAGMA {pragma} = {value}")
+    return statements
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    """
+    為新建立的 SQLite 連線套用設定檔（connection_created 訊號） / Apply the profile to a new SQLite connection (connection_created signal)
+    """
+    if connection.vendor != "sqlite":
+        return
+    sqlite_settings = get_sqlite_settings()
+    if not sqlite_settings["ENABLED"]:
+        return
+    expected_mode = str(sqlite_settings.get("JOURNAL_MODE") or "").lower()
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(sqlite_settings):
+            cursor.execute(statement)
+            if statement.startswith("PRAGMA journal_mode"):
+                # 回傳實際模式；記憶體資料庫無法使用 WAL，會維持 memory / Returns the mode in effect; in-memory databases cannot use WAL and stay in memory mode
+                journal_mode = cursor.fetchone()[0].lower()
+                if journal_mode not in (expected_mode, "memory"):
+                    logger.warning("SQLite journal_mode is %s, expected %s", journal_mode, expected_mode)
+
+
+def pragma_values(connection):
+    """
+    讀取連線目前的 PRAGMA 值，供檢查與測試 / Read the connection's current PRAGMA values for inspection and tests
+    """
+    values = {}
+    with connection.cursor() as cursor:
+        for key, pragma in PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+            values[key] = cursor.fetchone()[0]
+    return values
@@ -0,0 +1,245 @@
+"""
+職缺狀態的計算與每日轉換 / Job status computation and daily transitions
+
+狀態（active/expired/scheduled）儲存於 JobPosting.status 並建有索引，供狀態過濾選擇 (status, 日期) 複合索引。
+寫入時由模型計算狀態；日期跨日後由排程以批次 UPDATE 轉換：可用 cron 執行
+manage.py transition_job_statuses，或在設定中啟用行程內排程執行緒。
+The status (active/expired/scheduled) is stored in the indexed JobPosting.status column so
+status filters can use the (status, date) composite indexes. The model computes it on write;
+after the day boundary a scheduler transitions rows with bulk UPDATEs, either through
+manage.py transition_job_statuses from cron or an in-process thread enabled in settings.
+
+轉換可能延遲或未設定，因此狀態過濾（stored_status_condition）同時比對日期，每個行程每天第一次
+依狀態讀取前，端點也會先補做當天的轉換（ensure_transitioned，非同步端點為 aensure_transitioned），
+結果不依賴排程是否準時執行；建立查詢本身不寫入資料庫。
+The transition can be late or not configured at all, so status filters
+(stored_status_condition) also check the dates, and before a process first reads by status
+each day the endpoint catches up the day's transition (ensure_transitioned, or
+aensure_transitioned in async endpoints); results do not depend on the scheduler running on
+time, and building a query never writes to the database.
+"""
+import logging
+import threading
+from datetime import date, datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Q
+
+from jobs.schemas import JobStatus
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_STATUS 覆寫 / Defaults, overridable by settings.JOBS_STATUS
+DEFAULT_STATUS_SETTINGS = {
+    "RUN_SCHEDULER": False,  # 是否在行程內啟動排程執行緒 / Start the in-process scheduler thread
+    "RUN_AT_SECONDS": 1,  # 午夜後延遲幾秒執行 / Seconds after midnight to run at
+}
+
+# 狀態欄位的選項 / Choices of the status column
+STATUS_CHOICES = [(status.value, status.name.title()) for status in JobStatus]
+
+# 狀態欄位長度 / Length of the status column
+STATUS_MAX_LENGTH = 16
+
+# 本行程已轉換到的日期 / Day this process last made sure statuses were transitioned to
+_transitioned_through = None
+_transition_lock = threading.Lock()
+
+
+def get_status_settings():
+    """
+    取得合併預設值後的狀態設定 / Get status settings merged with defaults
+    """
+    return {**DEFAULT_STATUS_SETTINGS, **getattr(settings, "JOBS_STATUS", {})}
+
+
+def compute_status(posting_date, expiration_date, today=None):
+    """
+    依日期計算職缺狀態 / Compute the job status from its dates
+
+    posting_date 與 expiration_date 當天都算 active / Both posting_date and expiration_date count as active
+    """
+    today = today or date.today()
+    if today < posting_date:
+        return JobStatus.SCHEDULED
+    if today > expiration_date:
+        return JobStatus.EXPIRED
+    return JobStatus.ACTIVE
+
+
+def status_condition(status, today=None):
+    """
+    以日期表示某狀態的查詢條件 / Query condition expressing a status through the dates
+    """
+    today = today or date.today()
+    if status == JobStatus.ACTIVE:
+        return Q(posting_date__lte=today, expiration_date__gte=today)
+    if status == JobStatus.EXPIRED:
+        return Q(expiration_date__lt=today)
+    return Q(posting_date__gt=today)
+
+
+def stored_status_condition(status, today=None):
+    """
+    依儲存欄位與日期過濾某狀態的條件 / Condition filtering a status through the stored column and the dates
+
+    status 等值使查詢仍使用 (status, 日期) 複合索引；日期條件排除轉換延遲時仍停留在此狀態的列
+    The status equality keeps the (status, date) composite indexes in use; the date condition
+    drops rows still holding this status while the transition is late
+    """
+    status = JobStatus(status)
+    return Q(status=status) & status_condition(status, today)
+
+
+def _pending_condition(status, today):
+    """
+    日常轉換中需要更新為某狀態的列 / Rows that the daily transition moves into a status
+
+    只檢查時間前進時可能改變的列，條件對應 (status, 日期) 複合索引
+    Only rows that can change as time moves forward are checked; the conditions match the
+    (status, date) composite indexes
+    """
+    if status == JobStatus.ACTIVE:
+        return Q(status=JobStatus.SCHEDULED, posting_date__lte=today, expiration_date__gte=today)
+    if status == JobStatus.EXPIRED:
+        return (
+            Q(status=JobStatus.ACTIVE, expiration_date__lt=today) |
+            Q(status=JobStatus.SCHEDULED, expiration_date__lt=today)
+        )
+    return Q(pk__in=[])
+
+
+def ensure_transitioned(today=None):
+    """
+    每個行程每天第一次依狀態讀取前補做當天的轉換，有執行時回傳 True / Catch up today's transition before a process first reads by status each day; True when it ran
+
+    未啟用排程或 cron 延遲時，尚未轉入某狀態的列（例如今天上架的職缺）不會因此缺席；
+    沒有待轉換的列時只是兩個走索引的 UPDATE
+    Rows not yet moved into a status (e.g. postings going live today) are no longer missing
+    when no scheduler runs or cron is late; with nothing pending this is two indexed UPDATEs
+    """
+    global _transitioned_through
+    today = today or date.today()
+    if _transitioned_through is not None and _transitioned_through >= today:
+        return False
+    with _transition_lock:
+        if _transitioned_through is not None and _transitioned_through >= today:
+            return False
+        transition_statuses(today)
+    return True
+
+
+async def aensure_transitioned(today=None):
+    """
+    ensure_transitioned 的非同步版本 / Async version of ensure_transitioned
+
+    當天已轉換時不切換執行緒；否則 UPDATE 在 sync_to_async 中執行
+    Skips the thread hop when the day is already transitioned; otherwise the UPDATEs run through sync_to_async
+    """
+    today = today or date.today()
+    if _transitioned_through is not None and _transitioned_through >= today:
+        return False
+    return await sync_to_async(ensure_transitioned)(today)
+
+
+def mark_transitioned(today=None):
+    """
+    記錄本行程已轉換到某日，None 表示下次讀取時重新檢查 / Record that this process has transitioned through a day; None rechecks on the next read
+    """
+    global _transitioned_through
+    _transitioned_through = today
+
+
+def transition_statuses(today=None, full=False):
+    """
+    以批次 UPDATE 將狀態轉換到指定日期 / Transition statuses to the given day with bulk UPDATEs
+
+    full=True 時重新計算所有列（例如時鐘倒退或資料以原生 SQL 寫入後），否則只處理時間前進造成的轉換；
+    回傳各狀態被更新的筆數，有更新時使列表快取失效
+    With full=True every row is recomputed (e.g. after the clock moved back or rows were written
+    with raw SQL), otherwise only transitions caused by time moving forward are applied; returns
+    the number of rows moved into each status and invalidates cached lists when anything changed
+    """
+    global _transitioned_through
+    from jobs.cache import invalidate_lists
+    from jobs.models import JobPosting
+
+    today = today or date.today()
+    counts = {}
+    for status in JobStatus:
+        if full:
+            condition = status_condition(status, today) & ~Q(status=status)
+        else:
+            condition = _pending_condition(status, today)
+        counts[status.value] = JobPosting.objects.filter(condition).update(status=status)
+
+    _transitioned_through = max(_transitioned_through or today, today)
+    if any(counts.values()):
+        invalidate_lists()
+    logger.info("Job statuses transitioned: today=%s full=%s counts=%s", today, full, counts)
+    return counts
+
+
+def seconds_until_next_run(now=None):
+    """
+    計算距離下一次執行（午夜後 RUN_AT_SECONDS 秒）的秒數 / Seconds until the next run (RUN_AT_SECONDS after midnight)
+    """
+    now = now or datetime.now()
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    delay = next_midnight - now + timedelta(seconds=get_status_settings()["RUN_AT_SECONDS"])
+    return max(delay.total_seconds(), 1.0)
+
+
+class StatusScheduler(threading.Thread):
+    """
+    行程內的每日狀態轉換排程 / In-process daily status transition scheduler
+
+    啟動時先補做一次轉換，之後每天午夜後執行 / Catches up once on start, then runs after every midnight
+    """
+
+    def __init__(self):
+        super().__init__(name="job-status-scheduler", daemon=True)
+        self._stopped = threading.Event()
+
+    def run_once(self):
+        """
+        執行一次轉換，錯誤只記錄不中斷排程 / Run one transition; errors are logged without stopping the scheduler
+        """
+        try:
+            transition_statuses()
+        except Exception:
+            logger.exception("Job status transition failed")
+        finally:
+            close_old_connections()
+
+    def run(self):
+        self.run_once()
+        while not self._stopped.wait(seconds_until_next_run()):
+            self.run_once()
+
+    def stop(self):
+        """
+        停止排程 / Stop the scheduler
+        """
+        self._stopped.set()
+
+
+# 目前行程中的排程實例 / Scheduler instance of the current process
+_scheduler = None
+
+# 保護排程啟動的鎖 / Lock guarding scheduler start-up
+_scheduler_lock = threading.Lock()
+
+
+def start_scheduler():
+    """
+    啟動行程內排程（每個行程只會啟動一次） / Start the in-process scheduler (once per process)
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = StatusScheduler()
+            _scheduler.start()
+    return _scheduler
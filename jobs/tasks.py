@@ -0,0 +1,436 @@
+"""
+資料庫佇列的背景工作 / Database-backed background tasks
+
+寫入端點只在同一個交易中新增 Task 列（交易外送箱），耗時的副作用交由 manage.py run_workers 的工作行程非同步執行：
+Write endpoints only insert Task rows inside their own transaction (a transactional outbox);
+heavy side effects run asynchronously in the worker processes of manage.py run_workers:
+- 工作以點分路徑指定可呼叫物件，參數為 JSON 物件，以關鍵字參數呼叫
+  A task names a callable by dotted path and its JSON object payload is passed as keyword arguments
+- idempotency_key 唯一；相同鍵重複加入時沿用既有工作，同一份變更只會執行一次
+  idempotency_key is unique; enqueueing the same key again reuses the existing task, so one
+  change runs once
+- 工作行程以單一 UPDATE 認領到期工作（支援時加上 SKIP LOCKED）；失敗後依指數退避重試，
+  超過 max_attempts 即標記為 failed
+  Workers claim due tasks with one UPDATE (plus SKIP LOCKED where supported); failures retry
+  with exponential backoff and become failed after max_attempts
+- 工作行程中斷時，認領超過 LEASE_SECONDS 的工作會被放回佇列
+  Tasks claimed longer than LEASE_SECONDS ago by a crashed worker are put back in the queue
+
+執行過程至少一次（at-least-once）：逾時重新認領的工作可能執行兩次，工作本身應可重複執行。
+Execution is at-least-once: a task reclaimed after its lease expired may run twice, so tasks
+should be safe to repeat.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from enum import Enum
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, close_old_connections, connections, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# 預設設定，可由 settings.JOBS_TASKS 覆寫 / Defaults, overridable by settings.JOBS_TASKS
+DEFAULT_TASK_SETTINGS = {
+    "JOB_SIDE_EFFECTS": [],  # 職缺建立或更新後加入的工作（點分路徑，以 job_id 呼叫） / Tasks enqueued after a posting is created or updated (dotted paths called with job_id)
+    "MAX_ATTEMPTS": 5,  # 每個工作最多執行次數 / Attempts per task
+    "BACKOFF_BASE": 2.0,  # 第一次重試前的秒數，之後每次加倍 / Seconds before the first retry, doubling afterwards
+    "BACKOFF_MAX": 600.0,  # 重試間隔上限秒數 / Longest retry delay in seconds
+    "BACKOFF_JITTER": 0.1,  # 重試間隔的隨機增加比例，避免同時重試 / Random extra share of the retry delay, spreading retries out
+    "LEASE_SECONDS": 300,  # 認領後多久未完成視為工作行程中斷 / Seconds after which a claimed task is considered abandoned
+    "PROCESSES": 2,  # run_workers 預設的工作行程數 / Default worker processes of run_workers
+    "BATCH_SIZE": 10,  # 每次認領的工作數 / Tasks claimed at once
+    "POLL_INTERVAL": 1.0,  # 佇列為空時的輪詢間隔秒數 / Seconds between polls of an empty queue
+    "RETENTION_SECONDS": 7 * 24 * 3600,  # 完成的工作保留秒數 / Seconds finished tasks are kept
+    "METRICS_WINDOW": 300,  # 延遲量測涵蓋最近幾秒完成的工作 / Latency metrics cover tasks finished within this many seconds
+}
+
+# 工作欄位長度 / Column lengths of the task table
+TASK_NAME_MAX_LENGTH = 255
+TASK_STATUS_MAX_LENGTH = 16
+
+# 延遲量測最多讀取的工作數 / Most finished tasks read for the latency metrics
+METRICS_SAMPLE_SIZE = 10_000
+
+# 每處理幾批工作做一次維護（放回逾時工作、清除舊工作） / Batches between maintenance runs (requeue abandoned, purge old)
+MAINTENANCE_EVERY = 60
+
+
+class TaskStatus(str, Enum):
+    """
+    工作狀態 / Task status
+    """
+    QUEUED = "queued"  # 等待執行或等待重試 / Waiting to run or to retry
+    RUNNING = "running"  # 已被工作行程認領 / Claimed by a worker
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"  # 超過最多執行次數 / Out of attempts
+
+
+# 狀態欄位的選項 / Choices of the status column
+TASK_STATUS_CHOICES = [(status.value, status.name.title()) for status in TaskStatus]
+
+
+class UnknownTask(LookupError):
+    """
+    工作名稱無法匯入為可呼叫物件 / The task name cannot be imported as a callable
+    """
+
+
+def get_task_settings():
+    """
+    取得合併預設值後的工作設定 / Get task settings merged with defaults
+    """
+    return {**DEFAULT_TASK_SETTINGS, **getattr(settings, "JOBS_TASKS", {})}
+
+
+def resolve_task(name):
+    """
+    由點分路徑取得工作的可呼叫物件 / Get the callable of a task from its dotted path
+    """
+    try:
+        handler = import_string(name)
+    except ImportError as error:
+        raise UnknownTask(f"Unknown task {name!r}: {error}") from error
+    if not callable(handler):
+        raise UnknownTask(f"Task {name!r} is not callable")
+    return handler
+
+
+def _build_task(name, payload, key, delay, max_attempts):
+    """
+    建立未儲存的工作，並確認名稱可匯入 / Build an unsaved task after checking the name imports
+    """
+    from jobs.models import Task
+
+    resolve_task(name)
+    return Task(
+        name=name,
+        payload=payload or {},
+        idempotency_key=key,
+        max_attempts=max_attempts or get_task_settings()["MAX_ATTEMPTS"],
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue(name, payload=None, *, key=None, delay=0, max_attempts=None):
+    """
+    加入一個工作並回傳 Task / Enqueue a task and return its Task row
+
+    在交易中呼叫時工作與資料一起提交；key 已存在時不新增，回傳既有的工作
+    Called inside a transaction, the task commits together with the data; when key already
+    exists nothing is added and the existing task is returned
+    """
+    from jobs.models import Task
+
+    task = _build_task(name, payload, key, delay, max_attempts)
+    if key is None:
+        task.save(using=DEFAULT_DB_ALIAS)
+        return task
+    Task.objects.using(DEFAULT_DB_ALIAS).bulk_create([task], ignore_conflicts=True)
+    return Task.objects.using(DEFAULT_DB_ALIAS).get(idempotency_key=key)
+
+
+def enqueue_many(specs):
+    """
+    以單一 INSERT 加入多個工作，略過已存在的 key；specs 為 (name, payload, key) / Enqueue several tasks with one INSERT, skipping existing keys; specs are (name, payload, key)
+    """
+    from jobs.models import Task
+
+    tasks = [_build_task(name, payload, key, 0, None) for name, payload, key in specs]
+    if tasks:
+        Task.objects.using(DEFAULT_DB_ALIAS).bulk_create(tasks, ignore_conflicts=True)
+    return len(tasks)
+
+
+def enqueue_job_side_effects(jobs):
+    """
+    為建立或更新的職缺加入 JOB_SIDE_EFFECTS 的工作 / Enqueue the JOB_SIDE_EFFECTS tasks for created or updated postings
+
+    鍵包含 updated_at，同一版本重送不會重複執行，之後的變更仍會各自執行一次；未設定時不查詢資料庫
+    Keys include updated_at, so resending the same version does not run twice while later
+    changes still run once each; nothing is queried when none are configured
+    """
+    names = get_task_settings()["JOB_SIDE_EFFECTS"]
+    if not names:
+        return 0
+    return enqueue_many(
+        (name, {"job_id": job.pk}, f"{name}:{job.pk}:{job.updated_at.isoformat()}")
+        for job in jobs
+        for name in names
+    )
+
+
+def save_with_side_effects(job):
+    """
+    在同一交易中儲存職缺並加入副作用工作 / Save a posting and enqueue its side-effect tasks in one transaction
+
+    未設定副作用時直接儲存，不另開交易 / Without configured side effects this is a plain save with no extra transaction
+    """
+    if not get_task_settings()["JOB_SIDE_EFFECTS"]:
+        job.save()
+        return job
+    with transaction.atomic():
+        job.save()
+        enqueue_job_side_effects([job])
+    return job
+
+
+async def asave_with_side_effects(job):
+    """
+    save_with_side_effects 的非同步版本；未設定副作用時直接 asave / Async save_with_side_effects; a plain asave when no side effects are configured
+    """
+    if not get_task_settings()["JOB_SIDE_EFFECTS"]:
+        await job.asave()
+        return job
+    return await sync_to_async(save_with_side_effects)(job)
+
+
+def retry_delay(attempts, task_settings=None):
+    """
+    第 attempts 次失敗後的重試間隔秒數（指數退避加隨機抖動） / Seconds before retrying after the attempts-th failure (exponential backoff with jitter)
+    """
+    task_settings = task_settings or get_task_settings()
+    delay = min(task_settings["BACKOFF_MAX"], task_settings["BACKOFF_BASE"] * 2 ** max(attempts - 1, 0))
+    return delay * (1 + task_settings["BACKOFF_JITTER"] * random.random())
+
+
+def worker_name():
+    """
+    工作行程的唯一名稱：主機、行程與隨機後綴 / Unique worker name: host, process and a random suffix
+    """
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def claim_tasks(worker, limit):
+    """
+    認領最多 limit 個到期工作並回傳 / Claim up to limit due tasks and return them
+
+    以 UPDATE ... WHERE id IN (到期工作) AND status='queued' 認領，同一工作不會被兩個工作行程取得
+    Claims with UPDATE ... WHERE id IN (due tasks) AND status='queued', so no task is handed to
+    two workers
+    """
+    from jobs.models import Task
+
+    tasks = Task.objects.using(DEFAULT_DB_ALIAS)
+    now = timezone.now()
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        due = tasks.filter(status=TaskStatus.QUEUED, run_after__lte=now).order_by("run_after", "id")
+        if connections[DEFAULT_DB_ALIAS].features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        claimed = tasks.filter(id__in=list(due.values_list("id", flat=True)[:limit]), status=TaskStatus.QUEUED).update(
+            status=TaskStatus.RUNNING, locked_by=worker, locked_at=now, attempts=F("attempts") + 1,
+        )
+    if not claimed:
+        return []
+    return list(tasks.filter(status=TaskStatus.RUNNING, locked_by=worker, locked_at=now).order_by("run_after", "id"))
+
+
+def execute_task(task, task_settings=None):
+    """
+    執行一個已認領的工作並記錄結果，成功時回傳 True / Run one claimed task and record the outcome; True on success
+
+    失敗時仍有剩餘次數則依退避排回佇列，否則標記為 failed。工作不包在交易中：SQLite 的
+    IMMEDIATE 交易會在整個工作期間持有寫入鎖，使工作行程互相等待；需要原子性的工作自行使用 transaction.atomic
+    A failed task goes back in the queue after its backoff while attempts remain, otherwise it
+    is marked failed. Tasks are not wrapped in a transaction: an SQLite IMMEDIATE transaction
+    would hold the write lock for the whole task and serialize the workers; tasks needing
+    atomicity use transaction.atomic themselves
+    """
+    from jobs.models import Task
+
+    task_settings = task_settings or get_task_settings()
+    owned = Task.objects.using(DEFAULT_DB_ALIAS).filter(id=task.id, status=TaskStatus.RUNNING, locked_by=task.locked_by)
+    started_at = timezone.now()
+    try:
+        resolve_task(task.name)(**task.payload)
+    except Exception as error:
+        now = timezone.now()
+        message = f"{type(error).__name__}: {error}"
+        if task.attempts >= task.max_attempts or isinstance(error, UnknownTask):
+            logger.error("Task failed: id=%s name=%s attempts=%s error=%s", task.id, task.name, task.attempts, message)
+            owned.update(
+                status=TaskStatus.FAILED, started_at=started_at, finished_at=now, locked_by="", last_error=message,
+            )
+        else:
+            delay = retry_delay(task.attempts, task_settings)
+            logger.warning(
+                "Task will retry: id=%s name=%s attempts=%s delay=%.1fs error=%s",
+                task.id, task.name, task.attempts, delay, message,
+            )
+            owned.update(
+                status=TaskStatus.QUEUED, run_after=now + timedelta(seconds=delay), started_at=started_at, locked_by="",
+                last_error=message,
+            )
+        return False
+    owned.update(
+        status=TaskStatus.SUCCEEDED, started_at=started_at, finished_at=timezone.now(), locked_by="", last_error="",
+    )
+    return True
+
+
+def requeue_abandoned(lease_seconds=None):
+    """
+    將認領超過租約時間的工作放回佇列（次數用盡則標記 failed），回傳筆數 / Put tasks claimed longer than the lease back in the queue (failed when out of attempts); returns the count
+    """
+    from jobs.models import Task
+
+    lease_seconds = get_task_settings()["LEASE_SECONDS"] if lease_seconds is None else lease_seconds
+    now = timezone.now()
+    abandoned = Task.objects.using(DEFAULT_DB_ALIAS).filter(
+        status=TaskStatus.RUNNING, locked_at__lt=now - timedelta(seconds=lease_seconds),
+    )
+    message = "Lease expired before the task finished"
+    failed = abandoned.filter(attempts__gte=F("max_attempts")).update(
+        status=TaskStatus.FAILED, finished_at=now, locked_by="", last_error=message,
+    )
+    requeued = abandoned.update(status=TaskStatus.QUEUED, run_after=now, locked_by="", last_error=message)
+    if failed or requeued:
+        logger.warning("Abandoned tasks recovered: requeued=%s failed=%s", requeued, failed)
+    return requeued + failed
+
+
+def purge_finished(retention_seconds=None):
+    """
+    刪除超過保留時間的成功工作，回傳筆數；failed 工作保留以供檢查 / Delete succeeded tasks past the retention and return the count; failed tasks are kept for inspection
+    """
+    from jobs.models import Task
+
+    retention_seconds = get_task_settings()["RETENTION_SECONDS"] if retention_seconds is None else retention_seconds
+    deleted, _ = Task.objects.using(DEFAULT_DB_ALIAS).filter(
+        status=TaskStatus.SUCCEEDED, finished_at__lt=timezone.now() - timedelta(seconds=retention_seconds),
+    ).delete()
+    return deleted
+
+
+class Worker:
+    """
+    單一工作行程的認領與執行迴圈 / Claim-and-run loop of one worker process
+    """
+
+    def __init__(self, batch_size=None, poll_interval=None):
+        task_settings = get_task_settings()
+        self.name = worker_name()
+        self.batch_size = batch_size or task_settings["BATCH_SIZE"]
+        self.poll_interval = task_settings["POLL_INTERVAL"] if poll_interval is None else poll_interval
+        self.succeeded = 0
+        self.failed = 0
+        self._stopped = threading.Event()
+
+    def run_once(self):
+        """
+        認領並執行一批工作，回傳處理數 / Claim and run one batch of tasks; returns how many were processed
+        """
+        task_settings = get_task_settings()
+        tasks = claim_tasks(self.name, self.batch_size)
+        for task in tasks:
+            if execute_task(task, task_settings):
+                self.succeeded += 1
+            else:
+                self.failed += 1
+        return len(tasks)
+
+    def maintain(self):
+        """
+        放回逾時工作並清除舊工作 / Requeue abandoned tasks and purge old ones
+        """
+        requeue_abandoned()
+        purge_finished()
+
+    def run(self, burst=False):
+        """
+        執行直到 stop()；burst 時佇列沒有到期工作即結束 / Run until stop(); with burst, return once no task is due
+
+        資料庫錯誤只記錄，稍後重試 / Database errors are logged and retried later
+        """
+        batches = 0
+        while not self._stopped.is_set():
+            try:
+                if batches % MAINTENANCE_EVERY == 0:
+                    self.maintain()
+                processed = self.run_once()
+            except DatabaseError:
+                logger.exception("Task worker database error: worker=%s", self.name)
+                processed = 0
+            finally:
+                close_old_connections()
+            batches += 1
+            if not processed:
+                if burst:
+                    break
+                self._stopped.wait(self.poll_interval)
+        return self.succeeded, self.failed
+
+    def stop(self):
+        """
+        處理完目前這批後停止 / Stop after the current batch
+        """
+        self._stopped.set()
+
+
+def run_pending(limit=None):
+    """
+    在目前行程執行所有到期工作直到佇列清空（或達 limit 批），回傳 (成功數, 失敗數)
+    Run due tasks in the current process until the queue is drained (or limit batches ran);
+    returns (succeeded, failed)
+
+    供測試與單次執行使用 / Meant for tests and one-off runs
+    """
+    worker = Worker()
+    batches = 0
+    while (limit is None or batches < limit) and worker.run_once():
+        batches += 1
+    return worker.succeeded, worker.failed
+
+
+def _percentile(values, percent):
+    """
+    已排序數列的百分位數 / Percentile of a sorted list
+    """
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * percent / 100))]
+
+
+def queue_stats(now=None):
+    """
+    佇列深度與最近完成工作的延遲 / Queue depth and the latency of recently finished tasks
+
+    wait 為到期到被認領的秒數，run 為執行秒數；涵蓋最近 METRICS_WINDOW 秒完成的工作
+    wait is seconds from due to claimed and run is seconds spent running, over tasks finished in
+    the last METRICS_WINDOW seconds
+    """
+    from jobs.models import Task
+
+    tasks = Task.objects.using(DEFAULT_DB_ALIAS)
+    now = now or timezone.now()
+    depth = {status.value: 0 for status in TaskStatus}
+    depth.update(tasks.order_by().values_list("status").annotate(count=Count("id")))
+    due = tasks.filter(status=TaskStatus.QUEUED, run_after__lte=now).aggregate(count=Count("id"), oldest=Min("run_after"))
+
+    window = get_task_settings()["METRICS_WINDOW"]
+    finished = tasks.filter(
+        status__in=(TaskStatus.SUCCEEDED, TaskStatus.FAILED), finished_at__gte=now - timedelta(seconds=window),
+    ).values_list("run_after", "started_at", "finished_at")[:METRICS_SAMPLE_SIZE]
+    waits, runs = [], []
+    for run_after, started_at, finished_at in finished:
+        if started_at is not None:
+            waits.append(max((started_at - run_after).total_seconds(), 0.0))
+            runs.append(max((finished_at - started_at).total_seconds(), 0.0))
+    waits.sort()
+    runs.sort()
+    return {
+        "depth": depth,
+        "due": due["count"],
+        "oldest_due_seconds": (now - due["oldest"]).total_seconds() if due["oldest"] else 0.0,
+        "recent_finished": len(runs),
+        "wait_seconds": {"0.5": _percentile(waits, 50), "0.95": _percentile(waits, 95), "max": waits[-1] if waits else 0.0},
+        "run_seconds": {"0.5": _percentile(runs, 50), "0.95": _percentile(runs, 95), "max": runs[-1] if runs else 0.0},
+    }
@@ -0,0 +1,27 @@
+from datetime import date
+
+import pytest
+from django.core.cache import caches
+
+from jobs.auth import token_cache
+from jobs.metrics import reset_metrics
+from jobs.ratelimit import reset_rate_limits
+from jobs.snapshot import active_snapshot
+from jobs.status import mark_transitioned
+from jobs.tests.query_budget import pytest_addoption, pytest_configure, query_budget  # noqa: F401  查詢預算外掛 / Query budget plugin
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """
+    每個測試前清空快取，避免回應、令牌、限流狀態與快照跨測試殘留 / Clear caches before each test so cached responses, tokens, rate limits and snapshots do not leak
+    """
+    for cache in caches.all():
+        cache.clear()
+    token_cache.clear()
+    active_snapshot.clear()
+    reset_rate_limits()
+    reset_metrics()
+    # 測試資料寫入時已計算狀態，不需補做轉換 / Test rows get their status on write, so no catch-up transition is needed
+    mark_transitioned(date.today())
+    yield
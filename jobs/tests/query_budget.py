@@ -0,0 +1,166 @@
+"""
+查詢預算 pytest 外掛 / Query budget pytest plugin
+
+在區塊內擷取 SQL，並在下列情況使測試失敗：
+Captures the SQL run inside a block and fails the test when:
+- 查詢數超過預算 / the query count exceeds the budget
+- 同一條 SQL（含參數）重複執行 / the same SQL (with parameters) runs more than once
+- 同一查詢樣板（參數不同）重複超過門檻，通常是 N+1 / the same query template (different parameters)
+  repeats past a threshold, usually an N+1
+
+超過時間門檻的查詢只記錄警告 / Queries slower than a threshold are only logged as warnings
+
+用法 / Usage:
+    with self.assertQueryBudget(2):  # QueryBudgetMixin
+        self.client.get("/api/jobs/")
+
+    def test_list(query_budget):  # pytest fixture
+        with query_budget(2):
+            ...
+
+由 jobs/tests/conftest.py 載入外掛鉤子與 fixture；慢查詢門檻由 pytest.ini 的 query_budget_slow_ms 設定
+jobs/tests/conftest.py loads the plugin hooks and fixture; the slow query threshold comes from
+query_budget_slow_ms in pytest.ini
+"""
+import logging
+import re
+from collections import Counter
+
+import pytest
+
+logger = logging.getLogger(__name__)
+
+# 預設慢查詢門檻（毫秒） / Default slow query threshold in milliseconds
+DEFAULT_SLOW_MS = 100
+
+# 同一樣板重複幾次視為 N+1 / Repeats of one template treated as an N+1
+DEFAULT_REPEAT_THRESHOLD = 3
+
+# 由 ini 設定的慢查詢門檻 / Slow query threshold from the ini file
+_slow_ms = DEFAULT_SLOW_MS
+
+# 將字面值替換為佔位符以取得查詢樣板 / Replace literals with placeholders to get the query template
+_LITERAL_PATTERNS = (
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)"), "(?)"),
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    區塊內的查詢違反預算 / Queries in the block broke the budget
+    """
+
+
+def query_template(sql):
+    """
+    取得去除字面值的查詢樣板 / Get the query template with literals stripped
+    """
+    for pattern, placeholder in _LITERAL_PATTERNS:
+        sql = pattern.sub(placeholder, sql)
+    return sql
+
+
+class QueryBudget:
+    """
+    擷取區塊內查詢並檢查預算的 context manager / Context manager capturing queries in a block and checking the budget
+    """
+
+    def __init__(self, max_queries, allow_duplicates=False, repeat_threshold=DEFAULT_REPEAT_THRESHOLD,
+                 slow_ms=None, using="default", label=None):
+        self.max_queries = max_queries
+        self.allow_duplicates = allow_duplicates
+        self.repeat_threshold = repeat_threshold
+        self.slow_ms = _slow_ms if slow_ms is None else slow_ms
+        self.using = using
+        self.label = label
+        self._capture = None
+
+    @property
+    def queries(self):
+        """
+        擷取到的查詢（{"sql", "time"}） / Captured queries ({"sql", "time"})
+        """
+        return self._capture.captured_queries if self._capture else []
+
+    def __enter__(self):
+        from django.db import connections
+        from django.test.utils import CaptureQueriesContext
+
+        self._capture = CaptureQueriesContext(connections[self.using])
+        self._capture.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._capture.__exit__(exc_type, exc_value, traceback)
+        if exc_type is not None:
+            return
+        self._log_slow_queries()
+        problems = self.problems()
+        if problems:
+            raise QueryBudgetExceeded(self.report(problems))
+
+    def _log_slow_queries(self):
+        for query in self.queries:
+            milliseconds = float(query["time"]) * 1000
+            if milliseconds > self.slow_ms:
+                logger.warning("Slow query (%.1f ms > %s ms) in %s: %s", milliseconds, self.slow_ms, self.label or "block", query["sql"])
+
+    def problems(self):
+        """
+        回傳違反預算的說明列表 / Return descriptions of every budget violation
+        """
+        problems = []
+        if len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries exceed the budget of {self.max_queries}")
+        if not self.allow_duplicates:
+            duplicates = Counter(query["sql"] for query in self.queries)
+            problems += [f"duplicate query x{count}: {sql}" for sql, count in duplicates.items() if count > 1]
+        if self.repeat_threshold:
+            templates = Counter(query_template(query["sql"]) for query in self.queries)
+            problems += [
+                f"possible N+1, template repeated x{count}: {template}"
+                for template, count in templates.items() if count >= self.repeat_threshold
+            ]
+        return problems
+
+    def report(self, problems):
+        """
+        組成失敗訊息，附上所有查詢 / Build the failure message listing every query
+        """
+        lines = [f"Query budget exceeded{f' in {self.label}' if self.label else ''}:"]
+        lines += [f"  - {problem}" for problem in problems]
+        lines.append("Captured queries:")
+        lines += [f"  {index}. {query['sql']}" for index, query in enumerate(self.queries, start=1)]
+        return "\n".join(lines)
+
+
+class QueryBudgetMixin:
+    """
+    提供 assertQueryBudget 的 TestCase 混入類別 / TestCase mixin providing assertQueryBudget
+    """
+
+    def assertQueryBudget(self, max_queries, **options):
+        options.setdefault("label", self.id())
+        return QueryBudget(max_queries, **options)
+
+
+def pytest_addoption(parser):
+    parser.addini("query_budget_slow_ms", "Log queries slower than this many milliseconds", default=str(DEFAULT_SLOW_MS))
+
+
+def pytest_configure(config):
+    global _slow_ms
+    _slow_ms = float(config.getini("query_budget_slow_ms"))
+
+
+@pytest.fixture
+def query_budget(request):
+    """
+    回傳 QueryBudget 工廠，標籤預設為測試名稱 / Return a QueryBudget factory labelled with the test name
+    """
+    def factory(max_queries, **options):
+        options.setdefault("label", request.node.nodeid)
+        return QueryBudget(max_queries, **options)
+    return factory
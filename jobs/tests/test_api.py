@@ -6,9 +6,10 @@ from django.contrib.auth.models import User
 from ninja_jwt.tokens import RefreshToken
 
 from jobs.models import JobPosting
+from jobs.tests.query_budget import QueryBudgetMixin
 
 
-class JobPostingAPITest(TestCase):
+class JobPostingAPITest(QueryBudgetMixin, TestCase):
     """
     測試職缺API的功能 / Test functionality of Job Posting API
     """
@@ -80,12 +81,14 @@ class JobPostingAPITest(TestCase):
         }
         
         # 發送POST請求 / Send POST request
-        response = self.client.post(
-            self.jobs_url,
-            data=json.dumps(new_job_data),
-            content_type="application/json",
-            **self.authenticate()
-        )
+        # 使用者、寫入、技能同步（查詢、補建、重讀、清除、寫入） / User, insert, skill sync (lookup, create missing, reload, clear, insert)
+        with self.assertQueryBudget(7):
+            response = self.client.post(
+                self.jobs_url,
+                data=json.dumps(new_job_data),
+                content_type="application/json",
+                **self.authenticate()
+            )
         
         # 檢查響應 / Check response
         self.assertEqual(response.status_code, 201)
@@ -113,10 +116,12 @@ class JobPostingAPITest(TestCase):
         )
         
         # 測試獲取所有職缺 / Test fetching all jobs
-        response = self.client.get(
-            self.jobs_url,
-            **self.authenticate()
-        )
+        # 使用者、ETag 彙總與單一列表查詢 / User, the ETag aggregate and a single list query
+        with self.assertQueryBudget(3):
+            response = self.client.get(
+                self.jobs_url,
+                **self.authenticate()
+            )
         self.assertEqual(response.status_code, 200)
         response_data = json.loads(response.content)
         self.assertEqual(len(response_data), 2)
@@ -154,10 +159,12 @@ class JobPostingAPITest(TestCase):
         """
         測試獲取單個職缺詳情 / Test getting a single job posting
         """
-        response = self.client.get(
-            self.job_detail_url,
-            **self.authenticate()
-        )
+        # 使用者與職缺 / User and posting
+        with self.assertQueryBudget(2):
+            response = self.client.get(
+                self.job_detail_url,
+                **self.authenticate()
+            )
         self.assertEqual(response.status_code, 200)
         response_data = json.loads(response.content)
         self.assertEqual(response_data["id"], self.job.id)
@@ -186,12 +193,14 @@ class JobPostingAPITest(TestCase):
             "required_skills": ["Python", "Django", "SQL", "FastAPI"]
         }
         
-        response = self.client.put(
-            self.job_detail_url,
-            data=json.dumps(update_data),
-            content_type="application/json",
-            **self.authenticate()
-        )
+        # 使用者、交易保存點、讀取、更新與技能同步 / User, transaction savepoint, fetch, update and skill sync
+        with self.assertQueryBudget(10):
+            response = self.client.put(
+                self.job_detail_url,
+                data=json.dumps(update_data),
+                content_type="application/json",
+                **self.authenticate()
+            )
         
         self.assertEqual(response.status_code, 200)
         
@@ -220,10 +229,12 @@ class JobPostingAPITest(TestCase):
         self.assertEqual(JobPosting.objects.filter(id=self.job.id).count(), 1)
         
         # 刪除職缺 / Delete job
-        response = self.client.delete(
-            self.job_detail_url,
-            **self.authenticate()
-        )
+        # 使用者、讀取、刪除技能關聯與職缺 / User, fetch, delete skill links and posting
+        with self.assertQueryBudget(4):
+            response = self.client.delete(
+                self.job_detail_url,
+                **self.authenticate()
+            )
         
         self.assertEqual(response.status_code, 200)
         
@@ -0,0 +1,123 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.schemas import JobStatus
+from jobs.status import mark_transitioned
+
+
+class AsyncJobPostingAPITest(TestCase):
+    """
+    測試非同步職缺 API / Test the async job posting API
+    """
+
+    def setUp(self):
+        # 建立測試用戶與職缺 / Create test user and posting
+        self.user = User.objects.create_user(username="asyncuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.job = JobPosting.objects.create(
+            title="Async Job",
+            description="Served without the sync adapter",
+            location="Taipei",
+            company_name="Async Company",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+            _required_skills='["Python"]',
+        )
+        self.jobs_url = "/api/async/jobs/"
+        self.job_detail_url = f"/api/async/jobs/{self.job.id}"
+
+    def headers(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"Authorization": f"Bearer {self.access_token}"}
+
+    def job_payload(self, **overrides):
+        """
+        產生職缺輸入資料 / Build job input data
+        """
+        payload = {
+            "title": "Async Created",
+            "description": "Created asynchronously",
+            "location": "Taichung",
+            "company_name": "Async Company",
+            "posting_date": self.today.isoformat(),
+            "expiration_date": (self.today + timedelta(days=10)).isoformat(),
+            "required_skills": ["Go"],
+        }
+        payload.update(overrides)
+        return payload
+
+    async def test_authentication_required(self):
+        """測試未認證被拒絕 / Test unauthenticated requests are refused"""
+        response = await self.async_client.get(self.jobs_url)
+        self.assertEqual(response.status_code, 401)
+
+    async def test_list_and_detail(self):
+        """測試非同步列表與詳情 / Test async list and detail"""
+        response = await self.async_client.get(f"{self.jobs_url}?search=Async", headers=self.headers())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([job["title"] for job in json.loads(response.content)], ["Async Job"])
+
+        response = await self.async_client.get(self.job_detail_url, headers=self.headers())
+        self.assertEqual(json.loads(response.content)["required_skills"], ["Python"])
+
+        response = await self.async_client.get("/api/async/jobs/9999", headers=self.headers())
+        self.assertEqual(response.status_code, 404)
+
+    async def test_status_filter_catches_up(self):
+        """測試當天第一次依狀態讀取時，非同步端點補做轉換而不出錯 / Test the first status read of the day catches up the transition in async endpoints"""
+        expired = await JobPosting.objects.acreate(
+            title="Async Expired", description="Expired yesterday", location="Taipei", company_name="Async Company",
+            posting_date=self.today - timedelta(days=10), expiration_date=self.today - timedelta(days=1),
+        )
+        # 模擬轉換尚未執行的新行程 / Simulate a fresh process whose transition has not run
+        await JobPosting.objects.filter(id=expired.id).aupdate(status=JobStatus.ACTIVE)
+        await JobPosting.objects.filter(id=self.job.id).aupdate(status=JobStatus.SCHEDULED)
+        mark_transitioned(None)
+
+        for status, titles in (("expired", ["Async Expired"]), ("scheduled", []), ("active", ["Async Job"])):
+            response = await self.async_client.get(f"{self.jobs_url}?status={status}", headers=self.headers())
+            self.assertEqual(response.status_code, 200, status)
+            self.assertEqual([job["title"] for job in json.loads(response.content)], titles, status)
+        await self.job.arefresh_from_db()
+        self.assertEqual(self.job.status, JobStatus.ACTIVE)
+
+    async def test_create_update_delete(self):
+        """測試非同步建立、更新與刪除 / Test async create, update and delete"""
+        response = await self.async_client.post(
+            self.jobs_url,
+            data=json.dumps(self.job_payload()),
+            content_type="application/json",
+            headers=self.headers(),
+        )
+        self.assertEqual(response.status_code, 201)
+        created_id = json.loads(response.content)["id"]
+        created = await JobPosting.objects.aget(id=created_id)
+        self.assertEqual(await created.skills.acount(), 1)
+
+        response = await self.async_client.put(
+            f"/api/async/jobs/{created_id}",
+            data=json.dumps(self.job_payload(title="Async Updated")),
+            content_type="application/json",
+            headers=self.headers(),
+        )
+        self.assertEqual(json.loads(response.content)["title"], "Async Updated")
+
+        response = await self.async_client.put(
+            f"/api/async/jobs/{created_id}",
+            data=json.dumps(self.job_payload(company_name="Other")),
+            content_type="application/json",
+            headers=self.headers(),
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = await self.async_client.delete(f"/api/async/jobs/{created_id}", headers=self.headers())
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(await JobPosting.objects.filter(id=created_id).aexists())
@@ -0,0 +1,109 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.auth import TokenCacheEntry, VerifiedTokenCache, revoke_user, token_cache
+from jobs.models import JobPosting
+
+
+class CachedJWTAuthTest(TestCase):
+    """
+    測試已驗證令牌快取 / Test the verified-token cache
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="cached", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+        JobPosting.objects.create(
+            title="Cached Job",
+            description="Auth cache",
+            location="Taipei",
+            company_name="Test Company",
+            posting_date=date.today() - timedelta(days=1),
+            expiration_date=date.today() + timedelta(days=30),
+        )
+        self.url = f"/api/jobs/{JobPosting.objects.get().id}"
+
+    def get(self, token=None):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {token or self.access_token}")
+
+    def test_cache_hit_skips_user_query(self):
+        """
+        測試命中時不再查詢使用者 / Test a hit no longer queries the user
+        """
+        with self.assertNumQueries(2):
+            self.assertEqual(self.get().status_code, 200)
+        # 第二次令牌與回應快取都命中，不需任何查詢 / The second request hits both the token and response caches and runs no query
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get().status_code, 200)
+
+        stats = token_cache.snapshot()
+        self.assertEqual((stats["hit"], stats["miss"], stats["verify_count"]), (1, 1, 1))
+        self.assertGreater(stats["verify_seconds_total"], 0)
+
+    def test_revoked_token_is_rejected(self):
+        """
+        測試撤銷後的令牌即使已快取也會被拒絕 / Test a revoked token is rejected even when cached
+        """
+        other_token = str(RefreshToken.for_user(self.user).access_token)
+        self.assertEqual(self.get().status_code, 200)
+        self.assertEqual(self.get(other_token).status_code, 200)
+
+        response = self.client.post("/api/auth/token/revoke", HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get().status_code, 401)
+        self.assertEqual(self.get(other_token).status_code, 200)
+
+        revoke_user(self.user.pk)
+        self.assertEqual(self.get(other_token).status_code, 401)
+
+    def test_deactivated_user_is_dropped(self):
+        """
+        測試停用使用者後其快取項目被移除 / Test deactivating a user drops its cached entries
+        """
+        self.assertEqual(self.get().status_code, 200)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(token_cache.snapshot()["size"], 0)
+        self.assertEqual(self.get().status_code, 401)
+
+    @override_settings(JOBS_AUTH_CACHE={"ENABLED": False})
+    def test_disabled_cache_verifies_every_request(self):
+        """
+        測試停用快取時每次請求都完整驗證 / Test every request is fully verified when the cache is disabled
+        """
+        self.get()
+        self.get()
+        self.assertEqual(token_cache.snapshot()["verify_count"], 2)
+        self.assertEqual(token_cache.snapshot()["size"], 0)
+
+
+class VerifiedTokenCacheTest(TestCase):
+    """
+    測試 LRU 的逐出與到期 / Test LRU eviction and expiry
+    """
+
+    def entry(self, expires_at):
+        return TokenCacheEntry(user=None, user_id=1, jti="jti", issued_at=0, expires_at=expires_at)
+
+    def test_evicts_least_recently_used(self):
+        cache = VerifiedTokenCache()
+        later = time.time() + 60
+        cache.put("a", self.entry(later), max_entries=2)
+        cache.put("b", self.entry(later), max_entries=2)
+        cache.get("a")
+        cache.put("c", self.entry(later), max_entries=2)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.snapshot()["eviction"], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = VerifiedTokenCache()
+        cache.put("a", self.entry(time.time() - 1), max_entries=2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.snapshot()["size"], 0)
+        self.assertEqual(cache.snapshot()["expired"], 1)
@@ -0,0 +1,157 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.bulk import bulk_delete_jobs
+from jobs.cache import list_generation
+from jobs.models import JobPosting
+from jobs.search import apply_search
+
+
+class JobBulkAPITest(TestCase):
+    """
+    測試職缺批次端點 / Test the job bulk endpoints
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="bulkuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.next_month = self.today + timedelta(days=30)
+        self.job = JobPosting.objects.create(
+            title="Existing Job",
+            description="Bulk test",
+            location="Taipei",
+            company_name="Bulk Company",
+            posting_date=self.today,
+            expiration_date=self.next_month,
+            _required_skills='["Python"]',
+        )
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def job_payload(self, **overrides):
+        """
+        產生職缺輸入資料 / Build job input data
+        """
+        payload = {
+            "title": "Bulk Job",
+            "description": "Created in bulk",
+            "location": "Taichung",
+            "company_name": "Bulk Company",
+            "posting_date": self.today.isoformat(),
+            "expiration_date": self.next_month.isoformat(),
+            "required_skills": ["Go"],
+        }
+        payload.update(overrides)
+        return payload
+
+    def send(self, method, url, body):
+        """
+        發送 JSON 請求並回傳解析後的內容 / Send a JSON request and return the parsed body
+        """
+        response = getattr(self.client, method)(
+            url,
+            data=json.dumps(body),
+            content_type="application/json",
+            **self.authenticate()
+        )
+        return response.status_code, json.loads(response.content)
+
+    def test_bulk_create_reports_per_item_errors(self):
+        """測試批次建立回報每筆錯誤 / Test bulk create reports errors per item"""
+        items = [
+            self.job_payload(title="First"),
+            self.job_payload(posting_date="not-a-date"),
+            self.job_payload(title="Third", required_skills=["Rust", "Go"]),
+        ]
+        status_code, body = self.send("post", "/api/jobs/bulk", {"items": items})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual((body["succeeded"], body["failed"]), (2, 1))
+        self.assertFalse(body["results"][1]["success"])
+        self.assertIn("posting_date", body["results"][1]["errors"][0])
+
+        third = JobPosting.objects.get(id=body["results"][2]["id"])
+        self.assertEqual(third.required_skills, ["Rust", "Go"])
+        self.assertEqual(list(third.skills.order_by("job_links__position").values_list("name", flat=True)), ["Rust", "Go"])
+        self.assertTrue(apply_search(JobPosting.objects.all(), "Third").exists())
+
+    def test_bulk_create_all_or_nothing(self):
+        """測試全有或全無模式 / Test all-or-nothing mode"""
+        items = [self.job_payload(), {"title": "Missing fields"}]
+        status_code, body = self.send("post", "/api/jobs/bulk", {"items": items, "all_or_nothing": True})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual(body["succeeded"], 0)
+        self.assertEqual(JobPosting.objects.count(), 1)
+
+    @override_settings(JOBS_BULK={"MAX_ITEMS": 2})
+    def test_bulk_size_limit(self):
+        """測試超過批次上限回傳 413 / Test exceeding the batch limit returns 413"""
+        status_code, _ = self.send("post", "/api/jobs/bulk", {"items": [self.job_payload()] * 3})
+        self.assertEqual(status_code, 413)
+
+    def test_bulk_update(self):
+        """測試批次更新與公司名檢查 / Test bulk update and the company name check"""
+        before = JobPosting.objects.get(id=self.job.id).updated_at
+        items = [
+            self.job_payload(id=self.job.id, title="Renamed", required_skills=["Kotlin"]),
+            self.job_payload(id=self.job.id, title="Duplicate"),
+            self.job_payload(id=9999),
+            self.job_payload(id=self.job.id, company_name="Other Company"),
+        ]
+        status_code, body = self.send("put", "/api/jobs/bulk", {"items": items})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual([result["success"] for result in body["results"]], [True, False, False, False])
+        updated = JobPosting.objects.get(id=self.job.id)
+        self.assertEqual(updated.title, "Renamed")
+        self.assertEqual(updated.location, "Taichung")
+        self.assertGreater(updated.updated_at, before)
+        self.assertEqual(list(updated.skills.values_list("name", flat=True)), ["Kotlin"])
+
+    def test_bulk_delete(self):
+        """測試批次刪除 / Test bulk delete"""
+        status_code, body = self.send("post", "/api/jobs/bulk/delete", {"ids": [self.job.id, 9999]})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 1))
+        self.assertFalse(JobPosting.objects.filter(id=self.job.id).exists())
+
+    def test_bulk_delete_reports_every_item(self):
+        """測試批次刪除對每個請求項目回報結果，索引與請求位置一致 / Test bulk delete reports every requested item at its request position"""
+        status_code, body = self.send("post", "/api/jobs/bulk/delete", {"ids": [self.job.id, self.job.id, 9999]})
+
+        self.assertEqual(status_code, 200)
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 2))
+        self.assertEqual(
+            [(result["index"], result["id"], result["errors"]) for result in body["results"]],
+            [(0, self.job.id, []), (1, self.job.id, ["id: Duplicate id in request"]), (2, 9999, ["Job posting not found"])],
+        )
+
+    def test_bulk_delete_invalidates_once(self):
+        """測試批次刪除只遞增一次列表世代號，不逐筆失效 / Test bulk delete bumps the list generation once instead of per row"""
+        job_ids = [self.job.id] + [
+            JobPosting.objects.create(
+                title=f"Delete Job {number}", description="Bulk test", location="Taipei", company_name="Test Company",
+                posting_date=self.today, expiration_date=self.next_month,
+            ).id
+            for number in range(3)
+        ]
+        generation = list_generation()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            summary = bulk_delete_jobs(job_ids)
+
+        self.assertEqual(summary["succeeded"], 4)
+        # 只有快照記錄這一次失效的回呼 / Only the snapshot's callback noting the single invalidation
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(list_generation(), generation + 1)
@@ -0,0 +1,128 @@
+import json
+from datetime import date, datetime, timedelta
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.cache import (
+    CACHE_STATUS_HEADER,
+    cache_stats,
+    list_cache_key,
+    seconds_until_midnight,
+)
+from jobs.models import JobPosting
+from jobs.schemas import JobFilterParams
+
+
+class JobResponseCacheTest(TestCase):
+    """
+    測試職缺回應快取 / Test the job response cache
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="cacheuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.job = JobPosting.objects.create(
+            title="Cached Job",
+            description="Cache test",
+            location="Taipei",
+            company_name="Cache Company",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+            _required_skills='["Python"]',
+        )
+        self.job_detail_url = f"/api/jobs/{self.job.id}"
+        cache_stats.reset()
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def test_list_hit_after_miss(self):
+        """測試第二次列表請求命中快取 / Test the second list request hits the cache"""
+        first = self.client.get("/api/jobs/?location=Taipei", **self.authenticate())
+        second = self.client.get("/api/jobs/?location=taipei", **self.authenticate())
+        self.assertEqual(first[CACHE_STATUS_HEADER], "MISS")
+        self.assertEqual(second[CACHE_STATUS_HEADER], "HIT")
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(cache_stats.snapshot()["list"], {"hit": 1, "miss": 1})
+
+    def test_update_invalidates_list_and_detail(self):
+        """測試透過 API 更新會使快取失效 / Test updating through the API invalidates the cache"""
+        self.client.get("/api/jobs/", **self.authenticate())
+        self.client.get(self.job_detail_url, **self.authenticate())
+
+        update_data = {
+            "title": "Renamed Job",
+            "description": "Cache test",
+            "location": "Taipei",
+            "company_name": "Cache Company",
+            "posting_date": self.job.posting_date.isoformat(),
+            "expiration_date": self.job.expiration_date.isoformat(),
+            "required_skills": ["Python"],
+        }
+        response = self.client.put(
+            self.job_detail_url,
+            data=json.dumps(update_data),
+            content_type="application/json",
+            **self.authenticate()
+        )
+        self.assertEqual(response.status_code, 200)
+
+        detail = self.client.get(self.job_detail_url, **self.authenticate())
+        listing = self.client.get("/api/jobs/", **self.authenticate())
+        self.assertEqual(detail[CACHE_STATUS_HEADER], "MISS")
+        self.assertEqual(json.loads(detail.content)["title"], "Renamed Job")
+        self.assertEqual(listing[CACHE_STATUS_HEADER], "MISS")
+        self.assertEqual(json.loads(listing.content)[0]["title"], "Renamed Job")
+
+    def test_read_between_save_and_commit(self):
+        """測試提交前讀取寫入的快取項目在提交後失效 / Test entries cached by reads between save and commit are dropped after the commit"""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                self.job.title = "Committed Job"
+                self.job.save()
+                # 模擬提交前的併發讀取 / Simulate concurrent reads before the commit
+                self.client.get("/api/jobs/", **self.authenticate())
+                self.client.get(self.job_detail_url, **self.authenticate())
+                self.assertEqual(self.client.get(self.job_detail_url, **self.authenticate())[CACHE_STATUS_HEADER], "HIT")
+        self.assertTrue(callbacks)
+
+        self.assertEqual(self.client.get(self.job_detail_url, **self.authenticate())[CACHE_STATUS_HEADER], "MISS")
+        self.assertEqual(self.client.get("/api/jobs/", **self.authenticate())[CACHE_STATUS_HEADER], "MISS")
+
+    def test_delete_invalidates_detail(self):
+        """測試刪除後詳情不再命中快取 / Test the detail is not served from cache after delete"""
+        self.client.get(self.job_detail_url, **self.authenticate())
+        self.client.delete(self.job_detail_url, **self.authenticate())
+        response = self.client.get(self.job_detail_url, **self.authenticate())
+        self.assertEqual(response.status_code, 404)
+
+    def test_equivalent_filters_share_key(self):
+        """測試語意相同的參數產生相同的鍵 / Test equivalent params produce the same key"""
+        first = JobFilterParams(skill="Python, django", search=" Job ", sort_by="title")
+        second = JobFilterParams(skill="DJANGO,python", search="job")
+        self.assertEqual(list_cache_key(first, self.today), list_cache_key(second, self.today))
+        self.assertNotEqual(
+            list_cache_key(first, self.today),
+            list_cache_key(first, self.today + timedelta(days=1)),
+        )
+
+    def test_ttl_respects_midnight(self):
+        """測試 TTL 不會超過午夜 / Test the TTL never crosses midnight"""
+        almost_midnight = datetime.combine(self.today, datetime.max.time()).replace(microsecond=0)
+        self.assertEqual(seconds_until_midnight(almost_midnight), 1)
+        self.assertEqual(seconds_until_midnight(datetime.combine(self.today, datetime.min.time())), 86400)
+
+    @override_settings(JOBS_RESPONSE_CACHE={"ENABLED": False})
+    def test_cache_can_be_disabled(self):
+        """測試可停用快取 / Test the cache can be disabled"""
+        self.client.get("/api/jobs/", **self.authenticate())
+        response = self.client.get("/api/jobs/", **self.authenticate())
+        self.assertEqual(response[CACHE_STATUS_HEADER], "MISS")
@@ -0,0 +1,33 @@
+import os
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+
+from jobs.checks import check_auth_cache, check_response_cache
+
+# 共用快取設定 / Shared cache settings
+SHARED_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "shared": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": os.path.join(tempfile.gettempdir(), "jobs-check-cache")},
+}
+
+
+@override_settings(CACHES=SHARED_CACHES)
+class SharedCacheCheckTest(SimpleTestCase):
+    """
+    測試跨行程狀態的快取系統檢查 / Test the system checks for caches holding cross-process state
+    """
+
+    def test_auth_cache(self):
+        """測試撤銷記錄於行程內快取時發出警告 / Test a warning is issued when revocations use a process-local cache"""
+        self.assertEqual([warning.id for warning in check_auth_cache()], ["jobs.W001"])
+        with self.settings(JOBS_AUTH_CACHE={"ALIAS": "shared"}):
+            self.assertEqual(check_auth_cache(), [])
+
+    def test_response_cache(self):
+        """測試列表世代號位於行程內快取時發出警告 / Test a warning is issued when the list generation uses a process-local cache"""
+        self.assertEqual([warning.id for warning in check_response_cache()], ["jobs.W002"])
+        with self.settings(JOBS_RESPONSE_CACHE={"ALIAS": "shared"}):
+            self.assertEqual(check_response_cache(), [])
+        with self.settings(JOBS_RESPONSE_CACHE={"ENABLED": False}, JOBS_SNAPSHOT={"ENABLED": False}):
+            self.assertEqual(check_response_cache(), [])
@@ -0,0 +1,96 @@
+import gzip
+import json
+from datetime import date, timedelta
+from unittest import skipUnless
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.compression import brotli, choose_encoding
+from jobs.models import JobPosting
+
+
+class ResponseCompressionTest(TestCase):
+    """
+    測試回應壓縮 / Test response compression
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="gzipuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        today = date.today()
+        for index in range(5):
+            JobPosting.objects.create(
+                title=f"Compressed Job {index}",
+                description="Repetitive description " * 100,
+                location="Taipei",
+                company_name="Gzip Company",
+                posting_date=today - timedelta(days=index),
+                expiration_date=today + timedelta(days=30),
+            )
+
+    def authenticate(self, **headers):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}", **headers}
+
+    def test_choose_encoding(self):
+        """測試依 q 值與伺服器偏好選擇編碼 / Test encodings are chosen by q-value and server preference"""
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding("gzip;q=0"))
+        self.assertIsNone(choose_encoding(""))
+        self.assertEqual(choose_encoding("gzip, br"), "br" if brotli else "gzip")
+        self.assertEqual(choose_encoding("br;q=0.5, gzip"), "gzip")
+
+    def test_gzip_list(self):
+        """測試大型列表以 gzip 壓縮且 ETag 帶有編碼後綴 / Test large lists are gzipped and the ETag carries the encoding suffix"""
+        plain = self.client.get("/api/jobs/", **self.authenticate())
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        response = self.client.get("/api/jobs/", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(json.loads(gzip.decompress(response.content)), json.loads(plain.content))
+        self.assertEqual(response["ETag"], plain["ETag"][:-1] + '-gzip"')
+
+        # 帶後綴的 ETag 仍可重新驗證，304 保留後綴 / The suffixed ETag still revalidates and the 304 keeps the suffix
+        not_modified = self.client.get(
+            "/api/jobs/", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=response["ETag"])
+        )
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    @skipUnless(brotli is not None, "brotli is not installed")
+    def test_brotli_preferred(self):
+        """測試同時接受時優先使用 brotli / Test brotli is preferred when both are accepted"""
+        plain = self.client.get("/api/jobs/", **self.authenticate())
+        response = self.client.get("/api/jobs/", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip, br"))
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+        export = self.client.get("/api/jobs/export", **self.authenticate(HTTP_ACCEPT_ENCODING="br"))
+        self.assertEqual(len(brotli.decompress(b"".join(export.streaming_content)).splitlines()), 5)
+
+    def test_small_responses_uncompressed(self):
+        """測試小於門檻的回應不壓縮 / Test responses below the threshold stay uncompressed"""
+        response = self.client.get("/api/jobs/?fields=id&limit=1", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+
+    @override_settings(JOBS_COMPRESSION={"ENABLED": False})
+    def test_disabled(self):
+        """測試停用時不壓縮 / Test nothing is compressed when disabled"""
+        response = self.client.get("/api/jobs/", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertNotIn("Content-Encoding", response)
+
+    def test_streaming_export_gzip(self):
+        """測試串流匯出逐塊壓縮 / Test streaming exports are compressed chunk by chunk"""
+        response = self.client.get("/api/jobs/export", **self.authenticate(HTTP_ACCEPT_ENCODING="gzip"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(response.streaming_content)).decode().splitlines()
+        self.assertEqual(len(lines), 5)
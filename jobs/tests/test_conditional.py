@@ -0,0 +1,170 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.cache import CACHE_STATUS_HEADER
+from jobs.conditional import detail_validators, list_validators
+from jobs.models import JobPosting
+
+
+class ConditionalRequestTest(TestCase):
+    """
+    測試 ETag 與條件式請求 / Test ETags and conditional requests
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="etaguser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.job = JobPosting.objects.create(
+            title="Tagged Job",
+            description="ETag test",
+            location="Taipei",
+            company_name="ETag Company",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+            _required_skills='["Python"]',
+        )
+        self.job_detail_url = f"/api/jobs/{self.job.id}"
+
+    def authenticate(self, **headers):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}", **headers}
+
+    def update_payload(self, title):
+        return json.dumps({
+            "title": title,
+            "description": "ETag test",
+            "location": "Taipei",
+            "company_name": "ETag Company",
+            "posting_date": self.job.posting_date.isoformat(),
+            "expiration_date": self.job.expiration_date.isoformat(),
+            "required_skills": ["Python"],
+        })
+
+    def test_detail_not_modified(self):
+        """測試詳情的 If-None-Match 相符時回傳 304，快取未命中時也只讀取 updated_at / Test a matching If-None-Match on detail gets a 304, reading only updated_at on a cache miss"""
+        response = self.client.get(self.job_detail_url, **self.authenticate())
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+
+        # 快取命中：不查詢資料庫 / Cache hit: no database query
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.job_detail_url, **self.authenticate(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached["ETag"], etag)
+        self.assertEqual(cached.content, b"")
+
+        # 快取停用：只讀取 updated_at / Cache disabled: only updated_at is read
+        with override_settings(JOBS_RESPONSE_CACHE={"ENABLED": False}), self.assertNumQueries(1):
+            uncached = self.client.get(self.job_detail_url, **self.authenticate(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(uncached.status_code, 304)
+        self.assertEqual(uncached["ETag"], etag)
+
+    def test_detail_etag_changes_on_update(self):
+        """測試更新後舊 ETag 不再相符 / Test the old ETag stops matching after an update"""
+        etag = self.client.get(self.job_detail_url, **self.authenticate())["ETag"]
+        self.job.title = "Renamed"
+        self.job.save()
+
+        response = self.client.get(self.job_detail_url, **self.authenticate(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(json.loads(response.content)["title"], "Renamed")
+
+    @override_settings(JOBS_RESPONSE_CACHE={"ENABLED": False})
+    def test_list_not_modified_without_serializing(self):
+        """測試列表的 If-None-Match 相符時以單一彙總查詢回傳 304 / Test a matching If-None-Match on a list gets a 304 from one aggregate query"""
+        response = self.client.get("/api/jobs/?location=Taipei", **self.authenticate())
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        # 認證使用者已快取，只剩彙總查詢 / The user is served from the auth cache, leaving the aggregate
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/jobs/?location=Taipei", **self.authenticate(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(response.status_code, 304)
+
+        # 不同分頁有不同的 ETag / Different pages have different ETags
+        other_page = self.client.get("/api/jobs/?location=Taipei&offset=1", **self.authenticate())
+        self.assertNotEqual(other_page["ETag"], etag)
+
+    def test_list_etag_changes_on_create_and_delete(self):
+        """測試新增或刪除職缺會改變列表 ETag / Test creating or deleting a posting changes the list ETag"""
+        etag = self.client.get("/api/jobs/", **self.authenticate())["ETag"]
+        other = JobPosting.objects.create(
+            title="Another Job",
+            description="ETag test",
+            location="Tainan",
+            company_name="ETag Company",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+        )
+        created = self.client.get("/api/jobs/", **self.authenticate(HTTP_IF_NONE_MATCH=etag))
+        self.assertEqual(created.status_code, 200)
+        self.assertEqual(created[CACHE_STATUS_HEADER], "MISS")
+
+        other.delete()
+        deleted = self.client.get("/api/jobs/", **self.authenticate(HTTP_IF_NONE_MATCH=created["ETag"]))
+        self.assertEqual(deleted.status_code, 200)
+
+    def test_validators_include_today(self):
+        """測試驗證值包含當天日期且 Last-Modified 不早於午夜 / Test validators embed today and Last-Modified is never before midnight"""
+        updated_at = self.job.updated_at - timedelta(days=3)
+        first = detail_validators(self.job.id, updated_at, self.today)
+        second = detail_validators(self.job.id, updated_at, self.today + timedelta(days=1))
+        self.assertNotEqual(first.etag, second.etag)
+        self.assertEqual(first.last_modified.date(), self.today)
+        self.assertNotEqual(
+            list_validators({"limit": 10}, updated_at, 1, self.today).etag,
+            list_validators({"limit": 10}, updated_at, 2, self.today).etag,
+        )
+
+    def test_put_if_match(self):
+        """測試 PUT 的 If-Match 不符時回傳 412 且不更新，相符時更新並回傳新 ETag / Test PUT with a stale If-Match gets a 412 and changes nothing, a current one updates and returns the new ETag"""
+        etag = self.client.get(self.job_detail_url, **self.authenticate())["ETag"]
+
+        stale = self.client.put(
+            self.job_detail_url,
+            data=self.update_payload("Stale Write"),
+            content_type="application/json",
+            **self.authenticate(HTTP_IF_MATCH='"stale"')
+        )
+        self.assertEqual(stale.status_code, 412)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.title, "Tagged Job")
+
+        current = self.client.put(
+            self.job_detail_url,
+            data=self.update_payload("Fresh Write"),
+            content_type="application/json",
+            **self.authenticate(HTTP_IF_MATCH=etag)
+        )
+        self.assertEqual(current.status_code, 200)
+        self.assertNotEqual(current["ETag"], etag)
+
+        # 新 ETag 與後續 GET 一致，舊 ETag 已失效 / The new ETag matches a later GET and the old one is stale
+        self.assertEqual(self.client.get(self.job_detail_url, **self.authenticate())["ETag"], current["ETag"])
+        replay = self.client.put(
+            self.job_detail_url,
+            data=self.update_payload("Lost Update"),
+            content_type="application/json",
+            **self.authenticate(HTTP_IF_MATCH=etag)
+        )
+        self.assertEqual(replay.status_code, 412)
+
+    async def test_async_detail_not_modified(self):
+        """測試非同步詳情端點支援 If-None-Match / Test the async detail endpoint honours If-None-Match"""
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        url = f"/api/async/jobs/{self.job.id}"
+        response = await self.async_client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        not_modified = await self.async_client.get(url, headers={**headers, "If-None-Match": response["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.export import EXPORT_FIELDS
+from jobs.models import JobPosting
+
+
+class JobExportTest(TestCase):
+    """
+    測試職缺串流匯出 / Test the streaming job export
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="exporter", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        for index, location in enumerate(["Taipei", "Taipei", "Tainan"]):
+            JobPosting.objects.create(
+                title=f"Export Job {index}",
+                description='Line one,\nline "two"',
+                location=location,
+                company_name="Export Company",
+                posting_date=self.today - timedelta(days=index),
+                expiration_date=self.today + timedelta(days=30),
+                _required_skills='["Python", "台灣"]',
+            )
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def test_ndjson_export_honours_filters(self):
+        """測試 NDJSON 匯出套用過濾與排序 / Test the NDJSON export applies filters and sorting"""
+        response = self.client.get("/api/jobs/export?location=taipei&sort_desc=true", **self.authenticate())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        records = [json.loads(line) for line in lines]
+        self.assertEqual([record["title"] for record in records], ["Export Job 0", "Export Job 1"])
+        self.assertEqual(records[0]["required_skills"], ["Python", "台灣"])
+        self.assertEqual(records[0]["posting_date"], self.today.isoformat())
+
+    def test_csv_export(self):
+        """測試 CSV 匯出 / Test the CSV export"""
+        response = self.client.get("/api/jobs/export?format=csv&limit=1", **self.authenticate())
+
+        self.assertEqual(response.status_code, 200)
+        content = b"".join(response.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(tuple(rows[0].keys()), EXPORT_FIELDS)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(json.loads(rows[0]["required_skills"]), ["Python", "台灣"])
+        self.assertEqual(rows[0]["description"], 'Line one,\nline "two"')
+
+    def test_export_requires_authentication(self):
+        """測試匯出需要認證 / Test the export requires authentication"""
+        response = self.client.get("/api/jobs/export")
+        self.assertEqual(response.status_code, 401)
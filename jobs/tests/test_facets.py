@@ -0,0 +1,96 @@
+import json
+from datetime import date, timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.facets import FacetTimeout, time_budget
+from jobs.models import JobPosting
+from jobs.schemas import JobStatus
+from jobs.status import mark_transitioned
+
+
+class JobFacetsTest(TestCase):
+    """
+    測試分面計數端點 / Test the facet counts endpoint
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="facetuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        # 建立不同地點、公司與技能的職缺 / Create postings across locations, companies and skills
+        today = date.today()
+        postings = [
+            ("Taipei", "Alpha", ["Python", "Django"], 0),
+            ("Taipei", "Alpha", ["Python"], 0),
+            ("Taipei", "Beta", ["Go"], 10),
+            ("Kaohsiung", "Beta", ["Python"], -40),
+        ]
+        for index, (location, company, skills, offset) in enumerate(postings):
+            job = JobPosting(
+                title=f"Facet Job {index}",
+                description="Facet test",
+                location=location,
+                company_name=company,
+                posting_date=today + timedelta(days=offset),
+                expiration_date=today + timedelta(days=offset + 30),
+            )
+            job.required_skills = skills
+            job.save()
+
+    def get_facets(self, query=""):
+        """
+        以認證請求分面端點 / Request the facets endpoint with authentication
+        """
+        return self.client.get(
+            f"/api/jobs/facets{query}", HTTP_AUTHORIZATION=f"Bearer {self.access_token}"
+        )
+
+    def test_facet_counts(self):
+        """測試各分面的筆數與排序 / Test counts and ordering of every facet"""
+        response = self.get_facets()
+        self.assertEqual(response.status_code, 200)
+        facets = json.loads(response.content)["facets"]
+        self.assertEqual(facets["location"], [{"value": "Taipei", "count": 3}, {"value": "Kaohsiung", "count": 1}])
+        self.assertEqual(facets["status"][0], {"value": "active", "count": 2})
+        self.assertEqual(facets["skill"][0], {"value": "Python", "count": 3})
+
+    def test_status_counts_match_filters_before_transition(self):
+        """測試跨日轉換執行前，狀態分面仍與 ?status= 過濾一致 / Test status facet counts agree with ?status= filtering before the day's transition runs"""
+        # 模擬轉換尚未執行：儲存的狀態全部落後 / Simulate a late transition: every stored status lags
+        JobPosting.objects.update(status=JobStatus.SCHEDULED)
+        mark_transitioned(None)
+
+        counts = {bucket["value"]: bucket["count"] for bucket in json.loads(self.get_facets().content)["facets"]["status"]}
+        self.assertEqual(counts, {"active": 2, "scheduled": 1, "expired": 1})
+        for status, count in counts.items():
+            response = self.client.get(f"/api/jobs/?status={status}", HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+            self.assertEqual(len(json.loads(response.content)), count, status)
+
+    def test_filters_and_top(self):
+        """測試過濾條件與 top 限制 / Test filters and the top limit"""
+        response = self.get_facets("?location=Taipei&top=1")
+        facets = json.loads(response.content)["facets"]
+        self.assertEqual(facets["company"], [{"value": "Alpha", "count": 2}])
+        self.assertEqual(facets["skill"], [{"value": "Python", "count": 2}])
+        self.assertEqual(self.get_facets("?top=0").status_code, 400)
+
+    @override_settings(JOBS_FACETS={"TIMEOUT_MS": 1})
+    def test_timed_out_facets_are_skipped(self):
+        """測試超時的分面被略過 / Test facets exceeding the budget are skipped"""
+        with mock.patch("jobs.facets.count_skills", side_effect=FacetTimeout("interrupted")):
+            body = json.loads(self.get_facets().content)
+        self.assertEqual(body["timed_out"], ["skill"])
+        self.assertNotIn("skill", body["facets"])
+
+    def test_time_budget_interrupts_query(self):
+        """測試時間預算會中斷 SQLite 查詢 / Test the time budget interrupts SQLite queries"""
+        with self.assertRaises(FacetTimeout):
+            with time_budget(1):
+                list(JobPosting.objects.raw(
+                    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+                    "SELECT 1 AS id FROM n LIMIT 100000000"
+                ))
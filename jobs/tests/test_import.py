@@ -0,0 +1,108 @@
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase
+
+from jobs.importer import import_file
+from jobs.models import JobPosting
+
+
+class ImportJobsCommandTest(TestCase):
+    """
+    測試職缺匯入指令 / Test the job import command
+    """
+
+    def setUp(self):
+        # 建立暫存目錄與基本資料 / Create a temp directory and base row data
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.today = date.today()
+
+    def row(self, **overrides):
+        """
+        產生一筆匯入資料 / Build one import row
+        """
+        row = {
+            "title": "Imported Job",
+            "description": "From a feed",
+            "location": "Taipei",
+            "salary_min": 40000,
+            "salary_max": None,
+            "company_name": "Feed Company",
+            "posting_date": self.today.isoformat(),
+            "expiration_date": (self.today + timedelta(days=30)).isoformat(),
+            "required_skills": ["Python"],
+        }
+        row.update(overrides)
+        return row
+
+    def write_file(self, name, content):
+        """
+        寫入暫存檔並回傳路徑 / Write a temp file and return its path
+        """
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as handle:
+            handle.write(content)
+        return path
+
+    def test_ndjson_import_reports_errors(self):
+        """測試 NDJSON 匯入與錯誤回報 / Test NDJSON import and error reporting"""
+        lines = [json.dumps(self.row(title=f"Job {index}")) for index in range(5)]
+        lines.insert(2, "{not json")
+        lines.append(json.dumps(self.row(posting_date="tomorrow")))
+        path = self.write_file("feed.ndjson", "\n".join(lines) + "\n")
+
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_jobs", path, "--chunk-size", "2", stdout=stdout, stderr=stderr)
+
+        self.assertEqual(JobPosting.objects.count(), 5)
+        self.assertIn("Imported 5 of 7 rows (2 failed)", stdout.getvalue())
+        self.assertIn("feed.ndjson:3", stderr.getvalue())
+        self.assertEqual(JobPosting.objects.get(title="Job 4").skills.get().name, "Python")
+
+    def test_csv_import(self):
+        """測試 CSV 匯入（技能為逗號分隔、空白欄位為 null） / Test CSV import with comma separated skills and blank nulls"""
+        content = (
+            "title,description,location,salary_min,salary_max,company_name,posting_date,expiration_date,required_skills\n"
+            f'CSV Job,"Multi\nline",Tainan,,90000,CSV Co,{self.today},{self.today + timedelta(days=5)},"Go, Rust"\n'
+        )
+        stats = import_file(self.write_file("feed.csv", content))
+
+        self.assertEqual((stats.written, stats.failed), (1, 0))
+        job = JobPosting.objects.get(title="CSV Job")
+        self.assertIsNone(job.salary_min)
+        self.assertEqual(job.description, "Multi\nline")
+        self.assertEqual(job.required_skills, ["Go", "Rust"])
+
+    def test_upsert_by_external_id(self):
+        """測試依 external_id upsert / Test upserting by external_id"""
+        first = self.write_file("first.ndjson", json.dumps(self.row(external_id="feed-1")) + "\n")
+        import_file(first, upsert=True)
+        original = JobPosting.objects.get(external_id="feed-1")
+
+        second = self.write_file(
+            "second.ndjson",
+            json.dumps(self.row(external_id="feed-1", title="Updated", required_skills=["Go"])) + "\n"
+            + json.dumps(self.row(external_id="feed-2")) + "\n",
+        )
+        stats = import_file(second, upsert=True)
+
+        self.assertEqual(stats.written, 2)
+        self.assertEqual(JobPosting.objects.count(), 2)
+        updated = JobPosting.objects.get(external_id="feed-1")
+        self.assertEqual(updated.id, original.id)
+        self.assertEqual(updated.title, "Updated")
+        self.assertEqual(list(updated.skills.values_list("name", flat=True)), ["Go"])
+
+    def test_duplicate_key_without_upsert_fails_chunk(self):
+        """測試未啟用 upsert 時重複外部鍵整塊失敗 / Test a duplicate external key fails its chunk without upsert"""
+        existing = self.row(external_id="dup")
+        existing.pop("required_skills")
+        JobPosting.objects.create(**existing)
+        path = self.write_file("dup.ndjson", json.dumps(self.row(external_id="dup")) + "\n")
+        stats = import_file(path)
+
+        self.assertEqual((stats.written, stats.failed), (0, 1))
@@ -0,0 +1,160 @@
+import math
+import random
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.bulk import bulk_create_jobs
+from jobs.locations import cell_ranges, geo_cell, get_gazetteer, haversine_km, near_prefilter, resolve_location
+from jobs.models import JobPosting, Location
+from jobs.queries import build_job_queryset
+from jobs.schemas import JobFilterParams
+
+# 台北 101 附近 / Near Taipei 101
+TAIPEI = "25.033,121.565"
+
+
+class LocationNormalizationTest(TestCase):
+    """
+    測試地點正規化與距離搜尋 / Test location normalization and proximity search
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="locationuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        today = date.today()
+        for title, location in (
+            ("Taipei Job", "Taipei"),
+            ("Taipei City Job", "Taipei City"),
+            ("Chinese Taipei Job", "臺北市"),
+            ("Banqiao Job", "New Taipei"),
+            ("Taoyuan Job", "桃園"),
+            ("Hsinchu Job", "Hsinchu, Taiwan"),
+            ("Kaohsiung Job", "Kaohsiung"),
+            ("Remote Job", "Remote"),
+        ):
+            JobPosting.objects.create(
+                title=title,
+                description="Location test",
+                location=location,
+                company_name="Location Company",
+                posting_date=today,
+                expiration_date=today + timedelta(days=30),
+            )
+
+    def titles(self, **params):
+        """
+        取得過濾後的職缺標題集合 / Get the set of titles matching the filters
+        """
+        return {job.title for job in build_job_queryset(JobFilterParams(**params))}
+
+    def test_resolve_variants(self):
+        """測試不同寫法解析為同一地點 / Test different spellings resolve to the same location"""
+        for text in ("Taipei", "台北", "臺北市", "Taipei City", " taipei, Taiwan ", "Remote / Taipei", "ＴＡＩＰＥＩ"):
+            self.assertEqual(resolve_location(text).name, "Taipei", text)
+        self.assertEqual(resolve_location("新竹縣").name, "Hsinchu County")
+        self.assertIsNone(resolve_location("Remote"))
+        self.assertIsNone(resolve_location(""))
+
+    def test_save_sets_location_fields(self):
+        """測試儲存時寫入標準地點與網格，變更地點時更新 / Test saving stores the standard location and grid cell and updates them on change"""
+        job = JobPosting.objects.get(title="Chinese Taipei Job")
+        taipei = Location.objects.get(name="Taipei")
+        self.assertEqual(job.normalized_location, taipei)
+        self.assertEqual(job.geo_cell, geo_cell(taipei.latitude, taipei.longitude))
+        self.assertIsNone(JobPosting.objects.get(title="Remote Job").normalized_location_id)
+
+        job.location = "Kaohsiung"
+        job.save(update_fields=["location"])
+        job.refresh_from_db()
+        self.assertEqual(job.normalized_location.name, "Kaohsiung")
+
+        result = bulk_create_jobs([{
+            "title": "Bulk Job",
+            "description": "Location test",
+            "location": "高雄",
+            "company_name": "Location Company",
+            "posting_date": date.today().isoformat(),
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat(),
+            "required_skills": [],
+        }])
+        self.assertEqual(JobPosting.objects.get(id=result["results"][0]["id"]).normalized_location.name, "Kaohsiung")
+
+    def test_location_filter_matches_normalized(self):
+        """測試地點過濾同時比對標準地點與原始文字 / Test the location filter matches the standard location and the raw text"""
+        taipei = {"Taipei Job", "Taipei City Job", "Chinese Taipei Job"}
+        self.assertEqual(self.titles(location="台北"), taipei)
+        # 原始文字的子字串比對仍保留 / Substring matching on the raw text is kept
+        self.assertEqual(self.titles(location="Taipei"), taipei | {"Banqiao Job"})
+        self.assertEqual(self.titles(location="remo"), {"Remote Job"})
+
+    def test_near_filter(self):
+        """測試距離過濾 / Test the proximity filter"""
+        self.assertEqual(self.titles(near=TAIPEI, radius_km=5), {"Taipei Job", "Taipei City Job", "Chinese Taipei Job"})
+        self.assertEqual(
+            self.titles(near=TAIPEI, radius_km=50),
+            {"Taipei Job", "Taipei City Job", "Chinese Taipei Job", "Banqiao Job", "Taoyuan Job"},
+        )
+        self.assertIn("Hsinchu Job", self.titles(near=TAIPEI, radius_km=100))
+        self.assertEqual(self.titles(near="22.627,120.301"), {"Kaohsiung Job"})
+        self.assertEqual(self.titles(near="0,0", radius_km=100), set())
+
+    def test_near_endpoint(self):
+        """測試列表端點的 near 參數與驗證 / Test the near parameter of the list endpoint and its validation"""
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+        response = self.client.get(f"/api/jobs/?near={TAIPEI}&radius_km=50&limit=20", **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+
+        for query in ("near=abc", "near=95,121", f"near={TAIPEI}&radius_km=0", f"near={TAIPEI}&radius_km=5000", "radius_km=10"):
+            self.assertEqual(self.client.get(f"/api/jobs/?{query}", **headers).status_code, 422, query)
+
+    def test_cell_ranges_cover_radius(self):
+        """測試網格區間涵蓋半徑內的點，包含跨越 ±180° 與極點 / Test the cell ranges cover points within the radius, across ±180° and near the poles"""
+        randomizer = random.Random(7)
+        for latitude, longitude, radius_km in ((25.03, 121.56, 50), (-18.1, 179.9, 300), (89.8, 10, 100), (0, -180, 20)):
+            ranges = cell_ranges(latitude, longitude, radius_km)
+            for _ in range(200):
+                # 半徑內的隨機點 / A random point within the radius
+                bearing = randomizer.uniform(0, 2 * math.pi)
+                distance = randomizer.uniform(0, radius_km) / 6371.0088
+                lat1, lng1 = math.radians(latitude), math.radians(longitude)
+                lat2 = math.asin(math.sin(lat1) * math.cos(distance) + math.cos(lat1) * math.sin(distance) * math.cos(bearing))
+                lng2 = lng1 + math.atan2(
+                    math.sin(bearing) * math.sin(distance) * math.cos(lat1),
+                    math.cos(distance) - math.sin(lat1) * math.sin(lat2),
+                )
+                point = (math.degrees(lat2), (math.degrees(lng2) + 540) % 360 - 180)
+                self.assertLessEqual(haversine_km(latitude, longitude, *point), radius_km + 1e-6)
+                cell = geo_cell(*point)
+                self.assertTrue(any(low <= cell <= high for low, high in ranges), (latitude, longitude, point))
+
+    def test_prefilter_range_cap(self):
+        """測試區間過多或不少於地點數時略過預篩 / Test the prefilter is skipped with too many ranges or no fewer ranges than locations"""
+        self.assertEqual(len(cell_ranges(25.033, 121.565, 50)), 10)
+        self.assertIsNotNone(near_prefilter(25.033, 121.565, 50, 11))
+        self.assertIsNone(near_prefilter(25.033, 121.565, 50, 10))
+        with self.settings(JOBS_GEO={"MAX_CELL_RANGES": 8}):
+            self.assertIsNone(near_prefilter(25.033, 121.565, 50, 11))
+
+        # 大半徑只以地點 id 過濾，結果不變 / Large radii filter on location ids only with the same results
+        self.assertGreater(len(cell_ranges(25.033, 121.565, 300)), 16)
+        queryset = build_job_queryset(JobFilterParams(near=TAIPEI, radius_km=300))
+        self.assertNotIn("geo_cell", str(queryset.query).split(" WHERE ")[1])
+        self.assertEqual(self.titles(near=TAIPEI, radius_km=300), {
+            "Taipei Job", "Taipei City Job", "Chinese Taipei Job", "Banqiao Job", "Taoyuan Job", "Hsinchu Job", "Kaohsiung Job",
+        })
+
+    def test_load_gazetteer_command(self):
+        """測試重新載入地名辭典並回填職缺 / Test reloading the gazetteer and backfilling postings"""
+        JobPosting.objects.update(normalized_location=None, geo_cell=None)
+        Location.objects.all().delete()
+
+        call_command("load_gazetteer", stdout=StringIO())
+        self.assertEqual(Location.objects.count(), len(get_gazetteer()))
+        self.assertEqual(self.titles(near=TAIPEI, radius_km=5), {"Taipei Job", "Taipei City Job", "Chinese Taipei Job"})
@@ -0,0 +1,103 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.metrics import DB_QUERIES, REQUESTS, render_metrics, reset_metrics
+from jobs.models import JobPosting
+
+
+class MetricsMiddlewareTest(TestCase):
+    """
+    測試請求量測與 Prometheus 輸出 / Test request instrumentation and the Prometheus output
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="metrics", password="testpassword")
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        self.job = JobPosting.objects.create(
+            title="Measured Job",
+            description="Instrumented",
+            location="Taipei",
+            company_name="Test Company",
+            posting_date=date.today() - timedelta(days=1),
+            expiration_date=date.today() + timedelta(days=30),
+        )
+
+    def test_server_timing_reports_queries_and_phases(self):
+        """
+        測試 Server-Timing 包含 SQL 數量與認證、序列化階段 / Test Server-Timing carries the SQL count and the auth and serialize phases
+        """
+        response = self.client.get("/api/jobs/", **self.headers)
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertIn("total;dur=", timing)
+        self.assertIn("auth;dur=", timing)
+        self.assertIn("serialize;dur=", timing)
+
+        # 使用者查詢、ETag 彙總與職缺列表查詢 / The user lookup, the ETag aggregate and the list query
+        labels = ("GET", "/api/jobs/")
+        self.assertEqual(DB_QUERIES.value(labels), 3)
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="3 queries"', timing)
+
+    def test_routes_are_labelled_by_pattern(self):
+        """
+        測試端點標籤使用路由樣式而非實際路徑 / Test endpoints are labelled by route pattern rather than the actual path
+        """
+        self.client.get(f"/api/jobs/{self.job.id}", **self.headers)
+        self.client.get("/api/jobs/999999", **self.headers)
+
+        self.assertEqual(REQUESTS.value(("GET", "/api/jobs/<job_id>", "200")), 1)
+        self.assertEqual(REQUESTS.value(("GET", "/api/jobs/<job_id>", "404")), 1)
+
+    def test_prometheus_endpoint(self):
+        self.client.get("/api/jobs/", **self.headers)
+        self.client.get("/api/jobs/", **self.headers)
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn('jobs_http_request_duration_seconds_bucket{method="GET",endpoint="/api/jobs/",le="+Inf"} 2', body)
+        self.assertIn('jobs_request_phase_duration_seconds_count{endpoint="/api/jobs/",phase="auth"} 2', body)
+        self.assertIn("jobs_auth_token_cache_miss 1", body)
+        self.assertIn('jobs_response_cache_misses_total{endpoint="list"} 1', body)
+        self.assertIn('jobs_response_cache_hits_total{endpoint="list"} 1', body)
+
+        reset_metrics()
+        self.assertNotIn("jobs_response_cache_hits_total{", render_metrics())
+
+    def test_prometheus_endpoint_access(self):
+        """
+        測試 /metrics 只開放給允許的 IP 或帶有令牌的抓取者 / Test /metrics only serves allow-listed IPs or scrapers with the token
+        """
+        remote = {"REMOTE_ADDR": "203.0.113.7"}
+        self.assertEqual(self.client.get("/metrics", **remote).status_code, 403)
+        with self.settings(JOBS_METRICS={"TOKEN": "scrape-secret"}):
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong", **remote).status_code, 403)
+            self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer scrape-secret", **remote).status_code, 200)
+        with self.settings(JOBS_METRICS={"ALLOWED_IPS": ("203.0.113.0/24",)}):
+            self.assertEqual(self.client.get("/metrics", **remote).status_code, 200)
+
+    @override_settings(JOBS_METRICS={"ENABLED": False})
+    def test_disabled(self):
+        response = self.client.get("/api/jobs/", **self.headers)
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(REQUESTS.value(("GET", "/api/jobs/", "200")), 0)
+
+
+class AsyncMetricsTest(TestCase):
+    """
+    測試非同步端點經 sync_to_async 的查詢也被計入 / Test queries run through sync_to_async by async endpoints are counted
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(username="async-metrics", password="testpassword")
+        self.headers = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+    async def test_async_queries_counted(self):
+        response = await self.async_client.get("/api/async/jobs/", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="3 queries"', response["Server-Timing"])
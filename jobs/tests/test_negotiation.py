@@ -0,0 +1,106 @@
+import json
+from datetime import date, timedelta
+from unittest import skipIf, skipUnless
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.negotiation import InvalidFields, msgpack, parse_fields
+
+
+class ContentNegotiationTest(TestCase):
+    """
+    測試稀疏欄位與回應編碼協商 / Test sparse fieldsets and response encoding negotiation
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="fieldsuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        today = date.today()
+        for index in range(3):
+            job = JobPosting(
+                title=f"Sparse Job {index}",
+                description="A long description " * 50,
+                location="Taipei",
+                company_name="Sparse Company",
+                posting_date=today - timedelta(days=index),
+                expiration_date=today + timedelta(days=30),
+            )
+            job.required_skills = ["Python"]
+            job.save()
+        self.job = job
+
+    def authenticate(self, **headers):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}", **headers}
+
+    def test_parse_fields(self):
+        """測試 fields 參數正規化為輸出順序，全部欄位視為預設 / Test the fields param is normalized to output order and all fields mean the default"""
+        self.assertEqual(parse_fields("title, id,title"), ("id", "title"))
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields(" , "))
+        with self.assertRaises(InvalidFields):
+            parse_fields("id,salary")
+
+    def test_list_projects_only_requested_columns(self):
+        """測試列表只輸出並只查詢指定欄位 / Test the list outputs and selects only the requested fields"""
+        # 使用者、ETag 彙總與列表查詢 / User, the ETag aggregate and the list query
+        with self.assertNumQueries(3) as context:
+            response = self.client.get("/api/jobs/?fields=id,title,required_skills", **self.authenticate())
+        self.assertEqual(response.status_code, 200)
+        rows = json.loads(response.content)
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(set(rows[0]), {"id", "title", "required_skills"})
+        self.assertEqual(rows[0]["required_skills"], ["Python"])
+
+        list_sql = context.captured_queries[-1]["sql"]
+        self.assertIn('"title"', list_sql)
+        self.assertNotIn('"description"', list_sql)
+
+        # 欄位組不同的回應使用不同的快取鍵與 ETag / Different fieldsets use different cache keys and ETags
+        full = self.client.get("/api/jobs/", **self.authenticate())
+        self.assertIn("description", json.loads(full.content)[0])
+        self.assertNotEqual(full["ETag"], response["ETag"])
+
+    def test_unknown_field_rejected(self):
+        """測試未知欄位回傳 400 / Test unknown fields get a 400"""
+        response = self.client.get("/api/jobs/?fields=id,password", **self.authenticate())
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("password", json.loads(response.content)["detail"])
+
+    def test_detail_and_cursor_fields(self):
+        """測試詳情與游標分頁支援稀疏欄位 / Test detail and cursor pages honour sparse fields"""
+        detail = self.client.get(f"/api/jobs/{self.job.id}?fields=title", **self.authenticate())
+        self.assertEqual(json.loads(detail.content), {"title": self.job.title})
+
+        page = self.client.get("/api/jobs/cursor?fields=title&limit=2", **self.authenticate())
+        body = json.loads(page.content)
+        self.assertEqual([set(row) for row in body["results"]], [{"title"}, {"title"}])
+        following = self.client.get(
+            f"/api/jobs/cursor?fields=title&limit=2&cursor={body['next_cursor']}", **self.authenticate()
+        )
+        self.assertEqual(len(json.loads(following.content)["results"]), 1)
+
+    @skipIf(msgpack is not None, "msgpack is installed")
+    def test_msgpack_falls_back_to_json(self):
+        """測試未安裝 msgpack 時回傳 JSON / Test JSON is returned when msgpack is not installed"""
+        response = self.client.get("/api/jobs/", **self.authenticate(HTTP_ACCEPT="application/msgpack"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("application/json"))
+        self.assertIn("Accept", response["Vary"])
+
+    @skipUnless(msgpack is not None, "msgpack is not installed")
+    def test_msgpack_list_and_detail(self):
+        """測試 Accept: application/msgpack 時輸出 MessagePack / Test Accept: application/msgpack gets MessagePack"""
+        json_rows = json.loads(self.client.get("/api/jobs/", **self.authenticate()).content)
+        response = self.client.get("/api/jobs/", **self.authenticate(HTTP_ACCEPT="application/msgpack"))
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(response.content), json_rows)
+
+        detail = self.client.get(f"/api/jobs/{self.job.id}?fields=id", **self.authenticate(HTTP_ACCEPT="application/msgpack"))
+        self.assertEqual(msgpack.unpackb(detail.content), {"id": self.job.id})
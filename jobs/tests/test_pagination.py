@@ -0,0 +1,110 @@
+import base64
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+class JobCursorPaginationTest(TestCase):
+    """
+    測試職缺游標分頁 / Test cursor pagination of job postings
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="pager", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        # 建立日期重複的職缺以測試同值排序 / Create postings sharing dates to test tie-breaking
+        self.today = date.today()
+        for index in range(7):
+            JobPosting.objects.create(
+                title=f"Job {index}",
+                description="Cursor test",
+                location="Taipei",
+                company_name="Cursor Company",
+                posting_date=self.today - timedelta(days=index // 2),
+                expiration_date=self.today + timedelta(days=(index * 3) % 4),
+            )
+        self.cursor_url = "/api/jobs/cursor"
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def collect_pages(self, query):
+        """
+        依序讀取所有頁面並回傳職缺 id 列表 / Walk every page and return the posting ids
+        """
+        job_ids = []
+        cursor = None
+        while True:
+            url = f"{self.cursor_url}?limit=3&{query}" + (f"&cursor={cursor}" if cursor else "")
+            response = self.client.get(url, **self.authenticate())
+            self.assertEqual(response.status_code, 200)
+            response_data = json.loads(response.content)
+            job_ids += [job["id"] for job in response_data["results"]]
+            cursor = response_data["next_cursor"]
+            if cursor is None:
+                return job_ids
+
+    def test_pages_match_offset_order(self):
+        """測試游標分頁順序與 offset 分頁一致 / Test cursor pages follow the offset order"""
+        for query in (
+            "sort_by=posting_date",
+            "sort_by=posting_date&sort_desc=true",
+            "sort_by=expiration_date",
+            "sort_by=expiration_date&sort_desc=true",
+        ):
+            response = self.client.get(f"/api/jobs/?limit=100&{query}", **self.authenticate())
+            expected_ids = [job["id"] for job in json.loads(response.content)]
+            self.assertEqual(self.collect_pages(query), expected_ids, query)
+
+    def test_invalid_cursor_rejected(self):
+        """測試無效游標回傳 400 / Test invalid cursors return 400"""
+        response = self.client.get(f"{self.cursor_url}?cursor=not-a-cursor", **self.authenticate())
+        self.assertEqual(response.status_code, 400)
+
+        # 游標與排序方向不符 / Cursor does not match the sort direction
+        cursor = encode_cursor("posting_date", False, self.today, 1)
+        response = self.client.get(
+            f"{self.cursor_url}?cursor={cursor}&sort_desc=true",
+            **self.authenticate()
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_forged_cursor_rejected(self):
+        """測試缺少欄位、非物件或排序值型別不符的游標回傳 400 / Test cursors missing keys, not objects or with mistyped sort values return 400"""
+        def forge(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+        valid = {"v": 1, "f": "posting_date", "d": False, "k": self.today.isoformat(), "id": 1}
+        forged = (
+            {key: value for key, value in valid.items() if key != "f"},
+            {key: value for key, value in valid.items() if key != "d"},
+            [valid],
+            "cursor",
+            {**valid, "k": 20240101},
+            {**valid, "id": "1"},
+            {**valid, "d": 0},
+        )
+        for payload in forged:
+            response = self.client.get(f"{self.cursor_url}?cursor={forge(payload)}", **self.authenticate())
+            self.assertEqual(response.status_code, 400, payload)
+
+        salary_cursor = forge({**valid, "f": "salary_min", "k": self.today.isoformat()})
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(salary_cursor, "salary_min", False)
+
+    def test_cursor_round_trip(self):
+        """測試游標編碼與解碼 / Test cursor encoding and decoding"""
+        cursor = encode_cursor("expiration_date", True, self.today, 42)
+        self.assertEqual(decode_cursor(cursor, "expiration_date", True), (self.today, 42))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(cursor, "posting_date", True)
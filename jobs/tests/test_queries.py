@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+from django.test import TestCase
+
+from jobs.models import JobPosting
+from jobs.queries import build_job_queryset
+from jobs.schemas import JobFilterParams, JobStatus
+
+
+class JobQueryIndexTest(TestCase):
+    """
+    測試列表查詢使用複合索引 / Test list queries use the composite indexes
+    """
+
+    def setUp(self):
+        # 建立不同狀態的職缺 / Create postings in different states
+        self.today = date.today()
+        for offset in range(-3, 4):
+            JobPosting.objects.create(
+                title=f"Job {offset}",
+                description="Index test",
+                location="Taipei",
+                company_name="Index Company",
+                posting_date=self.today + timedelta(days=offset),
+                expiration_date=self.today + timedelta(days=offset + 2),
+            )
+
+    def assert_uses_index(self, filters, index_name):
+        """
+        斷言查詢計畫包含指定索引 / Assert the query plan contains the given index
+        """
+        plan = build_job_queryset(filters)[:10].explain()
+        self.assertIn(index_name, plan)
+
+    def test_status_filters_use_indexes(self):
+        """測試狀態過濾與排序走對應索引 / Test status filters and sorting hit matching indexes"""
+        self.assert_uses_index(JobFilterParams(status=JobStatus.SCHEDULED), "jobs_status_post_date_idx")
+        self.assert_uses_index(
+            JobFilterParams(status=JobStatus.EXPIRED, sort_by="expiration_date"),
+            "jobs_status_exp_date_idx",
+        )
+        self.assert_uses_index(JobFilterParams(sort_desc=True), "jobs_post_date_exp_idx")
+
+    def test_status_filter_results(self):
+        """測試共用查詢的狀態過濾結果 / Test status filtering results of the shared query"""
+        active = build_job_queryset(JobFilterParams(status=JobStatus.ACTIVE))
+        self.assertEqual([job.title for job in active], ["Job -2", "Job -1", "Job 0"])
+
+    def test_invalid_sort_falls_back(self):
+        """測試非法排序欄位退回 posting_date / Test invalid sort fields fall back to posting_date"""
+        queryset = build_job_queryset(JobFilterParams(sort_by="title", sort_desc=True))
+        self.assertEqual(queryset.first().title, "Job 3")
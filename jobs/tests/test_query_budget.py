@@ -0,0 +1,33 @@
+import pytest
+from django.contrib.auth.models import User
+
+from jobs.tests.query_budget import QueryBudgetExceeded, query_template
+
+
+def test_query_template_strips_literals():
+    sql = "SELECT * FROM t WHERE a = 1 AND b = 'x''y' AND c IN (1, 2, 3)"
+    assert query_template(sql) == "SELECT * FROM t WHERE a = ? AND b = ? AND c IN (?)"
+
+
+@pytest.mark.django_db
+def test_budget_exceeded(query_budget):
+    with pytest.raises(QueryBudgetExceeded, match="2 queries exceed the budget of 1"):
+        with query_budget(1, allow_duplicates=True):
+            User.objects.count()
+            User.objects.count()
+
+
+@pytest.mark.django_db
+def test_duplicate_and_repeated_queries_flagged(query_budget):
+    """
+    測試重複查詢與 N+1 樣板都會被標示 / Test duplicate queries and N+1 templates are both flagged
+    """
+    with pytest.raises(QueryBudgetExceeded, match="duplicate query x2"):
+        with query_budget(10):
+            User.objects.filter(pk=1).exists()
+            User.objects.filter(pk=1).exists()
+
+    with pytest.raises(QueryBudgetExceeded, match="possible N\\+1, template repeated x3"):
+        with query_budget(10):
+            for pk in range(3):
+                User.objects.filter(pk=pk).exists()
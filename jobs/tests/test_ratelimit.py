@@ -0,0 +1,80 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.ratelimit import LocalTokenBucketBackend, parse_rate
+
+
+class TokenBucketTest(TestCase):
+    """
+    測試令牌桶的補充與等待時間 / Test token bucket refill and wait times
+    """
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("10/min"), (10, 10 / 60))
+        self.assertEqual(parse_rate("100/5m"), (100, 100 / 300))
+        with self.assertRaises(ValueError):
+            parse_rate("10/fortnight")
+
+    def test_bucket_refills_over_time(self):
+        backend = LocalTokenBucketBackend()
+        capacity, refill_rate = parse_rate("2/s")
+        self.assertEqual(backend.consume("key", capacity, refill_rate, now=100.0), 0)
+        self.assertEqual(backend.consume("key", capacity, refill_rate, now=100.0), 0)
+        self.assertAlmostEqual(backend.consume("key", capacity, refill_rate, now=100.0), 0.5)
+        self.assertEqual(backend.consume("key", capacity, refill_rate, now=100.5), 0)
+
+
+class LoginRateLimitTest(TestCase):
+    """
+    測試登入與職缺端點的限流 / Test rate limiting of the login and job endpoints
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="limited", password="testpassword")
+
+    def login(self, username="limited", address="10.0.0.1"):
+        return self.client.post(
+            "/api/auth/token",
+            {"username": username, "password": "wrong"},
+            content_type="application/json",
+            REMOTE_ADDR=address,
+        )
+
+    @override_settings(JOBS_RATE_LIMIT={"RATES": {"login_ip": "100/min", "login_user": "2/min"}})
+    def test_login_limited_per_username(self):
+        """
+        測試同一帳號超過速率時回應 429 與 Retry-After，且不同帳號不受影響
+        Test the same username gets 429 with Retry-After past the rate while others are unaffected
+        """
+        self.assertEqual(self.login(address="10.0.0.1").status_code, 401)
+        self.assertEqual(self.login(address="10.0.0.2").status_code, 401)
+        response = self.login(address="10.0.0.3")
+        self.assertEqual(response.status_code, 429)
+        # 2/min 每 30 秒補充一次，已過時間（密碼雜湊）會縮短等待 / 2/min refills every 30s, shortened by time spent hashing
+        self.assertTrue(0 < int(response["Retry-After"]) <= 30)
+        self.assertEqual(self.login(username="someone-else").status_code, 401)
+
+    @override_settings(JOBS_RATE_LIMIT={"RATES": {"login_ip": "1/min", "login_user": "100/min"}})
+    def test_login_limited_per_ip(self):
+        self.assertEqual(self.login(username="a").status_code, 401)
+        self.assertEqual(self.login(username="b").status_code, 429)
+        self.assertEqual(self.login(username="c", address="10.0.0.9").status_code, 401)
+
+    @override_settings(JOBS_RATE_LIMIT={"ENABLED": False, "RATES": {"login_ip": "1/min"}})
+    def test_disabled(self):
+        self.assertEqual(self.login().status_code, 401)
+        self.assertEqual(self.login().status_code, 401)
+
+    @override_settings(JOBS_RATE_LIMIT={"RATES": {"jobs": "1/min"}})
+    def test_job_endpoints_limited_per_user(self):
+        """
+        測試啟用職缺端點限流後以使用者計算 / Test job endpoint limits count per user once enabled
+        """
+        other = User.objects.create_user(username="other", password="testpassword")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        other_headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(other).access_token}"}
+
+        self.assertEqual(self.client.get("/api/jobs/", **headers).status_code, 200)
+        self.assertEqual(self.client.get("/api/jobs/", **headers).status_code, 429)
+        self.assertEqual(self.client.get("/api/jobs/", **other_headers).status_code, 200)
@@ -0,0 +1,139 @@
+import json
+import os
+import sqlite3
+import tempfile
+from datetime import date, timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.db import connection, connections
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from ninja_jwt.tokens import RefreshToken
+
+from jobs import routers
+from jobs.models import JobPosting
+from jobs.replication import copy_database, sync_replicas
+from jobs.routers import choose_replica, in_flight, is_pinned
+
+
+def job_queries(captured):
+    """
+    擷取到的查詢中讀寫職缺資料表的數量 / Number of captured queries touching the job postings table
+    """
+    return sum("jobs_jobposting" in query["sql"] for query in captured.captured_queries)
+
+
+# 測試時 replica 鏡像 default 的共用記憶體資料庫；TestCase 的未提交交易會鎖住另一條連線，因此使用 TransactionTestCase
+# Under tests replica mirrors default's shared in-memory database; TestCase's uncommitted transaction
+# would lock out the second connection, so these use TransactionTestCase
+@override_settings(
+    JOBS_REPLICAS={"ENABLED": True, "ALIASES": ["replica"]},
+    JOBS_RESPONSE_CACHE={"ENABLED": False},
+)
+class ReplicaRoutingTest(TransactionTestCase):
+    """
+    測試讀取副本路由 / Test read-replica routing
+    """
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="replicauser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        today = date.today()
+        self.job = JobPosting.objects.create(
+            title="Replicated Job",
+            description="Replica test",
+            location="Taipei",
+            company_name="Replica Company",
+            posting_date=today - timedelta(days=1),
+            expiration_date=today + timedelta(days=30),
+            _required_skills='["Python"]',
+        )
+        self.job_detail_url = f"/api/jobs/{self.job.id}"
+
+    def authenticate(self, **headers):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}", **headers}
+
+    def get(self, url):
+        """
+        發出 GET 並回傳回應與 default、replica 上的職缺查詢數 / Send a GET and return the response with job queries on default and replica
+        """
+        with CaptureQueriesContext(connection) as primary, CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.get(url, **self.authenticate())
+        return response, job_queries(primary), job_queries(replica)
+
+    def test_reads_go_to_replica(self):
+        """測試列表、詳情與搜尋讀取副本 / Test list, detail and search reads hit the replica"""
+        for url in ("/api/jobs/", self.job_detail_url, "/api/jobs/?search=Replicated"):
+            response, primary, replica = self.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(primary, 0, url)
+            self.assertGreater(replica, 0, url)
+        self.assertEqual(in_flight(), {})
+
+    def test_write_pins_client_to_primary(self):
+        """測試寫入後同一客戶端改讀 default，釘選到期後回到副本 / Test a client reads default after a write and returns to the replica once the pin expires"""
+        with CaptureQueriesContext(connections["replica"]) as replica:
+            response = self.client.put(
+                self.job_detail_url,
+                data=json.dumps({
+                    "title": "Renamed Job",
+                    "description": "Replica test",
+                    "location": "Taipei",
+                    "company_name": "Replica Company",
+                    "posting_date": self.job.posting_date.isoformat(),
+                    "expiration_date": self.job.expiration_date.isoformat(),
+                    "required_skills": ["Python"],
+                }),
+                content_type="application/json",
+                **self.authenticate()
+            )
+        self.assertEqual(response.status_code, 200)
+        # 寫入請求的讀取也走 default / Reads inside the write request use default as well
+        self.assertEqual(job_queries(replica), 0)
+        self.assertTrue(is_pinned(f"user:{self.user.pk}"))
+
+        response, primary, replica = self.get(self.job_detail_url)
+        self.assertEqual(json.loads(response.content)["title"], "Renamed Job")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        # 其他客戶端不受影響 / Other clients are unaffected
+        self.assertFalse(is_pinned("user:0"))
+
+        with override_settings(JOBS_REPLICAS={"ENABLED": True, "ALIASES": ["replica"], "PIN_SECONDS": 0}):
+            routers._pin_cache().clear()
+            _, primary, replica = self.get(self.job_detail_url)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    @override_settings(JOBS_REPLICAS={"ENABLED": False, "ALIASES": ["replica"]})
+    def test_disabled_reads_primary(self):
+        """測試停用時讀取 default / Test reads use default when disabled"""
+        _, primary, replica = self.get("/api/jobs/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_strategies(self):
+        """測試輪流與最少負載策略 / Test the round-robin and least-loaded strategies"""
+        aliases = ("replica_a", "replica_b")
+        self.assertEqual({choose_replica(aliases, "round_robin") for _ in range(4)}, set(aliases))
+        with mock.patch.dict(routers._in_flight, {"replica_a": 3, "replica_b": 1}):
+            self.assertEqual({choose_replica(aliases, "least_loaded") for _ in range(4)}, {"replica_b"})
+        with self.assertRaises(ValueError):
+            choose_replica(aliases, "random")
+
+    def test_replication_stand_in(self):
+        """測試替身將 default 複製到副本檔案，鏡像副本不動作 / Test the stand-in copies default into a replica file and leaves mirrors alone"""
+        self.assertEqual(sync_replicas(), {"replica": 0.0})
+
+        target_path = os.path.join(tempfile.mkdtemp(prefix="jobs_replica_"), "replica.sqlite3")
+        copy_database(connection, target_path)
+        with sqlite3.connect(target_path) as target:
+            titles = [row[0] for row in target.execute("SELECT title FROM jobs_jobposting")]
+        self.assertEqual(titles, ["Replicated Job"])
@@ -0,0 +1,114 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.queries import build_job_queryset
+from jobs.salary import SALARY_INDEX_TABLE, is_salary_index_available
+from jobs.schemas import JobFilterParams
+
+
+class JobSalaryFilterTest(TestCase):
+    """
+    測試薪資範圍過濾、排序與分布 / Test salary range filtering, sorting and distribution
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="salaryuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        # 建立不同薪資範圍的職缺（含 null 端點） / Create postings with various ranges, including null bounds
+        today = date.today()
+        ranges = {
+            "Low": (30000, 40000),
+            "Mid": (50000, 70000),
+            "High": (90000, 120000),
+            "OpenMax": (60000, None),
+            "OpenMin": (None, 45000),
+            "Unknown": (None, None),
+        }
+        for title, (salary_min, salary_max) in ranges.items():
+            JobPosting.objects.create(
+                title=title,
+                description="Salary test",
+                location="Taipei",
+                company_name="Salary Company",
+                salary_min=salary_min,
+                salary_max=salary_max,
+                posting_date=today,
+                expiration_date=today + timedelta(days=30),
+            )
+
+    def titles(self, **params):
+        """
+        取得過濾後的職缺標題集合 / Get the set of titles matching the filters
+        """
+        return {job.title for job in build_job_queryset(JobFilterParams(**params))}
+
+    def test_overlap(self):
+        """測試範圍交集與 null 端點 / Test overlap semantics and null bounds"""
+        self.assertEqual(self.titles(salary_min=42000, salary_max=65000), {"Mid", "OpenMax", "OpenMin"})
+        self.assertEqual(self.titles(salary_min=100000), {"High", "OpenMax"})
+
+    def test_contain(self):
+        """測試範圍包含 / Test containment semantics"""
+        self.assertEqual(
+            self.titles(salary_min=25000, salary_max=75000, salary_match="contain"), {"Low", "Mid"}
+        )
+        self.assertEqual(self.titles(salary_max=45000, salary_match="contain"), {"Low", "OpenMin"})
+
+    def test_range_index_in_sync(self):
+        """測試 R*Tree 索引隨寫入同步 / Test the R*Tree index follows writes"""
+        self.assertTrue(is_salary_index_available())
+        job = JobPosting.objects.get(title="Unknown")
+        job.salary_min = 200000
+        job.save()
+        self.assertEqual(self.titles(salary_min=150000), {"OpenMax", "Unknown"})
+        from django.db import connection
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {SALARY_INDEX_TABLE}")
+            self.assertEqual(cursor.fetchone()[0], 6)
+
+    def test_sort_nulls_last(self):
+        """測試薪資排序時 null 排在最後 / Test nulls sort last by salary"""
+        ascending = [job.title for job in build_job_queryset(JobFilterParams(sort_by="salary_min"))]
+        self.assertEqual(ascending[:4], ["Low", "Mid", "OpenMax", "High"])
+        descending = [job.title for job in build_job_queryset(JobFilterParams(sort_by="salary_min", sort_desc=True))]
+        self.assertEqual(descending[:4], ["High", "OpenMax", "Mid", "Low"])
+
+    def test_cursor_through_nulls(self):
+        """測試游標分頁走過 null 區段 / Test cursor pagination walks through the null tail"""
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+        titles = []
+        cursor = ""
+        while True:
+            response = self.client.get(f"/api/jobs/cursor?sort_by=salary_max&limit=2&cursor={cursor}", **headers)
+            page = json.loads(response.content)
+            titles += [job["title"] for job in page["results"]]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(titles[:4], ["Low", "OpenMin", "Mid", "High"])
+        self.assertEqual(set(titles[4:]), {"OpenMax", "Unknown"})
+
+    def test_histogram(self):
+        """測試薪資分布與驗證 / Test the salary histogram and its validation"""
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+        response = self.client.get("/api/jobs/salary-histogram?bucket_size=50000", **headers)
+        body = json.loads(response.content)
+        self.assertEqual(body["unknown"], 1)
+        self.assertEqual(
+            body["buckets"],
+            [
+                {"lower": 0, "upper": 50000, "count": 2},
+                {"lower": 50000, "upper": 100000, "count": 2},
+                {"lower": 100000, "upper": 150000, "count": 1},
+            ],
+        )
+        with self.settings(JOBS_SALARY={"MAX_BUCKETS": 3}):
+            response = self.client.get("/api/jobs/salary-histogram?bucket_size=1000", **headers)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get("/api/jobs/?salary_min=9&salary_max=1", **headers).status_code, 422)
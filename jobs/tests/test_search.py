@@ -0,0 +1,92 @@
+import json
+from io import StringIO
+from datetime import date, timedelta
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.search import FTS_TABLE, apply_search, build_match_query, is_fts_available
+
+
+class JobSearchIndexTest(TestCase):
+    """
+    測試職缺全文檢索索引 / Test the job posting full-text search index
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="searcher", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.python_job = JobPosting.objects.create(
+            title="Python Developer",
+            description="Build APIs with Django",
+            location="Taipei",
+            company_name="Snake Works",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+        )
+        self.frontend_job = JobPosting.objects.create(
+            title="Frontend Engineer",
+            description="React and Python tooling, Python scripts, more Python",
+            location="Taichung",
+            company_name="Pixel Corp",
+            posting_date=self.today - timedelta(days=2),
+            expiration_date=self.today + timedelta(days=30),
+        )
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def test_index_created_by_migration(self):
+        """測試遷移已建立 FTS 虛擬表 / Test the migration created the FTS table"""
+        self.assertTrue(is_fts_available())
+
+    def test_triggers_keep_index_in_sync(self):
+        """測試新增、更新、刪除會同步索引 / Test insert, update and delete keep the index in sync"""
+        self.assertEqual(list(apply_search(JobPosting.objects.all(), "snake")), [self.python_job])
+
+        self.python_job.company_name = "Cobra Labs"
+        self.python_job.save()
+        self.assertFalse(apply_search(JobPosting.objects.all(), "snake").exists())
+        self.assertTrue(apply_search(JobPosting.objects.all(), "cobra").exists())
+
+        self.python_job.delete()
+        self.assertFalse(apply_search(JobPosting.objects.all(), "cobra").exists())
+
+    def test_short_term_falls_back_to_icontains(self):
+        """測試過短字串退回 icontains / Test short terms fall back to icontains"""
+        results = apply_search(JobPosting.objects.all(), "Re")
+        self.assertEqual(list(results), [self.frontend_job])
+
+    def test_match_query_escapes_quotes(self):
+        """測試查詢字串會跳脫雙引號 / Test the match query escapes double quotes"""
+        self.assertEqual(build_match_query('say "hi"'), '"say ""hi"""')
+        self.assertFalse(apply_search(JobPosting.objects.all(), 'say "hi" OR').exists())
+
+    def test_rebuild_command_backfills_index(self):
+        """測試重建指令會回填索引 / Test the rebuild command backfills the index"""
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')")
+        self.assertFalse(apply_search(JobPosting.objects.all(), "Snake").exists())
+
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertTrue(apply_search(JobPosting.objects.all(), "Snake").exists())
+
+    def test_relevance_sort(self):
+        """測試依相關度排序 / Test sorting by relevance"""
+        response = self.client.get(
+            "/api/jobs/?search=python&sort_by=relevance",
+            **self.authenticate()
+        )
+        self.assertEqual(response.status_code, 200)
+        response_data = json.loads(response.content)
+        self.assertEqual(len(response_data), 2)
+        self.assertEqual(response_data[0]["id"], self.frontend_job.id)
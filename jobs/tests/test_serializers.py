@@ -0,0 +1,47 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+
+from jobs.cache import _render
+from jobs.models import JobPosting
+from jobs.serializers import project_job_rows, render_row_page, render_rows, serialize_job
+
+
+class JobRowSerializationTest(TestCase):
+    """
+    測試 values() 快速序列化路徑 / Test the values() fast serialization path
+    """
+
+    def setUp(self):
+        # 建立含中文與多技能的職缺 / Create postings with Chinese text and several skills
+        today = date.today()
+        for index in range(3):
+            job = JobPosting(
+                title=f"後端工程師 {index}",
+                description="Serializer test",
+                location="台北",
+                salary_min=50000,
+                salary_max=80000,
+                company_name="Serializer Company",
+                posting_date=today - timedelta(days=index),
+                expiration_date=today + timedelta(days=30),
+            )
+            job.required_skills = ["Python", "Django", f"Skill {index}"]
+            job.save()
+        self.queryset = JobPosting.objects.order_by("id")
+
+    def test_rows_match_model_serialization(self):
+        """測試快速路徑輸出與模型序列化一致 / Test the fast path matches model serialization"""
+        expected = json.loads(_render([serialize_job(job) for job in self.queryset]))
+        self.assertEqual(json.loads(render_rows(project_job_rows(self.queryset))), expected)
+
+    def test_constant_query_count(self):
+        """測試整頁序列化只需一次查詢 / Test serializing a page takes a single query"""
+        with self.assertNumQueries(1):
+            render_rows(project_job_rows(self.queryset))
+
+    def test_row_page(self):
+        """測試游標分頁輸出 / Test cursor page output"""
+        page = json.loads(render_row_page(project_job_rows(self.queryset), "abc"))
+        self.assertEqual(len(page["results"]), 3)
+        self.assertEqual(page["next_cursor"], "abc")
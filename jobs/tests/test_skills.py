@@ -0,0 +1,101 @@
+import json
+from datetime import date, timedelta
+from django.test import TestCase
+from django.contrib.auth.models import User
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting, JobPostingSkill, Skill
+from jobs.skills import SkillMatch, filter_by_skills, normalize_skill_name
+
+
+class JobSkillTest(TestCase):
+    """
+    測試正規化技能儲存與過濾 / Test normalized skill storage and filtering
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="skilluser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        self.java_job = self.create_job("Java Job", '["Java", "Spring"]')
+        self.js_job = self.create_job("JS Job", '["JavaScript", "React"]')
+        self.fullstack_job = self.create_job("Fullstack Job", '["java", "React", "SQL"]')
+
+    def create_job(self, title, skills_json):
+        """
+        建立測試職缺 / Create a test job posting
+        """
+        return JobPosting.objects.create(
+            title=title,
+            description="Skill test",
+            location="Taipei",
+            company_name="Skill Company",
+            posting_date=self.today - timedelta(days=1),
+            expiration_date=self.today + timedelta(days=30),
+            _required_skills=skills_json,
+        )
+
+    def authenticate(self):
+        """
+        構建帶有認證的請求頭 / Construct headers with authentication
+        """
+        return {"HTTP_AUTHORIZATION": f"Bearer {self.access_token}"}
+
+    def test_skills_synced_on_save(self):
+        """測試儲存時同步技能關聯 / Test skill links are synced on save"""
+        self.assertEqual(Skill.objects.filter(normalized_name="java").count(), 1)
+        self.assertEqual(
+            list(self.java_job.skill_links.order_by("position").values_list("skill__name", flat=True)),
+            ["Java", "Spring"],
+        )
+
+        self.java_job.required_skills = ["Kotlin"]
+        self.java_job.save()
+        self.assertEqual(
+            list(self.java_job.skills.values_list("normalized_name", flat=True)),
+            ["kotlin"],
+        )
+
+    def test_unchanged_skills_skip_sync(self):
+        """測試技能未變動時不重新同步 / Test unchanged skills are not re-synced"""
+        job = JobPosting.objects.get(id=self.js_job.id)
+        job.title = "Renamed"
+        with self.assertNumQueries(1):
+            job.save()
+
+    def test_exact_match_excludes_prefix(self):
+        """測試精確比對不會命中前綴相同的技能 / Test exact match does not hit skills sharing a prefix"""
+        results = filter_by_skills(JobPosting.objects.all(), ["Java"])
+        self.assertEqual(set(results), {self.java_job, self.fullstack_job})
+
+    def test_any_and_all_match(self):
+        """測試 ANY 與 ALL 模式 / Test ANY and ALL modes"""
+        any_results = filter_by_skills(JobPosting.objects.all(), ["Spring", "SQL"], SkillMatch.ANY)
+        self.assertEqual(set(any_results), {self.java_job, self.fullstack_job})
+
+        all_results = filter_by_skills(JobPosting.objects.all(), ["java", "react"], SkillMatch.ALL)
+        self.assertEqual(list(all_results), [self.fullstack_job])
+
+    def test_skill_filter_endpoint(self):
+        """測試列表端點的技能過濾 / Test the skill filter on the list endpoint"""
+        response = self.client.get("/api/jobs/?skill=Java", **self.authenticate())
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+        response = self.client.get(
+            "/api/jobs/?skill=React,SQL&skill_match=all",
+            **self.authenticate()
+        )
+        response_data = json.loads(response.content)
+        self.assertEqual([job["title"] for job in response_data], ["Fullstack Job"])
+
+    def test_normalize_skill_name(self):
+        """測試技能名稱正規化 / Test skill name normalization"""
+        self.assertEqual(normalize_skill_name("  Rest   API "), "rest api")
+
+    def test_deleting_job_removes_links(self):
+        """測試刪除職缺會移除技能關聯 / Test deleting a posting removes its skill links"""
+        self.java_job.delete()
+        self.assertFalse(JobPostingSkill.objects.filter(job_posting_id=self.java_job.id).exists())
@@ -0,0 +1,136 @@
+from datetime import date, timedelta
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.cache import invalidate_lists
+from jobs.models import JobPosting
+from jobs.snapshot import active_snapshot
+
+
+@override_settings(JOBS_RESPONSE_CACHE={"ENABLED": False})
+class ActiveSnapshotTest(TestCase):
+    """
+    測試有效職缺記憶體快照 / Test the in-memory active job snapshot
+    """
+
+    def setUp(self):
+        # 建立測試用戶與令牌 / Create test user and token
+        self.user = User.objects.create_user(username="snapshotuser", password="testpassword")
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        self.today = date.today()
+        postings = [
+            ("Backend Engineer", "Taipei City", "Acme", 50000, 80000, 3),
+            ("Frontend Engineer", "taipei", "ACME Labs", None, 60000, 3),
+            ("Data Engineer", "台北", "Globex", 70000, None, 5),
+            ("SRE", "Tainan", "Initech", None, None, 1),
+            ("QA Engineer", "Kaohsiung", "acme", 40000, 45000, 10),
+        ]
+        for title, location, company, salary_min, salary_max, days_ago in postings:
+            JobPosting.objects.create(
+                title=title,
+                description=f"{title} at {company}",
+                location=location,
+                company_name=company,
+                salary_min=salary_min,
+                salary_max=salary_max,
+                posting_date=self.today - timedelta(days=days_ago),
+                expiration_date=self.today + timedelta(days=days_ago * 7),
+                _required_skills='["Python"]',
+            )
+        # 不屬於快照的已過期與排程職缺 / Expired and scheduled postings stay out of the snapshot
+        for title, posting_date, expiration_date in (
+            ("Expired Job", self.today - timedelta(days=30), self.today - timedelta(days=1)),
+            ("Scheduled Job", self.today + timedelta(days=3), self.today + timedelta(days=30)),
+        ):
+            JobPosting.objects.create(
+                title=title, description="Not active", location="Taipei", company_name="Acme",
+                posting_date=posting_date, expiration_date=expiration_date,
+            )
+
+    def get(self, query):
+        return self.client.get(f"/api/jobs/?status=active&{query}", HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+
+    def test_matches_database_path(self):
+        """測試各種排序、過濾與分頁的內容與 ETag 與資料庫路徑相同 / Test content and ETags match the database path across sorts, filters and pages"""
+        queries = [
+            "",
+            "sort_desc=true",
+            "sort_by=expiration_date&sort_desc=true",
+            "sort_by=salary_min",
+            "sort_by=salary_min&sort_desc=true",
+            "sort_by=salary_max&sort_desc=true&limit=2&offset=1",
+            "location=TAIPEI",
+            "location=台北",
+            "company=acme&sort_desc=true&offset=1",
+            "location=nowhere",
+            "near=25.03,121.56&radius_km=50&sort_desc=true",
+            "fields=id,title&limit=3",
+        ]
+        # 第一次讀取建立快照 / The first read builds the snapshot
+        self.get("")
+        for query in queries:
+            with override_settings(JOBS_SNAPSHOT={"ENABLED": False}):
+                expected = self.get(query)
+            with self.subTest(query=query), self.assertNumQueries(0):
+                response = self.get(query)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(response["ETag"], expected["ETag"])
+        self.assertEqual(active_snapshot.stats()["rows"], 5)
+
+    def test_not_served_for_other_filters(self):
+        """測試搜尋、技能、薪資與非 active 狀態仍查詢資料庫 / Test search, skill, salary and non-active statuses still query the database"""
+        self.get("")
+        hits = active_snapshot.stats()["hits"]
+        for query in ("search=Engineer", "skill=Python", "salary_min=45000"):
+            self.assertEqual(self.get(query).status_code, 200)
+        self.client.get("/api/jobs/", HTTP_AUTHORIZATION=f"Bearer {self.access_token}")
+        self.assertEqual(active_snapshot.stats()["hits"], hits)
+
+    def test_incremental_update_on_write(self):
+        """測試寫入後只重新載入變動的職缺 / Test writes reload only the changed postings"""
+        self.get("")
+        stats = active_snapshot.stats()
+
+        job = JobPosting.objects.get(title="SRE")
+        job.title = "Site Reliability Engineer"
+        job.save()
+        JobPosting.objects.get(title="QA Engineer").delete()
+
+        with self.assertNumQueries(1):
+            titles = [row["title"] for row in self.get("sort_desc=true").json()]
+        self.assertEqual(titles, ["Site Reliability Engineer", "Frontend Engineer", "Backend Engineer", "Data Engineer"])
+        self.assertEqual(active_snapshot.stats()["rebuilds"], stats["rebuilds"])
+        self.assertEqual(active_snapshot.stats()["updates"], stats["updates"] + 1)
+
+        # 延後上架即離開快照 / Rescheduling a posting removes it from the snapshot
+        job.posting_date = self.today + timedelta(days=1)
+        job.save()
+        self.assertNotIn("Site Reliability Engineer", [row["title"] for row in self.get("").json()])
+
+    @override_settings(JOBS_SNAPSHOT={"REBUILD_INTERVAL": 0})
+    def test_full_rebuild_on_unknown_write(self):
+        """測試未知範圍的寫入（例如原生 SQL 後）會整份重建 / Test writes of unknown extent (e.g. after raw SQL) trigger a full rebuild"""
+        self.get("")
+        JobPosting.objects.filter(title="SRE").update(title="Renamed Without Signals")
+        invalidate_lists()
+
+        self.assertIn("Renamed Without Signals", [row["title"] for row in self.get("").json()])
+        self.assertEqual(active_snapshot.stats()["rebuilds"], 2)
+
+    def test_memory_reported(self):
+        """測試回報每十萬筆的記憶體估計 / Test the memory estimate per 100k postings is reported"""
+        self.get("")
+        stats = active_snapshot.stats()
+        self.assertGreater(stats["bytes"], 0)
+        self.assertGreater(stats["bytes_per_100k"], stats["bytes"])
+
+    async def test_async_list_served(self):
+        """測試非同步列表端點同樣由快照回答 / Test the async list endpoint is answered from the snapshot too"""
+        headers = {"Authorization": f"Bearer {self.access_token}"}
+        response = await self.async_client.get("/api/async/jobs/?status=active&sort_desc=true", headers=headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 5)
+        self.assertEqual(active_snapshot.stats()["hits"], 1)
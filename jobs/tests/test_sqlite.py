@@ -0,0 +1,49 @@
+import os
+import tempfile
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import TestCase, override_settings
+
+from jobs.sqlite import pragma_statements, pragma_values
+
+
+class SQLiteProfileTest(TestCase):
+    """
+    測試 SQLite 連線設定檔 / Test the SQLite connection profile
+    """
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix="jobs_sqlite_")
+        self.wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": os.path.join(directory, "profile.sqlite3")}, alias="profile")
+
+    def tearDown(self):
+        self.wrapper.close()
+
+    def test_profile_applied_on_connect(self):
+        """測試新連線套用 WAL 與其他 PRAGMA / Test new connections get WAL and the other PRAGMAs"""
+        self.wrapper.connect()
+        values = pragma_values(self.wrapper)
+        self.assertEqual(values["JOURNAL_MODE"], "wal")
+        self.assertEqual(values["SYNCHRONOUS"], 1)  # NORMAL
+        self.assertEqual(values["CACHE_SIZE"], -64000)
+        self.assertEqual(values["MMAP_SIZE"], 268435456)
+        self.assertEqual(values["TEMP_STORE"], 2)  # MEMORY
+
+    @override_settings(JOBS_SQLITE={"JOURNAL_MODE": None, "BUSY_TIMEOUT": 1500})
+    def test_none_leaves_pragma_alone(self):
+        """測試值為 None 的 PRAGMA 不設定 / Test PRAGMAs set to None are left alone"""
+        self.wrapper.connect()
+        values = pragma_values(self.wrapper)
+        self.assertEqual(values["JOURNAL_MODE"], "delete")
+        self.assertEqual(values["BUSY_TIMEOUT"], 1500)
+
+    @override_settings(JOBS_SQLITE={"ENABLED": False})
+    def test_disabled(self):
+        """測試停用時維持 SQLite 預設值 / Test SQLite defaults are kept when disabled"""
+        self.wrapper.connect()
+        self.assertEqual(pragma_values(self.wrapper)["SYNCHRONOUS"], 2)  # FULL
+
+    def test_invalid_value_rejected(self):
+        """測試非識別字或整數的值被拒絕 / Test values that are neither identifiers nor integers are rejected"""
+        with self.assertRaises(ValueError):
+            pragma_statements({"JOURNAL_MODE": "WAL; DROP TABLE jobs_jobposting"})
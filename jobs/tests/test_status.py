@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.models import JobPosting
+from jobs.queries import build_job_queryset
+from jobs.schemas import JobFilterParams, JobStatus
+from jobs.status import compute_status, ensure_transitioned, mark_transitioned, stored_status_condition, transition_statuses
+
+
+class JobStatusTransitionTest(TestCase):
+    """
+    測試儲存的狀態欄位與每日轉換 / Test the stored status column and daily transitions
+    """
+
+    def setUp(self):
+        # 建立明天上架、後天到期的職缺 / Create a posting going live tomorrow and expiring the day after
+        self.today = date.today()
+        self.job = JobPosting.objects.create(
+            title="Scheduled Job",
+            description="Status test",
+            location="Taipei",
+            company_name="Status Company",
+            posting_date=self.today + timedelta(days=1),
+            expiration_date=self.today + timedelta(days=2),
+        )
+
+    def test_status_computed_on_save(self):
+        """測試儲存時計算狀態 / Test the status is computed on save"""
+        self.assertEqual(self.job.status, JobStatus.SCHEDULED)
+        self.job.posting_date = self.today
+        self.job.save(update_fields=["posting_date"])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, JobStatus.ACTIVE)
+
+    def test_forward_transitions(self):
+        """測試跨日後批次轉換狀態 / Test bulk transitions across day boundaries"""
+        counts = transition_statuses(self.today + timedelta(days=1))
+        self.assertEqual(counts, {"active": 1, "expired": 0, "scheduled": 0})
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, JobStatus.ACTIVE)
+
+        transition_statuses(self.today + timedelta(days=3))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.status, JobStatus.EXPIRED)
+
+    def test_full_recompute_and_command(self):
+        """測試完整重算與管理命令 / Test the full recompute and the management command"""
+        JobPosting.objects.update(status=JobStatus.EXPIRED)
+        output = StringIO()
+        call_command("transition_job_statuses", "--full", stdout=output)
+        self.assertIn("scheduled=1", output.getvalue())
+        self.assertEqual(
+            JobPosting.objects.get().status,
+            compute_status(self.job.posting_date, self.job.expiration_date),
+        )
+
+    def test_filters_correct_without_transition(self):
+        """測試未執行跨日轉換時狀態過濾與快照仍正確 / Test status filters and the snapshot stay correct when no transition ran"""
+        user = User.objects.create_user(username="statususer", password="testpassword")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        late_expired = JobPosting.objects.create(
+            title="Expired Yesterday", description="Status test", location="Taipei", company_name="Status Company",
+            posting_date=self.today - timedelta(days=10), expiration_date=self.today - timedelta(days=1),
+        )
+        # 模擬昨天之後沒有執行轉換 / Simulate no transition since yesterday
+        JobPosting.objects.filter(id=late_expired.id).update(status=JobStatus.ACTIVE)
+        JobPosting.objects.filter(id=self.job.id).update(posting_date=self.today, status=JobStatus.SCHEDULED)
+        mark_transitioned(self.today - timedelta(days=1))
+
+        for path in ("/api/jobs/?status=active", "/api/jobs/?status=active&sort_desc=true"):
+            with override_settings(JOBS_SNAPSHOT={"ENABLED": "sort_desc" in path}):
+                titles = [row["title"] for row in self.client.get(path, **headers).json()]
+            self.assertEqual(titles, ["Scheduled Job"], path)
+        self.assertEqual(
+            [row["title"] for row in self.client.get("/api/jobs/?status=expired", **headers).json()], ["Expired Yesterday"],
+        )
+        # 補做的轉換只在當天第一次讀取時執行 / The catch-up transition only runs on the first read of the day
+        self.assertEqual(JobPosting.objects.get(id=late_expired.id).status, JobStatus.EXPIRED)
+        self.assertFalse(ensure_transitioned())
+
+    def test_date_condition_without_catch_up(self):
+        """測試轉換尚未補做時，儲存狀態已過期的列也不會出現 / Test rows whose stored status is outdated are excluded even before the catch-up"""
+        JobPosting.objects.filter(id=self.job.id).update(
+            posting_date=self.today - timedelta(days=5), expiration_date=self.today - timedelta(days=1),
+            status=JobStatus.ACTIVE,
+        )
+        self.assertFalse(JobPosting.objects.filter(stored_status_condition(JobStatus.ACTIVE)).exists())
+
+    def test_query_building_does_not_write(self):
+        """測試建立狀態查詢不會補做轉換 / Test building a status query does not run the catch-up"""
+        mark_transitioned(None)
+        with self.assertNumQueries(0):
+            build_job_queryset(JobFilterParams(status=JobStatus.ACTIVE))
@@ -0,0 +1,254 @@
+import os
+from datetime import date, timedelta
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from ninja_jwt.tokens import RefreshToken
+
+from jobs.bulk import bulk_update_jobs
+from jobs.cache import CACHE_STATUS_HEADER
+from jobs.management.commands.run_workers import Command as RunWorkersCommand
+from jobs.metrics import render_metrics
+from jobs.models import JobPosting, Task
+from jobs.tasks import (
+    TaskStatus,
+    UnknownTask,
+    claim_tasks,
+    enqueue,
+    queue_stats,
+    requeue_abandoned,
+    retry_delay,
+    run_pending,
+    save_with_side_effects,
+)
+
+# 測試工作執行時記錄的參數 / Arguments recorded by the test tasks
+CALLS = []
+
+RECORD_TASK = "jobs.tests.test_tasks.record_call"
+FAILING_TASK = "jobs.tests.test_tasks.failing_call"
+
+
+def record_call(**kwargs):
+    """
+    記錄參數的測試工作 / Test task recording its arguments
+    """
+    CALLS.append(kwargs)
+
+
+def failing_call(**kwargs):
+    """
+    總是失敗的測試工作 / Test task that always fails
+    """
+    raise RuntimeError("boom")
+
+
+def finished_child(batch_size, poll_interval, burst, results):
+    """
+    回報結果後正常結束的子行程 / Child process reporting its outcome and exiting normally
+    """
+    results.put((batch_size, 0))
+
+
+def crashed_child(batch_size, poll_interval, burst, results):
+    """
+    未回報結果即異常結束的子行程 / Child process exiting abnormally without reporting
+    """
+    os._exit(3)
+
+
+class TaskQueueTest(TestCase):
+    """
+    測試背景工作佇列 / Test the background task queue
+    """
+
+    def setUp(self):
+        CALLS.clear()
+
+    def test_enqueue_and_run(self):
+        """測試加入的工作由工作行程執行並記錄等待與執行時間 / Test enqueued tasks run and record wait and run times"""
+        task = enqueue(RECORD_TASK, {"job_id": 1})
+        self.assertEqual(task.status, TaskStatus.QUEUED)
+
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(CALLS, [{"job_id": 1}])
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (TaskStatus.SUCCEEDED, 1))
+        self.assertIsNotNone(task.finished_at)
+        self.assertEqual(queue_stats()["recent_finished"], 1)
+
+    def test_idempotency_key(self):
+        """測試相同鍵只加入並執行一次 / Test the same key is enqueued and run once"""
+        first = enqueue(RECORD_TASK, {"job_id": 1}, key="job:1:v1")
+        second = enqueue(RECORD_TASK, {"job_id": 1}, key="job:1:v1")
+        self.assertEqual(first.id, second.id)
+        run_pending()
+        enqueue(RECORD_TASK, {"job_id": 1}, key="job:1:v1")
+        self.assertEqual(run_pending(), (0, 0))
+        self.assertEqual(len(CALLS), 1)
+
+        with self.assertRaises(UnknownTask):
+            enqueue("jobs.tests.test_tasks.missing_call")
+
+    def test_retry_with_backoff_then_fail(self):
+        """測試失敗後依退避重試，次數用盡即標記 failed / Test failures retry with backoff and become failed when out of attempts"""
+        task = enqueue(FAILING_TASK, max_attempts=2)
+        self.assertEqual(run_pending(), (0, 1))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (TaskStatus.QUEUED, 1))
+        self.assertIn("RuntimeError: boom", task.last_error)
+        self.assertGreater(task.run_after, timezone.now())
+        # 尚未到期不會被認領 / Not claimed before it is due
+        self.assertEqual(claim_tasks("test-worker", 10), [])
+
+        Task.objects.filter(id=task.id).update(run_after=timezone.now())
+        run_pending()
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), (TaskStatus.FAILED, 2))
+
+        with self.settings(JOBS_TASKS={"BACKOFF_BASE": 2, "BACKOFF_MAX": 10, "BACKOFF_JITTER": 0}):
+            self.assertEqual([retry_delay(attempts) for attempts in (1, 2, 3, 5)], [2, 4, 8, 10])
+
+    def test_abandoned_task_requeued(self):
+        """測試租約逾時的工作放回佇列 / Test tasks whose lease expired go back to the queue"""
+        task = enqueue(RECORD_TASK, {"job_id": 2})
+        self.assertEqual([claimed.id for claimed in claim_tasks("crashed-worker", 10)], [task.id])
+        self.assertEqual(claim_tasks("other-worker", 10), [])
+        self.assertEqual(requeue_abandoned(), 0)
+
+        Task.objects.filter(id=task.id).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_abandoned(), 1)
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(CALLS, [{"job_id": 2}])
+
+    def test_run_workers_command(self):
+        """測試 run_workers --burst 執行到期工作後結束 / Test run_workers --burst runs due tasks and exits"""
+        for job_id in range(3):
+            enqueue(RECORD_TASK, {"job_id": job_id})
+        stdout = StringIO()
+        call_command("run_workers", "--processes", "1", "--burst", "--batch-size", "2", stdout=stdout)
+        self.assertEqual(len(CALLS), 3)
+        self.assertIn("3 succeeded", stdout.getvalue())
+
+    def test_run_workers_reports_crashed_workers(self):
+        """測試異常結束的工作行程會被回報並使命令失敗 / Test workers exiting abnormally are reported and fail the command"""
+        stdout, stderr = StringIO(), StringIO()
+        with mock.patch.object(RunWorkersCommand, "_run_processes", return_value=([(2, 0)], [(4242, 3)])):
+            with self.assertRaisesMessage(CommandError, "1 of 2 worker processes exited abnormally"):
+                call_command("run_workers", "--processes", "2", "--burst", stdout=stdout, stderr=stderr)
+        self.assertIn("2 succeeded", stdout.getvalue())
+        self.assertIn("Worker process 4242 exited with code 3", stderr.getvalue())
+
+    def test_metrics(self):
+        """測試 /metrics 輸出佇列深度 / Test /metrics reports the queue depth"""
+        enqueue(RECORD_TASK)
+        enqueue(RECORD_TASK, delay=60)
+        metrics = render_metrics()
+        self.assertIn('jobs_tasks{status="queued"} 2', metrics)
+        self.assertIn("jobs_tasks_due 1", metrics)
+        self.assertIn('jobs_tasks_wait_seconds{quantile="0.95"}', metrics)
+
+
+class RunWorkerProcessesTest(SimpleTestCase):
+    """
+    測試 run_workers 收集子行程結果 / Test run_workers collecting child process outcomes
+    """
+
+    def test_outcomes_and_crashes(self):
+        """測試讀取每個子行程的結果並回報異常結束者 / Test every child's outcome is read and abnormal exits are reported"""
+        command = RunWorkersCommand()
+        with mock.patch("jobs.management.commands.run_workers._run_in_child", finished_child):
+            self.assertEqual(command._run_processes(3, (5, 0, True)), ([(5, 0)] * 3, []))
+        with mock.patch("jobs.management.commands.run_workers._run_in_child", crashed_child):
+            outcomes, crashed = command._run_processes(2, (5, 0, True))
+        self.assertEqual(outcomes, [])
+        self.assertEqual([exitcode for _, exitcode in crashed], [3, 3])
+
+
+@override_settings(JOBS_TASKS={"JOB_SIDE_EFFECTS": [RECORD_TASK]})
+class JobSideEffectTest(TestCase):
+    """
+    測試職缺寫入加入副作用工作 / Test job writes enqueue side-effect tasks
+    """
+
+    def setUp(self):
+        CALLS.clear()
+        self.user = User.objects.create_user(username="taskuser", password="testpassword")
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+        self.job_data = {
+            "title": "Task Job",
+            "description": "Side effect test",
+            "location": "Taipei",
+            "company_name": "Task Company",
+            "posting_date": date.today().isoformat(),
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat(),
+            "required_skills": [],
+        }
+
+    def test_create_and_update_enqueue(self):
+        """測試建立與更新各加入一個工作，由工作行程非同步執行 / Test create and update each enqueue a task that workers run later"""
+        response = self.client.post("/api/jobs/", self.job_data, content_type="application/json", **self.headers)
+        self.assertEqual(response.status_code, 201)
+        job_id = response.json()["id"]
+        self.assertEqual(CALLS, [])
+        self.assertEqual(Task.objects.filter(name=RECORD_TASK, payload={"job_id": job_id}).count(), 1)
+
+        response = self.client.put(
+            f"/api/jobs/{job_id}", {**self.job_data, "title": "Renamed"}, content_type="application/json", **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+        bulk_update_jobs([{**self.job_data, "id": job_id, "title": "Renamed Again"}])
+        self.assertEqual(Task.objects.count(), 3)
+
+        self.assertEqual(run_pending(), (3, 0))
+        self.assertEqual(CALLS, [{"job_id": job_id}] * 3)
+
+    def test_put_enqueues_one_keyed_task(self):
+        """測試 PUT 加入一個以版本為鍵的工作，run_pending 執行它 / Test a PUT enqueues one task keyed by version that run_pending runs"""
+        job = JobPosting.objects.create(**{key: value for key, value in self.job_data.items() if key != "required_skills"})
+        response = self.client.put(
+            f"/api/jobs/{job.id}", {**self.job_data, "title": "Updated"}, content_type="application/json", **self.headers,
+        )
+        self.assertEqual(response.status_code, 200)
+
+        job.refresh_from_db()
+        task = Task.objects.get()
+        self.assertEqual((task.name, task.payload), (RECORD_TASK, {"job_id": job.id}))
+        self.assertEqual(task.idempotency_key, f"{RECORD_TASK}:{job.id}:{job.updated_at.isoformat()}")
+        self.assertEqual(CALLS, [])
+
+        self.assertEqual(run_pending(), (1, 0))
+        self.assertEqual(CALLS, [{"job_id": job.id}])
+        task.refresh_from_db()
+        self.assertEqual(task.status, TaskStatus.SUCCEEDED)
+
+    def test_no_stale_cache_after_commit(self):
+        """測試副作用交易中的讀取不會留下過期的列表與詳情快取 / Test reads inside the side-effect transaction leave no stale list or detail entries"""
+        job = JobPosting.objects.create(**{key: value for key, value in self.job_data.items() if key != "required_skills"})
+        detail_url = f"/api/jobs/{job.id}"
+        self.client.get("/api/jobs/", **self.headers)
+        self.client.get(detail_url, **self.headers)
+
+        # 回呼在區塊結束時執行，相當於提交 / Callbacks run when the block ends, standing in for the commit
+        with self.captureOnCommitCallbacks(execute=True):
+            job.title = "Renamed In Transaction"
+            save_with_side_effects(job)
+            # 模擬提交前的併發讀取 / Simulate concurrent reads before the commit
+            self.client.get("/api/jobs/", **self.headers)
+            self.client.get(detail_url, **self.headers)
+
+        listing = self.client.get("/api/jobs/", **self.headers)
+        detail = self.client.get(detail_url, **self.headers)
+        self.assertEqual((listing[CACHE_STATUS_HEADER], detail[CACHE_STATUS_HEADER]), ("MISS", "MISS"))
+        self.assertEqual(detail.json()["title"], "Renamed In Transaction")
+        self.assertEqual(Task.objects.filter(payload={"job_id": job.id}).count(), 1)
+
+    def test_no_side_effects_configured(self):
+        """測試未設定副作用時不加入工作 / Test nothing is enqueued without configured side effects"""
+        with self.settings(JOBS_TASKS={}):
+            response = self.client.post("/api/jobs/", self.job_data, content_type="application/json", **self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Task.objects.exists())